@@ -12,6 +12,7 @@ from chainer import datasets  # NOQA
 from chainer import distributions  # NOQA
 from chainer import function_hooks  # NOQA
 from chainer import functions  # NOQA
+from chainer import graph_optimizations  # NOQA
 from chainer import initializers  # NOQA
 from chainer import iterators  # NOQA
 from chainer import links  # NOQA
@@ -41,6 +42,7 @@ from chainer.function_node import FunctionNode  # NOQA
 from chainer.function_node import grad  # NOQA
 from chainer.functions import array  # NOQA
 from chainer.functions.math import basic_math  # NOQA
+from chainer.graph_optimizations.static_graph import static_graph  # NOQA
 from chainer.initializer import Initializer  # NOQA
 from chainer.link import Chain  # NOQA
 from chainer.link import ChainList  # NOQA
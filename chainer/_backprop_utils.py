@@ -1,3 +1,5 @@
+import contextlib
+
 import chainer
 
 
@@ -38,3 +40,24 @@ def concat_variable(gx, g_input):
 def add(lhs, rhs):
     y = concat_variable(lhs, rhs)
     return chainer.functions.add(*y)
+
+
+def get_loss_scale():
+    """Returns the loss scaling factor of the backprop in this thread."""
+    return getattr(chainer._thread_local, 'backprop_loss_scale', None)
+
+
+@contextlib.contextmanager
+def loss_scale_scope(loss_scale):
+    """Sets the loss scaling factor of the backprop in this thread.
+
+    Functions adding gradients to parameters apart from the computational
+    graph (e.g. row-sparse gradients) refer to it by :func:`get_loss_scale`.
+    """
+    thread_local = chainer._thread_local
+    outer_loss_scale = getattr(thread_local, 'backprop_loss_scale', None)
+    thread_local.backprop_loss_scale = loss_scale
+    try:
+        yield
+    finally:
+        thread_local.backprop_loss_scale = outer_loss_scale
@@ -1,6 +1,7 @@
 # import classes and functions
 from chainer.dataset.convert import concat_examples  # NOQA
 from chainer.dataset.convert import ConcatWithAsyncTransfer  # NOQA
+from chainer.dataset.convert import ConcatWithBuffers  # NOQA
 from chainer.dataset.convert import to_device  # NOQA
 from chainer.dataset.dataset_mixin import DatasetMixin  # NOQA
 from chainer.dataset.download import cache_or_load_file  # NOQA
@@ -8,4 +9,6 @@ from chainer.dataset.download import cached_download  # NOQA
 from chainer.dataset.download import get_dataset_directory  # NOQA
 from chainer.dataset.download import get_dataset_root  # NOQA
 from chainer.dataset.download import set_dataset_root  # NOQA
+from chainer.dataset.example_batch import ExampleBatch  # NOQA
+from chainer.dataset.example_batch import get_examples  # NOQA
 from chainer.dataset.iterator import Iterator  # NOQA
@@ -4,6 +4,7 @@ import numpy
 import six
 
 from chainer.backends import cuda
+from chainer.dataset import example_batch
 
 
 def to_device(device, x):
@@ -58,6 +59,11 @@ def concat_examples(batch, device=None, padding=None):
     array, and returns a dictionary with two entries ``x`` and ``y`` whose
     values are the concatenated arrays.
 
+    If the batch is an :class:`~chainer.dataset.ExampleBatch` given by the
+    bulk retrieval protocol of datasets (see
+    :func:`~chainer.dataset.get_examples`), the arrays of the stacked examples
+    held by it are used without concatenation.
+
     When the arrays to concatenate have different shapes, the behavior depends
     on the ``padding`` value. If ``padding`` is ``None`` (default), it raises
     an error. Otherwise, it builds an array of the minimum shape that the
@@ -118,19 +124,44 @@ def concat_examples(batch, device=None, padding=None):
         on the type of each example in the batch.
 
     """
+    return _concat_examples(batch, device, padding)
+
+
+def _concat_examples(batch, device, padding, get_buffer=None):
+    # get_buffer(key, shape, dtype) returns a numpy array to which the
+    # examples at the position key are concatenated.
     if len(batch) == 0:
         raise ValueError('batch is empty')
 
+    if isinstance(batch, example_batch.ExampleBatch) and \
+            batch.columns is not None:
+        # The examples are already stacked by the dataset
+        columns = batch.columns
+        if isinstance(columns, tuple):
+            return tuple([to_device(device, column) for column in columns])
+        elif isinstance(columns, dict):
+            return {key: to_device(device, column)
+                    for key, column in six.iteritems(columns)}
+        else:
+            return to_device(device, columns)
+
     first_elem = batch[0]
 
+    def concat(arrays, padding, key):
+        def get_out(shape, dtype):
+            return get_buffer(key, shape, dtype)
+
+        out = get_out if get_buffer is not None else None
+        return to_device(device, _concat_arrays(arrays, padding, out))
+
     if isinstance(first_elem, tuple):
         result = []
         if not isinstance(padding, tuple):
             padding = [padding] * len(first_elem)
 
         for i in six.moves.range(len(first_elem)):
-            result.append(to_device(device, _concat_arrays(
-                [example[i] for example in batch], padding[i])))
+            result.append(concat(
+                [example[i] for example in batch], padding[i], i))
 
         return tuple(result)
 
@@ -140,30 +171,92 @@ def concat_examples(batch, device=None, padding=None):
             padding = {key: padding for key in first_elem}
 
         for key in first_elem:
-            result[key] = to_device(device, _concat_arrays(
-                [example[key] for example in batch], padding[key]))
+            result[key] = concat(
+                [example[key] for example in batch], padding[key], key)
 
         return result
 
     else:
-        return to_device(device, _concat_arrays(batch, padding))
+        return concat(batch, padding, None)
 
 
-def _concat_arrays(arrays, padding):
+def _concat_arrays(arrays, padding, out=None):
+    # out(shape, dtype) returns a numpy array into which the examples are
+    # written. A new array is allocated if it is None.
+    if isinstance(arrays, numpy.ndarray):
+        # The examples are already stacked in one array, e.g. a slice of a
+        # dataset array
+        return _copy_to_buffer(arrays, out)
     # Convert `arrays` to numpy.ndarray if `arrays` consists of the built-in
     # types such as int or float.
     if not isinstance(arrays[0], numpy.ndarray) and\
        not isinstance(arrays[0], cuda.ndarray):
         arrays = numpy.asarray(arrays)
+        if arrays.dtype != object:
+            if out is None:
+                return arrays
+            return _copy_to_buffer(arrays, out)
     if padding is not None:
-        return _concat_arrays_with_padding(arrays, padding)
+        return _concat_arrays_with_padding(arrays, padding, out)
+
+    if isinstance(arrays[0], numpy.ndarray):
+        result = _concat_numpy_arrays(arrays, out)
+        if result is not None:
+            return result
 
     xp = cuda.get_array_module(arrays[0])
     with cuda.get_device_from_array(arrays[0]):
         return xp.concatenate([array[None] for array in arrays])
 
 
-def _concat_arrays_with_padding(arrays, padding):
+def _copy_to_buffer(array, out):
+    if out is None:
+        return array.copy()
+    buf = out(array.shape, array.dtype)
+    buf[...] = array
+    return buf
+
+
+_concatenate_supports_out = \
+    numpy.lib.NumpyVersion(numpy.__version__) >= '1.14.0'
+
+
+def _concat_numpy_arrays(arrays, out):
+    # Concatenates numpy arrays of the same shape into an array allocated
+    # once. It returns None if the shapes differ.
+    shape = arrays[0].shape
+    if not all([isinstance(array, numpy.ndarray) and array.shape == shape
+                for array in arrays]):
+        return None
+    dtype = numpy.result_type(*arrays)
+    batch_shape = (len(arrays),) + shape
+    if out is None:
+        result = numpy.empty(batch_shape, dtype=dtype)
+    else:
+        result = out(batch_shape, dtype)
+    _fill_rows(result, arrays)
+    return result
+
+
+def _fill_rows(result, arrays):
+    # Writes arrays of the shape result.shape[1:] into the rows of result,
+    # whose dtype must be the result type of them.
+    if result.ndim > 1 and _concatenate_supports_out:
+        # Concatenation along the existing first axis writes all examples
+        # with one call without making the views with the batch axis.
+        numpy.concatenate(
+            arrays, out=result.reshape((-1,) + result.shape[2:]))
+    else:
+        for i, array in enumerate(arrays):
+            result[i] = array
+
+
+def _concat_arrays_with_padding(arrays, padding, out=None):
+    if isinstance(arrays[0], numpy.ndarray):
+        result = _concat_numpy_arrays_with_padding(arrays, padding, out)
+        if result is not None:
+            return result
+
     shape = numpy.array(arrays[0].shape, dtype=int)
     for array in arrays[1:]:
         if numpy.any(shape != array.shape):
@@ -181,6 +274,111 @@ def _concat_arrays_with_padding(arrays, padding):
     return result
 
 
+def _concat_numpy_arrays_with_padding(arrays, padding, out):
+    # Computes the padded shape with one vectorized operation, and fills the
+    # examples that differ only in the length of the first axis with one
+    # masked assignment. It returns None if the arrays are not numpy arrays
+    # of the same dimensionality.
+    ndim = arrays[0].ndim
+    if ndim == 0 or not all([isinstance(array, numpy.ndarray) and
+                             array.ndim == ndim for array in arrays]):
+        return None
+    shapes = numpy.array([array.shape for array in arrays], dtype=int)
+    max_shape = shapes.max(axis=0)
+    shape = (len(arrays),) + tuple(max_shape.tolist())
+    dtype = arrays[0].dtype
+    if out is None:
+        result = numpy.empty(shape, dtype=dtype)
+    else:
+        result = out(shape, dtype)
+
+    if (shapes == max_shape).all() and numpy.result_type(*arrays) == dtype:
+        _fill_rows(result, arrays)
+    elif (shapes[:, 1:] == max_shape[1:]).all():
+        # Only the lengths of the first axis differ
+        mask = numpy.arange(max_shape[0]) < shapes[:, :1]
+        result[~mask] = padding
+        result[mask] = numpy.concatenate(arrays)
+    else:
+        result[...] = padding
+        for i, src in enumerate(arrays):
+            slices = tuple(slice(dim) for dim in src.shape)
+            result[(i,) + slices] = src
+    return result
+
+
+class ConcatWithBuffers(object):
+
+    """Converter that concatenates examples into recycled buffers.
+
+    This converter works as :func:`concat_examples`, except that the arrays
+    are concatenated into buffers on the host memory that are allocated on
+    the first call and reused by the subsequent calls. It saves the
+    allocation of new batch arrays on every iteration.
+
+    Each position of the examples (e.g. each element of tuple examples) has
+    ``n_buffers`` buffers used in rotation, so that an array returned by a
+    call is overwritten by the ``n_buffers``-th call after it. If the arrays
+    are sent to a GPU by the ``device`` argument, the buffers are only used
+    to build the arrays sent to the device. A buffer is allocated again when
+    the shape or the dtype of the batch changes. The arrays on GPU are
+    concatenated as :func:`concat_examples` does.
+
+    An instance of this class is intended to be used as a converter function
+    of an updater or an evaluator.
+
+    .. doctest::
+
+        from chainer.dataset import convert
+        ...
+        updater = chainer.training.updaters.StandardUpdater(
+                       ...,
+                       converter=convert.ConcatWithBuffers(),
+                       ...)
+
+    Args:
+        n_buffers (int): Number of buffers used in rotation for each
+            position of the examples. The arrays returned by a call must not
+            be used after ``n_buffers`` more calls.
+
+    """
+
+    def __init__(self, n_buffers=2):
+        if n_buffers < 1:
+            raise ValueError('n_buffers must be a positive integer')
+        self.n_buffers = n_buffers
+        self._buffers = collections.defaultdict(collections.deque)
+
+    def __call__(self, batch, device=None, padding=None):
+        """Concatenates examples into the buffers.
+
+        See also :func:`chainer.dataset.concat_examples`.
+
+        Args:
+            batch (list): A list of examples.
+            device (int): Device ID to which each array is sent.
+            padding: Scalar value for extra elements.
+
+        Returns:
+            Array, a tuple of arrays, or a dictionary of arrays.
+            The type depends on the type of each example in the batch.
+
+        """
+        return _concat_examples(batch, device, padding, self._get_buffer)
+
+    def _get_buffer(self, key, shape, dtype):
+        buffers = self._buffers[key]
+        buf = None
+        if len(buffers) >= self.n_buffers:
+            buf = buffers.popleft()
+            if buf.shape != shape or buf.dtype != dtype:
+                buf = None
+        if buf is None:
+            buf = numpy.empty(shape, dtype=dtype)
+        buffers.append(buf)
+        return buf
+
+
 class ConcatWithAsyncTransfer(object):
 
     """Interface to concatenate data and transfer them to GPU asynchronously.
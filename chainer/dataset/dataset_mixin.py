@@ -11,6 +11,11 @@ class DatasetMixin(object):
     combines the results into a list. This mixin makes it easy to implement a
     new dataset that does not support efficient slicing.
 
+    The examples of multiple indexes are extracted by :meth:`get_examples`,
+    which is also used by the built-in iterators (see
+    :func:`~chainer.dataset.get_examples`). Implementations can override it
+    to extract the examples at once.
+
     Dataset implementation using DatasetMixin still has to provide the
     :meth:`__len__` operator explicitly.
 
@@ -20,9 +25,10 @@ class DatasetMixin(object):
         """Returns an example or a sequence of examples.
 
         It implements the standard Python indexing and one-dimensional integer
-        array indexing. It uses the :meth:`get_example` method by default, but
-        it may be overridden by the implementation to, for example, improve the
-        slicing performance.
+        array indexing. It uses the :meth:`get_example` method for an integer
+        index and the :meth:`get_examples` method for the others by default,
+        but it may be overridden by the implementation to, for example,
+        improve the slicing performance.
 
         Args:
             index (int, slice, list or numpy.ndarray): An index of an example
@@ -31,7 +37,7 @@ class DatasetMixin(object):
         Returns:
             If index is int, returns an example created by `get_example`.
             If index is either slice or one-dimensional list or numpy.ndarray,
-            returns a list of examples created by `get_example`.
+            returns a list of examples created by `get_examples`.
 
         .. admonition:: Example
 
@@ -59,10 +65,9 @@ class DatasetMixin(object):
         """
         if isinstance(index, slice):
             current, stop, step = index.indices(len(self))
-            return [self.get_example(i) for i in
-                    six.moves.range(current, stop, step)]
+            return self.get_examples(six.moves.range(current, stop, step))
         elif isinstance(index, list) or isinstance(index, numpy.ndarray):
-            return [self.get_example(i) for i in index]
+            return self.get_examples(index)
         else:
             return self.get_example(index)
 
@@ -84,3 +89,22 @@ class DatasetMixin(object):
 
         """
         raise NotImplementedError
+
+    def get_examples(self, indices):
+        """Returns the examples of the given indices.
+
+        The default implementation calls :meth:`get_example` for each index.
+        Implementations can override it to extract the examples at once, e.g.
+        by fancy indexing of arrays. It should raise :class:`IndexError` if
+        any index is invalid.
+
+        Args:
+            indices (sequence of ints): The indices of the examples.
+
+        Returns:
+            list: The examples. It can be an
+            :class:`~chainer.dataset.ExampleBatch` that also holds the
+            examples stacked into arrays.
+
+        """
+        return [self.get_example(i) for i in indices]
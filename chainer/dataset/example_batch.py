@@ -0,0 +1,184 @@
+import numpy
+import six
+
+
+def _take(columns, indices):
+    if isinstance(columns, tuple):
+        return tuple([column[indices] for column in columns])
+    elif isinstance(columns, dict):
+        return {key: column[indices] for key, column in six.iteritems(columns)}
+    else:
+        return columns[indices]
+
+
+def _column_structure(column):
+    if not isinstance(column, numpy.ndarray):
+        return None
+    return column.shape[1:], column.dtype
+
+
+def _structure(columns):
+    # Returns the structure of columns compared by ExampleBatch.concatenate,
+    # or None if they are not stacked arrays. Columns can be concatenated only
+    # if the shapes of their examples and dtypes are the same.
+    if isinstance(columns, tuple):
+        items = list(enumerate(columns))
+    elif isinstance(columns, dict):
+        items = list(six.iteritems(columns))
+    else:
+        return _column_structure(columns)
+    structure = [(key, _column_structure(c)) for key, c in items]
+    if any([s is None for _, s in structure]):
+        return None
+    return frozenset(structure)
+
+
+class ExampleBatch(list):
+
+    """List of examples that also holds the examples stacked into arrays.
+
+    This is a list of examples returned by the bulk retrieval protocol of
+    datasets (see :func:`~chainer.dataset.get_examples`). In addition to the
+    examples themselves, it holds the arrays of the examples stacked along
+    the first axis in :attr:`columns`, which
+    :func:`~chainer.dataset.concat_examples` uses without concatenating the
+    examples one by one.
+
+    The examples are views into the stacked arrays. The stacked arrays are
+    discarded when the list is modified.
+
+    Args:
+        columns: Stacked examples. It is an array, a tuple of arrays, or a
+            dictionary of arrays, which corresponds to the examples of arrays,
+            tuples, or dictionaries, respectively. All arrays must be
+            :class:`numpy.ndarray` of the same length, which do not share the
+            memory with the dataset.
+
+    Attributes:
+        ~ExampleBatch.columns: Stacked examples. It is ``None`` if the list
+            has been modified.
+
+    """
+
+    def __init__(self, columns):
+        if isinstance(columns, tuple):
+            examples = six.moves.zip(*columns)
+        elif isinstance(columns, dict):
+            keys = list(columns)
+            examples = [dict(six.moves.zip(keys, values)) for values in
+                        six.moves.zip(*[columns[key] for key in keys])]
+        else:
+            examples = columns
+        super(ExampleBatch, self).__init__(examples)
+        self.columns = columns
+
+    @classmethod
+    def concatenate(cls, batches):
+        """Concatenates lists of examples.
+
+        Args:
+            batches (list of lists): Lists of examples.
+
+        Returns:
+            list: An :class:`ExampleBatch` if all of the given lists are
+            :class:`ExampleBatch` with the stacked arrays of the same
+            structure. Otherwise, a list of the examples.
+
+        """
+        if len(batches) == 1 and isinstance(batches[0], list):
+            return batches[0]
+        structure = None
+        for batch in batches:
+            columns = getattr(batch, 'columns', None)
+            if not isinstance(batch, cls) or _structure(columns) is None:
+                break
+            if structure is None:
+                structure = _structure(columns)
+            elif structure != _structure(columns):
+                break
+        else:
+            if structure is not None:
+                first = batches[0].columns
+                if isinstance(first, tuple):
+                    return cls(tuple([
+                        numpy.concatenate([b.columns[i] for b in batches])
+                        for i in six.moves.range(len(first))]))
+                elif isinstance(first, dict):
+                    return cls({key: numpy.concatenate(
+                        [b.columns[key] for b in batches]) for key in first})
+                else:
+                    return cls(numpy.concatenate(
+                        [b.columns for b in batches]))
+
+        examples = []
+        for batch in batches:
+            examples.extend(batch)
+        return examples
+
+    def take(self, indices):
+        """Returns the examples of the given indices.
+
+        Args:
+            indices (numpy.ndarray): Indices of the examples in this list.
+
+        Returns:
+            list: An :class:`ExampleBatch` if this list has the stacked arrays.
+            Otherwise, a list of the examples.
+
+        """
+        if self.columns is None:
+            return [self[i] for i in indices]
+        return ExampleBatch(_take(self.columns, indices))
+
+
+def _discarding_columns(name):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self.columns = None
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in ('__setitem__', '__delitem__', '__iadd__', '__imul__', 'append',
+              'extend', 'insert', 'pop', 'remove', 'reverse', 'sort'):
+    setattr(ExampleBatch, _name, _discarding_columns(_name))
+if six.PY2:
+    for _name in ('__setslice__', '__delslice__'):
+        setattr(ExampleBatch, _name, _discarding_columns(_name))
+
+
+def get_examples(dataset, indices):
+    """Returns the examples of the given indices in a dataset.
+
+    This function implements the bulk retrieval protocol of datasets. If the
+    dataset has a method ``get_examples``, it is called with the indices.
+    The method must return a list of the examples of the indices, and it can
+    return an :class:`~chainer.dataset.ExampleBatch` to provide the examples
+    stacked into arrays. If the dataset is a :class:`numpy.ndarray`, the
+    examples are gathered by one fancy indexing. Otherwise, the examples are
+    extracted one by one.
+
+    Built-in iterators use this function to load each batch, and datasets
+    like :class:`~chainer.datasets.TupleDataset` use it to load examples of
+    the underlying datasets. For datasets of in-memory arrays, a batch is
+    built by a few vectorized gathers instead of the Python calls for each
+    example.
+
+    Args:
+        dataset: Dataset.
+        indices (sequence of ints): Indices of the examples.
+
+    Returns:
+        list: List of the examples.
+
+    """
+    get = getattr(dataset, 'get_examples', None)
+    if get is not None:
+        return get(indices)
+    if isinstance(dataset, numpy.ndarray):
+        return ExampleBatch(dataset[numpy.asarray(indices, dtype=int)])
+    return [dataset[index] for index in indices]
@@ -5,6 +5,7 @@ import numpy
 import six
 
 from chainer.dataset import download
+from chainer.datasets import columnar_dataset
 from chainer.datasets import tuple_dataset
 
 
@@ -53,3 +54,14 @@ def preprocess_mnist(raw, withlabel, ndim, scale, image_dtype, label_dtype,
         return tuple_dataset.TupleDataset(images, labels)
     else:
         return images
+
+
+def load_preprocessed_mnist(root, name, retrieve, withlabel, ndim, scale,
+                            image_dtype, label_dtype, rgb_format, memmap):
+    params = (int(withlabel), ndim, scale, numpy.dtype(image_dtype).name,
+              numpy.dtype(label_dtype).name, int(rgb_format))
+    return columnar_dataset._load_preprocessed(
+        root, name, params,
+        lambda: preprocess_mnist(retrieve(), withlabel, ndim, scale,
+                                 image_dtype, label_dtype, rgb_format),
+        memmap)
@@ -7,10 +7,11 @@ import six.moves.cPickle as pickle
 
 import chainer
 from chainer.dataset import download
+from chainer.datasets import columnar_dataset
 from chainer.datasets import tuple_dataset
 
 
-def get_cifar10(withlabel=True, ndim=3, scale=1., dtype=None):
+def get_cifar10(withlabel=True, ndim=3, scale=1., dtype=None, memmap=False):
     """Gets the CIFAR-10 dataset.
 
     `CIFAR-10 <https://www.cs.toronto.edu/~kriz/cifar.html>`_ is a set of small
@@ -37,17 +38,22 @@ def get_cifar10(withlabel=True, ndim=3, scale=1., dtype=None):
             scaled to the interval ``[0, 1]``.
         dtype: Data type of resulting image arrays. ``chainer.config.dtype`` is
             used by default (see :ref:`configuration`).
+        memmap (bool): If ``True``, the preprocessed datasets are cached in
+            the columnar format under the dataset directory, and they are
+            read from the disk by memory mapping. Default is ``False``.
 
     Returns:
         A tuple of two datasets. If ``withlabel`` is ``True``, both datasets
         are :class:`~chainer.datasets.TupleDataset` instances. Otherwise, both
-        datasets are arrays of images.
+        datasets are arrays of images. If ``memmap`` is ``True``, both datasets
+        are :class:`~chainer.datasets.ColumnarDataset` instances instead.
 
     """
-    return _get_cifar('cifar-10', withlabel, ndim, scale, dtype)
+    return _get_cifar('cifar-10', withlabel, ndim, scale, dtype, memmap)
 
 
-def get_cifar100(withlabel=True, ndim=3, scale=1., dtype=None):
+def get_cifar100(withlabel=True, ndim=3, scale=1., dtype=None,
+                 memmap=False):
     """Gets the CIFAR-100 dataset.
 
     `CIFAR-100 <https://www.cs.toronto.edu/~kriz/cifar.html>`_ is a set of
@@ -74,17 +80,21 @@ def get_cifar100(withlabel=True, ndim=3, scale=1., dtype=None):
             scaled to the interval ``[0, 1]``.
         dtype: Data type of resulting image arrays. ``chainer.config.dtype`` is
             used by default (see :ref:`configuration`).
+        memmap (bool): If ``True``, the preprocessed datasets are cached in
+            the columnar format under the dataset directory, and they are
+            read from the disk by memory mapping. Default is ``False``.
 
     Returns:
         A tuple of two datasets. If ``withlabel`` is ``True``, both
         are :class:`~chainer.datasets.TupleDataset` instances. Otherwise, both
-        datasets are arrays of images.
+        datasets are arrays of images. If ``memmap`` is ``True``, both datasets
+        are :class:`~chainer.datasets.ColumnarDataset` instances instead.
 
     """
-    return _get_cifar('cifar-100', withlabel, ndim, scale, dtype)
+    return _get_cifar('cifar-100', withlabel, ndim, scale, dtype, memmap)
 
 
-def _get_cifar(name, withlabel, ndim, scale, dtype):
+def _get_cifar(name, withlabel, ndim, scale, dtype, memmap):
     root = download.get_dataset_directory(os.path.join('pfnet', 'chainer',
                                                        'cifar'))
     npz_path = os.path.join(root, '{}.npz'.format(name))
@@ -133,11 +143,24 @@ def _get_cifar(name, withlabel, ndim, scale, dtype):
         return {'train_x': train_x, 'train_y': train_y,
                 'test_x': test_x, 'test_y': test_y}
 
-    raw = download.cache_or_load_file(npz_path, creator, numpy.load)
-    train = _preprocess_cifar(raw['train_x'], raw['train_y'], withlabel,
-                              ndim, scale, dtype)
-    test = _preprocess_cifar(raw['test_x'], raw['test_y'], withlabel, ndim,
-                             scale, dtype)
+    # The raw arrays are not loaded if both preprocessed datasets are cached
+    raw = []
+
+    def preprocessor(split):
+        def preprocess():
+            if not raw:
+                raw.append(download.cache_or_load_file(
+                    npz_path, creator, numpy.load))
+            return _preprocess_cifar(
+                raw[0][split + '_x'], raw[0][split + '_y'], withlabel, ndim,
+                scale, dtype)
+        return preprocess
+
+    params = (int(withlabel), ndim, scale, chainer.get_dtype(dtype).name)
+    train = columnar_dataset._load_preprocessed(
+        root, '{}-train'.format(name), params, preprocessor('train'), memmap)
+    test = columnar_dataset._load_preprocessed(
+        root, '{}-test'.format(name), params, preprocessor('test'), memmap)
     return train, test
 
 
@@ -0,0 +1,409 @@
+import json
+import os
+
+import numpy
+import six
+
+from chainer.dataset import dataset_mixin
+from chainer.dataset import download
+from chainer.dataset import example_batch
+
+
+_format_version = 1
+_meta_name = 'meta.json'
+
+
+def _data_path(path, i):
+    return os.path.join(path, 'column{}.bin'.format(i))
+
+
+def _offsets_path(path, i):
+    return os.path.join(path, 'column{}.offsets.bin'.format(i))
+
+
+def _memmap(path, dtype, shape):
+    if numpy.prod(shape) * dtype.itemsize == 0:
+        # An empty file cannot be mapped
+        return numpy.empty(shape, dtype=dtype)
+    return numpy.memmap(path, dtype=dtype, mode='r', shape=shape)
+
+
+class _ColumnWriter(object):
+
+    def __init__(self, path, i):
+        self._data_path = _data_path(path, i)
+        self._offsets_path = _offsets_path(path, i)
+        self._file = open(self._data_path, 'wb')
+        self.dtype = None
+        self.shape = None
+        self.variable = False
+        self._lengths = []
+
+    def convert(self, value, stacked=False):
+        # Converts and checks the value without changing the state, so that
+        # nothing is written for an invalid example
+        if self.dtype is None:
+            value = numpy.asarray(value, order='C')
+            if value.dtype.kind == 'O':
+                raise ValueError('arrays of objects cannot be written')
+        else:
+            value = numpy.asarray(value, dtype=self.dtype, order='C')
+        shape = value.shape[1:] if stacked else value.shape
+        if self.shape is not None and (len(shape) != len(self.shape) or
+                                       shape[1:] != self.shape[1:]):
+            raise ValueError(
+                'shape of the column conflicts: {} and {}'.format(
+                    self.shape, shape))
+        return value
+
+    def write(self, value, stacked=False):
+        shape = value.shape[1:] if stacked else value.shape
+        if self.shape is None:
+            self.dtype = value.dtype
+            self.shape = shape
+        elif shape[:1] != self.shape[:1]:
+            self.variable = True
+        if len(shape) > 0:
+            if stacked:
+                self._lengths.extend([shape[0]] * len(value))
+            else:
+                self._lengths.append(shape[0])
+        self._file.write(value.tobytes())
+
+    def close(self):
+        self._file.close()
+        if self.variable:
+            offsets = numpy.zeros(len(self._lengths) + 1, dtype=numpy.int64)
+            numpy.cumsum(self._lengths, out=offsets[1:])
+            offsets.tofile(self._offsets_path)
+            shape = self.shape[1:]
+        else:
+            shape = self.shape
+        return {'dtype': self.dtype.str, 'shape': list(shape),
+                'variable': self.variable}
+
+
+class ColumnarDatasetWriter(object):
+
+    """Writer of a dataset in the columnar format.
+
+    This class streams examples into a directory in the format read by
+    :class:`ColumnarDataset`. Each element of the examples is written to a
+    raw binary file of its own, which is called a column. The dtype and the
+    shape of a column are determined by the first example, and the other
+    examples are converted to the dtype. Arrays whose lengths of the first
+    axis vary over the examples, such as sequences, are stored in a
+    variable-length column with an index of the offsets of the examples.
+
+    The examples must have the same structure: all of them are arrays, tuples
+    of arrays, or dictionaries of arrays with the same keys. The metadata of
+    the dataset is written when the writer is closed, so the directory cannot
+    be read until then. The writer can be used as a context manager that
+    closes it at the exit.
+
+    Args:
+        path (str): Path to the directory to write the dataset. It is created
+            if it does not exist.
+
+    .. admonition:: Example
+
+       >>> with ColumnarDatasetWriter(path) as writer:  # doctest: +SKIP
+       ...     for x, t in examples:
+       ...         writer.append((x, t))
+       >>> dataset = ColumnarDataset(path)  # doctest: +SKIP
+
+    """
+
+    def __init__(self, path):
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self._path = path
+        self._keys = None
+        self._columns = None
+        self._length = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, typ, value, traceback):
+        if typ is None:
+            self.close()
+        elif not self._closed:
+            # Only releases the files; the incomplete dataset is not readable
+            self._closed = True
+            for column in self._columns or ():
+                column._file.close()
+
+    def __len__(self):
+        return self._length
+
+    def _setup(self, example):
+        if isinstance(example, tuple):
+            keys = len(example)
+            n_columns = keys
+        elif isinstance(example, dict):
+            keys = sorted(example)
+            n_columns = len(keys)
+        else:
+            keys = None
+            n_columns = 1
+        self._keys = keys
+        self._columns = [_ColumnWriter(self._path, i)
+                         for i in six.moves.range(n_columns)]
+
+    def _split(self, example):
+        keys = self._keys
+        if isinstance(keys, int):
+            if not isinstance(example, tuple) or len(example) != keys:
+                raise ValueError('structure of the examples conflicts')
+            return example
+        elif isinstance(keys, list):
+            if not isinstance(example, dict) or sorted(example) != keys:
+                raise ValueError('structure of the examples conflicts')
+            return [example[key] for key in keys]
+        else:
+            if isinstance(example, (tuple, dict)):
+                raise ValueError('structure of the examples conflicts')
+            return example,
+
+    def append(self, example):
+        """Writes an example.
+
+        Args:
+            example: Example to write. It is an array, a tuple of arrays, or a
+                dictionary of arrays. Scalars are written as arrays of zero
+                dimension.
+
+        """
+        if self._closed:
+            raise RuntimeError('the writer is already closed')
+        if self._columns is None:
+            self._setup(example)
+        values = [column.convert(value) for column, value in six.moves.zip(
+            self._columns, self._split(example))]
+        for column, value in six.moves.zip(self._columns, values):
+            column.write(value)
+        self._length += 1
+
+    def extend(self, examples):
+        """Writes examples.
+
+        If the examples are given as an :class:`~chainer.dataset.ExampleBatch`
+        with the stacked arrays, each column is written at once.
+
+        Args:
+            examples (list): Examples to write.
+
+        """
+        columns = getattr(examples, 'columns', None)
+        if columns is None or len(examples) == 0:
+            for example in examples:
+                self.append(example)
+            return
+        if self._closed:
+            raise RuntimeError('the writer is already closed')
+        if self._columns is None:
+            self._setup(examples[0])
+        values = [column.convert(value, stacked=True)
+                  for column, value in six.moves.zip(
+                      self._columns, self._split(columns))]
+        for column, value in six.moves.zip(self._columns, values):
+            column.write(value, stacked=True)
+        self._length += len(examples)
+
+    def close(self):
+        """Finishes writing the dataset and writes its metadata."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._length == 0:
+            # The structure is unknown if no examples have been written
+            for column in self._columns or ():
+                column._file.close()
+            self._keys = None
+            columns = []
+        else:
+            columns = [column.close() for column in self._columns]
+        meta = {'version': _format_version, 'length': self._length,
+                'keys': self._keys, 'columns': columns}
+        with open(os.path.join(self._path, _meta_name), 'w') as f:
+            json.dump(meta, f)
+
+
+class ColumnarDataset(dataset_mixin.DatasetMixin):
+
+    """Dataset stored in the columnar format on disk.
+
+    This dataset reads a directory written by :class:`ColumnarDatasetWriter`.
+    Each column is mapped into memory by :class:`numpy.memmap`, so that the
+    examples are read from the disk on demand and only the pages actually
+    accessed reside in memory. The pages are shared through the page cache of
+    the OS by all processes reading the same dataset, e.g. the workers of
+    :class:`~chainer.iterators.MultiprocessIterator`. When the dataset is
+    pickled, only the path is serialized and the files are mapped again on
+    unpickling.
+
+    Each example is a copy of the stored data with the same structure as
+    written, i.e. an array, a tuple of arrays, or a dictionary of arrays.
+    :meth:`get_examples` gathers the examples of the indices from each column
+    by one fancy indexing. If the dataset has no variable-length columns, the
+    result is an :class:`~chainer.dataset.ExampleBatch` holding the gathered
+    columns.
+
+    Args:
+        path (str): Path to the directory of the dataset.
+
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._open()
+
+    def _open(self):
+        path = self._path
+        with open(os.path.join(path, _meta_name)) as f:
+            meta = json.load(f)
+        if meta['version'] != _format_version:
+            raise ValueError('unsupported version of the columnar format: '
+                             '{}'.format(meta['version']))
+        self._length = meta['length']
+        keys = meta['keys']
+        self._keys = keys
+        self._data = []
+        self._offsets = []
+        for i, column in enumerate(meta['columns']):
+            dtype = numpy.dtype(str(column['dtype']))
+            shape = tuple(column['shape'])
+            if column['variable']:
+                offsets = _memmap(_offsets_path(path, i), numpy.dtype('<i8'),
+                                  (self._length + 1,))
+                data = _memmap(_data_path(path, i), dtype,
+                               (int(offsets[-1]),) + shape)
+            else:
+                offsets = None
+                data = _memmap(_data_path(path, i), dtype,
+                               (self._length,) + shape)
+            self._data.append(data)
+            self._offsets.append(offsets)
+
+    def __getstate__(self):
+        return {'_path': self._path}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self):
+        return self._length
+
+    def _pack(self, values):
+        keys = self._keys
+        if isinstance(keys, int):
+            return tuple(values)
+        elif isinstance(keys, list):
+            return dict(six.moves.zip(keys, values))
+        else:
+            return values[0]
+
+    def get_example(self, i):
+        n = self._length
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('index out of range')
+        values = []
+        for data, offsets in six.moves.zip(self._data, self._offsets):
+            if offsets is None:
+                # Scalars are extracted as NumPy scalars
+                value = data[i]
+                values.append(value if data.ndim == 1 else numpy.array(value))
+            else:
+                values.append(numpy.array(data[offsets[i]:offsets[i + 1]]))
+        return self._pack(values)
+
+    def get_examples(self, indices):
+        """Returns the examples of the given indices.
+
+        Args:
+            indices (sequence of ints): The indices of the examples.
+
+        Returns:
+            list: The examples.
+
+        """
+        n = self._length
+        indices = numpy.asarray(indices, dtype=int)
+        if indices.size > 0 and (indices.min() < -n or indices.max() >= n):
+            raise IndexError('index out of range')
+        indices = numpy.where(indices < 0, indices + n, indices)
+
+        columns = []
+        for data, offsets in six.moves.zip(self._data, self._offsets):
+            if offsets is None:
+                columns.append(numpy.asarray(data[indices]))
+            else:
+                starts = offsets[indices]
+                stops = offsets[indices + 1]
+                columns.append([numpy.array(data[start:stop]) for start, stop
+                                in six.moves.zip(starts, stops)])
+        if all([offsets is None for offsets in self._offsets]):
+            return example_batch.ExampleBatch(self._pack(columns))
+        return [self._pack(values) for values in six.moves.zip(*columns)]
+
+
+def write_columnar_dataset(path, dataset, batch_size=1024):
+    """Writes a dataset in the columnar format.
+
+    The examples are extracted from the dataset in chunks by
+    :func:`~chainer.dataset.get_examples` and written by
+    :class:`ColumnarDatasetWriter`.
+
+    Args:
+        path (str): Path to the directory to write the dataset.
+        dataset: Dataset to write. It must support :meth:`__len__` and
+            :meth:`__getitem__`.
+        batch_size (int): Number of examples extracted at once.
+
+    """
+    with ColumnarDatasetWriter(path) as writer:
+        for start in six.moves.range(0, len(dataset), batch_size):
+            stop = min(start + batch_size, len(dataset))
+            writer.extend(example_batch.get_examples(
+                dataset, six.moves.range(start, stop)))
+
+
+def cache_or_load_columnar_dataset(path, creator):
+    """Caches a dataset in the columnar format, or loads it otherwise.
+
+    If there is no dataset at the path, ``creator`` is called to create the
+    dataset and it is written to the path in the columnar format. The cached
+    dataset is then opened as :class:`ColumnarDataset`. The cache is created
+    safely by :func:`~chainer.dataset.cache_or_load_file` even if this
+    function is called simultaneously by multiple processes.
+
+    Args:
+        path (str): Path to the directory of the cached dataset.
+        creator: Function without arguments which returns the dataset to
+            cache.
+
+    Returns:
+        ColumnarDataset: The cached dataset.
+
+    """
+    def write(temp_path):
+        write_columnar_dataset(temp_path, creator())
+
+    download.cache_or_load_file(path, write, lambda path: None)
+    return ColumnarDataset(path)
+
+
+def _load_preprocessed(root, name, params, creator, memmap):
+    # Used by the built-in dataset loaders. If memmap is True, the
+    # preprocessed dataset is cached in the columnar format under the name
+    # determined by the preprocessing parameters.
+    if not memmap:
+        return creator()
+    key = '_'.join([str(param) for param in params])
+    path = os.path.join(root, '{}-{}.columnar'.format(name, key))
+    return cache_or_load_columnar_dataset(path, creator)
@@ -1,4 +1,10 @@
+import bisect
+
+import numpy
+import six
+
 from chainer.dataset import dataset_mixin
+from chainer.dataset import example_batch
 
 
 class ConcatenatedDataset(dataset_mixin.DatasetMixin):
@@ -10,6 +16,10 @@ class ConcatenatedDataset(dataset_mixin.DatasetMixin):
     another base dataset with 20 samples are given, this dataset works as
     a dataset which has 30 samples.
 
+    The lengths of the base datasets are computed at the construction, so
+    they must not change afterwards. Each example is located by binary search
+    over the base datasets.
+
     Args:
         datasets: The underlying datasets. Each dataset has to support
             :meth:`__len__` and :meth:`__getitem__`.
@@ -18,15 +28,47 @@ class ConcatenatedDataset(dataset_mixin.DatasetMixin):
 
     def __init__(self, *datasets):
         self._datasets = datasets
+        # Offsets of the base datasets are computed once so that each example
+        # is located by binary search
+        self._offsets = numpy.cumsum(
+            [0] + [len(dataset) for dataset in datasets]).tolist()
 
     def __len__(self):
-        return sum(len(dataset) for dataset in self._datasets)
+        return self._offsets[-1]
 
     def get_example(self, i):
-        if i < 0:
+        if not 0 <= i < self._offsets[-1]:
             raise IndexError
-        for dataset in self._datasets:
-            if i < len(dataset):
-                return dataset[i]
-            i -= len(dataset)
-        raise IndexError
+        j = bisect.bisect_right(self._offsets, i) - 1
+        return self._datasets[j][i - self._offsets[j]]
+
+    def get_examples(self, indices):
+        indices = numpy.asarray(indices, dtype=int)
+        offsets = numpy.asarray(self._offsets)
+        if indices.size > 0 and (indices.min() < 0 or
+                                 indices.max() >= offsets[-1]):
+            raise IndexError
+        if indices.size == 0:
+            return []
+        # The indices are grouped by the base datasets, and the examples are
+        # extracted from each base dataset at once.
+        which = numpy.searchsorted(offsets, indices, side='right') - 1
+        order = numpy.argsort(which, kind='mergesort')
+        which = which[order]
+        datasets, starts = numpy.unique(which, return_index=True)
+        stops = numpy.append(starts[1:], len(order))
+        batches = []
+        for j, start, stop in six.moves.zip(
+                datasets.tolist(), starts.tolist(), stops.tolist()):
+            batches.append(example_batch.get_examples(
+                self._datasets[j], indices[order[start:stop]] - offsets[j]))
+        if len(batches) == 1:
+            return batches[0]
+
+        # Arranges the examples in the order of the indices
+        batch = example_batch.ExampleBatch.concatenate(batches)
+        inverse = numpy.empty_like(order)
+        inverse[order] = numpy.arange(len(order))
+        if isinstance(batch, example_batch.ExampleBatch):
+            return batch.take(inverse)
+        return [batch[i] for i in inverse]
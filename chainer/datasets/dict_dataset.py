@@ -1,5 +1,8 @@
+import numpy
 import six
 
+from chainer.dataset import example_batch
+
 
 class DictDataset(object):
 
@@ -39,3 +42,29 @@ class DictDataset(object):
 
     def __len__(self):
         return self._length
+
+    def get_examples(self, indices):
+        """Returns the examples of the given indices.
+
+        The examples are extracted from each underlying dataset at once by
+        :func:`~chainer.dataset.get_examples`. If all of them give stacked
+        arrays, e.g. for datasets of :class:`numpy.ndarray`, the result holds
+        the dictionary of them as the stacked examples.
+
+        Args:
+            indices (sequence of ints): The indices of the examples.
+
+        Returns:
+            list: The dictionaries of the examples.
+
+        """
+        batches = {key: example_batch.get_examples(dataset, indices)
+                   for key, dataset in six.iteritems(self._datasets)}
+        columns = {key: getattr(batch, 'columns', None)
+                   for key, batch in six.iteritems(batches)}
+        if all([isinstance(column, numpy.ndarray)
+                for column in six.itervalues(columns)]):
+            return example_batch.ExampleBatch(columns)
+        keys = list(batches)
+        return [dict(six.moves.zip(keys, values)) for values in
+                six.moves.zip(*[batches[key] for key in keys])]
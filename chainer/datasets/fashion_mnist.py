@@ -4,12 +4,12 @@ import numpy
 
 import chainer
 from chainer.dataset import download
+from chainer.datasets._mnist_helper import load_preprocessed_mnist
 from chainer.datasets._mnist_helper import make_npz
-from chainer.datasets._mnist_helper import preprocess_mnist
 
 
 def get_fashion_mnist(withlabel=True, ndim=1, scale=1., dtype=None,
-                      label_dtype=numpy.int32, rgb_format=False):
+                      label_dtype=numpy.int32, rgb_format=False, memmap=False):
     """Gets the Fashion-MNIST dataset.
 
     `Fashion-MNIST <https://github.com/zalandoresearch/fashion-mnist/>`_ is a
@@ -41,21 +41,25 @@ def get_fashion_mnist(withlabel=True, ndim=1, scale=1., dtype=None,
         rgb_format (bool): if ``ndim == 3`` and ``rgb_format`` is ``True``, the
             image will be converted to rgb format by duplicating the channels
             so the image shape is (3, 28, 28). Default is ``False``.
+        memmap (bool): If ``True``, the preprocessed datasets are cached in
+            the columnar format under the dataset directory, and they are
+            read from the disk by memory mapping. Default is ``False``.
 
     Returns:
         A tuple of two datasets. If ``withlabel`` is ``True``, both datasets
         are :class:`~chainer.datasets.TupleDataset` instances. Otherwise, both
-        datasets are arrays of images.
+        datasets are arrays of images. If ``memmap`` is ``True``, both datasets
+        are :class:`~chainer.datasets.ColumnarDataset` instances instead.
 
     """
-    train_raw = _retrieve_fashion_mnist_training()
     dtype = chainer.get_dtype(dtype)
-
-    train = preprocess_mnist(train_raw, withlabel, ndim, scale, dtype,
-                             label_dtype, rgb_format)
-    test_raw = _retrieve_fashion_mnist_test()
-    test = preprocess_mnist(test_raw, withlabel, ndim, scale, dtype,
-                            label_dtype, rgb_format)
+    root = download.get_dataset_directory('pfnet/chainer/fashion-mnist')
+    train = load_preprocessed_mnist(
+        root, 'train', _retrieve_fashion_mnist_training, withlabel, ndim,
+        scale, dtype, label_dtype, rgb_format, memmap)
+    test = load_preprocessed_mnist(
+        root, 'test', _retrieve_fashion_mnist_test, withlabel, ndim, scale,
+        dtype, label_dtype, rgb_format, memmap)
     return train, test
 
 
@@ -8,8 +8,12 @@ except ImportError as e:
     available = False
     _import_error = e
 import bisect
+import collections
+import hashlib
 import io
+import shutil
 import six
+import tempfile
 import threading
 import zipfile
 
@@ -17,10 +21,26 @@ import chainer
 from chainer.dataset import dataset_mixin
 
 
-def _read_image_as_array(path, dtype):
+# Modes supported by Image.reduce
+_reducible_modes = ('L', 'LA', 'RGB', 'RGBA', 'I', 'F')
+
+
+def _reduce_image(f, min_size):
+    height, width = min_size
+    # JPEG images are decoded at a reduced scale in the draft mode
+    f.draft(None, (width, height))
+    factor = min(f.size[0] // width, f.size[1] // height)
+    if factor > 1 and hasattr(f, 'reduce') and f.mode in _reducible_modes:
+        # Only pillow >= 7.0 has 'reduce' method
+        return f.reduce(factor)
+    return f
+
+
+def _read_image_as_array(path, dtype, min_size=None):
     f = Image.open(path)
     try:
-        image = numpy.asarray(f, dtype=dtype)
+        image = f if min_size is None else _reduce_image(f, min_size)
+        image = numpy.asarray(image, dtype=dtype)
     finally:
         # Only pillow >= 3.0 has 'close' method
         if hasattr(f, 'close'):
@@ -35,6 +55,90 @@ def _postprocess_image(image):
     return image.transpose(2, 0, 1)
 
 
+class _ImageCache(object):
+
+    # Cache of decoded images. The images are kept in memory in the LRU
+    # manner up to ``size`` bytes, and saved as .npy files in ``directory``,
+    # which are shared by all processes. Only the settings are pickled so
+    # that each worker process starts with an empty in-memory cache.
+
+    def __init__(self, size, directory, params):
+        self._size = size
+        self._directory = directory
+        self._params = params
+        self.__setstate__(self.__getstate__())
+
+    def __getstate__(self):
+        return {'_size': self._size, '_directory': self._directory,
+                '_params': self._params}
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self._arrays = collections.OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        if self._directory is not None and \
+                not os.path.isdir(self._directory):
+            try:
+                os.makedirs(self._directory)
+            except OSError:
+                # Created by another process
+                if not os.path.isdir(self._directory):
+                    raise
+
+    def get(self, key, load):
+        """Returns the cached image of the key, or loads it."""
+        with self._lock:
+            image = self._arrays.pop(key, None)
+            if image is not None:
+                self._arrays[key] = image
+                # Copied so that the cached image is not modified
+                return image.copy()
+
+        image = None
+        path = None
+        if self._directory is not None:
+            name = hashlib.sha1(
+                repr((key, self._params)).encode('utf-8')).hexdigest()
+            path = os.path.join(self._directory, name + '.npy')
+            if os.path.exists(path):
+                image = numpy.load(path)
+        if image is None:
+            image = load()
+            if path is not None:
+                self._save(path, image)
+
+        if 0 < image.nbytes <= self._size:
+            with self._lock:
+                if key not in self._arrays:
+                    self._arrays[key] = image.copy()
+                    self._nbytes += image.nbytes
+                while self._nbytes > self._size:
+                    _, evicted = self._arrays.popitem(last=False)
+                    self._nbytes -= evicted.nbytes
+        return image
+
+    def _save(self, path, image):
+        # Written to a temporary file and moved so that other processes never
+        # read an incomplete file
+        fd, temp_path = tempfile.mkstemp(dir=self._directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                numpy.save(f, image)
+            shutil.move(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+def _create_cache(cache_size, cache_dir, dtype, min_size):
+    if not cache_size and cache_dir is None:
+        return None
+    return _ImageCache(cache_size, cache_dir,
+                       (numpy.dtype(dtype).str, min_size))
+
+
 class ImageDataset(dataset_mixin.DatasetMixin):
 
     """Dataset of images built from a list of paths to image files.
@@ -72,10 +176,27 @@ class ImageDataset(dataset_mixin.DatasetMixin):
         root (str): Root directory to retrieve images from.
         dtype: Data type of resulting image arrays. ``chainer.config.dtype`` is
             used by default (see :ref:`configuration`).
+        min_size (tuple of ints): Minimum size ``(height, width)`` of the
+            decoded images. If it is given, each image is reduced by the
+            largest integral factor that keeps its height and width not less
+            than ``min_size``. JPEG images are decoded at the reduced scale
+            by the draft mode of PIL, which is much faster than decoding them
+            at the full resolution, though the pixels are slightly different
+            from those of the images resized after decoding.
+        cache_size (int): Maximum number of bytes of the decoded images
+            cached in memory. The least recently used images are discarded
+            first. Each process, e.g. each worker process of
+            :class:`~chainer.iterators.MultiprocessIterator`, has its own
+            cache.
+        cache_dir (str): Directory to cache the decoded images as ``.npy``
+            files, which can be shared by multiple processes. You are
+            responsible to clear it when the images or the options above
+            are changed.
 
     """
 
-    def __init__(self, paths, root='.', dtype=None):
+    def __init__(self, paths, root='.', dtype=None, min_size=None,
+                 cache_size=0, cache_dir=None):
         _check_pillow_availability()
         if isinstance(paths, six.string_types):
             with open(paths) as paths_file:
@@ -83,14 +204,23 @@ class ImageDataset(dataset_mixin.DatasetMixin):
         self._paths = paths
         self._root = root
         self._dtype = chainer.get_dtype(dtype)
+        self._min_size = min_size
+        self._cache = _create_cache(cache_size, cache_dir, self._dtype,
+                                    min_size)
 
     def __len__(self):
         return len(self._paths)
 
     def get_example(self, i):
         path = os.path.join(self._root, self._paths[i])
-        image = _read_image_as_array(path, self._dtype)
 
+        def load():
+            return _read_image_as_array(path, self._dtype, self._min_size)
+
+        if self._cache is None:
+            image = load()
+        else:
+            image = self._cache.get(path, load)
         return _postprocess_image(image)
 
 
@@ -130,10 +260,27 @@ class LabeledImageDataset(dataset_mixin.DatasetMixin):
         dtype: Data type of resulting image arrays. ``chainer.config.dtype`` is
             used by default (see :ref:`configuration`).
         label_dtype: Data type of the labels.
+        min_size (tuple of ints): Minimum size ``(height, width)`` of the
+            decoded images. If it is given, each image is reduced by the
+            largest integral factor that keeps its height and width not less
+            than ``min_size``. JPEG images are decoded at the reduced scale
+            by the draft mode of PIL, which is much faster than decoding them
+            at the full resolution, though the pixels are slightly different
+            from those of the images resized after decoding.
+        cache_size (int): Maximum number of bytes of the decoded images
+            cached in memory. The least recently used images are discarded
+            first. Each process, e.g. each worker process of
+            :class:`~chainer.iterators.MultiprocessIterator`, has its own
+            cache.
+        cache_dir (str): Directory to cache the decoded images as ``.npy``
+            files, which can be shared by multiple processes. You are
+            responsible to clear it when the images or the options above
+            are changed.
 
     """
 
-    def __init__(self, pairs, root='.', dtype=None, label_dtype=numpy.int32):
+    def __init__(self, pairs, root='.', dtype=None, label_dtype=numpy.int32,
+                 min_size=None, cache_size=0, cache_dir=None):
         _check_pillow_availability()
         if isinstance(pairs, six.string_types):
             pairs_path = pairs
@@ -150,6 +297,9 @@ class LabeledImageDataset(dataset_mixin.DatasetMixin):
         self._root = root
         self._dtype = chainer.get_dtype(dtype)
         self._label_dtype = label_dtype
+        self._min_size = min_size
+        self._cache = _create_cache(cache_size, cache_dir, self._dtype,
+                                    min_size)
 
     def __len__(self):
         return len(self._pairs)
@@ -157,7 +307,15 @@ class LabeledImageDataset(dataset_mixin.DatasetMixin):
     def get_example(self, i):
         path, int_label = self._pairs[i]
         full_path = os.path.join(self._root, path)
-        image = _read_image_as_array(full_path, self._dtype)
+
+        def load():
+            return _read_image_as_array(
+                full_path, self._dtype, self._min_size)
+
+        if self._cache is None:
+            image = load()
+        else:
+            image = self._cache.get(full_path, load)
 
         label = numpy.array(int_label, dtype=self._label_dtype)
         return _postprocess_image(image), label
@@ -176,10 +334,21 @@ class MultiZippedImageDataset(dataset_mixin.DatasetMixin):
         zipfilenames (list of strings): List of zipped archive filename.
         dtype: Data type of resulting image arrays. ``chainer.config.dtype`` is
             used by default (see :ref:`configuration`).
+        min_size (tuple of ints): Minimum size of the decoded images. See
+            :class:`ZippedImageDataset` for details.
+        cache_size (int): Maximum number of bytes of the decoded images
+            cached in memory, which is shared by all the zip files.
+        cache_dir (str): Directory to cache the decoded images.
     """
 
-    def __init__(self, zipfilenames, dtype=None):
-        self._zfs = [ZippedImageDataset(fn, dtype) for fn in zipfilenames]
+    def __init__(self, zipfilenames, dtype=None, min_size=None, cache_size=0,
+                 cache_dir=None):
+        self._zfs = [ZippedImageDataset(fn, dtype, min_size)
+                     for fn in zipfilenames]
+        cache = _create_cache(cache_size, cache_dir, chainer.get_dtype(dtype),
+                              min_size)
+        for zf in self._zfs:
+            zf._cache = cache
         self._zpaths_accumlens = [0]
         zplen = 0
         for zf in self._zfs:
@@ -213,14 +382,34 @@ class ZippedImageDataset(dataset_mixin.DatasetMixin):
         zipfilename (str): a string to point zipfile path
         dtype: Data type of resulting image arrays. ``chainer.config.dtype`` is
             used by default (see :ref:`configuration`).
+        min_size (tuple of ints): Minimum size ``(height, width)`` of the
+            decoded images. If it is given, each image is reduced by the
+            largest integral factor that keeps its height and width not less
+            than ``min_size``. JPEG images are decoded at the reduced scale
+            by the draft mode of PIL, which is much faster than decoding them
+            at the full resolution, though the pixels are slightly different
+            from those of the images resized after decoding.
+        cache_size (int): Maximum number of bytes of the decoded images
+            cached in memory. The least recently used images are discarded
+            first. Each process, e.g. each worker process of
+            :class:`~chainer.iterators.MultiprocessIterator`, has its own
+            cache.
+        cache_dir (str): Directory to cache the decoded images as ``.npy``
+            files, which can be shared by multiple processes. You are
+            responsible to clear it when the images or the options above
+            are changed.
 
     """
 
-    def __init__(self, zipfilename, dtype=None):
+    def __init__(self, zipfilename, dtype=None, min_size=None, cache_size=0,
+                 cache_dir=None):
         self._zipfilename = zipfilename
         self._zf = zipfile.ZipFile(zipfilename)
         self._zf_pid = os.getpid()
         self._dtype = chainer.get_dtype(dtype)
+        self._min_size = min_size
+        self._cache = _create_cache(cache_size, cache_dir, self._dtype,
+                                    min_size)
         self._paths = [x for x in self._zf.namelist() if not x.endswith('/')]
         self._lock = threading.Lock()
 
@@ -238,14 +427,21 @@ class ZippedImageDataset(dataset_mixin.DatasetMixin):
         self._lock = threading.Lock()
 
     def get_example(self, i):
-        # PIL may seek() on the file -- zipfile won't support it
-        with self._lock:
-            if self._zf is None or self._zf_pid != os.getpid():
-                self._zf_pid = os.getpid()
-                self._zf = zipfile.ZipFile(self._zipfilename)
-            image_file_mem = self._zf.read(self._paths[i])
-        image_file = io.BytesIO(image_file_mem)
-        image = _read_image_as_array(image_file, self._dtype)
+        def load():
+            # PIL may seek() on the file -- zipfile won't support it
+            with self._lock:
+                if self._zf is None or self._zf_pid != os.getpid():
+                    self._zf_pid = os.getpid()
+                    self._zf = zipfile.ZipFile(self._zipfilename)
+                image_file_mem = self._zf.read(self._paths[i])
+            image_file = io.BytesIO(image_file_mem)
+            return _read_image_as_array(
+                image_file, self._dtype, self._min_size)
+
+        if self._cache is None:
+            image = load()
+        else:
+            image = self._cache.get((self._zipfilename, self._paths[i]), load)
         return _postprocess_image(image)
 
 
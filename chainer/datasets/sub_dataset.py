@@ -2,6 +2,7 @@ import numpy
 import six
 
 from chainer.dataset import dataset_mixin
+from chainer.dataset import example_batch
 
 
 class SubDataset(dataset_mixin.DatasetMixin):
@@ -75,6 +76,17 @@ class SubDataset(dataset_mixin.DatasetMixin):
             index = self._order[index]
         return self._dataset[index]
 
+    def get_examples(self, indices):
+        indices = numpy.asarray(indices, dtype=int)
+        if indices.size > 0 and (indices.max() >= self._size or
+                                 indices.min() < -self._size):
+            raise IndexError('dataset index out of range')
+        indices = numpy.where(
+            indices >= 0, indices + self._start, indices + self._finish)
+        if self._order is not None:
+            indices = numpy.asarray(self._order)[indices]
+        return example_batch.get_examples(self._dataset, indices)
+
 
 def split_dataset(dataset, split_at, order=None):
     """Splits a dataset into two subsets.
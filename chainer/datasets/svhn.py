@@ -10,11 +10,12 @@ except Exception as e:
 
 import chainer
 from chainer.dataset import download
+from chainer.datasets import columnar_dataset
 from chainer.datasets import tuple_dataset
 
 
 def get_svhn(withlabel=True, scale=1., dtype=None, label_dtype=numpy.int32,
-             add_extra=False):
+             add_extra=False, memmap=False):
     """Gets the SVHN dataset.
 
     `The Street View House Numbers (SVHN) dataset <http://ufldl.stanford.edu/housenumbers/>`_
@@ -37,29 +38,38 @@ def get_svhn(withlabel=True, scale=1., dtype=None, label_dtype=numpy.int32,
             used by default (see :ref:`configuration`).
         label_dtype: Data type of the labels.
         add_extra: Use extra training set.
+        memmap (bool): If ``True``, the preprocessed datasets are cached in
+            the columnar format under the dataset directory, and they are
+            read from the disk by memory mapping. Default is ``False``.
 
     Returns:
         If ``add_extra`` is ``False``, a tuple of two datasets (train and test). Otherwise,
         a tuple of three datasets (train, test, and extra).
         If ``withlabel`` is ``True``, all datasets are :class:`~chainer.datasets.
         TupleDataset` instances. Otherwise, both datasets are arrays of images.
+        If ``memmap`` is ``True``, all datasets are :class:`~chainer.datasets.
+        ColumnarDataset` instances instead.
 
     """  # NOQA
     if not _scipy_available:
         raise RuntimeError('SciPy is not available: %s' % _error)
 
-    train_raw = _retrieve_svhn_training()
     dtype = chainer.get_dtype(dtype)
-
-    train = _preprocess_svhn(train_raw, withlabel, scale, dtype,
-                             label_dtype)
-    test_raw = _retrieve_svhn_test()
-    test = _preprocess_svhn(test_raw, withlabel, scale, dtype,
-                            label_dtype)
+    root = download.get_dataset_directory('pfnet/chainer/svhn')
+    params = (int(withlabel), scale, dtype.name,
+              numpy.dtype(label_dtype).name)
+
+    def load(name, retrieve):
+        return columnar_dataset._load_preprocessed(
+            root, name, params,
+            lambda: _preprocess_svhn(retrieve(), withlabel, scale, dtype,
+                                     label_dtype),
+            memmap)
+
+    train = load('train', _retrieve_svhn_training)
+    test = load('test', _retrieve_svhn_test)
     if add_extra:
-        extra_raw = _retrieve_svhn_extra()
-        extra = _preprocess_svhn(extra_raw, withlabel, scale, dtype,
-                                 label_dtype)
+        extra = load('extra', _retrieve_svhn_extra)
         return train, test, extra
     else:
         return train, test
@@ -1,12 +1,100 @@
+import codecs
 import io
+import locale
+import mmap
+import os
+import shutil
 import sys
+import tempfile
 import threading
 
+import numpy
 import six
 
 from chainer.dataset import dataset_mixin
 
 
+_index_version = 1
+_index_header_size = 4
+_newline_codes = {None: 0, '': 1, '\n': 2, '\r': 3, '\r\n': 4}
+_scan_chunk_size = 1 << 26
+
+
+def _is_ascii_compatible(encoding):
+    # Line boundaries can be found in the raw bytes if the newline
+    # characters are encoded as the ASCII bytes, which never appear in
+    # multibyte characters of such encodings.
+    try:
+        name = codecs.lookup(encoding).name
+        return name != 'utf-7' and '\r\n'.encode(encoding) == b'\r\n'
+    except LookupError:
+        return False
+
+
+def _scan_bounds(data, newline):
+    # Returns the positions of the line boundaries in the bytes, scanning
+    # them in large chunks with vectorized comparisons.
+    size = len(data)
+    buf = numpy.frombuffer(data, dtype=numpy.uint8) if size else \
+        numpy.empty(0, dtype=numpy.uint8)
+    ends = [numpy.zeros(1, dtype=numpy.int64)]
+    for start in six.moves.range(0, size, _scan_chunk_size):
+        stop = min(start + _scan_chunk_size, size)
+        chunk = buf[start:stop]
+        following = buf[start + 1:stop + 1]
+        if newline == '\n':
+            end = numpy.flatnonzero(chunk == 10) + 1
+        elif newline == '\r':
+            end = numpy.flatnonzero(chunk == 13) + 1
+        elif newline == '\r\n':
+            crlf = chunk[:len(following)] == 13
+            crlf &= following == 10
+            end = numpy.flatnonzero(crlf) + 2
+        else:
+            # Universal newlines: LF, CRLF and CR alone
+            cr = chunk == 13
+            cr[:len(following)] &= following != 10
+            end = numpy.flatnonzero((chunk == 10) | cr) + 1
+        ends.append(end + start)
+    bounds = numpy.concatenate(ends).astype(numpy.int64)
+    if bounds[-1] != size:
+        # The last line without a line break
+        bounds = numpy.append(bounds, size)
+    return bounds
+
+
+def _index_key(path, newline):
+    stat = os.stat(path)
+    return [_index_version, stat.st_size, int(stat.st_mtime * 1e9),
+            _newline_codes[newline]]
+
+
+def _load_index(path, newline):
+    try:
+        index = numpy.load(path + '.idx', mmap_mode='r')
+    except (IOError, OSError, ValueError):
+        return None
+    if index.dtype != numpy.int64 or index.ndim != 1 or \
+            list(index[:_index_header_size]) != _index_key(path, newline):
+        return None
+    # Viewed as a plain array, whose elements are accessed faster
+    return index[_index_header_size:].view(numpy.ndarray)
+
+
+def _save_index(path, newline, bounds):
+    # Written to a temporary file and moved so that other processes never
+    # read an incomplete index
+    index = numpy.concatenate((_index_key(path, newline), bounds))
+    try:
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)))
+        with os.fdopen(fd, 'wb') as f:
+            numpy.save(f, index)
+        shutil.move(temp_path, path + '.idx')
+    except (IOError, OSError):
+        pass
+
+
 class TextDataset(dataset_mixin.DatasetMixin):
 
     """Dataset of a line-oriented text file.
@@ -22,6 +110,13 @@ class TextDataset(dataset_mixin.DatasetMixin):
         that case you are responsible to guarantee that files are not
         modified after the cache has built.
 
+    If the encodings of all files are ASCII-compatible, e.g. UTF-8, the files
+    are mapped into memory by :mod:`mmap`. The line boundaries are found by
+    scanning the mapped bytes with vectorized operations, and each line is
+    read by slicing the mapped bytes, so that multiple threads can read
+    lines in parallel without locks. Otherwise, the files are read as text
+    files, whose accesses are serialized by a lock.
+
     Args:
         paths (str or list of str):
             Path to the text file(s).
@@ -54,12 +149,19 @@ class TextDataset(dataset_mixin.DatasetMixin):
             the number of files. Arguments are lines loaded from each file.
             The filter function must return True to accept the line, or
             return False to skip the line.
+        index_cache (bool):
+            If ``True``, the positions of the line boundaries of each file
+            are saved to the file with the suffix ``.idx`` next to it, which
+            is reused while the size and the modification time of the file
+            do not change. It is ignored if the files are not
+            memory-mapped, and the index is not saved if the directory is
+            not writable.
 
     """
 
     def __init__(
             self, paths, encoding=None, errors=None, newline=None,
-            filter_func=None):
+            filter_func=None, index_cache=False):
         if isinstance(paths, six.string_types):
             paths = [paths]
         elif len(paths) == 0:
@@ -82,40 +184,60 @@ class TextDataset(dataset_mixin.DatasetMixin):
         self._errors = errors
         self._newline = newline
         self._fps = None
+        self._mmaps = None
+        self._use_mmap = all([
+            _is_ascii_compatible(
+                e if e is not None else locale.getpreferredencoding(False))
+            for e in encoding])
 
         self._open()
+        if self._use_mmap:
+            self._bounds = tuple([
+                self._index(k, index_cache)
+                for k in six.moves.range(len(paths))])
+            linenum = len(self._bounds[0]) - 1
+            if any([len(b) - 1 != linenum for b in self._bounds]):
+                raise ValueError('number of lines in files does not match')
+            if filter_func is None:
+                lines = six.moves.range(linenum)
+            else:
+                lines = numpy.array(
+                    [i for i in six.moves.range(linenum)
+                     if filter_func(*self._read_lines(i))], dtype=numpy.int64)
+        else:
+            # Line number is 0-origin.
+            # `lines` is a list of line numbers not filtered; if no
+            # filter_func is given, it is range(linenum)).
+            # `bounds` is a list of cursor positions of line boundaries for
+            # each file, i.e. i-th line of k-th file starts at
+            # `bounds[k][i]`.
+            linenum = 0
+            lines = []
+            bounds = tuple([[0] for _ in self._fps])
+            while True:
+                data = [fp.readline() for fp in self._fps]
+                if not all(data):  # any of files reached EOF
+                    if any(data):  # not all files reached EOF
+                        raise ValueError(
+                            'number of lines in files does not match')
+                    break
+                for i, fp in enumerate(self._fps):
+                    bounds[i].append(fp.tell())
+                if filter_func is not None and filter_func(*data):
+                    lines.append(linenum)
+                linenum += 1
+
+            if filter_func is None:
+                lines = six.moves.range(linenum)
+            self._bounds = bounds
 
-        # Line number is 0-origin.
-        # `lines` is a list of line numbers not filtered; if no filter_func is
-        # given, it is range(linenum)).
-        # `bounds` is a list of cursor positions of line boundaries for each
-        # file, i.e. i-th line of k-th file starts at `bounds[k][i]`.
-        linenum = 0
-        lines = []
-        bounds = tuple([[0] for _ in self._fps])
-        while True:
-            data = [fp.readline() for fp in self._fps]
-            if not all(data):  # any of files reached EOF
-                if any(data):  # not all files reached EOF
-                    raise ValueError(
-                        'number of lines in files does not match')
-                break
-            for i, fp in enumerate(self._fps):
-                bounds[i].append(fp.tell())
-            if filter_func is not None and filter_func(*data):
-                lines.append(linenum)
-            linenum += 1
-
-        if filter_func is None:
-            lines = six.moves.range(linenum)
-
-        self._bounds = bounds
         self._lines = lines
         self._lock = threading.Lock()
 
     def __getstate__(self):
         state = self.__dict__.copy()
         del state['_fps']
+        del state['_mmaps']
         del state['_lock']
         return state
 
@@ -128,6 +250,13 @@ class TextDataset(dataset_mixin.DatasetMixin):
         return len(self._lines)
 
     def _open(self):
+        if self._use_mmap:
+            self._fps = [io.open(path, mode='rb') for path in self._paths]
+            self._mmaps = [
+                mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+                if os.fstat(fp.fileno()).st_size > 0 else None
+                for fp in self._fps]
+            return
         self._fps = [
             io.open(
                 path,
@@ -147,6 +276,9 @@ class TextDataset(dataset_mixin.DatasetMixin):
         automatically be closed after TextDataset instance goes out of scope.
         """
         exc = None
+        for m in self._mmaps or ():
+            if m is not None:
+                m.close()
         for fp in self._fps:
             try:
                 fp.close()
@@ -160,6 +292,12 @@ class TextDataset(dataset_mixin.DatasetMixin):
             raise IndexError
         linenum = self._lines[idx]
 
+        if self._use_mmap:
+            lines = self._read_lines(linenum)
+            if len(lines) == 1:
+                return lines[0]
+            return tuple(lines)
+
         self._lock.acquire()
         try:
             for k, fp in enumerate(self._fps):
@@ -170,3 +308,28 @@ class TextDataset(dataset_mixin.DatasetMixin):
             return tuple(lines)
         finally:
             self._lock.release()
+
+    def _index(self, k, index_cache):
+        path = self._paths[k]
+        newline = self._newline[k]
+        if index_cache:
+            bounds = _load_index(path, newline)
+            if bounds is not None:
+                return bounds
+        data = self._mmaps[k]
+        bounds = _scan_bounds(data if data is not None else b'', newline)
+        if index_cache:
+            _save_index(path, newline, bounds)
+        return bounds
+
+    def _read_lines(self, linenum):
+        lines = []
+        for k, data in enumerate(self._mmaps):
+            bounds = self._bounds[k]
+            line = data[bounds[linenum]:bounds[linenum + 1]].decode(
+                self._encoding[k] or locale.getpreferredencoding(False),
+                self._errors[k] or 'strict')
+            if self._newline[k] is None:
+                line = line.replace('\r\n', '\n').replace('\r', '\n')
+            lines.append(line)
+        return lines
@@ -1,4 +1,5 @@
 from chainer.dataset import dataset_mixin
+from chainer.dataset import example_batch
 
 
 class TransformDataset(dataset_mixin.DatasetMixin):
@@ -50,3 +51,7 @@ class TransformDataset(dataset_mixin.DatasetMixin):
     def get_example(self, i):
         in_data = self._dataset[i]
         return self._transform(in_data)
+
+    def get_examples(self, indices):
+        in_data = example_batch.get_examples(self._dataset, indices)
+        return [self._transform(data) for data in in_data]
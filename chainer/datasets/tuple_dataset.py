@@ -1,5 +1,8 @@
+import numpy
 import six
 
+from chainer.dataset import example_batch
+
 
 class TupleDataset(object):
 
@@ -49,3 +52,25 @@ class TupleDataset(object):
 
     def __len__(self):
         return self._length
+
+    def get_examples(self, indices):
+        """Returns the examples of the given indices.
+
+        The examples are extracted from each underlying dataset at once by
+        :func:`~chainer.dataset.get_examples`. If all of them give stacked
+        arrays, e.g. for datasets of :class:`numpy.ndarray`, the result holds
+        the tuple of them as the stacked examples.
+
+        Args:
+            indices (sequence of ints): The indices of the examples.
+
+        Returns:
+            list: The tuples of the examples.
+
+        """
+        batches = [example_batch.get_examples(dataset, indices)
+                   for dataset in self._datasets]
+        columns = [getattr(batch, 'columns', None) for batch in batches]
+        if all([isinstance(column, numpy.ndarray) for column in columns]):
+            return example_batch.ExampleBatch(tuple(columns))
+        return list(six.moves.zip(*batches))
@@ -119,15 +119,28 @@ class FunctionNode(object):
 
     """
 
-    inputs = None
-    outputs = None
-    rank = 0
-    stack = None
-    _input_indexes_to_retain = None
-    _output_indexes_to_retain = None
-    _retained_output_data = None
-    _local_function_hooks = None
-    lazy_grad_sum = False
+    # The attributes common to all function nodes are stored in slots to
+    # reduce the memory footprint of graphs. ``__dict__`` is kept for the
+    # attributes of each implementation.
+    __slots__ = ('inputs', 'outputs', 'rank', 'stack',
+                 '_input_indexes_to_retain', '_output_indexes_to_retain',
+                 '_retained_output_data', '_local_function_hooks',
+                 'lazy_grad_sum', '__dict__', '__weakref__')
+
+    def __new__(cls, *args, **kwargs):
+        # Initialize the slots here since implementations do not necessarily
+        # call __init__ of the base class.
+        self = super(FunctionNode, cls).__new__(cls)
+        self.inputs = None
+        self.outputs = None
+        self.rank = 0
+        self.stack = None
+        self._input_indexes_to_retain = None
+        self._output_indexes_to_retain = None
+        self._retained_output_data = None
+        self._local_function_hooks = None
+        self.lazy_grad_sum = False
+        return self
 
     @property
     def local_function_hooks(self):
@@ -220,6 +233,10 @@ Use apply() method instead.\
             A tuple of output :class:`~chainer.Variable` objects.
 
         """
+        input_vars = self._get_fast_path_inputs(inputs)
+        if input_vars is not None:
+            return self._apply_fast(input_vars)
+
         input_vars = [chainer.as_variable(x) for x in inputs]
         in_data = tuple([x.data for x in input_vars])
         requires_grad = any([x.requires_grad for x in input_vars])
@@ -250,25 +267,20 @@ Use apply() method instead.\
         for hook in hooks:
             hook.forward_preprocess(self, in_data)
 
+        # Recorder of chainer.static_graph
+        recorder = getattr(chainer._thread_local, 'static_graph_recorder',
+                           None)
+
         # Forward propagation
         with cuda.get_device_from_array(*in_data):
             self._input_indexes_to_retain = None
             self._output_indexes_to_retain = None
-            outputs = self.forward(in_data)
+            if recorder is None:
+                outputs = self.forward(in_data)
+            else:
+                outputs = recorder.forward(self, in_data)
 
-        # Check for output array types
-        if not isinstance(outputs, tuple):
-            raise TypeError(
-                'forward output must be a tuple ({})\n'
-                'Actual: {}'.format(self.label, type(outputs)))
-
-        if not chainer.is_arrays_compatible(outputs):
-            raise TypeError(
-                'incompatible array types are mixed in the forward output '
-                '({}).\n'
-                'Actual: {}'.format(
-                    self.label,
-                    ', '.join(str(type(x)) for x in outputs)))
+        self._check_outputs(outputs)
 
         for hook in hooks:
             hook.forward_postprocess(self, in_data)
@@ -286,30 +298,114 @@ Use apply() method instead.\
                      for y in outputs])
 
         if configuration.config.enable_backprop:
-            # Topological ordering
-            self.rank = max([x.rank for x in input_vars]) if input_vars else 0
-            # Add backward edges
-            for y in ret:
-                y.creator_node = self
-            self.inputs = tuple([x.node for x in input_vars])
-            # Add forward edges (must be weak references)
-            self.outputs = tuple([weakref.ref(y.node) for y in ret])
-
-            if self._input_indexes_to_retain is not None:
-                for index in self._input_indexes_to_retain:
-                    input_vars[index].retain_data()
-
-            if self._output_indexes_to_retain is not None:
-                retained_data = []
-                for index in self._output_indexes_to_retain:
-                    ret[index].retain_data()
-                    retained_data.append(outputs[index])
-                self._retained_output_data = tuple(retained_data)
-
-            self.lazy_grad_sum = configuration.config.lazy_grad_sum
+            self._connect_graph(
+                input_vars, ret, outputs,
+                configuration.config.lazy_grad_sum)
+
+        if recorder is not None:
+            recorder.record(self, input_vars, ret)
+
+        return ret
+
+    def _get_fast_path_inputs(self, inputs):
+        # Returns the input variables if the call can take the fast path of
+        # apply, i.e., no function hooks are registered, the debug mode is
+        # off, no static graph is being recorded, and all the inputs are
+        # NumPy arrays. Otherwise it returns None.
+        if self._local_function_hooks:
+            return None
+        thread_local = chainer._thread_local.__dict__
+        if (thread_local.get('function_hooks') or
+                thread_local.get('static_graph_recorder') is not None):
+            return None
+        if configuration.config.debug:
+            return None
+
+        input_vars = []
+        for x in inputs:
+            if isinstance(x, variable.Variable):
+                if type(x._data[0]) is not numpy.ndarray:
+                    return None
+            elif type(x) is numpy.ndarray:
+                x = variable.Variable(x, requires_grad=False)
+            else:
+                return None
+            input_vars.append(x)
+        return input_vars
+
+    def _apply_fast(self, input_vars):
+        # Fast path of apply. It omits the device selection, the function
+        # hooks and the checks for debug mode, which are unnecessary on the
+        # conditions checked by _get_fast_path_inputs.
+        in_data = tuple([x._data[0] for x in input_vars])
+        config = configuration.config
+
+        if config.type_check:
+            self._check_data_type_forward(in_data)
+
+        self._input_indexes_to_retain = None
+        self._output_indexes_to_retain = None
+        outputs = self.forward(in_data)
+
+        if (type(outputs) is not tuple or
+                not all([type(y) is numpy.ndarray for y in outputs])):
+            self._check_outputs(outputs)
+
+        requires_grad = False
+        for x in input_vars:
+            if x._requires_grad:
+                requires_grad = True
+                break
+        ret = tuple([variable._create_variable_fast(y, requires_grad)
+                     for y in outputs])
 
+        if config.enable_backprop:
+            self._connect_graph(
+                input_vars, ret, outputs, config.lazy_grad_sum)
         return ret
 
+    def _check_outputs(self, outputs):
+        # Check for output array types
+        if not isinstance(outputs, tuple):
+            raise TypeError(
+                'forward output must be a tuple ({})\n'
+                'Actual: {}'.format(self.label, type(outputs)))
+
+        if not chainer.is_arrays_compatible(outputs):
+            raise TypeError(
+                'incompatible array types are mixed in the forward output '
+                '({}).\n'
+                'Actual: {}'.format(
+                    self.label,
+                    ', '.join(str(type(x)) for x in outputs)))
+
+    def _connect_graph(self, input_vars, ret, outputs, lazy_grad_sum):
+        input_nodes = tuple([x._node for x in input_vars])
+        output_nodes = [y._node for y in ret]
+        # Topological ordering
+        rank = max([x.rank for x in input_nodes]) if input_nodes else 0
+        self.rank = rank
+        # Add backward edges
+        for y in output_nodes:
+            y._creator_node = self
+            y._rank = rank + 1
+        self.inputs = input_nodes
+        # Add forward edges (must be weak references)
+        self.outputs = tuple([weakref.ref(y) for y in output_nodes])
+
+        if self._input_indexes_to_retain is not None:
+            for index in self._input_indexes_to_retain:
+                input_vars[index].retain_data()
+
+        if self._output_indexes_to_retain is not None:
+            retained_data = []
+            for index in self._output_indexes_to_retain:
+                ret[index].retain_data()
+                retained_data.append(outputs[index])
+            self._retained_output_data = tuple(retained_data)
+
+        self.lazy_grad_sum = lazy_grad_sum
+
     def _check_data_type_forward(self, in_data):
         in_type = type_check.get_light_types(in_data)
         try:
@@ -821,7 +917,8 @@ def grad(outputs, inputs, grad_outputs=None, grad_inputs=None, set_grad=False,
 
     # Backprop implementation. It edits grads which will only contain the
     # gradients w.r.t. the inputs.
-    with chainer.using_config('enable_backprop', enable_double_backprop):
+    with chainer.using_config('enable_backprop', enable_double_backprop), \
+            _backprop_utils.loss_scale_scope(loss_scale):
         _backprop(outputs, inputs, grad_required, retain_grad, grads,
                   loss_scale)
 
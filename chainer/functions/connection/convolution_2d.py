@@ -99,15 +99,11 @@ class Convolution2DFunction(function_node.FunctionNode):
         if self._use_ideep:
             return self._forward_ideep(x, W, b)
 
-        kh, kw = W.shape[2:]
-        col = conv.im2col_cpu(
-            x, kh, kw, self.sy, self.sx, self.ph, self.pw,
+        y = conv.conv_2d_cpu(
+            x, W, self.sy, self.sx, self.ph, self.pw,
             cover_all=self.cover_all, dy=self.dy, dx=self.dx)
-        y = numpy.tensordot(
-            col, W, ((1, 2, 3), (1, 2, 3))).astype(x.dtype, copy=False)
         if b is not None:
-            y += b
-        y = numpy.rollaxis(y, 3, 1)
+            y += b.reshape((1, b.size, 1, 1))
         return y,
 
     def _forward_ideep(self, x, W, b):
@@ -289,11 +285,9 @@ class Convolution2DGradW(function_node.FunctionNode):
         if self._use_ideep:
             return self._forward_ideep(x, gy)
 
-        col = conv.im2col_cpu(
-            x, self.kh, self.kw, self.sy, self.sx, self.ph, self.pw,
-            cover_all=self.cover_all, dy=self.dy, dx=self.dx)
-        gW = numpy.tensordot(gy, col, ((0, 2, 3), (0, 4, 5))
-                             ).astype(self.W_dtype, copy=False)
+        gW = conv.conv_2d_grad_w_cpu(
+            x, gy, self.kh, self.kw, self.sy, self.sx, self.ph, self.pw,
+            dy=self.dy, dx=self.dx).astype(self.W_dtype, copy=False)
         return gW,
 
     def _forward_ideep(self, x, gy):
@@ -138,10 +138,8 @@ class Deconvolution2DFunction(function_node.FunctionNode):
         if self._use_ideep:
             return self._forward_ideep(x, W, b)
 
-        gcol = numpy.tensordot(W, x, (0, 1)).astype(x.dtype, copy=False)
-        gcol = numpy.rollaxis(gcol, 3)
-        y = conv.col2im_cpu(
-            gcol, self.sy, self.sx, self.ph, self.pw, self.outh, self.outw,
+        y = conv.deconv_2d_cpu(
+            x, W, self.sy, self.sx, self.ph, self.pw, self.outh, self.outw,
             dy=self.dy, dx=self.dx)
         # b, k, h, w
         if b is not None:
@@ -1,16 +1,34 @@
 import numpy
-import six
 
 import chainer
+from chainer import _backprop_utils
 from chainer.backends import cuda
 from chainer import function_node
+from chainer.utils import sparse
 from chainer.utils import type_check
+from chainer import variable
+
+
+def _row_sparse_grad(x, gy, w_shape, ignore_label):
+    # Gathers the rows of the gradient of W without summing the duplicated
+    # IDs up. Negative IDs refer to the rows from the last as in the forward.
+    xp = cuda.get_array_module(x, gy)
+    x = x.ravel()
+    gy = gy.reshape((x.size,) + tuple(w_shape[1:]))
+    if ignore_label is not None:
+        mask = x != ignore_label
+        x = x[mask]
+        gy = gy[mask]
+    x = xp.where(x < 0, x + w_shape[0], x)
+    return sparse.RowSparseArray(x, gy, w_shape)
 
 
 class EmbedIDFunction(function_node.FunctionNode):
 
-    def __init__(self, ignore_label=None):
+    def __init__(self, ignore_label=None, sparse_target=None):
         self.ignore_label = ignore_label
+        # Parameter to which the row-sparse gradient is added
+        self.sparse_target = sparse_target
 
     def check_type_forward(self, in_types):
         type_check.expect(in_types.size() == 2)
@@ -46,6 +64,16 @@ class EmbedIDFunction(function_node.FunctionNode):
 
     def backward(self, indexes, grad_outputs):
         inputs = self.get_retained_inputs()
+        target = self.sparse_target
+        if (target is not None and not chainer.config.enable_backprop and
+                target.shape == self._w_shape):
+            # The gradient of W is added to the parameter directly, since
+            # the graph cannot propagate a row-sparse gradient. It is only
+            # done unless the gradient is differentiated again.
+            target._add_sparse_grad(_row_sparse_grad(
+                inputs[0].array, grad_outputs[0].array, self._w_shape,
+                self.ignore_label), _backprop_utils.get_loss_scale())
+            return None, None
         gW = EmbedIDGrad(
             self._w_shape, self.ignore_label).apply(inputs + grad_outputs)[0]
         return None, gW
@@ -66,12 +94,11 @@ class EmbedIDGrad(function_node.FunctionNode):
 
         if xp is numpy:
             # It is equivalent to `numpy.add.at(gW, x, gy)` but ufunc.at is
-            # too slow.
-            for ix, igy in six.moves.zip(x.ravel(),
-                                         gy.reshape(x.size, -1)):
-                if ix == self.ignore_label:
-                    continue
-                gW[ix] += igy
+            # too slow. The rows of the same IDs are summed up by a segment
+            # sum instead.
+            grad = _row_sparse_grad(
+                x, gy, self.w_shape, self.ignore_label).coalesce()
+            gW[grad.rows] = grad.values
         else:
             if self.ignore_label is None:
                 cuda.elementwise(
@@ -115,7 +142,7 @@ class EmbedIDGrad(function_node.FunctionNode):
         return None, ggy
 
 
-def embed_id(x, W, ignore_label=None):
+def embed_id(x, W, ignore_label=None, sparse_grad=False):
     """Efficient linear function for one-hot input.
 
     This function implements so called *word embeddings*. It takes two
@@ -136,6 +163,15 @@ def embed_id(x, W, ignore_label=None):
         ignore_label (:class:`int` or :class:`None`):
             If ``ignore_label`` is an int value, ``i``-th column of return
             value is filled with ``0``.
+        sparse_grad (bool): If ``True`` and ``W`` is a
+            :class:`~chainer.Parameter`, the gradient of ``W`` is added to
+            :attr:`~chainer.Parameter.sparse_grad` of ``W`` as a
+            :class:`~chainer.utils.RowSparseArray` holding only the rows of
+            the given IDs, instead of the dense gradient of the whole matrix.
+            The optimizers update only these rows if possible. Since the
+            gradient is not propagated through the graph,
+            :func:`chainer.grad` does not return it. It is ignored when the
+            gradient is computed with ``enable_double_backprop``.
 
     Returns:
         ~chainer.Variable: Output variable.
@@ -162,4 +198,9 @@ def embed_id(x, W, ignore_label=None):
                [0., 0., 0.]], dtype=float32)
 
     """
-    return EmbedIDFunction(ignore_label=ignore_label).apply((x, W))[0]
+    sparse_target = None
+    if sparse_grad and isinstance(W, variable.Parameter):
+        sparse_target = W
+    return EmbedIDFunction(
+        ignore_label=ignore_label,
+        sparse_target=sparse_target).apply((x, W))[0]
@@ -309,6 +309,12 @@ def n_step_gru_base(n_layers, dropout_ratio, hx, ws, bs, xs,
         ys = chainer.functions.split_axis(ys, sections, 0)
         return hy, ys
 
+    elif n_step_rnn.use_cpu_implementation(hx, xs):
+        hy, _, ys = n_step_rnn.n_step_rnn_cpu(
+            'gru', _gru, n_layers, dropout_ratio, hx, None, ws, bs, xs,
+            use_bi_direction)
+        return hy, ys
+
     else:
         hy, _, ys = n_step_rnn.n_step_rnn_impl(
             _gru, n_layers, dropout_ratio, hx, None, ws, bs, xs,
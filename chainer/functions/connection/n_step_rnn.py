@@ -10,6 +10,7 @@ import chainer
 from chainer.backends import cuda
 from chainer import configuration
 from chainer import function
+from chainer import function_node
 from chainer.functions.activation import relu
 from chainer.functions.activation import tanh
 from chainer.functions.array import concat
@@ -836,6 +837,15 @@ def n_step_rnn_base(n_layers, dropout_ratio, hx, ws, bs, xs,
         raise ValueError('Invalid activation: "%s". Please select from [%s]'
                          % (activation, candidate))
 
+    def f(x, h, c, w, b):
+        xw, hw = w
+        xb, hb = b
+        rnn_in = linear.linear(x, xw, xb) + linear.linear(h, hw, hb)
+        if activation == 'tanh':
+            return tanh.tanh(rnn_in), None
+        elif activation == 'relu':
+            return relu.relu(rnn_in), None
+
     xp = cuda.get_array_module(hx)
 
     if xp is not numpy and chainer.should_use_cudnn('>=auto', 5000):
@@ -865,17 +875,13 @@ def n_step_rnn_base(n_layers, dropout_ratio, hx, ws, bs, xs,
         ys = chainer.functions.split_axis(ys, sections, 0)
         return hy, ys
 
-    else:
-
-        def f(x, h, c, w, b):
-            xw, hw = w
-            xb, hb = b
-            rnn_in = linear.linear(x, xw, xb) + linear.linear(h, hw, hb)
-            if activation == 'tanh':
-                return tanh.tanh(rnn_in), None
-            elif activation == 'relu':
-                return relu.relu(rnn_in), None
+    elif use_cpu_implementation(hx, xs):
+        hy, _, ys = n_step_rnn_cpu(
+            'rnn_%s' % activation, f, n_layers, dropout_ratio, hx, None, ws,
+            bs, xs, use_bi_direction)
+        return hy, ys
 
+    else:
         hy, _, ys = n_step_rnn_impl(
             f, n_layers, dropout_ratio, hx, None, ws, bs, xs, use_bi_direction)
         return hy, ys
@@ -957,3 +963,348 @@ def _one_directional_loop(f, xs, h, c, w, b):
 
 def _dropout_sequence(xs, dropout_ratio):
     return [dropout.dropout(x, ratio=dropout_ratio) for x in xs]
+
+
+_rnn_n_gates = {'rnn_tanh': 1, 'rnn_relu': 1, 'gru': 3, 'lstm': 4}
+
+
+def _sigmoid_inplace(x):
+    half = x.dtype.type(0.5)
+    x *= half
+    numpy.tanh(x, out=x)
+    x *= half
+    x += half
+
+
+class NStepRNNLayerCPU(function_node.FunctionNode):
+
+    """One layer of one direction of a recurrent network on CPU.
+
+    It computes the recurrence over the concatenated input sequences at once
+    instead of unrolling it into functions of each timestep. The projections
+    of the inputs of all the timesteps are computed by one GEMM, and the
+    hidden states are updated in place in preallocated buffers. A variable
+    length mini-batch is handled by shrinking the active rows of the states
+    like the implementation unrolled over the timesteps.
+
+    The inputs are the concatenated sequences ``x`` of shape
+    ``(sum(batches), I)``, the initial hidden state ``h`` of shape ``(B, N)``,
+    the initial cell state ``c`` only for LSTM, and the weights and biases of
+    the layer in the order of ``ws`` and ``bs``. The outputs are the
+    concatenated hidden states ``y`` and the last hidden (and cell) states.
+
+    The backward computation is also fused unless double backpropagation is
+    enabled, in which case the recurrence is unrolled over the timesteps by
+    the cell function ``f`` of :func:`n_step_rnn_impl` and differentiated.
+
+    """
+
+    def __init__(self, rnn_mode, f, batches, reverse=False):
+        self.rnn_mode = rnn_mode
+        self.f = f
+        self.n_gates = _rnn_n_gates[rnn_mode]
+        self.use_cell = rnn_mode == 'lstm'
+        self.batches = batches
+        self.offsets = numpy.concatenate(([0], numpy.cumsum(batches)))
+        self.reverse = reverse
+
+    def check_type_forward(self, in_types):
+        n_states = 3 if self.use_cell else 2
+        type_check.expect(in_types.size() == n_states + 4 * self.n_gates)
+        x_type, h_type = in_types[:2]
+        type_check.expect(
+            x_type.dtype.kind == 'f',
+            x_type.ndim == 2,
+            x_type.shape[0] == self.offsets[-1],
+            h_type.dtype == x_type.dtype,
+            h_type.ndim == 2,
+            h_type.shape[0] == self.batches[0],
+        )
+        for t in in_types[2:]:
+            type_check.expect(t.dtype == x_type.dtype)
+
+    def _steps(self):
+        steps = six.moves.range(len(self.batches))
+        if self.reverse:
+            steps = reversed(steps)
+        return [(self.offsets[t], self.batches[t]) for t in steps]
+
+    def _weights(self, params):
+        G = self.n_gates
+        ws, bs = params[:2 * G], params[2 * G:]
+        return (numpy.concatenate(ws[:G]), numpy.concatenate(ws[G:]),
+                numpy.concatenate(bs[:G]), numpy.concatenate(bs[G:]))
+
+    def forward_cpu(self, inputs):
+        n_states = 3 if self.use_cell else 2
+        x, h = inputs[:2]
+        W_x, W_h, b_x, b_h = self._weights(inputs[n_states:])
+        self.retain_inputs(tuple(six.moves.range(len(inputs))))
+        N = h.shape[1]
+        mode = self.rnn_mode
+
+        # Projections of the inputs of all the timesteps, which are
+        # overwritten by the activations of the gates
+        gates = x.dot(W_x.T)
+        gates += b_x
+        if mode == 'gru':
+            gates[:, :2 * N] += b_h[:2 * N]
+            b_hn = b_h[2 * N:]
+            self.hn = numpy.empty((len(x), N), dtype=x.dtype)
+        else:
+            gates += b_h
+
+        y = numpy.empty((len(x), N), dtype=x.dtype)
+        self.h_prev = numpy.empty_like(y)
+        h = h.copy()
+        if self.use_cell:
+            c = inputs[2].copy()
+            self.c_prev = numpy.empty_like(y)
+
+        for offset, batch in self._steps():
+            s = slice(offset, offset + batch)
+            h_t = h[:batch]
+            self.h_prev[s] = h_t
+            g = gates[s]
+            hw = h_t.dot(W_h.T)
+            if mode == 'lstm':
+                g += hw
+                i, f, a, o = numpy.split(g, 4, axis=1)
+                _sigmoid_inplace(g[:, :2 * N])
+                numpy.tanh(a, out=a)
+                _sigmoid_inplace(o)
+                c_t = c[:batch]
+                self.c_prev[s] = c_t
+                c_t *= f
+                c_t += i * a
+                numpy.multiply(o, numpy.tanh(c_t), out=y[s])
+            elif mode == 'gru':
+                g[:, :2 * N] += hw[:, :2 * N]
+                _sigmoid_inplace(g[:, :2 * N])
+                r, z, n = numpy.split(g, 3, axis=1)
+                hn = self.hn[s]
+                numpy.add(hw[:, 2 * N:], b_hn, out=hn)
+                n += r * hn
+                numpy.tanh(n, out=n)
+                numpy.subtract(h_t, n, out=y[s])
+                y[s] *= z
+                y[s] += n
+            else:
+                g += hw
+                if mode == 'rnn_tanh':
+                    numpy.tanh(g, out=g)
+                else:
+                    numpy.maximum(g, 0, out=g)
+                y[s] = g
+            h_t[...] = y[s]
+
+        self.gates = gates
+        if self.use_cell:
+            return y, h, c
+        return y, h
+
+    def backward(self, indexes, grad_outputs):
+        inputs = self.get_retained_inputs()
+        if chainer.config.enable_backprop:
+            return self._backward_unrolled(indexes, inputs, grad_outputs)
+        n_states = 3 if self.use_cell else 2
+        given = [g is not None for g in grad_outputs]
+        return NStepRNNLayerCPUGrad(self, given).apply(
+            (inputs[0],) + inputs[n_states:] +
+            tuple([g for g in grad_outputs if g is not None]))
+
+    def _backward_unrolled(self, indexes, inputs, grad_outputs):
+        # Differentiates the recurrence unrolled over the timesteps, whose
+        # gradients can be further backpropagated
+        n_states = 3 if self.use_cell else 2
+        G = self.n_gates
+        x, h = inputs[:2]
+        c = inputs[2] if self.use_cell else None
+        w = inputs[n_states:n_states + 2 * G]
+        b = inputs[n_states + 2 * G:]
+        xs = split_axis.split_axis(x, self.offsets[1:-1], 0)
+        if self.reverse:
+            xs = reversed(xs)
+        h, c, hs = _one_directional_loop(self.f, xs, h, c, w, b)
+        if self.reverse:
+            hs.reverse()
+        outputs = [concat.concat(hs, axis=0), h, c]
+
+        ys = []
+        gys = []
+        for y, gy in six.moves.zip(outputs, grad_outputs):
+            if gy is not None:
+                ys.append(y)
+                gys.append(gy)
+        targets = [inputs[i] for i in indexes]
+        gxs = chainer.grad(ys, targets, gys, enable_double_backprop=True)
+        return tuple(gxs)
+
+
+class NStepRNNLayerCPUGrad(function_node.FunctionNode):
+
+    def __init__(self, layer, given):
+        self.layer = layer
+        self.given = given
+
+    def forward_cpu(self, inputs):
+        layer = self.layer
+        mode = layer.rnn_mode
+        n_params = 4 * layer.n_gates
+        x = inputs[0]
+        W_x, W_h, _, _ = layer._weights(inputs[1:1 + n_params])
+        gates = layer.gates
+        h_prev = layer.h_prev
+        N = h_prev.shape[1]
+
+        # The gradients of the states are updated in place, which are zero if
+        # not given
+        inputs = iter(inputs[1 + n_params:])
+        gy, gh, gc = [next(inputs) if given else None
+                      for given in self.given] + [None] * (3 - len(self.given))
+        shape = (layer.batches[0], N)
+        gh = numpy.zeros(shape, x.dtype) if gh is None else gh.copy()
+        if layer.use_cell:
+            gc = numpy.zeros(shape, x.dtype) if gc is None else gc.copy()
+
+        # Gradients of the pre-activations of the gates w.r.t. the input and
+        # the hidden state, which differ only for GRU
+        g_gates = numpy.empty_like(gates)
+        g_hgates = numpy.empty_like(gates) if mode == 'gru' else g_gates
+
+        for offset, batch in reversed(layer._steps()):
+            s = slice(offset, offset + batch)
+            gh_t = gh[:batch]
+            if gy is not None:
+                gh_t += gy[s]
+            gg = g_gates[s]
+            if mode == 'lstm':
+                i, f, a, o = numpy.split(gates[s], 4, axis=1)
+                gi, gf, ga, go = numpy.split(gg, 4, axis=1)
+                c_prev = layer.c_prev[s]
+                gc_t = gc[:batch]
+                tanh_c = numpy.tanh(f * c_prev + i * a)
+                numpy.multiply(gh_t, tanh_c, out=go)
+                tanh_c *= tanh_c
+                numpy.subtract(1, tanh_c, out=tanh_c)
+                tanh_c *= o
+                tanh_c *= gh_t
+                gc_t += tanh_c
+                numpy.multiply(gc_t, a, out=gi)
+                numpy.multiply(gc_t, i, out=ga)
+                numpy.multiply(gc_t, c_prev, out=gf)
+                gc_t *= f
+                gg[:, :2 * N] *= gates[s, :2 * N]
+                gg[:, :2 * N] *= 1 - gates[s, :2 * N]
+                ga *= 1 - a * a
+                go *= o
+                go *= 1 - o
+            elif mode == 'gru':
+                r, z, n = numpy.split(gates[s], 3, axis=1)
+                gr, gz, gn = numpy.split(gg, 3, axis=1)
+                hn = layer.hn[s]
+                numpy.multiply(gh_t, 1 - z, out=gn)
+                gn *= 1 - n * n
+                numpy.subtract(h_prev[s], n, out=gz)
+                gz *= gh_t
+                numpy.multiply(gn, hn, out=gr)
+                gg[:, :2 * N] *= gates[s, :2 * N]
+                gg[:, :2 * N] *= 1 - gates[s, :2 * N]
+                ghg = g_hgates[s]
+                ghg[:, :2 * N] = gg[:, :2 * N]
+                numpy.multiply(gn, r, out=ghg[:, 2 * N:])
+            else:
+                if mode == 'rnn_tanh':
+                    numpy.multiply(gh_t, 1 - gates[s] * gates[s], out=gg)
+                else:
+                    numpy.multiply(gh_t, gates[s] > 0, out=gg)
+
+            gh_prev = g_hgates[s].dot(W_h)
+            if mode == 'gru':
+                gh_t *= z
+                gh_t += gh_prev
+            else:
+                gh_t[...] = gh_prev
+
+        gx = g_gates.dot(W_x)
+        gW_x = g_gates.T.dot(x)
+        gW_h = g_hgates.T.dot(h_prev)
+        gb_x = g_gates.sum(axis=0)
+        gb_h = g_hgates.sum(axis=0)
+        G = layer.n_gates
+        ret = [gx, gh]
+        if layer.use_cell:
+            ret.append(gc)
+        ret.extend(numpy.split(gW_x, G))
+        ret.extend(numpy.split(gW_h, G))
+        ret.extend(numpy.split(gb_x, G))
+        ret.extend(numpy.split(gb_h, G))
+        return tuple(ret)
+
+    def backward(self, indexes, grad_outputs):
+        # NStepRNNLayerCPU uses this node only if double backpropagation is
+        # disabled
+        raise NotImplementedError(
+            'NStepRNNLayerCPUGrad does not support double backpropagation')
+
+
+def n_step_rnn_cpu(rnn_mode, f, n_layers, dropout_ratio, hx, cx, ws, bs, xs,
+                   use_bi_direction):
+    """Stacked RNNs on CPU by :class:`NStepRNNLayerCPU` of each layer.
+
+    This function has the same interface as :func:`n_step_rnn_impl` except
+    that the kind of the recurrence is given by ``rnn_mode``, which is one of
+    ``'rnn_tanh'``, ``'rnn_relu'``, ``'gru'`` and ``'lstm'``. The cell
+    function ``f`` is only used for double backpropagation.
+
+    """
+    direction = 2 if use_bi_direction else 1
+    use_cell = rnn_mode == 'lstm'
+    batches = [len(x) for x in xs]
+    hx = chainer.functions.separate(hx)
+    if use_cell:
+        cx = chainer.functions.separate(cx)
+
+    x = concat.concat(xs, axis=0)
+    hy = []
+    cy = []
+    for layer in six.moves.range(n_layers):
+        ys = []
+        for di in six.moves.range(direction):
+            idx = direction * layer + di
+            if layer == 0:
+                x_in = x
+            else:
+                x_in = dropout.dropout(x, ratio=dropout_ratio)
+            inputs = [x_in, hx[idx]]
+            if use_cell:
+                inputs.append(cx[idx])
+            inputs.extend(ws[idx])
+            inputs.extend(bs[idx])
+            outputs = NStepRNNLayerCPU(
+                rnn_mode, f, batches, reverse=di == 1).apply(inputs)
+            ys.append(outputs[0])
+            hy.append(outputs[1])
+            if use_cell:
+                cy.append(outputs[2])
+        if use_bi_direction:
+            x = concat.concat(ys, axis=1)
+        else:
+            x = ys[0]
+
+    sections = numpy.cumsum(batches[:-1])
+    ys = split_axis.split_axis(x, sections, 0)
+    hy = stack.stack(hy)
+    if use_cell:
+        cy = stack.stack(cy)
+    else:
+        cy = None
+    return hy, cy, tuple(ys)
+
+
+def use_cpu_implementation(hx, xs):
+    # NStepRNNLayerCPU is used only for NumPy arrays, e.g. not for the arrays
+    # of iDeep
+    arrays = [chainer.as_variable(v).array for v in [hx] + list(xs)]
+    return (len(xs) > 0 and
+            all([isinstance(a, numpy.ndarray) for a in arrays]))
@@ -6,6 +6,7 @@ from chainer.backends import intel64
 from chainer import function_node
 from chainer.functions.pooling import pooling_2d
 from chainer.utils import conv
+from chainer.utils import conv_nd
 
 
 class AveragePooling2D(pooling_2d.Pooling2D):
@@ -21,9 +22,10 @@ class AveragePooling2D(pooling_2d.Pooling2D):
         self._in_shape = x[0].shape
         self._in_dtype = x[0].dtype
 
-        col = conv.im2col_cpu(x[0], self.kh, self.kw, self.sy, self.sx,
-                              self.ph, self.pw)
-        y = col.mean(axis=(2, 3))
+        col = conv.im2col_view_cpu(
+            x[0], self.kh, self.kw, self.sy, self.sx, self.ph, self.pw)
+        y = conv_nd.sum_windows_nd_cpu(col)
+        y /= self.kh * self.kw
         return y,
 
     def _forward_ideep(self, x):
@@ -119,8 +121,9 @@ class AveragePooling2DGrad(function_node.FunctionNode):
             return self._forward_ideep(gy)
 
         h, w = self._in_shape[2:]
-        gcol = numpy.tile(gy[0][:, :, None, None],
-                          (1, 1, self.kh, self.kw, 1, 1))
+        n, c, out_h, out_w = gy[0].shape
+        gcol = numpy.broadcast_to(gy[0][:, :, None, None],
+                                  (n, c, self.kh, self.kw, out_h, out_w))
         gx = conv.col2im_cpu(gcol, self.sy, self.sx, self.ph, self.pw, h, w)
         gx /= self.kh * self.kw
         return gx,
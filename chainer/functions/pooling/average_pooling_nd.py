@@ -78,18 +78,18 @@ class AveragePoolingND(pooling_nd._PoolingND):
         self._in_shape = x.shape
         self._in_dtype = x.dtype
 
-        col = conv_nd.im2col_nd_cpu(
+        col = conv_nd.im2col_nd_view_cpu(
             x, self.ksize, self.stride, self.pad, cover_all=self.cover_all)
 
-        # mean along (_, _, k_1, k_2, ..., k_N, _, ..., _)
-        y_axis = tuple(six.moves.range(2, 2 + len(self.ksize)))
+        # sum along (_, _, k_1, k_2, ..., k_N, _, ..., _)
+        y = conv_nd.sum_windows_nd_cpu(col)
         if self.pad_value is None:
             dims = x.shape[2:]
             width = self._get_pooling_width(numpy, dims, x.dtype)
-            y = col.sum(axis=y_axis) / width
+            y /= width
         else:
             assert self.pad_value == 0
-            y = col.mean(axis=y_axis)
+            y /= functools.reduce(operator.mul, self.ksize)
 
         return y,
 
@@ -167,8 +167,8 @@ class AveragePoolingNDGrad(function_node.FunctionNode):
         odims = gy.shape[2:]
         colon = slice(None, None, None)
         gy_index = (colon, colon) + (None,) * len(idims)
-        gcol_reps = (1, 1) + self.ksize + (1,) * len(odims)
-        gcol = numpy.tile(gy[gy_index], gcol_reps)
+        gcol_shape = gy.shape[:2] + self.ksize + odims
+        gcol = numpy.broadcast_to(gy[gy_index], gcol_shape)
         gx = conv_nd.col2im_nd_cpu(gcol, self.stride, self.pad, idims)
         if self.pad_value is None:
             width = self._get_pooling_width(numpy, odims, gx.dtype)
@@ -6,12 +6,18 @@ from chainer.backends import intel64
 from chainer import function_node
 from chainer.functions.pooling import pooling_2d
 from chainer.utils import conv
+from chainer.utils import conv_nd
 
 
 class MaxPooling2D(pooling_2d.Pooling2D):
 
     """Max pooling over a set of 2d planes."""
 
+    # Whether the indexes are computed on CPU when backprop is disabled. It is
+    # set to False when the function object is not exposed to users, who can
+    # otherwise use the indexes (e.g. for upsampling_2d).
+    _indexes_required = True
+
     def forward_cpu(self, x):
         if (intel64.should_use_ideep('>=auto')
                 and intel64.inputs_all_ready(x)):
@@ -20,16 +26,14 @@ class MaxPooling2D(pooling_2d.Pooling2D):
         self._in_shape = x[0].shape
         self._in_dtype = x[0].dtype
 
-        col = conv.im2col_cpu(
+        col = conv.im2col_view_cpu(
             x[0], self.kh, self.kw, self.sy, self.sx, self.ph, self.pw,
             pval=-float('inf'), cover_all=self.cover_all)
-        n, c, kh, kw, out_h, out_w = col.shape
-        col = col.reshape(n, c, kh * kw, out_h, out_w)
-
-        # We select maximum twice, since the implementation using numpy.choose
-        # hits its bug when kh * kw >= 32.
-        self.indexes = col.argmax(axis=2)
-        y = col.max(axis=2)
+        if chainer.config.enable_backprop or self._indexes_required:
+            y, self.indexes = conv_nd.max_windows_nd_cpu(
+                col, return_indices=True)
+        else:
+            y = conv_nd.max_windows_nd_cpu(col)
         return y,
 
     def _forward_ideep(self, x):
@@ -144,22 +148,10 @@ class MaxPooling2DGrad(function_node.FunctionNode):
                 and intel64.inputs_all_ready(gy)):
             return self._forward_ideep(gy)
 
-        n, c, out_h, out_w = gy[0].shape
-        h, w = self._in_shape[2:]
-        kh, kw = self.kh, self.kw
-
-        gcol = numpy.zeros(
-            (n * c * out_h * out_w * kh * kw), dtype=self._in_dtype)
-
-        indexes = self.indexes.flatten()
-        indexes += numpy.arange(0, indexes.size * kh * kw, kh * kw)
-
-        gcol[indexes] = gy[0].ravel()
-        gcol = gcol.reshape(n, c, out_h, out_w, kh, kw)
-        gcol = numpy.swapaxes(gcol, 2, 4)
-        gcol = numpy.swapaxes(gcol, 3, 5)
-
-        gx = conv.col2im_cpu(gcol, self.sy, self.sx, self.ph, self.pw, h, w)
+        gx = conv_nd.scatter_windows_nd_cpu(
+            gy[0].astype(self._in_dtype, copy=False), self.indexes,
+            (self.kh, self.kw), (self.sy, self.sx), (self.ph, self.pw),
+            self._in_shape[2:])
         return gx,
 
     def _forward_ideep(self, gy):
@@ -251,15 +243,10 @@ class MaxPooling2DWithIndexes(function_node.FunctionNode):
             self.mpool2d = mpool2d
 
     def forward_cpu(self, x):
-        col = conv.im2col_cpu(
+        col = conv.im2col_view_cpu(
             x[0], self.kh, self.kw, self.sy, self.sx, self.ph, self.pw,
             pval=-float('inf'), cover_all=self.cover_all)
-        n, c, kh, kw, out_h, out_w = col.shape
-        col = col.reshape(n, c, kh * kw, out_h, out_w)
-        col = col.transpose(0, 1, 3, 4, 2).reshape(-1, kh * kw)
-        indexes = self.indexes.ravel()
-        col = col[numpy.arange(len(indexes)), indexes]
-        return col.reshape(n, c, out_h, out_w),
+        return conv_nd.take_windows_nd_cpu(col, self.indexes),
 
     def forward_gpu(self, inputs):
         if self._used_cudnn:
@@ -379,4 +366,5 @@ def max_pooling_2d(x, ksize, stride=None, pad=0, cover_all=True,
             out = func.apply((x,))[0]
         return out, func.indexes
 
+    func._indexes_required = False
     return func.apply((x,))[0]
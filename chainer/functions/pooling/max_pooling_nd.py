@@ -1,6 +1,3 @@
-import functools
-from operator import mul
-
 import numpy
 import six
 
@@ -22,6 +19,11 @@ class MaxPoolingND(pooling_nd._PoolingND):
 
     """
 
+    # Whether the indexes are computed on CPU when backprop is disabled. It is
+    # set to False when the function object is not exposed to users, who can
+    # otherwise use the indexes (e.g. for upsampling_2d).
+    _indexes_required = True
+
     def __init__(self, ndim, ksize, stride=None, pad=0, cover_all=True):
         super(MaxPoolingND, self).__init__(
             ndim, ksize, stride=stride, pad=pad, cover_all=cover_all)
@@ -30,21 +32,14 @@ class MaxPoolingND(pooling_nd._PoolingND):
         self._in_shape = x[0].shape
         self._in_dtype = x[0].dtype
 
-        col = conv_nd.im2col_nd_cpu(
+        col = conv_nd.im2col_nd_view_cpu(
             x[0], self.ksize, self.stride, self.pad, pval=-float('inf'),
             cover_all=self.cover_all)
-        n, c = col.shape[:2]
-        mid = (len(col.shape) - 2) // 2 + 2
-        ksize = col.shape[2:mid]
-        outs = col.shape[mid:]
-        # (n, c, k_1 * k_2 * ... * k_N, out_1, out_2, ..., out_N)
-        col_shape = (n, c) + (functools.reduce(mul, ksize),) + outs
-        col = col.reshape(col_shape)
-
-        # We select maximum twice, since the implementation using numpy.choose
-        # hits its bug when kh * kw >= 32.
-        self.indexes = col.argmax(axis=2)
-        y = col.max(axis=2)
+        if chainer.config.enable_backprop or self._indexes_required:
+            y, self.indexes = conv_nd.max_windows_nd_cpu(
+                col, return_indices=True)
+        else:
+            y = conv_nd.max_windows_nd_cpu(col)
         return y,
 
     def forward_gpu(self, x):
@@ -101,26 +96,9 @@ class MaxPoolingNDGrad(function_node.FunctionNode):
         self.mpoolnd = mpoolnd
 
     def forward_cpu(self, gy):
-        ndim = self.ndim
-        n, c = gy[0].shape[:2]
-        outs = gy[0].shape[2:]
-        dims = self._in_shape[2:]
-        prod_outs = functools.reduce(mul, outs)
-        prod_ksize = functools.reduce(mul, self.ksize)
-
-        gcol = numpy.zeros(
-            n * c * prod_outs * prod_ksize, dtype=self._in_dtype)
-
-        indexes = self.indexes.flatten()
-        indexes += numpy.arange(0, indexes.size * prod_ksize, prod_ksize)
-
-        gcol[indexes] = gy[0].ravel()
-        gcol_shape = (n, c) + outs + self.ksize
-        gcol = gcol.reshape(gcol_shape)
-        for i in six.moves.range(ndim):
-            gcol = numpy.swapaxes(gcol, 2 + i, ndim + 2 + i)
-
-        gx = conv_nd.col2im_nd_cpu(gcol, self.stride, self.pad, dims)
+        gx = conv_nd.scatter_windows_nd_cpu(
+            gy[0].astype(self._in_dtype, copy=False), self.indexes,
+            self.ksize, self.stride, self.pad, self._in_shape[2:])
         return gx,
 
     def forward_gpu(self, gy):
@@ -160,25 +138,10 @@ class MaxPoolingNDWithIndexes(function_node.FunctionNode):
             self.mpoolnd = mpoolnd
 
     def forward_cpu(self, x):
-        col = conv_nd.im2col_nd_cpu(
+        col = conv_nd.im2col_nd_view_cpu(
             x[0], self.ksize, self.stride, self.pad, pval=-float('inf'),
             cover_all=self.cover_all)
-        n, c = col.shape[:2]
-        mid = (len(col.shape) - 2) // 2 + 2
-        ksize = col.shape[2:mid]
-        outs = col.shape[mid:]
-        # (n, c, k_1 * k_2 * ... * k_N, out_1, out_2, ..., out_N)
-        ksize_total = functools.reduce(mul, ksize)
-        col_shape = (n, c) + (ksize_total,) + outs
-        col = col.reshape(col_shape)
-        # (n, c, out_1, ..., out_N, k_1 * .. * k_N)
-        col_indexes = (0, 1) + tuple(six.moves.range(3, 3 + self.ndim)) + (2,)
-        col = col.transpose(col_indexes)
-        col = col.reshape(-1, ksize_total)
-
-        indexes = self.indexes.ravel()
-        col = col[numpy.arange(len(indexes)), indexes]
-        return col.reshape((n, c) + outs),
+        return conv_nd.take_windows_nd_cpu(col, self.indexes),
 
     def forward_gpu(self, inputs):
         if self._used_cudnn:
@@ -279,4 +242,5 @@ def max_pooling_nd(x, ksize, stride=None, pad=0, cover_all=True,
             out = func.apply((x,))[0]
         return out, func.indexes
 
+    func._indexes_required = False
     return func.apply((x,))[0]
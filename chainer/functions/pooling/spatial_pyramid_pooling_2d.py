@@ -91,6 +91,7 @@ def spatial_pyramid_pooling_2d(x, pyramid_height, pooling_class=None,
                 pooling == 'max'):
             pooler = chainer.functions.MaxPooling2D(
                 ksize=ksize, stride=None, pad=pad, cover_all=True)
+            pooler._indexes_required = False
         else:
             pooler = pooling if pooling is not None else pooling_class
             raise ValueError('Unsupported pooling operation: ', pooler)
@@ -4,6 +4,7 @@ from chainer.backends import cuda
 from chainer import function_node
 from chainer.functions.pooling import pooling_2d
 from chainer.utils import conv
+from chainer.utils import conv_nd
 from chainer.utils import type_check
 
 
@@ -48,18 +49,9 @@ class Upsampling2D(pooling_2d.Pooling2D):
             self.outw = conv.get_deconv_outsize(
                 w, self.kw, self.sx, self.pw, cover_all=self.cover_all)
 
-        up_y = numpy.zeros((n, c, self.outh, self.outw), dtype=self._in_dtype)
-        up_y = conv.im2col_cpu(
-            up_y, self.kh, self.kw, self.sy, self.sx, self.ph, self.pw,
-            cover_all=self.cover_all).transpose(0, 1, 4, 5, 2, 3)
-        colh, colw = up_y.shape[2:4]
-        up_y = up_y.reshape(-1, self.kh * self.kw)
-        indexes = self.indexes.ravel()
-        up_y[numpy.arange(len(indexes)), indexes] = x[0].ravel()
-        up_y = up_y.reshape(n, c, colh, colw, self.kh, self.kw)
-        up_y = conv.col2im_cpu(
-            up_y.transpose(0, 1, 4, 5, 2, 3), self.sy, self.sx, self.ph,
-            self.pw, self.outh, self.outw)
+        up_y = conv_nd.scatter_windows_nd_cpu(
+            x[0], self.indexes, (self.kh, self.kw), (self.sy, self.sx),
+            (self.ph, self.pw), (self.outh, self.outw))
         return up_y,
 
     def forward_gpu(self, x):
@@ -120,14 +112,10 @@ class Upsampling2DGrad(function_node.FunctionNode):
         self._in_dtype = upsampling2d._in_dtype
 
     def forward_cpu(self, gy):
-        gcol = conv.im2col_cpu(
+        gcol = conv.im2col_view_cpu(
             gy[0], self.kh, self.kw, self.sy, self.sx, self.ph, self.pw,
             cover_all=self.cover_all)
-        n, c, kh, kw, out_h, out_w = gcol.shape
-        gcol = gcol.transpose(0, 1, 4, 5, 2, 3).reshape(-1, kh * kw)
-        indexes = self.indexes.ravel()
-        gx = gcol[numpy.arange(len(indexes)), indexes]
-        return gx.reshape(n, c, out_h, out_w),
+        return conv_nd.take_windows_nd_cpu(gcol, self.indexes),
 
     def forward_gpu(self, gy):
         xp = cuda.cupy
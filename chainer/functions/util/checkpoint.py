@@ -0,0 +1,324 @@
+import contextlib
+import weakref
+
+import numpy
+import six
+
+import chainer
+from chainer.backends import cuda
+from chainer import configuration
+from chainer import function
+from chainer import function_node
+from chainer.utils import argument
+from chainer import variable
+
+
+# Sizes of layer outputs measured for each model and input signature
+_layer_bytes_cache = weakref.WeakKeyDictionary()
+
+
+def _as_tuple(outs):
+    if isinstance(outs, tuple):
+        for out in outs:
+            if not isinstance(out, variable.Variable):
+                raise RuntimeError(
+                    'A layer returned a tuple including {}, which is not a '
+                    'Variable'.format(type(out)))
+        return outs
+    elif isinstance(outs, variable.Variable):
+        return outs,
+    raise RuntimeError(
+        'A tuple of Variables or a Variable are expected, but {} is '
+        'returned.'.format(type(outs)))
+
+
+def _call_layers(layers, xs, layer_bytes=None):
+    x = xs if len(xs) > 1 else xs[0]
+    for layer in layers:
+        if isinstance(x, tuple):
+            x = layer(*x)
+        else:
+            x = layer(x)
+        if layer_bytes is not None:
+            layer_bytes.append(
+                sum([y.data.nbytes for y in _as_tuple(x)]))
+    return _as_tuple(x)
+
+
+def _collect_params(layers):
+    params = []
+    seen = set()
+    for layer in layers:
+        if not isinstance(layer, chainer.Link):
+            continue
+        for param in layer.params():
+            if id(param) not in seen:
+                seen.add(id(param))
+                params.append(param)
+    return params
+
+
+class _PersistentState(object):
+
+    """Saves persistent values of links and restores them on exit.
+
+    It is used to cancel the side effects of recomputation on persistent
+    values such as the running statistics of batch normalization.
+
+    """
+
+    def __init__(self, layers):
+        self._saved = []
+        for layer in layers:
+            if not isinstance(layer, chainer.Link):
+                continue
+            for link in layer.links():
+                for name in link._persistent:
+                    value = link.__dict__[name]
+                    if isinstance(value, chainer.get_array_types()):
+                        value = (value, value.copy())
+                    self._saved.append((link, name, value))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        for link, name, value in self._saved:
+            if isinstance(value, tuple):
+                array, saved = value
+                array[...] = saved
+                value = array
+            setattr(link, name, value)
+
+
+class _RandomState(object):
+
+    """Random state to replay random number generation of a segment.
+
+    The state of the global random number generator of NumPy is saved at
+    construction. On GPU, the segment is run with a dedicated CuPy random
+    state seeded from the global one, as the state of CuPy random number
+    generators cannot be saved.
+
+    """
+
+    def __init__(self, xp):
+        self._numpy_state = numpy.random.get_state()
+        self._seed = None
+        if xp is not numpy:
+            self._seed = int(cuda.cupy.random.randint(0, 2 ** 31 - 1))
+
+    @contextlib.contextmanager
+    def _use_cupy_state(self):
+        if self._seed is None:
+            yield
+            return
+        random = cuda.cupy.random
+        original = random.get_random_state()
+        random.set_random_state(random.RandomState(self._seed))
+        try:
+            yield
+        finally:
+            random.set_random_state(original)
+
+    def forward(self):
+        """Returns a context to run the original forward computation."""
+        return self._use_cupy_state()
+
+    @contextlib.contextmanager
+    def replay(self):
+        """Returns a context to replay the random number generation."""
+        numpy_state = numpy.random.get_state()
+        numpy.random.set_state(self._numpy_state)
+        try:
+            with self._use_cupy_state():
+                yield
+        finally:
+            numpy.random.set_state(numpy_state)
+
+
+class Checkpoint(function_node.FunctionNode):
+
+    """Segment of layers whose activations are recomputed in backprop."""
+
+    def __init__(self, layers, n_inputs, params):
+        self.layers = layers
+        self.n_inputs = n_inputs
+        self.params = params
+        self.layer_bytes = None
+
+    def forward(self, inputs):
+        n_inputs = self.n_inputs
+        self.retain_inputs(tuple(six.moves.range(n_inputs)))
+        self._random_state = _RandomState(cuda.get_array_module(*inputs))
+        self.layer_bytes = []
+        with function.no_backprop_mode(), self._random_state.forward():
+            xs = [variable.Variable(x) for x in inputs[:n_inputs]]
+            outs = _call_layers(self.layers, xs, self.layer_bytes)
+        return tuple([out.data for out in outs])
+
+    def backward(self, indexes, grad_outputs):
+        xs = self.get_retained_inputs()
+        with _PersistentState(self.layers), self._random_state.replay():
+            with function.force_backprop_mode():
+                outs = _call_layers(self.layers, xs)
+
+        outs, grad_outputs = zip(*[
+            (y, gy) for y, gy in six.moves.zip(outs, grad_outputs)
+            if gy is not None])
+        gxs = chainer.grad(
+            outs, list(xs) + self.params, grad_outputs=grad_outputs,
+            enable_double_backprop=configuration.config.enable_backprop)
+        return tuple([gxs[i] for i in indexes])
+
+
+def _measure_layer_bytes(layers, xs):
+    layer_bytes = []
+    xp = cuda.get_array_module(*xs)
+    random_state = _RandomState(xp)
+    with _PersistentState(layers), random_state.replay():
+        with function.no_backprop_mode():
+            _call_layers(layers, xs, layer_bytes)
+    return layer_bytes
+
+
+def _split_by_count(n_layers, n_segments):
+    n_segments = max(1, min(n_segments, n_layers))
+    bounds = [n_layers * i // n_segments
+              for i in six.moves.range(n_segments + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _split_by_budget(layer_bytes, memory_budget):
+    segments = []
+    start = 0
+    total = 0
+    for i, nbytes in enumerate(layer_bytes):
+        if i > start and total + nbytes > memory_budget:
+            segments.append((start, i))
+            start = i
+            total = 0
+        total += nbytes
+    segments.append((start, len(layer_bytes)))
+    return segments
+
+
+def checkpoint_sequential(model, *xs, **kwargs):
+    """checkpoint_sequential(model, *xs, n_segments=None, memory_budget=None)
+
+    Calls a sequential model storing only activations at segment boundaries.
+
+    This function splits the layers of ``model`` into segments and calls them
+    sequentially. Each segment except the last one is run without creating a
+    computational graph like :func:`~chainer.functions.forget`, so only the
+    activations at the segment boundaries are kept. In backprop, each
+    segment is called again to recompute its activations. It trades the
+    memory consumption of activations for an additional forward computation
+    of the checkpointed segments.
+
+    The segments are determined either by the number of segments or by a
+    memory budget. With ``n_segments``, the layers are split into the given
+    number of segments of (almost) equal number of layers. With
+    ``memory_budget``, consecutive layers are packed greedily into a segment
+    as long as the total size of their outputs does not exceed the budget.
+    The output sizes are measured by an additional forward computation at
+    the first call for each input signature.
+
+    The recomputation reproduces the original forward computation: the random
+    number generation (e.g., in :func:`~chainer.functions.dropout`) is
+    replayed, and the persistent values of links (e.g., the running
+    statistics of :class:`~chainer.links.BatchNormalization`) are not updated
+    twice.
+
+    The trade made by this function is reported to the current reporter with
+    the following keys.
+
+    * ``checkpoint/n_segments``: The number of segments.
+    * ``checkpoint/stored_bytes``: The total size of layer outputs kept for
+      backprop.
+    * ``checkpoint/released_bytes``: The total size of layer outputs
+      discarded in the forward computation and recomputed in backprop.
+    * ``checkpoint/recomputed_layers``: The number of layers called again in
+      backprop.
+
+    .. admonition:: Example
+
+       >>> model = chainer.Sequential(
+       ...     L.Linear(3, 4), F.relu, L.Linear(4, 4), F.relu, L.Linear(4, 2))
+       >>> x = np.random.uniform(-1, 1, (5, 3)).astype(np.float32)
+       >>> y = F.checkpoint_sequential(model, x, n_segments=2)
+       >>> y.shape
+       (5, 2)
+
+    Args:
+        model (~chainer.Sequential or ~chainer.ChainList): Model to call. The
+            layers (or the child links in the case of
+            :class:`~chainer.ChainList`) are called in order, where the
+            output of each layer is passed to the next one as
+            :class:`~chainer.Sequential` does.
+        xs (~chainer.Variable): Input variables of the first layer.
+        n_segments (int): Number of segments.
+        memory_budget (int): Maximum total size of layer outputs of a
+            segment in bytes.
+
+    Returns:
+        ~chainer.Variable: The output of the last layer. If it returns a
+        tuple, the function returns a tuple too.
+
+    """
+    n_segments, memory_budget = argument.parse_kwargs(
+        kwargs, ('n_segments', None), ('memory_budget', None))
+    if (n_segments is None) == (memory_budget is None):
+        raise ValueError(
+            'Either n_segments or memory_budget must be specified')
+    if not isinstance(model, chainer.ChainList):
+        raise TypeError(
+            'model must be a Sequential or a ChainList, not {}'.format(
+                type(model)))
+
+    layers = list(model)
+    if not layers or not configuration.config.enable_backprop:
+        outs = _call_layers(layers, xs)
+        return outs[0] if len(outs) == 1 else outs
+
+    layer_bytes = None
+    if any([param.data is None for param in _collect_params(layers)]):
+        layer_bytes = _measure_layer_bytes(layers, xs)
+    if memory_budget is not None:
+        signature = tuple([(x.shape, x.dtype) for x in xs])
+        cache = _layer_bytes_cache.setdefault(model, {})
+        if layer_bytes is not None:
+            cache[signature] = layer_bytes
+        elif signature in cache:
+            layer_bytes = cache[signature]
+        else:
+            layer_bytes = _measure_layer_bytes(layers, xs)
+            cache[signature] = layer_bytes
+        segments = _split_by_budget(layer_bytes, memory_budget)
+    else:
+        segments = _split_by_count(len(layers), n_segments)
+
+    stored_bytes = 0
+    released_bytes = 0
+    recomputed_layers = 0
+    for start, end in segments[:-1]:
+        segment = layers[start:end]
+        params = _collect_params(segment)
+        checkpoint = Checkpoint(segment, len(xs), params)
+        xs = checkpoint.apply(tuple(xs) + tuple(params))
+        stored_bytes += checkpoint.layer_bytes[-1]
+        released_bytes += sum(checkpoint.layer_bytes[:-1])
+        recomputed_layers += len(segment)
+
+    start, end = segments[-1]
+    last_bytes = []
+    outs = _call_layers(layers[start:end], xs, last_bytes)
+    stored_bytes += sum(last_bytes)
+
+    chainer.report({
+        'checkpoint/n_segments': len(segments),
+        'checkpoint/stored_bytes': stored_bytes,
+        'checkpoint/released_bytes': released_bytes,
+        'checkpoint/recomputed_layers': recomputed_layers,
+    })
+    return outs[0] if len(outs) == 1 else outs
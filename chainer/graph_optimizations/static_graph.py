@@ -0,0 +1,566 @@
+import collections
+import functools
+import weakref
+
+import six
+
+import chainer
+from chainer.backends import cuda
+from chainer import configuration
+from chainer import function
+from chainer import function_node
+from chainer import link
+from chainer import variable
+
+
+_function_node_slots = tuple([
+    name for name in function_node.FunctionNode.__slots__
+    if name not in ('__dict__', '__weakref__')])
+
+
+class _Uncapturable(Exception):
+    pass
+
+
+def _get_recorder():
+    return getattr(chainer._thread_local, 'static_graph_recorder', None)
+
+
+def _set_recorder(recorder):
+    chainer._thread_local.static_graph_recorder = recorder
+
+
+def _array_signature(x):
+    if isinstance(x, variable.Variable):
+        data = x.data
+        requires_grad = x.requires_grad
+    else:
+        data = x
+        requires_grad = False
+    if isinstance(data, cuda.ndarray):
+        device = data.device.id
+    else:
+        device = -1
+    return type(data), data.shape, data.dtype, device, requires_grad
+
+
+def _is_array(x):
+    return isinstance(x, chainer.get_array_types())
+
+
+def _shallow_copy(obj):
+    # Faster equivalent of copy.copy for plain objects and function nodes
+    new_obj = object.__new__(type(obj))
+    if isinstance(obj, function_node.FunctionNode):
+        for name in _function_node_slots:
+            setattr(new_obj, name, getattr(obj, name))
+    new_obj.__dict__.update(obj.__dict__)
+    return new_obj
+
+
+def _copy_node(node):
+    # Each replay runs on fresh shallow copies of the recorded nodes because
+    # forward implementations store per-call state (masks, statistics, ...)
+    # as attributes of the node.
+    new_node = _shallow_copy(node)
+    if isinstance(node, function.FunctionAdapter):
+        new_function = _shallow_copy(node._function)
+        new_function._node = weakref.ref(new_node)
+        new_function._owned_node = None
+        new_node._function = new_function
+    new_node.lazy_grad_sum = False
+    return new_node
+
+
+def _make_template(node):
+    # The recorded node is still a part of the graph built by the recording
+    # call, so a detached copy is kept instead.
+    template = _copy_node(node)
+    template.inputs = None
+    template.outputs = None
+    template._retained_output_data = None
+    return template
+
+
+class _ReplayVariableNode(object):
+
+    """Minimal stand-in of :class:`~chainer.variable.VariableNode`.
+
+    It is used as an input or output node of a replayed function node while
+    running its backward computation.
+
+    """
+
+    __slots__ = ('data', 'dtype', 'shape', '__weakref__')
+
+    creator = None
+    creator_node = None
+    requires_grad = True
+
+    def __init__(self, data, dtype, shape):
+        self.data = data
+        self.dtype = dtype
+        self.shape = shape
+
+    def get_variable(self):
+        return variable.Variable(self.data, requires_grad=False)
+
+    def get_variable_or_none(self):
+        return None
+
+
+class _Recorder(object):
+
+    """Collects function applications while a static graph is captured."""
+
+    def __init__(self):
+        self.steps = []
+        self.n_slots = 0
+        self.arg_slots = []
+        self.external_slots = []
+        self.externals = []
+        self._node_slots = {}
+        self._array_slots = {}
+        # Keeps the recorded objects alive so that their ids are not reused
+        # while recording.
+        self._keep = []
+        self.error = None
+
+    def _new_slot(self):
+        slot = self.n_slots
+        self.n_slots += 1
+        return slot
+
+    def add_argument(self, x):
+        slot = self._new_slot()
+        self.arg_slots.append(slot)
+        if isinstance(x, variable.Variable):
+            self._node_slots[x.node] = slot
+            self._array_slots[id(x.data)] = slot
+        else:
+            self._array_slots[id(x)] = slot
+        self._keep.append(x)
+
+    def forward(self, node, in_data):
+        # Function applications inside ``forward`` are not a part of the graph
+        _set_recorder(None)
+        try:
+            return node.forward(in_data)
+        finally:
+            _set_recorder(self)
+
+    def record(self, node, input_vars, outputs):
+        if self.error is not None:
+            return
+        try:
+            self._record(node, input_vars, outputs)
+        except _Uncapturable as e:
+            self.error = str(e)
+
+    def _record(self, node, input_vars, outputs):
+        if node._n_local_function_hooks != 0:
+            raise _Uncapturable(
+                '{} has local function hooks'.format(node.label))
+
+        in_slots = []
+        target_input_indexes = []
+        for i, x in enumerate(input_vars):
+            slot = self._node_slots.get(x.node)
+            detached = False
+            if slot is None:
+                if x.creator_node is not None:
+                    raise _Uncapturable(
+                        'an input of {} is computed outside of the static '
+                        'graph'.format(node.label))
+                slot = self._array_slots.get(id(x.data))
+                if slot is None:
+                    if (x.requires_grad and
+                            not isinstance(x, variable.Parameter)):
+                        raise _Uncapturable(
+                            'an input of {} is a variable created outside of '
+                            'the static graph'.format(node.label))
+                    # Parameters and constants are captured by reference
+                    slot = self._new_slot()
+                    self.external_slots.append(slot)
+                    self.externals.append(x)
+                    self._node_slots[x.node] = slot
+                else:
+                    # The array of a captured value is used directly, so the
+                    # gradient must not flow through this edge.
+                    detached = True
+            in_slots.append(slot)
+            if x.requires_grad and not detached:
+                target_input_indexes.append(i)
+
+        out_slots = []
+        for y in outputs:
+            slot = self._new_slot()
+            self._node_slots[y.node] = slot
+            self._array_slots[id(y.data)] = slot
+            out_slots.append(slot)
+
+        self._keep.append(input_vars)
+        self._keep.append(outputs)
+        self.steps.append((node, tuple(in_slots), tuple(out_slots),
+                           tuple(target_input_indexes)))
+
+    def output_slot(self, y):
+        if not isinstance(y, variable.Variable):
+            raise _Uncapturable(
+                'the static graph must return variables, not {}'.format(
+                    type(y)))
+        slot = self._node_slots.get(y.node)
+        if slot is None:
+            raise _Uncapturable(
+                'an output variable is not computed in the static graph')
+        return slot
+
+
+class _StaticGraphPlan(object):
+
+    """Replayable sequence of function nodes of a captured graph."""
+
+    def __init__(self, recorder, output_slots, output_type):
+        # Renumber slots so that the arguments come first, followed by the
+        # externally captured variables and the intermediate values.
+        remap = {}
+        for slot in recorder.arg_slots + recorder.external_slots:
+            remap[slot] = len(remap)
+        for _, _, out_slots, _ in recorder.steps:
+            for slot in out_slots:
+                remap[slot] = len(remap)
+
+        self.n_arguments = len(recorder.arg_slots)
+        self.externals = tuple(recorder.externals)
+        self.n_inputs = self.n_arguments + len(self.externals)
+        self.n_slots = len(remap)
+        self.output_slots = tuple([remap[s] for s in output_slots])
+        self.output_type = output_type
+
+        steps = [(_make_template(node), tuple([remap[s] for s in in_slots]),
+                  tuple([remap[s] for s in out_slots]), target)
+                 for node, in_slots, out_slots, target in recorder.steps]
+
+        # Liveness analysis to release intermediate arrays as early as
+        # possible during the replayed forward computation.
+        last_use = {}
+        for i, (_, in_slots, out_slots, _) in enumerate(steps):
+            for slot in in_slots + out_slots:
+                last_use[slot] = i
+        outputs = set(self.output_slots)
+        free_slots = [[] for _ in steps]
+        for slot, i in six.iteritems(last_use):
+            if slot >= self.n_inputs and slot not in outputs:
+                free_slots[i].append(slot)
+
+        self.steps = tuple([
+            (node, in_slots, out_slots, target, tuple(free))
+            for (node, in_slots, out_slots, target), free
+            in six.moves.zip(steps, free_slots)])
+        self.external_signature = tuple(
+            [x.requires_grad for x in self.externals])
+
+    def is_valid(self):
+        return self.external_signature == tuple(
+            [x.requires_grad for x in self.externals])
+
+    def replay(self, args, label):
+        inputs = tuple(args) + self.externals
+        ys = StaticGraphFunction(self, label).apply(inputs)
+        if self.output_type is None:
+            return ys[0]
+        return self.output_type(ys)
+
+
+class StaticGraphFunction(function_node.FunctionNode):
+
+    """Function node that replays a captured static graph.
+
+    The whole captured graph is represented by a single node of the
+    computational graph, which avoids constructing variables and nodes for
+    every intermediate value.
+
+    """
+
+    def __init__(self, plan, label):
+        self._plan = plan
+        self._label = label
+        self._states = None
+
+    @property
+    def label(self):
+        return 'StaticGraph({})'.format(self._label)
+
+    def forward(self, inputs):
+        plan = self._plan
+        values = list(inputs)
+        values.extend([None] * (plan.n_slots - plan.n_inputs))
+        retain = configuration.config.enable_backprop
+        states = []
+
+        for template, in_slots, out_slots, _, free_slots in plan.steps:
+            node = _copy_node(template)
+            in_data = tuple([values[s] for s in in_slots])
+            node._input_indexes_to_retain = None
+            node._output_indexes_to_retain = None
+            outputs = node.forward(in_data)
+            for slot, y in six.moves.zip(out_slots, outputs):
+                values[slot] = y
+
+            if retain:
+                input_nodes = [_ReplayVariableNode(None, x.dtype, x.shape)
+                               for x in in_data]
+                if node._input_indexes_to_retain is not None:
+                    for index in node._input_indexes_to_retain:
+                        input_nodes[index].data = in_data[index]
+                output_nodes = [_ReplayVariableNode(None, y.dtype, y.shape)
+                                for y in outputs]
+                if node._output_indexes_to_retain is not None:
+                    for index in node._output_indexes_to_retain:
+                        output_nodes[index].data = outputs[index]
+                    node._retained_output_data = tuple(
+                        [outputs[index]
+                         for index in node._output_indexes_to_retain])
+                states.append((node, tuple(input_nodes), output_nodes))
+
+            for slot in free_slots:
+                values[slot] = None
+
+        if retain:
+            self._states = states
+        return tuple([values[s] for s in plan.output_slots])
+
+    def backward(self, target_input_indexes, grad_outputs):
+        if configuration.config.enable_backprop:
+            raise RuntimeError(
+                'double backprop is not supported by static graphs')
+
+        plan = self._plan
+        grads = {}
+        for slot, gy in six.moves.zip(plan.output_slots, grad_outputs):
+            if gy is None:
+                continue
+            cur = grads.get(slot)
+            grads[slot] = gy if cur is None else gy + cur
+
+        for (_, in_slots, out_slots, target, _), (
+                node, input_nodes, output_nodes) in zip(
+                    reversed(plan.steps), reversed(self._states)):
+            gys = tuple([grads.pop(s, None) for s in out_slots])
+            if not target or all([gy is None for gy in gys]):
+                continue
+
+            node.inputs = input_nodes
+            node.outputs = tuple([weakref.ref(y) for y in output_nodes])
+
+            gxs = []
+            selected = set()
+            for i in target:
+                slot = in_slots[i]
+                if slot in selected:
+                    gxs.append(None)
+                else:
+                    gxs.append(grads.get(slot))
+                    selected.add(slot)
+
+            new_gxs = node.backward_accumulate(target, gys, tuple(gxs))
+
+            selected = set()
+            for i, gx in six.moves.zip(target, new_gxs):
+                if gx is None:
+                    continue
+                slot = in_slots[i]
+                if slot in selected:
+                    cur = grads.get(slot)
+                    if cur is not None:
+                        gx = gx + cur
+                else:
+                    selected.add(slot)
+                grads[slot] = gx
+
+        return tuple([grads.get(i) for i in target_input_indexes])
+
+
+class _StaticGraph(object):
+
+    def __init__(self, func, max_plans):
+        self._func = func
+        self._label = getattr(func, '__name__', type(func).__name__)
+        self._max_plans = max_plans
+        self._plans = collections.OrderedDict()
+        self._link_plans = weakref.WeakKeyDictionary()
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return functools.partial(self.__call__, obj)
+
+    def _get_plans(self, owner):
+        if owner is None:
+            return self._plans
+        plans = self._link_plans.get(owner)
+        if plans is None:
+            plans = collections.OrderedDict()
+            self._link_plans[owner] = plans
+        return plans
+
+    def __call__(self, *args, **kwargs):
+        func = self._func
+        if (_get_recorder() is not None or chainer.is_debug() or
+                chainer.get_function_hooks()):
+            return func(*args, **kwargs)
+
+        owner = None
+        array_args = args
+        if args and isinstance(args[0], link.Link):
+            owner = args[0]
+            array_args = args[1:]
+
+        signature = []
+        for x in array_args:
+            if isinstance(x, variable.Variable) or _is_array(x):
+                signature.append(_array_signature(x))
+            else:
+                signature.append(x)
+        config = configuration.config
+        key = (tuple(signature), tuple(sorted(kwargs.items())),
+               bool(config.train), bool(config.enable_backprop), config.dtype)
+        try:
+            plans = self._get_plans(owner)
+            plan = plans.pop(key, False)
+        except TypeError:
+            # Unhashable arguments
+            return func(*args, **kwargs)
+        if plan is not False:
+            # Mark the plan as the most recently used one
+            plans[key] = plan
+
+        if plan is None:
+            return func(*args, **kwargs)
+        if plan is not False and plan.is_valid():
+            return plan.replay(
+                [x for x in array_args
+                 if isinstance(x, variable.Variable) or _is_array(x)],
+                self._label)
+
+        recorder = _Recorder()
+        for x in array_args:
+            if isinstance(x, variable.Variable) or _is_array(x):
+                recorder.add_argument(x)
+        _set_recorder(recorder)
+        try:
+            ret = func(*args, **kwargs)
+        finally:
+            _set_recorder(None)
+
+        plans[key] = self._build_plan(recorder, ret)
+        while len(plans) > self._max_plans:
+            # Evict the least recently used plan with its buffers
+            plans.popitem(last=False)
+        return ret
+
+    def _build_plan(self, recorder, ret):
+        if isinstance(ret, (tuple, list)):
+            output_type = type(ret)
+            outputs = ret
+        else:
+            output_type = None
+            outputs = ret,
+        try:
+            if recorder.error is not None:
+                raise _Uncapturable(recorder.error)
+            output_slots = [recorder.output_slot(y) for y in outputs]
+        except _Uncapturable:
+            return None
+        return _StaticGraphPlan(recorder, output_slots, output_type)
+
+
+def static_graph(func=None, max_plans=8):
+    """Decorator to capture a computational graph once and replay it.
+
+    A function (or a method of :class:`~chainer.Link`) decorated by this
+    decorator is executed normally at the first call for each *input
+    signature*, while all function applications are recorded. Subsequent
+    calls with the same signature do not run the Python code of the function;
+    instead, the recorded :class:`~chainer.FunctionNode` objects are replayed
+    directly on the new input arrays. The replayed computation is represented
+    by a single node of the computational graph, so the per-iteration Python
+    overhead of creating variables, variable nodes, weak references and
+    running type checks and the heap-based ordering of backprop are skipped.
+
+    The input signature consists of the types, shapes, dtypes, devices and
+    ``requires_grad`` flags of the array and variable arguments, the values
+    of the other arguments, and the ``train``, ``enable_backprop`` and
+    ``dtype`` configurations. When the decorated object is a method of a
+    link, the captured graphs are kept separately for each link instance.
+    At most ``max_plans`` captured graphs are kept (per link instance) in the
+    least-recently-used order, since each of them holds the buffers of its
+    intermediate arrays; when inputs of many different shapes are given
+    (e.g., variable-length sequences), the least recently used graph is
+    discarded and captured again when its signature appears next time.
+
+    Parameters used in the function are captured by reference, so the
+    replayed graph always reads their latest values and accumulates their
+    gradients as usual. The recording falls back to normal execution (and the
+    function keeps being executed normally for the signature) when the graph
+    cannot be captured, e.g., when an input of a function is a variable
+    computed or created outside of the decorated function, or the function
+    does not return variables. Normal execution is also used while function
+    hooks are registered, in debug mode, and inside another static graph.
+
+    .. admonition:: Example
+
+       >>> class MLP(chainer.Chain):
+       ...     def __init__(self):
+       ...         super(MLP, self).__init__()
+       ...         with self.init_scope():
+       ...             self.l1 = L.Linear(3, 4)
+       ...             self.l2 = L.Linear(4, 2)
+       ...
+       ...     @chainer.static_graph
+       ...     def __call__(self, x):
+       ...         return self.l2(F.relu(self.l1(x)))
+       ...
+       >>> model = MLP()
+       >>> x = np.ones((5, 3), np.float32)
+       >>> y = model(x)  # recorded
+       >>> y = model(x)  # replayed
+
+    .. note::
+
+       The replayed graph only reproduces what is computed by function nodes.
+       Python-side effects of the decorated function (e.g., reporting values,
+       updating attributes of links) happen only at the recording call.
+       Control flow must depend only on the input signature, and arrays
+       created in the function outside of function nodes are treated as
+       constants. Stateful links such as :class:`~chainer.links.LSTM` must
+       be replaced by their stateless variants, to which the states are
+       passed explicitly as arguments.
+
+    .. note::
+
+       Double backprop through a replayed graph is not supported.
+
+    .. warning::
+
+       This feature is experimental. The interface can change in the future.
+
+    Args:
+        func (callable): Function or method to capture. It must return a
+            :class:`~chainer.Variable` or a tuple or a list of variables.
+            If it is omitted, this function returns a decorator with the
+            given ``max_plans``, e.g. ``@static_graph(max_plans=2)``.
+        max_plans (int): Maximum number of input signatures whose captured
+            graphs are kept.
+
+    Returns:
+        callable: The wrapped function.
+
+    """
+    if func is None:
+        return functools.partial(static_graph, max_plans=max_plans)
+    if max_plans < 1:
+        raise ValueError('max_plans must be positive')
+    wrapper = _StaticGraph(func, max_plans)
+    functools.update_wrapper(wrapper, func)
+    return wrapper
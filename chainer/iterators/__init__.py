@@ -1,7 +1,10 @@
 # import classes and functions
+from chainer.iterators.bucket_iterator import BucketIterator  # NOQA
 from chainer.iterators.multiprocess_iterator import MultiprocessIterator  # NOQA
 from chainer.iterators.multithread_iterator import MultithreadIterator  # NOQA
 from chainer.iterators.serial_iterator import SerialIterator  # NOQA
 
+from chainer.iterators.order_samplers import BucketOrderSampler  # NOQA
 from chainer.iterators.order_samplers import OrderSampler  # NOQA
+from chainer.iterators.order_samplers import ShardedOrderSampler  # NOQA
 from chainer.iterators.order_samplers import ShuffleOrderSampler  # NOQA
@@ -0,0 +1,125 @@
+from __future__ import division
+
+import numpy
+
+from chainer.dataset import example_batch
+from chainer.dataset import iterator
+
+
+class BucketIterator(iterator.Iterator):
+
+    """Dataset iterator that extracts batches of examples of similar lengths.
+
+    This iterator extracts the batches sampled by
+    :class:`~chainer.iterators.BucketOrderSampler`, whose sizes can vary if
+    they are limited by the number of tokens. Unlike
+    :class:`~chainer.iterators.SerialIterator`, a batch never spans two
+    epochs, and the order sampler samples the batches of the next epoch when
+    an epoch finishes. :attr:`current_position` and :attr:`epoch_detail` are
+    measured in the number of the examples extracted in the epoch.
+
+    Args:
+        dataset: Dataset to iterate.
+        order_sampler (~chainer.iterators.BucketOrderSampler): Order sampler
+            that samples the batches of each epoch. The number of the lengths
+            given to the sampler must be the same as the size of the dataset.
+        repeat (bool): If ``True``, it infinitely loops over the dataset.
+            Otherwise, it stops iteration at the end of the first epoch.
+
+    .. admonition:: Example
+
+       >>> lengths = [len(x) for x, t in dataset]  # doctest: +SKIP
+       >>> it = BucketIterator(  # doctest: +SKIP
+       ...     dataset, BucketOrderSampler(lengths, max_tokens=4096))
+
+    """
+
+    def __init__(self, dataset, order_sampler, repeat=True):
+        if len(order_sampler.lengths) != len(dataset):
+            raise ValueError('the number of the lengths does not match the '
+                             'size of the dataset')
+        self.dataset = dataset
+        self.order_sampler = order_sampler
+        self._repeat = repeat
+
+        self.reset()
+
+    def __next__(self):
+        if not self._repeat and self.epoch > 0:
+            raise StopIteration
+
+        self._previous_epoch_detail = self.epoch_detail
+
+        i = self.current_position
+        N = self._epoch_size
+        j = numpy.searchsorted(self._starts, i, side='right')
+        i_end = self._starts[j] if j < len(self._starts) else N
+        indices = self._order[i:i_end]
+
+        if i_end >= N:
+            if self._repeat:
+                self._set_batches(self.order_sampler.sample_batches())
+            self.current_position = 0
+            self.epoch += 1
+            self.is_new_epoch = True
+        else:
+            self.is_new_epoch = False
+            self.current_position = i_end
+
+        return example_batch.get_examples(self.dataset, indices)
+
+    next = __next__
+
+    def _set_batches(self, batches):
+        # The batches are kept as the concatenated indices and the flags of
+        # the first examples of the batches, whose shapes do not change over
+        # the epochs so that they can be deserialized in place.
+        N = self._epoch_size
+        self._order = numpy.empty(N, dtype=numpy.int64)
+        self._batch_starts = numpy.zeros(N, dtype=numpy.bool_)
+        start = 0
+        for batch in batches:
+            self._order[start:start + len(batch)] = batch
+            self._batch_starts[start] = True
+            start += len(batch)
+        if start != N:
+            raise ValueError('the batches do not cover the dataset')
+        self._starts = numpy.flatnonzero(self._batch_starts)
+
+    @property
+    def epoch_detail(self):
+        return self.epoch + self.current_position / self._epoch_size
+
+    @property
+    def previous_epoch_detail(self):
+        if self._previous_epoch_detail < 0:
+            return None
+        return self._previous_epoch_detail
+
+    def serialize(self, serializer):
+        self.current_position = serializer('current_position',
+                                           self.current_position)
+        self.epoch = serializer('epoch', self.epoch)
+        self.is_new_epoch = serializer('is_new_epoch', self.is_new_epoch)
+        serializer('order', self._order)
+        serializer('batch_starts', self._batch_starts)
+        self._previous_epoch_detail = serializer(
+            'previous_epoch_detail', self._previous_epoch_detail)
+        self._starts = numpy.flatnonzero(self._batch_starts)
+
+    def reset(self):
+        self.current_position = 0
+        self.epoch = 0
+        self.is_new_epoch = False
+
+        # use -1 instead of None internally.
+        self._previous_epoch_detail = -1.
+        self._set_batches(self.order_sampler.sample_batches())
+
+    @property
+    def _epoch_size(self):
+        return len(self.dataset)
+
+    @property
+    def repeat(self):
+        return self._repeat
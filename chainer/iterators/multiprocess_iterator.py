@@ -6,10 +6,12 @@ import signal
 import sys
 import threading
 import warnings
+import weakref
 
 import numpy
 import six
 
+from chainer.dataset import example_batch
 from chainer.dataset import iterator
 from chainer.iterators.order_samplers import ShuffleOrderSampler
 
@@ -57,6 +59,28 @@ class MultiprocessIterator(iterator.Iterator):
             This should return the next order. The size of the order
             should remain constant.
             This option cannot be used when ``shuffle`` is not ``None``.
+        collate (bool): If ``True``, the worker processes collate the
+            examples of each batch directly into a ring of batch buffers in
+            shared memory, which is allocated according to the first batch.
+            Each batch is returned as an :class:`~chainer.dataset.ExampleBatch`
+            whose stacked arrays are views of a buffer, so that
+            :func:`~chainer.dataset.concat_examples` uses them without
+            copying. It requires that all examples consist of arrays or
+            scalars of the same shapes and dtypes; batches that do not fit
+            the buffers are returned as usual with a warning. If the first
+            batch does not satisfy it, this option is disabled.
+        n_buffers (int): Number of batch buffers in the ring used if
+            ``collate`` is ``True``. It must be at least ``n_prefetch + 2``,
+            which is the default. The buffer of a batch is reused only after
+            all the arrays viewing it (including the arrays derived from
+            them, e.g. the inputs retained by the computational graph) are
+            deleted, and the prefetch waits while no buffer is free. Hence at
+            most ``n_buffers - 1`` batches can be held when the next batch is
+            retrieved.
+        copy_batches (bool): If ``True``, the stacked arrays of collated
+            batches are copied out of the buffers, which are reused
+            immediately. It allows to hold any number of batches at the cost
+            of a copy of each batch.
 
     """
 
@@ -67,7 +91,8 @@ class MultiprocessIterator(iterator.Iterator):
 
     def __init__(self, dataset, batch_size, repeat=True, shuffle=None,
                  n_processes=None, n_prefetch=1, shared_mem=None,
-                 order_sampler=None):
+                 order_sampler=None, collate=False, n_buffers=None,
+                 copy_batches=False):
         self.dataset = dataset
         self.batch_size = batch_size
         self.repeat = repeat
@@ -76,6 +101,13 @@ class MultiprocessIterator(iterator.Iterator):
         self.n_processes = n_processes or multiprocessing.cpu_count()
         self.n_prefetch = max(n_prefetch, 1)
         self.shared_mem = shared_mem
+        self.collate = collate
+        if n_buffers is None:
+            n_buffers = self.n_prefetch + 2
+        elif n_buffers < self.n_prefetch + 2:
+            raise ValueError('n_buffers must be at least n_prefetch + 2')
+        self.n_buffers = n_buffers
+        self.copy_batches = copy_batches
 
         if self.shuffle is not None:
             if order_sampler is not None:
@@ -98,7 +130,8 @@ class MultiprocessIterator(iterator.Iterator):
             self.dataset, self.batch_size, self.repeat,
             self.n_processes, self.n_prefetch, self.shared_mem,
             self._comm, self.order_sampler,
-            self._interruption_testing)
+            self._interruption_testing, self.collate, self.n_buffers,
+            self.copy_batches)
         # defer launching prefetch thread until creating the worker pool,
         # not to leave a background thread in forked processes.
         self._thread = None
@@ -151,7 +184,9 @@ class MultiprocessIterator(iterator.Iterator):
         other = MultiprocessIterator(
             self.dataset, self.batch_size, self.repeat, shuffle=None,
             n_processes=self.n_processes, n_prefetch=self.n_prefetch,
-            shared_mem=self.shared_mem, order_sampler=self.order_sampler)
+            shared_mem=self.shared_mem, order_sampler=self.order_sampler,
+            collate=self.collate, n_buffers=self.n_buffers,
+            copy_batches=self.copy_batches)
 
         other.current_position = self.current_position
         other.epoch = self.epoch
@@ -181,6 +216,10 @@ class MultiprocessIterator(iterator.Iterator):
             serializer('order', self._order)
         except KeyError:
             serializer('_order', self._order)
+        if self._order is not None and \
+                hasattr(self.order_sampler, 'set_epoch'):
+            # The order of the next epoch is sampled next
+            self.order_sampler.set_epoch(self.epoch + 1)
         try:
             self._previous_epoch_detail = serializer(
                 'previous_epoch_detail', self._previous_epoch_detail)
@@ -206,6 +245,8 @@ class MultiprocessIterator(iterator.Iterator):
         # use -1 instead of None internally.
         self._previous_epoch_detail = -1.
         if self.order_sampler:
+            if hasattr(self.order_sampler, 'set_epoch'):
+                self.order_sampler.set_epoch(0)
             self._order = self.order_sampler(
                 numpy.arange(len(self.dataset)), 0)
         else:
@@ -302,7 +343,8 @@ class _PrefetchLoop(object):
     def __init__(self, dataset, batch_size, repeat,
                  n_processes, n_prefetch, mem_size, comm,
                  order_sampler,
-                 _interruption_testing):
+                 _interruption_testing, collate=False, n_buffers=None,
+                 copy_batches=False):
         self.dataset = dataset
         self.batch_size = batch_size
         self.repeat = repeat
@@ -310,13 +352,20 @@ class _PrefetchLoop(object):
         self.mem_size = mem_size
         self.comm = comm
         self.order_sampler = order_sampler
+        self.collate = collate
+        self.n_buffers = n_buffers
+        self.copy_batches = copy_batches
 
+        self.layout = None
+        self.ring = None
         self._allocate_shared_memory()
         self._pool = None
 
         self._interruption_testing = _interruption_testing
 
     def measure_required(self):
+        if self.collate:
+            return self.layout is None
         return self.mem_size is None
 
     def measure(self):
@@ -328,24 +377,39 @@ class _PrefetchLoop(object):
         if indices is None:  # stop iteration
             batch = None
         else:
-            batch = [self.dataset[idx] for idx in indices]
-            self.mem_size = max(map(_measure, batch))
+            batch = example_batch.get_examples(self.dataset, indices)
+            if self.collate:
+                self.layout = _BatchLayout.create(batch, self.batch_size)
+                if self.layout is None:
+                    warnings.warn(
+                        'The examples cannot be collated in shared memory '
+                        'since they are not arrays or scalars of the same '
+                        'shapes and dtypes. The collate option of '
+                        'MultiprocessIterator is disabled.', UserWarning)
+                    self.collate = False
+            if not self.collate and self.mem_size is None:
+                self.mem_size = max(map(_measure, batch))
             self._allocate_shared_memory()
 
         return batch, self.prefetch_state
 
     def _allocate_shared_memory(self):
-        if self.measure_required():
+        if self.layout is not None:
+            self.mem_bulk = None
+            self.ring = _BufferRing(self.layout, self.n_buffers)
+        elif self.mem_size is None:
             self.mem_bulk = None
         else:
             self.mem_bulk = \
                 sharedctypes.RawArray('b', self.batch_size * self.mem_size)
 
     def launch_thread(self):
+        ring = None if self.ring is None else self.ring.memory
         self._pool = multiprocessing.Pool(
             processes=self.n_processes,
             initializer=_fetch_setup,
-            initargs=(self.dataset, self.mem_size, self.mem_bulk))
+            initargs=(self.dataset, self.mem_size, self.mem_bulk,
+                      self.layout, ring))
         if self._interruption_testing:
             pids = self._pool.map(_report_pid, range(self.n_processes))
             print(' '.join(map(str, pids)))
@@ -376,7 +440,21 @@ class _PrefetchLoop(object):
         if indices is None:  # stop iteration
             batch = None
         else:
-            future = self._pool.map_async(_fetch_run, enumerate(indices))
+            # Each process extracts a chunk of the examples at once by the
+            # bulk retrieval protocol
+            n_chunks = min(self.n_processes, len(indices))
+            chunks = numpy.array_split(numpy.asarray(indices), n_chunks)
+            offsets = numpy.cumsum([0] + [len(c) for c in chunks[:-1]])
+            if self.ring is None:
+                slot = None
+            else:
+                slot = self._acquire_buffer()
+                if slot is None:
+                    return False  # terminated
+            future = self._pool.map_async(
+                _fetch_run,
+                [(slot, offset, chunk) for offset, chunk
+                 in six.moves.zip(offsets.tolist(), chunks)])
             while True:
                 try:
                     data_all = future.get(_response_time)
@@ -386,11 +464,46 @@ class _PrefetchLoop(object):
                 else:
                     break
 
-            batch = [_unpack(data, self.mem_bulk) for data in data_all]
+            if slot is not None:
+                batch = self._collated_batch(
+                    slot, len(indices), offsets, data_all)
+            else:
+                batch = [_unpack(data, self.mem_bulk)
+                         for chunk in data_all for data in chunk]
 
         self.comm.put(batch, self.prefetch_state, reset_count)
         return True
 
+    def _acquire_buffer(self):
+        # Waits until the consumer releases a batch buffer
+        while True:
+            slot = self.ring.acquire(_response_time)
+            if slot is not None:
+                return slot
+            if self.comm.is_terminated:
+                return None
+
+    def _collated_batch(self, slot, n, offsets, data_all):
+        if all([data is None for data in data_all]):
+            return example_batch.ExampleBatch(self.layout.pack(
+                self.ring.get(slot, n, copy=self.copy_batches)))
+
+        # Some chunks could not be collated into the buffer, so the examples
+        # are returned as a list
+        warnings.warn(
+            'The examples do not fit the shared memory allocated by the '
+            'first batch. They are returned without collation.', UserWarning)
+        columns = self.ring.get(slot, n, copy=True)
+        starts = offsets.tolist()
+        stops = starts[1:] + [n]
+        batch = []
+        for start, stop, data in six.moves.zip(starts, stops, data_all):
+            if data is None:
+                data = example_batch.ExampleBatch(self.layout.pack(
+                    [column[start:stop] for column in columns]))
+            batch.extend(data)
+        return batch
+
     def _proceed(self):
         (pos, epoch, is_new_epoch,
             previous_epoch_detail, order) = self.prefetch_state
@@ -444,30 +557,209 @@ class _PrefetchLoop(object):
 _fetch_dataset = None
 _fetch_mem_size = None
 _fetch_mem_bulk = None
+_fetch_layout = None
+_fetch_ring = None
 
 
-def _fetch_setup(dataset, mem_size, mem_bulk):
+def _fetch_setup(dataset, mem_size, mem_bulk, layout=None, ring=None):
     global _fetch_dataset, _fetch_mem_size, _fetch_mem_bulk
+    global _fetch_layout, _fetch_ring
     signal.signal(signal.SIGINT, signal.SIG_IGN)
     _fetch_dataset = dataset
     _fetch_mem_size = mem_size
     _fetch_mem_bulk = mem_bulk
+    _fetch_layout = layout
+    _fetch_ring = ring
 
 
 def _fetch_run(inputs):
-    i, index = inputs
-    data = _fetch_dataset[index]
-    if _fetch_mem_bulk is not None:
+    slot, start, indices = inputs
+    batch = example_batch.get_examples(_fetch_dataset, indices)
+    if slot is not None:
+        # Returns None if the examples are collated into the batch buffer
+        views = _fetch_layout.views(_fetch_ring, slot)
+        if _fetch_layout.collate(batch, views, start):
+            return None
+        return list(batch)
+    if _fetch_mem_bulk is None:
+        return list(batch)
+    packed = []
+    for i, data in enumerate(batch, start):
         offset = i * _fetch_mem_size
         limit = offset + _fetch_mem_size
-        data = _pack(data, _fetch_mem_bulk, offset, limit)
-    return data
+        packed.append(_pack(data, _fetch_mem_bulk, offset, limit))
+    return packed
 
 
 def _report_pid(_):  # for testing
     return multiprocessing.current_process().pid
 
 
+class _BatchLayout(object):
+
+    # Layout of a batch collated in a batch buffer. Each element of the
+    # examples is stacked into an array in the buffer, which are arranged
+    # with the alignment of 64 bytes.
+
+    _alignment = 64
+
+    def __init__(self, keys, specs, batch_size):
+        self.keys = keys
+        self.specs = specs
+        self.batch_size = batch_size
+        self.offsets = []
+        nbytes = 0
+        for shape, dtype in specs:
+            self.offsets.append(nbytes)
+            size = batch_size * int(numpy.prod(shape)) * dtype.itemsize
+            nbytes += -(-size // self._alignment) * self._alignment
+        self.nbytes = max(nbytes, self._alignment)
+
+    @classmethod
+    def create(cls, batch, batch_size):
+        # Returns None if the batch cannot be collated
+        if len(batch) == 0:
+            return None
+        first = batch[0]
+        if isinstance(first, tuple):
+            keys = len(first)
+        elif isinstance(first, dict):
+            keys = sorted(first)
+        else:
+            keys = None
+        layout = cls(keys, [], batch_size)
+        specs = None
+        for example in batch:
+            values = layout.split(example)
+            if values is None:
+                return None
+            spec = [(value.shape, value.dtype) for value in values]
+            if specs is None:
+                specs = spec
+            elif spec != specs:
+                return None
+        return cls(keys, specs, batch_size)
+
+    def split(self, example):
+        # Returns the elements of an example (or the stacked examples) as
+        # arrays, or None if it does not have the structure of the layout
+        keys = self.keys
+        if isinstance(keys, int):
+            if not isinstance(example, tuple) or len(example) != keys:
+                return None
+            values = example
+        elif isinstance(keys, list):
+            if not isinstance(example, dict) or sorted(example) != keys:
+                return None
+            values = [example[key] for key in keys]
+        else:
+            if isinstance(example, (tuple, dict)):
+                return None
+            values = example,
+        if not all([isinstance(value, _collatable_types) for value in values]):
+            return None
+        return [numpy.asarray(value) for value in values]
+
+    def pack(self, columns):
+        if isinstance(self.keys, int):
+            return tuple(columns)
+        elif isinstance(self.keys, list):
+            return dict(six.moves.zip(self.keys, columns))
+        else:
+            return columns[0]
+
+    def views(self, ring, slot):
+        base = slot * self.nbytes
+        return [numpy.frombuffer(
+            ring, dtype, self.batch_size * int(numpy.prod(shape)),
+            base + offset).reshape((self.batch_size,) + shape)
+            for (shape, dtype), offset in six.moves.zip(
+                self.specs, self.offsets)]
+
+    def collate(self, batch, views, start):
+        # Copies the examples to the views from the start position, and
+        # returns whether they fit the layout
+        stop = start + len(batch)
+        if stop > self.batch_size:
+            return False
+        columns = getattr(batch, 'columns', None)
+        if columns is not None:
+            columns = self.split(columns)
+        if columns is not None and all([
+                column.shape[1:] == view.shape[1:] and
+                column.dtype == view.dtype
+                for column, view in six.moves.zip(columns, views)]):
+            for column, view in six.moves.zip(columns, views):
+                view[start:stop] = column
+            return True
+
+        for i, example in enumerate(batch, start):
+            values = self.split(example)
+            if values is None:
+                return False
+            for value, view in six.moves.zip(values, views):
+                if value.shape != view.shape[1:] or value.dtype != view.dtype:
+                    return False
+                view[i] = value
+        return True
+
+
+class _BufferRing(object):
+
+    # Ring of batch buffers in shared memory. A buffer is handed out to the
+    # prefetch thread, and is released when all the arrays viewing it are
+    # deleted by the consumer.
+
+    def __init__(self, layout, n_buffers):
+        self.layout = layout
+        self.memory = sharedctypes.RawArray('b', n_buffers * layout.nbytes)
+        self._cond = threading.Condition()
+        self._free = list(six.moves.range(n_buffers))
+        self._refs = {}
+
+    def acquire(self, timeout):
+        # Returns None if no buffer is released within the timeout
+        with self._cond:
+            if not self._free:
+                self._cond.wait(timeout)
+            if not self._free:
+                return None
+            return self._free.pop(0)
+
+    def release(self, slot):
+        with self._cond:
+            self._refs.pop(slot, None)
+            self._free.append(slot)
+            self._cond.notify()
+
+    def get(self, slot, n, copy=False):
+        # Returns the stacked arrays of the first n examples in the buffer
+        views = self.layout.views(self.memory, slot)
+        columns = [view[:n] for view in views]
+        if copy or not views:
+            columns = [column.copy() for column in columns]
+            self.release(slot)
+            return columns
+
+        # Any view of the arrays refers to the array created by frombuffer
+        # as its base, so the buffer is in use while the bases are alive
+        remaining = [len(views)]
+
+        def callback(_):
+            with self._cond:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    self.release(slot)
+
+        self._refs[slot] = [weakref.ref(view.base, callback)
+                            for view in views]
+        return columns
+
+
+_collatable_types = (numpy.ndarray, numpy.generic, bool, float) + \
+    six.integer_types
+
+
 class _PackedNdarray(object):
 
     def __init__(self, array, mem, offset):
@@ -1,9 +1,13 @@
 from __future__ import division
+import collections
 from multiprocessing import pool
+import time
 
 import numpy
 import six
 
+from chainer.dataset import convert
+from chainer.dataset import example_batch
 from chainer.dataset import iterator
 from chainer.iterators.order_samplers import ShuffleOrderSampler
 
@@ -17,7 +21,13 @@ class MultithreadIterator(iterator.Iterator):
     module to parallelize the loading.
 
     Note that this iterator effectively prefetches the examples for the next
-    batch asynchronously after the current batch is returned.
+    ``n_prefetch`` batches asynchronously after the current batch is returned.
+    The prefetching continues across the boundaries of epochs if ``repeat``
+    is ``True``.
+
+    The iterator counts how long :meth:`__next__` waits for the worker
+    threads, which is available as :attr:`prefetch_stats`. If it often waits
+    with no batches prefetched, the training is bound by data loading.
 
     This iterator saves ``-1`` instead of ``None`` in snapshots since some
     serializers do not support ``None``.
@@ -39,11 +49,20 @@ class MultithreadIterator(iterator.Iterator):
             This should return the next order. The size of the order
             should remain constant.
             This option cannot be used when ``shuffle`` is not ``None``.
+        n_prefetch (int): Number of batches loaded in advance.
+        collate (bool): If ``True``, each worker thread also stacks the
+            examples it loads into arrays, and each batch is returned as an
+            :class:`~chainer.dataset.ExampleBatch` holding the stacked arrays,
+            which :func:`~chainer.dataset.concat_examples` uses without
+            stacking the examples again. Chunks of examples that cannot be
+            stacked, e.g. arrays of different shapes, are returned as they
+            are.
 
     """
 
     def __init__(self, dataset, batch_size, repeat=True, shuffle=None,
-                 n_threads=1, order_sampler=None):
+                 n_threads=1, order_sampler=None, n_prefetch=1,
+                 collate=False):
         self.dataset = dataset
         self.batch_size = batch_size
         self._repeat = repeat
@@ -67,7 +86,17 @@ class MultithreadIterator(iterator.Iterator):
         self.order_sampler = order_sampler
 
         self.n_threads = n_threads
+        if n_prefetch < 1:
+            raise ValueError('n_prefetch must be a positive integer')
+        self.n_prefetch = n_prefetch
+        self.collate = collate
         self._pool = None
+        self._prefetched = collections.deque()
+
+        self._n_batches = 0
+        self._n_waits = 0
+        self._wait_time = 0.
+        self._queue_depth = 0
 
         self.reset()
 
@@ -76,13 +105,15 @@ class MultithreadIterator(iterator.Iterator):
         self.epoch = 0
         self.is_new_epoch = False
         if self.order_sampler:
+            if hasattr(self.order_sampler, 'set_epoch'):
+                self.order_sampler.set_epoch(0)
             self._order = self.order_sampler(
                 numpy.arange(len(self.dataset)), 0)
         else:
             self._order = None
 
         # reset internal state
-        self._next = None
+        self._prefetched.clear()
         self._previous_epoch_detail = None
 
     def __enter__(self):
@@ -94,7 +125,7 @@ class MultithreadIterator(iterator.Iterator):
     def finalize(self):
         pool = self._pool
 
-        self._next = None
+        self._prefetched.clear()
         self._pool = None
         if pool is not None:
             pool.terminate()
@@ -105,12 +136,12 @@ class MultithreadIterator(iterator.Iterator):
 
         self._previous_epoch_detail = self.epoch_detail
 
-        if self._next is None:
+        if not self._prefetched:
             # load for the first iteration
             self._invoke_prefetch()
 
         batch = self._get()
-        self._invoke_prefetch()  # prefetch for the next iteration
+        self._invoke_prefetch()  # prefetch for the next iterations
         return batch
 
     next = __next__
@@ -123,38 +154,98 @@ class MultithreadIterator(iterator.Iterator):
     def previous_epoch_detail(self):
         return self._previous_epoch_detail
 
+    @property
+    def prefetch_stats(self):
+        """Statistics of the prefetching.
+
+        It is a dictionary of the following values accumulated since the
+        iterator is created or :meth:`reset_prefetch_stats` is called.
+
+        - ``'n_batches'``: Number of batches returned.
+        - ``'n_waits'``: Number of batches waited for, i.e. which had not
+          been loaded yet when they were requested.
+        - ``'wait_time'``: Total time in seconds spent waiting for batches.
+        - ``'mean_queue_depth'``: Average number of batches that had already
+          been loaded when a batch was requested, including the requested
+          one.
+
+        """
+        n = self._n_batches
+        return {
+            'n_batches': n,
+            'n_waits': self._n_waits,
+            'wait_time': self._wait_time,
+            'mean_queue_depth': self._queue_depth / n if n else 0.,
+        }
+
+    def reset_prefetch_stats(self):
+        """Resets the statistics of the prefetching."""
+        self._n_batches = 0
+        self._n_waits = 0
+        self._wait_time = 0.
+        self._queue_depth = 0
+
     def serialize(self, serializer):
         self.current_position = serializer(
             'current_position', self.current_position)
         self.epoch = serializer('epoch', self.epoch)
         self.is_new_epoch = serializer('is_new_epoch', self.is_new_epoch)
         self._order = serializer('_order', self._order)
+        if self._order is not None and \
+                hasattr(self.order_sampler, 'set_epoch'):
+            # The order of the next epoch is sampled next
+            self.order_sampler.set_epoch(self.epoch + 1)
         self._previous_epoch_detail = serializer(
             'previous_epoch_detail', self._previous_epoch_detail)
-        self._next = None
+        self._prefetched.clear()
 
     @staticmethod
     def _read(args):
-        dataset, index = args
-        return dataset[index]
+        dataset, indices, collate = args
+        batch = example_batch.get_examples(dataset, indices)
+        if not collate or getattr(batch, 'columns', None) is not None:
+            return batch
+        try:
+            columns = convert.concat_examples(batch)
+        except (TypeError, ValueError):
+            # The examples cannot be stacked
+            return batch
+        if isinstance(columns, tuple):
+            arrays = columns
+        elif isinstance(columns, dict):
+            arrays = list(six.itervalues(columns))
+        else:
+            arrays = columns,
+        if not all([isinstance(array, numpy.ndarray) and
+                    array.dtype.kind != 'O' for array in arrays]):
+            return batch
+        return example_batch.ExampleBatch(columns)
 
     def _invoke_prefetch(self):
-        assert self._next is None
-        if not self._repeat and self.epoch > 0:
-            return
+        # Keeps n_prefetch batches in flight. Each batch is planned from the
+        # state after the previous prefetched batch, so the prefetching
+        # continues across the boundaries of epochs.
         if self._pool is None:
             self._pool = pool.ThreadPool(self.n_threads)
-        n = self._epoch_size
-        i = self.current_position
-
-        order = self._order
-        args = []
+        while len(self._prefetched) < self.n_prefetch:
+            if self._prefetched:
+                state = self._prefetched[-1][1]
+            else:
+                state = (self.current_position, self.epoch,
+                         self.is_new_epoch, self._order)
+            i, epoch, _, order = state
+            if not self._repeat and epoch > 0:
+                break
+            self._prefetched.append(self._prefetch(i, epoch, order))
+
+    def _prefetch(self, i, epoch, order):
+        n = len(self.dataset) if order is None else len(order)
+        indices = []
         dataset = self.dataset
-        epoch = self.epoch
         is_new_epoch = False
         for _ in six.moves.range(self.batch_size):
             index = i if order is None else order[i]
-            args.append((dataset, index))
+            indices.append(index)
             i += 1
             if i >= n:
                 epoch += 1
@@ -173,19 +264,30 @@ class MultithreadIterator(iterator.Iterator):
                                          'the size of the previous order.')
                     order = new_order
 
-        self._next = self._pool.map_async(MultithreadIterator._read, args)
-        self._next_state = (i, epoch, is_new_epoch, order)
+        # Each thread extracts a chunk of the examples at once by the bulk
+        # retrieval protocol
+        n_chunks = min(self.n_threads, len(indices))
+        args = [(dataset, chunk, self.collate) for chunk in
+                numpy.array_split(numpy.array(indices), n_chunks)]
+        future = self._pool.map_async(MultithreadIterator._read, args)
+        return future, (i, epoch, is_new_epoch, order)
 
     def _get(self):
-        next = self._next
-        while not next.ready():
-            next.wait(0.5)  # To avoid interruption bug in Python2
-
-        batch = [data for data in next.get()]
-        self._next = None
+        self._queue_depth += sum(
+            [future.ready() for future, _ in self._prefetched])
+        next, state = self._prefetched.popleft()
+        if not next.ready():
+            self._n_waits += 1
+            start = time.time()
+            while not next.ready():
+                next.wait(0.5)  # To avoid interruption bug in Python2
+            self._wait_time += time.time() - start
+        self._n_batches += 1
+
+        batch = example_batch.ExampleBatch.concatenate(next.get())
 
         (self.current_position, self.epoch,
-         self.is_new_epoch, self._order) = self._next_state
+         self.is_new_epoch, self._order) = state
         return batch
 
     @property
@@ -57,3 +57,211 @@ class ShuffleOrderSampler(OrderSampler):
 
     def __call__(self, current_order, current_position):
         return self._random.permutation(len(current_order))
+
+
+class BucketOrderSampler(OrderSampler):
+
+    """Sampler that groups examples of similar lengths into batches.
+
+    This sampler is intended for datasets of variable-length sequences. The
+    examples are sorted by their buckets, which are the ranges of lengths of
+    the width ``bucket_width``, and split into batches in the sorted order,
+    so that each batch consists of examples of similar lengths and little
+    computation is wasted on padding. The size of each batch is limited by
+    the number of examples, by the number of tokens after padding, i.e. the
+    number of the examples times the length of the longest one, or by both.
+    If ``shuffle`` is ``True``, the examples are shuffled within each bucket
+    and the batches are shuffled across the buckets every epoch.
+
+    :meth:`sample_batches` returns the batches of an epoch, which are
+    iterated by :class:`~chainer.iterators.BucketIterator`. This sampler can
+    also be used as ``order_sampler`` of the other iterators, which then
+    extract the batches as they are if ``max_tokens`` is not given and
+    ``batch_size`` is the same as that of the iterator.
+
+    Args:
+        lengths (sequence of ints): Lengths of the examples, e.g. the
+            numbers of tokens of the sequences.
+        batch_size (int): Maximum number of examples in each batch.
+        max_tokens (int): Maximum number of tokens in each batch. A batch
+            consists of one example if it alone exceeds the limit.
+        bucket_width (int): Width of the range of lengths in each bucket.
+        shuffle (bool): If ``True``, the examples and the batches are
+            shuffled. Otherwise, the batches are extracted in the order of
+            the lengths.
+        random_state (numpy.random.RandomState): Pseudo-random number
+            generator.
+
+    """
+
+    def __init__(self, lengths, batch_size=None, max_tokens=None,
+                 bucket_width=1, shuffle=True, random_state=None):
+        lengths = numpy.asarray(lengths, dtype=numpy.int64)
+        if lengths.ndim != 1:
+            raise ValueError('lengths must be a 1-D sequence')
+        if batch_size is None and max_tokens is None:
+            raise ValueError('either batch_size or max_tokens must be given')
+        if batch_size is not None and batch_size < 1:
+            raise ValueError('batch_size must be positive')
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError('max_tokens must be positive')
+        if bucket_width < 1:
+            raise ValueError('bucket_width must be positive')
+        if random_state is None:
+            random_state = numpy.random.random.__self__
+        self.lengths = lengths
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.bucket_width = bucket_width
+        self.shuffle = shuffle
+        self._random = random_state
+
+    def __call__(self, current_order, current_position):
+        if len(current_order) != len(self.lengths):
+            raise ValueError('the size of the order does not match the '
+                             'number of the lengths')
+        batches = self.sample_batches()
+        if not batches:
+            return numpy.empty(0, dtype=numpy.intp)
+        return numpy.concatenate(batches)
+
+    def sample_batches(self):
+        """Samples the batches of the next epoch.
+
+        Returns:
+            list of numpy.ndarray:
+            1-D arrays of the indices of the examples in each batch. Every
+            example appears in exactly one batch.
+
+        """
+        n = len(self.lengths)
+        if n == 0:
+            return []
+        buckets = self.lengths // self.bucket_width
+        if self.shuffle:
+            # A stable sort of a random permutation shuffles each bucket
+            order = self._random.permutation(n)
+            order = order[numpy.argsort(buckets[order], kind='mergesort')]
+        else:
+            order = numpy.argsort(buckets, kind='mergesort')
+        batches = numpy.split(order, self._split_points(self.lengths[order]))
+        if self.shuffle:
+            batches = [batches[i]
+                       for i in self._random.permutation(len(batches))]
+        return batches
+
+    def _split_points(self, lengths):
+        batch_size = self.batch_size
+        max_tokens = self.max_tokens
+        if max_tokens is None:
+            return numpy.arange(batch_size, len(lengths), batch_size)
+
+        points = []
+        start = 0
+        longest = 0
+        for i, length in enumerate(lengths.tolist()):
+            longest = max(longest, length)
+            size = i - start + 1
+            if size > 1 and (size * longest > max_tokens or
+                             batch_size is not None and size > batch_size):
+                points.append(i)
+                start = i
+                longest = length
+        return points
+
+
+class ShardedOrderSampler(OrderSampler):
+
+    """Sampler that gives each worker a disjoint shard of a common order.
+
+    This sampler is intended for data-parallel training by multiple
+    processes, each of which has an iterator over the whole dataset. Every
+    epoch, all the samplers generate the same permutation of the dataset from
+    the shared seed and the number of the epoch, and each of them takes a
+    disjoint slice of it determined by ``rank``. The slices of all the
+    workers have the same size, so that the iterators of all the workers
+    have the same ``epoch_detail`` at each iteration. If the size of the
+    dataset is not divisible by ``size``, the permutation is padded with its
+    first examples, or the remainder is dropped if ``drop_remainder`` is
+    ``True``.
+
+    The size of the dataset is taken from the initial order given by the
+    iterator. The number of the epoch is counted by the calls of the sampler,
+    and the built-in iterators set it by :meth:`set_epoch` when they are
+    reset or deserialized.
+
+    >>> order_sampler = chainer.iterators.ShardedOrderSampler(
+    ...     rank, size, seed=0)  # doctest: +SKIP
+    >>> it = chainer.iterators.SerialIterator(
+    ...     dataset, batch_size, order_sampler=order_sampler)  # doctest: +SKIP
+
+    Args:
+        rank (int): Index of the worker, which is in ``[0, size)``.
+        size (int): Number of the workers.
+        seed (int): Seed of the permutations shared by all the workers.
+        shuffle (bool): If ``True``, the dataset is shuffled every epoch.
+            Otherwise, the examples are split in the order of indexes.
+        drop_remainder (bool): If ``True``, the examples that do not fill the
+            shards of all the workers are dropped. Otherwise, some examples
+            are used twice in an epoch to fill the shards.
+
+    """
+
+    def __init__(self, rank, size, seed=0, shuffle=True,
+                 drop_remainder=False):
+        if size < 1:
+            raise ValueError('size must be positive')
+        if not 0 <= rank < size:
+            raise ValueError('rank must be in [0, size)')
+        self.rank = rank
+        self.size = size
+        self.seed = seed
+        self.shuffle = shuffle
+        self.drop_remainder = drop_remainder
+        self.epoch = 0
+        self._dataset_size = None
+
+    def _shard_size(self, n):
+        if self.drop_remainder:
+            return n // self.size
+        return -(-n // self.size)
+
+    def __call__(self, current_order, current_position):
+        n = self._dataset_size
+        if n is None or len(current_order) != self._shard_size(n):
+            # The initial order given by the iterator covers the dataset
+            n = len(current_order)
+            self._dataset_size = n
+        order = self.get_order(self.epoch, n)
+        self.epoch += 1
+        return order
+
+    def get_order(self, epoch, n):
+        """Returns the shard of the worker in an epoch.
+
+        Args:
+            epoch (int): Number of the epoch.
+            n (int): Size of the dataset.
+
+        Returns:
+            numpy.ndarray: 1-D array of the indices in the shard.
+
+        """
+        if self.shuffle:
+            random = numpy.random.RandomState([self.seed, epoch])
+            perm = random.permutation(n)
+        else:
+            perm = numpy.arange(n)
+        total = self._shard_size(n) * self.size
+        if total > n:
+            perm = numpy.resize(perm, total)
+        return perm[self.rank:total:self.size]
+
+    def set_epoch(self, epoch):
+        """Sets the number of the epoch of the order sampled next.
+
+        Args:
+            epoch (int): Number of the epoch.
+
+        """
+        self.epoch = epoch
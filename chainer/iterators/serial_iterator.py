@@ -2,6 +2,7 @@ from __future__ import division
 
 import numpy
 
+from chainer.dataset import example_batch
 from chainer.dataset import iterator
 from chainer.iterators.order_samplers import ShuffleOrderSampler
 
@@ -75,10 +76,7 @@ class SerialIterator(iterator.Iterator):
         i_end = i + self.batch_size
         N = self._epoch_size
 
-        if self._order is None:
-            batch = self.dataset[i:i_end]
-        else:
-            batch = [self.dataset[index] for index in self._order[i:i_end]]
+        parts = [self._get_indices(i, i_end)]
 
         if i_end >= N:
             if self._repeat:
@@ -90,11 +88,7 @@ class SerialIterator(iterator.Iterator):
                                          'the size of the previous order.')
                     self._order = new_order
                 if rest > 0:
-                    if self._order is None:
-                        batch.extend(self.dataset[:rest])
-                    else:
-                        batch.extend([self.dataset[index]
-                                      for index in self._order[:rest]])
+                    parts.append(self._get_indices(0, rest))
                 self.current_position = rest
             else:
                 self.current_position = 0
@@ -105,10 +99,36 @@ class SerialIterator(iterator.Iterator):
             self.is_new_epoch = False
             self.current_position = i_end
 
-        return batch
+        return self._get_examples(parts)
 
     next = __next__
 
+    def _get_indices(self, start, stop):
+        # Returns a slice or an array of the indexes of the examples
+        if self._order is None:
+            return slice(start, stop)
+        return numpy.array(self._order[start:stop])
+
+    def _get_examples(self, parts):
+        dataset = self.dataset
+        if isinstance(parts[0], slice) and \
+                not hasattr(dataset, 'get_examples') and \
+                not isinstance(dataset, numpy.ndarray):
+            batch = dataset[parts[0]]
+            for part in parts[1:]:
+                batch.extend(dataset[part])
+            return batch
+
+        # Extract the examples at once by the bulk retrieval protocol
+        indices = [
+            numpy.arange(*part.indices(len(dataset)))
+            if isinstance(part, slice) else part for part in parts]
+        if len(indices) == 1:
+            indices = indices[0]
+        else:
+            indices = numpy.concatenate(indices)
+        return example_batch.get_examples(dataset, indices)
+
     @property
     def epoch_detail(self):
         return self.epoch + self.current_position / self._epoch_size
@@ -129,6 +149,9 @@ class SerialIterator(iterator.Iterator):
                 serializer('order', self._order)
             except KeyError:
                 serializer('_order', self._order)
+            if hasattr(self.order_sampler, 'set_epoch'):
+                # The order of the next epoch is sampled next
+                self.order_sampler.set_epoch(self.epoch + 1)
         try:
             self._previous_epoch_detail = serializer(
                 'previous_epoch_detail', self._previous_epoch_detail)
@@ -150,6 +173,8 @@ class SerialIterator(iterator.Iterator):
         # use -1 instead of None internally.
         self._previous_epoch_detail = -1.
         if self.order_sampler:
+            if hasattr(self.order_sampler, 'set_epoch'):
+                self.order_sampler.set_epoch(0)
             self._order = self.order_sampler(
                 numpy.arange(len(self.dataset)), 0)
         else:
@@ -36,6 +36,283 @@ def _ensure_shape_dtype(value):
         return value
 
 
+def _is_packable(array):
+    return isinstance(array, (numpy.ndarray, cuda.ndarray))
+
+
+class ParameterArena(object):
+
+    """Contiguous storage of the parameters of a link hierarchy.
+
+    A parameter arena holds the data arrays of all initialized parameters in a
+    link hierarchy in a few flat arrays, one for each combination of the array
+    type, the data type and the device. The data array of each parameter is
+    replaced with a view into the flat array, so that the operations over the
+    whole model can be done by single vectorized operations on the flat
+    arrays. The gradient arrays can also be packed in the same layout.
+
+    The parameters are ordered by their paths in the hierarchy. The
+    parameters of other array types than :class:`numpy.ndarray` and
+    :class:`cupy.ndarray` (e.g. iDeep arrays) are not packed.
+
+    A parameter arena is created by :meth:`Link.pack_params`, and users should
+    get it by :attr:`Link.param_arena`, which packs the parameters again if
+    any parameter has been initialized or replaced since the last packing
+    (e.g. by lazy initialization or :meth:`Link.to_gpu`).
+
+    Attributes:
+        ~ParameterArena.data (list of arrays): Flat arrays that hold the data
+            arrays of the parameters.
+        ~ParameterArena.grad (list of arrays): Flat arrays that hold the
+            gradient arrays of the parameters. It is ``None`` if the gradients
+            are not packed.
+
+    """
+
+    def __init__(self, link, grads=False):
+        self._pack_grads = grads
+        self.pack(link)
+
+    def __getstate__(self):
+        # Copies of the views are not views into the copied flat arrays, so
+        # the copied arena packs the parameters again on the first access.
+        return {'_pack_grads': self._pack_grads}
+
+    def __setstate__(self, state):
+        self._pack_grads = state['_pack_grads']
+        self.data = []
+        self.grad = [] if self._pack_grads else None
+        self._params = []
+        self._paths = []
+        self._param_ids = {}
+        self._locations = []
+        self._data_views = []
+        self._grad_views = []
+
+    def pack(self, link):
+        """Packs the parameters of the link hierarchy into flat arrays.
+
+        The current values of the data and gradient arrays are copied to the
+        new flat arrays.
+
+        Args:
+            link (~chainer.Link): Root of the link hierarchy.
+
+        """
+        named_params = sorted(
+            link.namedparams(include_uninit=False), key=lambda x: x[0])
+        params = [param for _, param in named_params]
+        keys = []
+        sizes = collections.OrderedDict()
+        for param in params:
+            array = param.array
+            if _is_packable(array):
+                key = (type(array), array.dtype,
+                       cuda.get_device_from_array(array).id)
+                sizes[key] = sizes.get(key, 0) + array.size
+            else:
+                key = None
+            keys.append(key)
+
+        group_indexes = {key: i for i, key in enumerate(sizes)}
+        self.data = []
+        self.grad = [] if self._pack_grads else None
+        for key, size in six.iteritems(sizes):
+            xp = numpy if key[0] is numpy.ndarray else cuda.cupy
+            with cuda.get_device_from_id(key[2] if key[2] >= 0 else None):
+                self.data.append(xp.empty(size, dtype=key[1]))
+                if self._pack_grads:
+                    self.grad.append(xp.zeros(size, dtype=key[1]))
+
+        self._params = params
+        self._paths = [path for path, _ in named_params]
+        self._param_ids = {id(param): i for i, param in enumerate(params)}
+        self._locations = []
+        self._data_views = []
+        self._grad_views = []
+        offsets = [0] * len(sizes)
+        for param, key in six.moves.zip(params, keys):
+            if key is None:
+                self._locations.append(None)
+                self._data_views.append(None)
+                self._grad_views.append(None)
+                continue
+            i = group_indexes[key]
+            s = slice(offsets[i], offsets[i] + param.size)
+            offsets[i] = s.stop
+            self._locations.append((i, s))
+
+            shape = param.shape
+            data = self.data[i]
+            with cuda.get_device_from_array(data):
+                data[s] = param.array.ravel()
+                param.array = data[s].reshape(shape)
+                self._data_views.append(param.array)
+                if self._pack_grads:
+                    grad_view = self.grad[i][s].reshape(shape)
+                    if param.grad is not None:
+                        grad_view[...] = param.grad
+                        param.grad = grad_view
+                    # The view is also used as the buffer of in-place gradient
+                    # accumulation in Variable.backward
+                    param._grad_buffer = grad_view
+                    self._grad_views.append(grad_view)
+                else:
+                    self._grad_views.append(None)
+
+    def is_valid(self, link):
+        """Checks if the arena holds all initialized parameters.
+
+        Args:
+            link (~chainer.Link): Root of the link hierarchy.
+
+        Returns:
+            bool: ``False`` if any parameter has been initialized or replaced,
+            or any data array has been replaced since the last packing.
+
+        """
+        n_params = 0
+        param_ids = self._param_ids
+        for param in link.params(include_uninit=False):
+            if id(param) not in param_ids:
+                return False
+            n_params += 1
+        if n_params != len(self._params):
+            return False
+        for param, view in six.moves.zip(self._params, self._data_views):
+            array = param.array
+            if view is None:
+                if _is_packable(array):
+                    return False
+            elif array is not view:
+                return False
+        return True
+
+    def is_packed(self, param):
+        """Returns ``True`` if the given parameter is packed in the arena."""
+        index = self._param_ids.get(id(param))
+        return index is not None and self._locations[index] is not None
+
+    def gather_grads(self, rebind=True):
+        """Makes the gradient arrays of all parameters views into the arena.
+
+        The gradient arrays that are not views into the arena are copied into
+        it, and the gradients of parameters without gradient arrays are filled
+        by zeros. The gradients must be packed.
+
+        Args:
+            rebind (bool): If ``False``, the gradients are only copied into
+                the arena, and the gradient arrays of the parameters are left
+                unchanged. The arena then holds the current gradients only
+                until the next backprop.
+
+        """
+        for param, view in six.moves.zip(self._params, self._grad_views):
+            if view is None:
+                continue
+            grad = param.grad
+            if grad is view:
+                continue
+            with cuda.get_device_from_array(view):
+                if grad is None:
+                    view.fill(0)
+                else:
+                    view[...] = grad
+            if rebind:
+                param.grad = view
+
+    def get_flat_grads(self, link):
+        """Returns the flat gradient arrays if they hold all gradients.
+
+        The gradient arrays are gathered into the arena by
+        :meth:`gather_grads` before returning.
+
+        Args:
+            link (~chainer.Link): Root of the link hierarchy.
+
+        Returns:
+            list of arrays: :attr:`grad` if the gradients are packed and the
+            arena holds all parameters of the link, all of which have
+            gradient arrays. Otherwise ``None``.
+
+        """
+        if self.grad is None:
+            return None
+        for param in link.params():
+            if param.grad is None or not self.is_packed(param):
+                return None
+        self.gather_grads()
+        return self.grad
+
+    def get_runs(self, params):
+        """Splits parameters into runs stored contiguously in the arena.
+
+        Args:
+            params (list of ~chainer.Parameter): Parameters in the arena.
+
+        Returns:
+            list: List of tuples ``(params, data, grad)``, where ``params`` is
+            a list of parameters stored contiguously, and ``data`` and ``grad``
+            are the views of the flat arrays in which they are stored (``grad``
+            is ``None`` if the gradients are not packed). ``None`` is returned
+            if any of the given parameters is not packed.
+
+        """
+        locations = []
+        for param in params:
+            index = self._param_ids.get(id(param))
+            if index is None or self._locations[index] is None:
+                return None
+            locations.append((self._locations[index], param))
+        locations.sort(key=lambda x: (x[0][0], x[0][1].start))
+
+        ret = []
+        start = 0
+        for j in six.moves.range(1, len(locations) + 1):
+            if j < len(locations):
+                (i, s), _ = locations[j]
+                prev_i, prev_s = locations[j - 1][0]
+                if i == prev_i and s.start == prev_s.stop:
+                    continue
+            i, first = locations[start][0]
+            last = locations[j - 1][0][1]
+            run = [param for _, param in locations[start:j]]
+            data = self.data[i][first.start:last.stop]
+            grad = None
+            if self.grad is not None:
+                grad = self.grad[i][first.start:last.stop]
+            ret.append((run, data, grad))
+            start = j
+        return ret
+
+    def is_compatible(self, other):
+        """Checks if another arena has the same layout.
+
+        Args:
+            other (ParameterArena): Another arena.
+
+        Returns:
+            bool: ``True`` if the flat arrays of the arenas correspond to each
+            other in the sizes and the data types, and all the parameters are
+            packed in the same way.
+
+        """
+        if len(self.data) != len(other.data):
+            return False
+        if self._paths != other._paths:
+            return False
+        for a, b in six.moves.zip(self.data, other.data):
+            if a.size != b.size or a.dtype != b.dtype:
+                return False
+        for a, b in six.moves.zip(self._locations, other._locations):
+            if a != b:
+                return False
+        for a, b in six.moves.zip(self._params, other._params):
+            if a.shape != b.shape:
+                return False
+        return True
+
+
 class Link(object):
 
     """Building block of model definitions.
@@ -129,6 +406,8 @@ class Link(object):
 
     """
 
+    _param_arena = None
+
     def __init__(self, **params):
         self._params = set()
         self._persistent = set()
@@ -344,6 +623,8 @@ Assign a Parameter object directly to an attribute within a \
             ret._params = set(self._params)
             ret._persistent = set(self._persistent)
             ret.name = None
+            # The arena is not shared since the parameters are copied
+            ret._param_arena = None
             d = ret.__dict__
             for name in ret._params:
                 d[name] = copy.copy(d[name])
@@ -437,6 +718,78 @@ Assign a Parameter object directly to an attribute within a \
         self._device_id = None
         return self
 
+    def pack_params(self, grads=False):
+        """Packs the parameters of the link hierarchy into contiguous arrays.
+
+        This method creates a :class:`~chainer.link.ParameterArena` that holds
+        the data arrays (and the gradient arrays if ``grads`` is ``True``) of
+        all initialized parameters under the hierarchy in a few flat arrays,
+        and replaces the arrays of the parameters with views into them. Then
+        :meth:`copyparams`, :meth:`addgrads` and :meth:`zerograds` between
+        links with arenas of the same layout run as single vectorized
+        operations, and the arena can be used for operations over the whole
+        model such as computing the norm of the gradients.
+
+        The arena is kept over lazy initialization of parameters and transfers
+        between devices; the parameters are packed again when the arena is
+        accessed via :attr:`param_arena`. The serialization format of the link
+        is not changed.
+
+        When the gradients are packed, the views into the arena are used as
+        the buffers of in-place gradient accumulation (see
+        :meth:`Variable.backward() <chainer.Variable.backward>`). Gradient
+        arrays computed otherwise are copied into the arena by the operations
+        using it.
+
+        Args:
+            grads (bool): If ``True``, the gradient arrays are also packed.
+
+        Returns:
+            ~chainer.link.ParameterArena: The parameter arena.
+
+        """
+        self._param_arena = ParameterArena(self, grads)
+        return self._param_arena
+
+    def unpack_params(self):
+        """Removes the parameter arena.
+
+        The parameters keep the current arrays, which remain views into the
+        flat arrays of the removed arena.
+
+        """
+        self._param_arena = None
+
+    @property
+    def param_arena(self):
+        """Parameter arena created by :meth:`pack_params`.
+
+        The parameters are packed again if any parameter has been initialized
+        or replaced since the last packing. It is ``None`` if the parameters
+        are not packed.
+
+        """
+        arena = self._param_arena
+        if arena is not None and not arena.is_valid(self):
+            arena.pack(self)
+        return arena
+
+    def _get_compatible_arenas(self, link):
+        # Returns the arenas of this link and the given link if they have the
+        # same layout and hold all initialized parameters of them, or None
+        # otherwise. The uninitialized parameters are left untouched as
+        # Parameter.copydata and Parameter.addgrad do when both sides are
+        # uninitialized.
+        if self._param_arena is None or link._param_arena is None:
+            return None
+        dst = self.param_arena
+        src = link.param_arena
+        if not dst.is_compatible(src):
+            return None
+        if None in dst._locations:
+            return None
+        return dst, src
+
     def params(self, include_uninit=True):
         """Returns a generator of all parameters under the link hierarchy.
 
@@ -519,11 +872,33 @@ Assign a Parameter object directly to an attribute within a \
             link (Link): Source link object.
 
         """
+        if not self._copyparams_packed(link):
+            self._copyparams(link)
+
+    def _copyparams(self, link):
+        # Copies the parameters one by one. The arenas are only checked at
+        # the root of the hierarchy by copyparams.
         src = link.__dict__
         dst = self.__dict__
         for name in self._params:
             dst[name].copydata(src[name])
 
+    def _copyparams_packed(self, link):
+        arenas = self._get_compatible_arenas(link)
+        if arenas is None:
+            return False
+        dst_arena, src_arena = arenas
+        for dst, src in six.moves.zip(dst_arena.data, src_arena.data):
+            src_xp = cuda.get_array_module(src)
+            dst_xp = cuda.get_array_module(dst)
+            if dst_xp is src_xp:
+                dst_xp.copyto(dst, src)
+            elif dst_xp is numpy:
+                dst_xp.copyto(dst, src.get())
+            else:
+                dst.set(src)
+        return True
+
     def cleargrads(self):
         """Clears all gradient arrays.
 
@@ -547,8 +922,17 @@ Assign a Parameter object directly to an attribute within a \
         warnings.warn(
             'Link.zerograds is deprecated. Use Link.cleargrads instead.',
             DeprecationWarning)
+        arena = self.param_arena
+        if arena is not None and arena.grad is None:
+            arena = None
+        if arena is not None:
+            arena.gather_grads()
+            for grad in arena.grad:
+                with cuda.get_device_from_array(grad):
+                    grad.fill(0)
         for param in self.params():
-            param.zerograd()
+            if arena is None or not arena.is_packed(param):
+                param.zerograd()
 
     def addgrads(self, link):
         """Accumulates gradient values from given link.
@@ -561,11 +945,38 @@ Assign a Parameter object directly to an attribute within a \
             link (Link): Source link object.
 
         """
+        if not self._addgrads_packed(link):
+            self._addgrads(link)
+
+    def _addgrads(self, link):
+        # Accumulates the gradients one by one. The arenas are only checked at
+        # the root of the hierarchy by addgrads.
         src = link.__dict__
         dst = self.__dict__
         for name in self._params:
             dst[name].addgrad(src[name])
 
+    def _addgrads_packed(self, link):
+        arenas = self._get_compatible_arenas(link)
+        if arenas is None:
+            return False
+        dst_arena, src_arena = arenas
+        if dst_arena.grad is None or src_arena.grad is None:
+            return False
+        dst_arena.gather_grads()
+        # The gradients of the source link are read from its arena without
+        # replacing its gradient arrays.
+        src_arena.gather_grads(rebind=False)
+        for dst, src in six.moves.zip(dst_arena.grad, src_arena.grad):
+            with cuda.get_device_from_array(dst) as dev:
+                if cuda.get_device_from_array(src).id != dev.id:
+                    src = cuda.to_gpu(src, dev.id) if dev.id >= 0 else \
+                        cuda.to_cpu(src)
+                dst += src
+        for dst, src in six.moves.zip(dst_arena._params, src_arena._params):
+            dst._addgrad_sparse(src)
+        return True
+
     def enable_update(self):
         """Enables update rules of all parameters under the link hierarchy.
 
@@ -933,19 +1344,19 @@ Assign a Link object directly to an attribute within a \
         for name in self._children:
             yield d[name]
 
-    def copyparams(self, link):
-        super(Chain, self).copyparams(link)
+    def _copyparams(self, link):
+        super(Chain, self)._copyparams(link)
         src = link.__dict__
         dst = self.__dict__
         for name in self._children:
-            dst[name].copyparams(src[name])
+            dst[name]._copyparams(src[name])
 
-    def addgrads(self, link):
-        super(Chain, self).addgrads(link)
+    def _addgrads(self, link):
+        super(Chain, self)._addgrads(link)
         src = link.__dict__
         dst = self.__dict__
         for name in self._children:
-            dst[name].addgrads(src[name])
+            dst[name]._addgrads(src[name])
 
     def serialize(self, serializer):
         super(Chain, self).serialize(serializer)
@@ -1116,15 +1527,15 @@ class ChainList(Link, collections.MutableSequence):
         for child in self._children:
             yield child
 
-    def copyparams(self, link):
-        super(ChainList, self).copyparams(link)
+    def _copyparams(self, link):
+        super(ChainList, self)._copyparams(link)
         for idx, child in enumerate(self._children):
-            child.copyparams(link[idx])
+            child._copyparams(link[idx])
 
-    def addgrads(self, link):
-        super(ChainList, self).addgrads(link)
+    def _addgrads(self, link):
+        super(ChainList, self)._addgrads(link)
         for idx, child in enumerate(self._children):
-            child.addgrads(link[idx])
+            child._addgrads(link[idx])
 
     def serialize(self, serializer):
         super(ChainList, self).serialize(serializer)
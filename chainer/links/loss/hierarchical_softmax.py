@@ -1,4 +1,5 @@
 import copy
+import heapq
 
 import numpy
 import six
@@ -7,6 +8,7 @@ from chainer.backends import cuda
 from chainer import function
 from chainer.initializers import uniform
 from chainer import link
+from chainer.utils import sparse
 from chainer.utils import type_check
 from chainer import variable
 
@@ -20,45 +22,73 @@ class TreeParser(object):
         return self.next_id
 
     def get_paths(self):
-        return self.paths
+        return {leaf: self.flat_paths[begin:end]
+                for leaf, (begin, end) in six.iteritems(self.leaves)}
 
     def get_codes(self):
-        return self.codes
+        return {leaf: self.flat_codes[begin:end]
+                for leaf, (begin, end) in six.iteritems(self.leaves)}
 
     def parse(self, tree):
         self.next_id = 0
-        self.path = []
-        self.code = []
-        self.paths = {}
-        self.codes = {}
-        self._parse(tree)
-
-        assert(len(self.path) == 0)
-        assert(len(self.code) == 0)
-        assert(len(self.paths) == len(self.codes))
-
-    def _parse(self, node):
-        if isinstance(node, tuple):
-            # internal node
-            if len(node) != 2:
-                raise ValueError(
-                    'All internal nodes must have two child nodes')
-            left, right = node
-            self.path.append(self.next_id)
-            self.next_id += 1
-            self.code.append(1.0)
-            self._parse(left)
-
-            self.code[-1] = -1.0
-            self._parse(right)
-
-            self.path.pop()
-            self.code.pop()
-
-        else:
-            # leaf node
-            self.paths[node] = numpy.array(self.path, dtype=numpy.int32)
-            self.codes[node] = numpy.array(self.code, dtype=numpy.float32)
+
+        # The tree is traversed in pre-order with an explicit stack instead of
+        # recursion, since a tree of a large vocabulary can be too deep for
+        # the recursion limit. It records the parent of each node and the
+        # code of the edge from the parent, where the internal nodes are
+        # numbered in pre-order.
+        parents = []
+        codes = []
+        leaves = []
+        leaf_parents = []
+        leaf_codes = []
+        leaf_depths = []
+        stack = [(tree, -1, 0.0, 0)]
+        while stack:
+            node, parent, code, depth = stack.pop()
+            if isinstance(node, tuple):
+                # internal node
+                if len(node) != 2:
+                    raise ValueError(
+                        'All internal nodes must have two child nodes')
+                left, right = node
+                node_id = self.next_id
+                self.next_id += 1
+                parents.append(parent)
+                codes.append(code)
+                stack.append((right, node_id, -1.0, depth + 1))
+                stack.append((left, node_id, 1.0, depth + 1))
+
+            else:
+                # leaf node
+                leaves.append(node)
+                leaf_parents.append(parent)
+                leaf_codes.append(code)
+                leaf_depths.append(depth)
+
+        # The paths of the leaves are concatenated in pre-order into
+        # flat_paths and flat_codes. They are filled from the leaves toward
+        # the root, one level at a time for all the leaves.
+        parents = numpy.array(parents, dtype=numpy.int32)
+        codes = numpy.array(codes, dtype=numpy.float32)
+        ends = numpy.cumsum(leaf_depths, dtype=numpy.int64)
+        self.flat_paths = numpy.empty((ends[-1],), dtype=numpy.int32)
+        self.flat_codes = numpy.empty((ends[-1],), dtype=numpy.float32)
+        node = numpy.array(leaf_parents, dtype=numpy.int32)
+        code = numpy.array(leaf_codes, dtype=numpy.float32)
+        position = ends - 1
+        while len(node) > 0:
+            keep = node >= 0
+            node, code, position = node[keep], code[keep], position[keep]
+            self.flat_paths[position] = node
+            self.flat_codes[position] = code
+            code = codes[node]
+            node = parents[node]
+            position -= 1
+
+        begins = ends - leaf_depths
+        self.leaves = dict(six.moves.zip(
+            leaves, six.moves.zip(begins.tolist(), ends.tolist())))
 
 
 class BinaryHierarchicalSoftmaxFunction(function.Function):
@@ -80,19 +110,24 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
     def __init__(self, tree):
         parser = TreeParser()
         parser.parse(tree)
-        paths = parser.get_paths()
-        codes = parser.get_codes()
-        n_vocab = max(paths.keys()) + 1
-
-        self.paths = numpy.concatenate(
-            [paths[i] for i in range(n_vocab) if i in paths])
-        self.codes = numpy.concatenate(
-            [codes[i] for i in range(n_vocab) if i in codes])
-        begins = numpy.empty((n_vocab + 1,), dtype=numpy.int32)
-        begins[0] = 0
-        for i in range(0, n_vocab):
-            length = len(paths[i]) if i in paths else 0
-            begins[i + 1] = begins[i] + length
+        leaves = numpy.array(list(parser.leaves.keys()), dtype=numpy.int64)
+        bounds = numpy.array(list(parser.leaves.values()),
+                             dtype=numpy.int64).reshape(-1, 2)
+        n_vocab = leaves.max() + 1
+
+        # Rearranges the paths in the order of the leaves
+        order = numpy.argsort(leaves)
+        leaves = leaves[order]
+        src_begins = bounds[order, 0]
+        lengths = bounds[order, 1] - src_begins
+        begins = numpy.zeros((n_vocab + 1,), dtype=numpy.int32)
+        begins[leaves + 1] = lengths
+        numpy.cumsum(begins, out=begins)
+        dst_begins = begins[leaves]
+        indices = numpy.arange(lengths.sum()) + numpy.repeat(
+            src_begins - dst_begins, lengths)
+        self.paths = parser.flat_paths[indices]
+        self.codes = parser.flat_codes[indices]
         self.begins = begins
 
         self.parser_size = parser.size()
@@ -124,45 +159,57 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
         self.codes = cuda.to_cpu(self.codes)
         self.begins = cuda.to_cpu(self.begins)
 
+    def _flatten_paths(self, t):
+        # Flattens the pairs of the examples and the nodes on their paths.
+        # Returns the example of each pair, the position of each pair in
+        # ``paths`` and ``codes``, and the offsets of the pairs of each
+        # example.
+        begins = self.begins[t]
+        lengths = self.begins[t + 1] - begins
+        offsets = numpy.zeros((len(t) + 1,), dtype=numpy.int64)
+        numpy.cumsum(lengths, out=offsets[1:])
+        examples = numpy.repeat(numpy.arange(len(t)), lengths)
+        positions = numpy.arange(offsets[-1]) + numpy.repeat(
+            begins - offsets[:-1], lengths)
+        return examples, positions, offsets
+
     def forward_cpu(self, inputs):
         x, t, W = inputs
 
-        loss = numpy.float32(0.0)
-        for ix, it in six.moves.zip(x, t):
-            loss += self._forward_cpu_one(ix, it, W)
-        return numpy.array(loss),
-
-    def _forward_cpu_one(self, x, t, W):
-        begin = self.begins[t]
-        end = self.begins[t + 1]
-
-        w = W[self.paths[begin:end]]
-        wxy = w.dot(x) * self.codes[begin:end]
+        examples, positions, offsets = self._flatten_paths(t)
+        w = W[self.paths[positions]]
+        wxy = numpy.einsum('ij,ij->i', w, x[examples])
+        wxy *= self.codes[positions]
         loss = numpy.logaddexp(0.0, -wxy)  # == log(1 + exp(-wxy))
-        return numpy.sum(loss)
+
+        self._paths_cpu = examples, positions, offsets
+        self.wxy = wxy
+        return numpy.array(loss.sum(), dtype=numpy.float32),
 
     def backward_cpu(self, inputs, grad_outputs):
         x, t, W = inputs
         gloss, = grad_outputs
-        gx = numpy.empty_like(x)
-        gW = numpy.zeros_like(W)
-        for i, (ix, it) in enumerate(six.moves.zip(x, t)):
-            gx[i] = self._backward_cpu_one(ix, it, W, gloss, gW)
+        examples, positions, offsets = self._paths_cpu
+
+        nodes = self.paths[positions]
+        codes = self.codes[positions]
+        g = -gloss * codes / (1.0 + numpy.exp(self.wxy))
+        g = g.astype(numpy.float32, copy=False)[:, None]
+
+        # The gradients of the pairs are summed up for each example, whose
+        # pairs are contiguous, and for each node by a segment sum
+        gx = numpy.zeros_like(x)
+        if len(nodes) > 0:
+            nonempty = offsets[:-1] != offsets[1:]
+            gx[nonempty] = numpy.add.reduceat(
+                g * W[nodes], offsets[:-1][nonempty], axis=0)
+        # Only the pages of the rows written are touched unlike zeros_like
+        gW = numpy.zeros(W.shape, dtype=W.dtype)
+        grad = sparse.RowSparseArray(
+            nodes, g * x[examples], W.shape).coalesce()
+        gW[grad.rows] = grad.values
         return gx, None, gW
 
-    def _backward_cpu_one(self, x, t, W, gloss, gW):
-        begin = self.begins[t]
-        end = self.begins[t + 1]
-
-        path = self.paths[begin:end]
-        w = W[path]
-        wxy = w.dot(x) * self.codes[begin:end]
-        g = -gloss * self.codes[begin:end] / (1.0 + numpy.exp(wxy))
-        gx = g.dot(w)
-        gw = g.reshape((g.shape[0], 1)).dot(x.reshape(1, x.shape[0]))
-        gW[path] += gw
-        return gx
-
     def forward_gpu(self, inputs):
         x, t, W = inputs
         max_length = cuda.reduce(
@@ -333,21 +380,22 @@ class BinaryHierarchicalSoftmax(link.Link):
         if len(word_counts) == 0:
             raise ValueError('Empty vocabulary')
 
-        q = six.moves.queue.PriorityQueue()
         # Add unique id to each entry so that we can compare two entries with
         # same counts.
         # Note that itreitems randomly order the entries.
-        for uid, (w, c) in enumerate(six.iteritems(word_counts)):
-            q.put((c, uid, w))
+        q = [(c, uid, w)
+             for uid, (w, c) in enumerate(six.iteritems(word_counts))]
+        heapq.heapify(q)
 
-        while q.qsize() >= 2:
-            (count1, id1, word1) = q.get()
-            (count2, id2, word2) = q.get()
+        while len(q) >= 2:
+            (count1, id1, word1) = heapq.heappop(q)
+            (count2, id2, word2) = q[0]
             count = count1 + count2
             tree = (word1, word2)
-            q.put((count, min(id1, id2), tree))
+            # Replaces the second entry with the merged one
+            heapq.heapreplace(q, (count, min(id1, id2), tree))
 
-        return q.get()[2]
+        return q[0][2]
 
     def __call__(self, x, t):
         """Computes the loss value for given input and ground truth labels.
@@ -87,7 +87,9 @@ class UpdateRule(object):
 
     An implementation of update rule should override :meth:`update_core` or
     its device-dependent variants (i.e., :meth:`update_core_cpu` and
-    :meth:`update_core_gpu`).
+    :meth:`update_core_gpu`). It can also override
+    :meth:`update_core_sparse` to update only the rows of the parameter given
+    by a row-sparse gradient (see :attr:`~chainer.Parameter.sparse_grad`).
 
     The state (e.g. a moving average of the gradient) of the update rule is
     stored into the state dictionary. An implementation of update rule using
@@ -109,6 +111,12 @@ class UpdateRule(object):
 
     """
 
+    # If True, update_core is an elementwise operation of the parameter, the
+    # gradient and the state arrays, so that the parameters can be updated at
+    # once by applying it to the concatenation of them.
+    # See GradientMethod.use_fused_update.
+    _elementwise = False
+
     def __init__(self, parent_hyperparam=None):
         self._pre_update_hooks = collections.OrderedDict()
         self._post_update_hooks = collections.OrderedDict()
@@ -188,6 +196,20 @@ class UpdateRule(object):
 
         self.t += 1
 
+        if getattr(param, '_sparse_grads', None):
+            # The sparse gradient is applied as is only if nothing else needs
+            # the dense gradient
+            if (param.grad is not None or self._pre_update_hooks or
+                    self._post_update_hooks or
+                    (self._use_fp32_update and
+                     param.dtype == numpy.float16) or
+                    not isinstance(param.data,
+                                   (numpy.ndarray, cuda.ndarray))):
+                param._densify_grad()
+            else:
+                self._update_sparse(param)
+                return
+
         if self._use_fp32_update and param.dtype == numpy.float16:
             if self._fp32_param is None:
                 self._fp32_param = variable.Variable(
@@ -235,6 +257,27 @@ class UpdateRule(object):
             else:
                 self.update_core_gpu(param)
 
+    def update_core_sparse(self, param, grad):
+        """Updates the parameter with a row-sparse gradient.
+
+        This method is called instead of :meth:`update_core` when the
+        parameter only has a row-sparse gradient. ``param.grad`` is ``None``
+        here. An implementation can override it to update only the rows of
+        the gradient; the default implementation makes the dense gradient and
+        calls :meth:`update_core`.
+
+        Args:
+            param (~chainer.Variable): Variable to be updated.
+            grad (~chainer.utils.RowSparseArray): Coalesced gradient of the
+                parameter.
+
+        """
+        param.grad = grad.to_dense()
+        try:
+            self.update_core(param)
+        finally:
+            param.grad = None
+
     def update_core_cpu(self, param):
         """Updates the parameter on CPU.
 
@@ -303,6 +346,14 @@ class UpdateRule(object):
             for key in self._state:
                 self._state[key] = serializer(key, self._state[key])
 
+    def _update_sparse(self, param):
+        grad = param.sparse_grad
+        self._prepare(param)
+        with cuda.get_device_from_array(param.data):
+            if param._loss_scale is not None:
+                grad.values /= param._loss_scale
+            self.update_core_sparse(param, grad)
+
     def _prepare(self, param):
         with cuda.get_device_from_array(param.data) as device:
             state = self.state
@@ -495,7 +546,12 @@ class Optimizer(object):
                 true, this hook function is called for each parameter by
                 passing the update rule and the parameter. Otherwise, this hook
                 function is called only once each iteration by passing the
-                optimizer.
+                optimizer. A hook called for each parameter can also have a
+                method ``call_for_packed_params``. If the target link packs
+                all the parameters and their gradients by
+                :meth:`~chainer.Link.pack_params`, the method is called
+                instead, only once by passing the lists of the flat data
+                arrays and the flat gradient arrays.
             name (str): Name of the registration. If omitted, ``hook.name`` is
                 used by default.
             timing (str): Specifies when the hook is called. If 'auto', the
@@ -552,11 +608,28 @@ class Optimizer(object):
 
     def _call_hook(self, hook):
         if getattr(hook, 'call_for_each_param', False):
+            if self._call_hook_for_packed_params(hook):
+                return
             for param in self.target.params():
                 hook(param.update_rule, param)
         else:
             hook(self)
 
+    def _call_hook_for_packed_params(self, hook):
+        # Calls the hook once for the flat arrays of the parameter arena of
+        # the target link if both the hook and the arena support it.
+        call = getattr(hook, 'call_for_packed_params', None)
+        if call is None:
+            return False
+        arena = self.target.param_arena
+        if arena is None:
+            return False
+        grads = arena.get_flat_grads(self.target)
+        if grads is None:
+            return False
+        call(arena.data, grads)
+        return True
+
     def serialize(self, serializer):
         """Serializes or deserializes the optimizer.
 
@@ -585,6 +658,138 @@ class Optimizer(object):
         self._loss_scale = loss_scale
 
 
+def _fused_update_key(param, hyperparam):
+    # Returns the key of the group in which the parameter is updated, or None
+    # if it has to be updated individually.
+    rule = param.update_rule
+    if not (rule._elementwise and rule.enabled):
+        return None
+    if rule._pre_update_hooks or rule._post_update_hooks:
+        return None
+    # The hyperparameter must not be customized for each parameter
+    rule_hyperparam = rule.hyperparam
+    if (rule_hyperparam._parent is not hyperparam or
+            len(rule_hyperparam.__dict__) != 1):
+        return None
+    data = param.array
+    grad = param.grad
+    if not isinstance(data, (numpy.ndarray, cuda.ndarray)):
+        return None
+    if type(grad) is not type(data):
+        return None
+    if rule._use_fp32_update and data.dtype == numpy.float16:
+        return None
+    state = rule.state
+    if state is not None:
+        for value in six.itervalues(state):
+            if type(value) is not type(data):
+                return None
+    return type(rule), data.dtype, cuda.get_device_from_array(data).id
+
+
+class _FusedUpdateGroup(object):
+
+    # Parameters updated at once by an elementwise update rule. The data,
+    # gradient and state arrays of the parameters are replaced with views into
+    # flat arrays owned by this object, and update_core is applied to the flat
+    # arrays.
+
+    def __init__(self, params, data=None, grad=None):
+        # If data is given, the parameters are already stored contiguously in
+        # it (and their gradients in grad if given) by the parameter arena of
+        # the target link, which is used as is.
+        for param in params:
+            param.update_rule._prepare(param)
+
+        self.params = params
+        rule = params[0].update_rule
+        first = params[0].array
+        xp = cuda.get_array_module(first)
+        offsets = numpy.cumsum([0] + [param.size for param in params])
+        self.slices = [slice(int(begin), int(end)) for begin, end
+                       in six.moves.zip(offsets[:-1], offsets[1:])]
+        size = int(offsets[-1])
+
+        with cuda.get_device_from_array(first):
+            if data is None:
+                data = xp.empty(size, dtype=first.dtype)
+                for param, s in six.moves.zip(params, self.slices):
+                    data[s] = param.array.ravel()
+                    param.array = data[s].reshape(param.shape)
+            if grad is None:
+                grad = xp.zeros(size, dtype=first.dtype)
+                grad_views = [grad[s].reshape(param.shape)
+                              for param, s in six.moves.zip(
+                                  params, self.slices)]
+            else:
+                grad_views = [param._grad_buffer for param in params]
+            self.data = data
+            self.grad = grad
+            self.data_views = [param.array for param in params]
+            self.grad_views = grad_views
+
+            self.state = {
+                key: xp.empty(size, dtype=value.dtype)
+                for key, value in six.iteritems(rule.state)}
+            self.state_views = {key: [] for key in self.state}
+            for param, s in six.moves.zip(params, self.slices):
+                state = param.update_rule.state
+                for key, flat in six.iteritems(self.state):
+                    flat[s] = state[key].ravel()
+                    state[key] = flat[s].reshape(param.shape)
+                    self.state_views[key].append(state[key])
+
+        self.flat_param = variable.Variable(self.data, grad=self.grad)
+        self.rule = copy.copy(rule)
+        self.rule._state = self.state
+
+    def is_valid(self, params):
+        # Checks if the parameters and their arrays are not replaced
+        if len(params) != len(self.params):
+            return False
+        for i, (param, expected) in enumerate(
+                six.moves.zip(params, self.params)):
+            if param is not expected or param.array is not self.data_views[i]:
+                return False
+            state = param.update_rule.state
+            if state is None or len(state) != len(self.state):
+                return False
+            for key, views in six.iteritems(self.state_views):
+                if state.get(key) is not views[i]:
+                    return False
+        return True
+
+    def update(self):
+        params = self.params
+        t = params[0].update_rule.t
+        loss_scale = params[0]._loss_scale
+        uniform = True
+        for param, s, grad_view in six.moves.zip(
+                params, self.slices, self.grad_views):
+            if param.update_rule.t != t or param._loss_scale != loss_scale:
+                uniform = False
+            grad = param.grad
+            if grad is not grad_view:
+                with cuda.get_device_from_array(grad):
+                    self.grad[s] = grad.ravel()
+                param.grad = grad_view
+                # The view is also used as the buffer of in-place gradient
+                # accumulation in Variable.backward
+                param._grad_buffer = grad_view
+
+        if not uniform:
+            for param in params:
+                param.update()
+            return
+
+        for param in params:
+            param.update_rule.t += 1
+        if loss_scale is not None:
+            self.grad /= loss_scale
+        self.rule.t = t + 1
+        self.rule.update_core(self.flat_param)
+
+
 class GradientMethod(Optimizer):
     """Base class of all single gradient-based optimizers.
 
@@ -616,6 +821,8 @@ class GradientMethod(Optimizer):
         super(GradientMethod, self).__init__()
         self.hyperparam = Hyperparameter()
         self._use_fp32_update = False
+        self._use_fused_update = False
+        self._fused_groups = {}
 
     def setup(self, link):
         super(GradientMethod, self).setup(link)
@@ -635,7 +842,7 @@ class GradientMethod(Optimizer):
 
         """
         for name, param in self.target.namedparams(False):
-            if param.grad is None:
+            if param.grad is None and not param._sparse_grads:
                 with cuda.get_device_from_array(param.data):
                     xp = cuda.get_array_module(param.data)
                     param.grad = xp.zeros_like(param.data)
@@ -677,13 +884,21 @@ class GradientMethod(Optimizer):
             loss.backward(loss_scale=self._loss_scale)
             del loss
 
+        if self._pre_update_hooks or self._post_update_hooks:
+            # Optimizer hooks work on the dense gradients
+            for param in self.target.params(False):
+                param._densify_grad()
+
         self.reallocate_cleared_grads()
 
         self.call_hooks('pre')
 
         self.t += 1
-        for param in self.target.params():
-            param.update()
+        if self._use_fused_update:
+            self._fused_update()
+        else:
+            for param in self.target.params():
+                param.update()
 
         self.reallocate_cleared_grads()
 
@@ -733,6 +948,66 @@ class GradientMethod(Optimizer):
             for param in link.params():
                 param.update_rule.use_fp32_update()
 
+    def use_fused_update(self, flag=True):
+        """Enables or disables the fused update of parameters.
+
+        When it is enabled, :meth:`update` packs the parameters of the same
+        data type on the same device into one flat array, and updates all of
+        them at once with one vectorized expression instead of calling the
+        update rule for each parameter. It reduces the overhead of models with
+        many small parameters. The gradients and the states of the update
+        rules are also packed into flat arrays.
+
+        The arrays of the parameters, the gradients and the states are replaced
+        with views into the flat arrays on the first update, and they are
+        packed again if any of them is replaced later (e.g. by
+        :meth:`~chainer.Link.to_gpu`). The states are serialized for each
+        parameter as before.
+
+        The fused update is only applied to update rules of elementwise
+        operations, e.g. the ones of :class:`~chainer.optimizers.SGD`,
+        :class:`~chainer.optimizers.MomentumSGD`,
+        :class:`~chainer.optimizers.Adam` and
+        :class:`~chainer.optimizers.RMSprop`. The parameters whose update rules
+        have their own hyperparameters or hook functions, are disabled, or
+        use fp32 update of fp16 parameters are updated individually.
+
+        Args:
+            flag (bool): If ``True``, the fused update is enabled.
+
+        """
+        self._use_fused_update = flag
+        self._fused_groups = {}
+
+    def _fused_update(self):
+        params = collections.OrderedDict()
+        for param in self.target.params():
+            if param.update_rule is None:
+                continue
+            key = _fused_update_key(param, self.hyperparam)
+            if key is None:
+                param.update()
+            else:
+                params.setdefault(key, []).append(param)
+
+        # The parameter arena of the target link is used if exists, so that
+        # the parameters are not moved between the arena and the groups
+        arena = self.target.param_arena
+        groups = {}
+        for key, group_params in six.iteritems(params):
+            runs = None
+            if arena is not None:
+                runs = arena.get_runs(group_params)
+            if runs is None:
+                runs = [(group_params, None, None)]
+            for i, (run_params, data, grad) in enumerate(runs):
+                group = self._fused_groups.get((key, i))
+                if group is None or not group.is_valid(run_params):
+                    group = _FusedUpdateGroup(run_params, data, grad)
+                groups[key, i] = group
+                group.update()
+        self._fused_groups = groups
+
 
 class HyperparameterProxy(object):
 
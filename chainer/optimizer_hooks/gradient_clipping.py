@@ -34,6 +34,10 @@ class GradientClipping(object):
                          'pre' (before any updates) and 'post' (after any
                          updates).
 
+    When the parameters and their gradients are packed by
+    :meth:`~chainer.Link.pack_params`, the norm is computed and the gradients
+    are scaled on the flat gradient arrays.
+
     .. versionadded:: 4.0.0
        The *timing* parameter.
 
@@ -45,11 +49,15 @@ class GradientClipping(object):
         self.threshold = threshold
 
     def __call__(self, opt):
-        norm = numpy.sqrt(_sum_sqnorm(
-            [p.grad for p in opt.target.params(False)]))
+        grads = None
+        arena = opt.target.param_arena
+        if arena is not None:
+            grads = arena.get_flat_grads(opt.target)
+        if grads is None:
+            grads = [p.grad for p in opt.target.params(False)]
+        norm = numpy.sqrt(_sum_sqnorm(grads))
         rate = self.threshold / norm
         if rate < 1:
-            for param in opt.target.params(False):
-                grad = param.grad
+            for grad in grads:
                 with cuda.get_device_from_array(grad):
                     grad *= rate
@@ -23,6 +23,10 @@ class Lasso(object):
                          not expect users to switch the value from default one,
                          which is `True`.
 
+    When the parameters and their gradients are packed by
+    :meth:`~chainer.Link.pack_params`, the regularization is applied to the
+    flat arrays at once by :meth:`call_for_packed_params`.
+
     .. versionadded:: 4.0.0
        The *timing* parameter.
 
@@ -38,6 +42,20 @@ class Lasso(object):
         p, g = param.data, param.grad
         if p is None or g is None:
             return
+        self._decay(p, g)
+
+    def call_for_packed_params(self, data, grad):
+        """Applies Lasso regularization to the flat arrays of an arena.
+
+        Args:
+            data (list of arrays): Flat data arrays.
+            grad (list of arrays): Flat gradient arrays.
+
+        """
+        for p, g in zip(data, grad):
+            self._decay(p, g)
+
+    def _decay(self, p, g):
         xp = cuda.get_array_module(p)
         with cuda.get_device_from_array(p) as dev:
             sign = xp.sign(p)
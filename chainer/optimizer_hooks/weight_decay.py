@@ -25,6 +25,10 @@ class WeightDecay(object):
                          not expect users to switch the value from default one,
                          which is `True`.
 
+    When the parameters and their gradients are packed by
+    :meth:`~chainer.Link.pack_params`, the decay is applied to the flat arrays
+    at once by :meth:`call_for_packed_params`.
+
     .. versionadded:: 4.0.0
        The *timing* parameter.
 
@@ -40,6 +44,20 @@ class WeightDecay(object):
         p, g = param.data, param.grad
         if p is None or g is None:
             return
+        self._decay(p, g)
+
+    def call_for_packed_params(self, data, grad):
+        """Applies weight decay to the flat arrays of a parameter arena.
+
+        Args:
+            data (list of arrays): Flat data arrays.
+            grad (list of arrays): Flat gradient arrays.
+
+        """
+        for p, g in zip(data, grad):
+            self._decay(p, g)
+
+    def _decay(self, p, g):
         with cuda.get_device_from_array(p) as dev:
             if int(dev) == -1:
                 g += self.rate * p
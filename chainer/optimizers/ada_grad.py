@@ -49,6 +49,16 @@ class AdaGradRule(optimizer.UpdateRule):
         h += grad * grad
         param.data -= lr * grad / (numpy.sqrt(h) + eps)
 
+    def update_core_sparse(self, param, grad):
+        xp = cuda.get_array_module(param.data)
+        rows = grad.rows
+        g = grad.values
+        h = self.state['h']
+        h_rows = h[rows] + g * g
+        h[rows] = h_rows
+        param.data[rows] -= self.hyperparam.lr * g / (
+            xp.sqrt(h_rows) + self.hyperparam.eps)
+
     def update_core_gpu(self, param):
         grad = param.grad
         if grad is None:
@@ -47,6 +47,12 @@ class AdamRule(optimizer.UpdateRule):
     See :class:`~chainer.optimizers.Adam` for the default values
     of the hyperparameters.
 
+    A row-sparse gradient (see :attr:`~chainer.Parameter.sparse_grad`) is
+    applied lazily: only the rows it contains and their moments are updated,
+    so that the moments of the other rows do not decay and the weight decay
+    is not applied to them in the iteration. The bias correction of the
+    learning rate still uses the number of all updates.
+
     Args:
         parent_hyperparam (~chainer.optimizer.Hyperparameter): Hyperparameter
             that provides the default values.
@@ -60,6 +66,8 @@ class AdamRule(optimizer.UpdateRule):
 
     """
 
+    _elementwise = True
+
     def __init__(self, parent_hyperparam=None,
                  alpha=None, beta1=None, beta2=None, eps=None,
                  eta=None, weight_decay_rate=None, amsgrad=None):
@@ -111,6 +119,37 @@ class AdamRule(optimizer.UpdateRule):
         param.data -= hp.eta * (self.lr * m / (numpy.sqrt(vhat) + hp.eps) +
                                 hp.weight_decay_rate * param.data)
 
+    def update_core_sparse(self, param, grad):
+        # Lazy Adam: only the moments of the rows in the gradient decay and
+        # only these rows are updated, including the weight decay
+        xp = cuda.get_array_module(param.data)
+        hp = self.hyperparam
+        eps = grad.dtype.type(hp.eps)
+        if hp.eps != 0 and eps == 0:
+            raise ValueError(
+                'eps of Adam optimizer is too small for {} ({})'.format(
+                    grad.dtype.name, hp.eps))
+        rows = grad.rows
+        g = grad.values
+        m, v = self.state['m'], self.state['v']
+        m_rows = m[rows]
+        v_rows = v[rows]
+        m_rows += (1 - hp.beta1) * (g - m_rows)
+        v_rows += (1 - hp.beta2) * (g * g - v_rows)
+        m[rows] = m_rows
+        v[rows] = v_rows
+
+        if hp.amsgrad:
+            vhat = self.state['vhat']
+            vhat_rows = xp.maximum(vhat[rows], v_rows)
+            vhat[rows] = vhat_rows
+        else:
+            vhat_rows = v_rows
+        data_rows = param.data[rows]
+        param.data[rows] = data_rows - hp.eta * (
+            self.lr * m_rows / (xp.sqrt(vhat_rows) + hp.eps) +
+            hp.weight_decay_rate * data_rows)
+
     def update_core_gpu(self, param):
         grad = param.grad
         if grad is None:
@@ -15,6 +15,10 @@ class MomentumSGDRule(optimizer.UpdateRule):
     See :class:`~chainer.optimizers.MomentumSGD` for the default values of the
     hyperparameters.
 
+    A row-sparse gradient (see :attr:`~chainer.Parameter.sparse_grad`) only
+    updates the rows it contains and their velocities, i.e. the velocities of
+    the other rows do not decay and the rows do not move in the iteration.
+
     Args:
         parent_hyperparam (~chainer.optimizer.Hyperparameter): Hyperparameter
             that provides the default values.
@@ -23,6 +27,8 @@ class MomentumSGDRule(optimizer.UpdateRule):
 
     """
 
+    _elementwise = True
+
     def __init__(self, parent_hyperparam=None, lr=None, momentum=None):
         super(MomentumSGDRule, self).__init__(
             parent_hyperparam or _default_hyperparam)
@@ -56,6 +62,16 @@ class MomentumSGDRule(optimizer.UpdateRule):
             v -= self.hyperparam.lr * grad
             param.data += v
 
+    def update_core_sparse(self, param, grad):
+        # The velocities of the other rows are left as they are until the
+        # rows appear in the gradient
+        rows = grad.rows
+        v = self.state['v']
+        v_rows = self.hyperparam.momentum * v[rows] - \
+            self.hyperparam.lr * grad.values
+        v[rows] = v_rows
+        param.data[rows] += v_rows
+
     def update_core_gpu(self, param):
         grad = param.grad
         if grad is None:
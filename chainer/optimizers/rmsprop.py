@@ -26,6 +26,8 @@ class RMSpropRule(optimizer.UpdateRule):
 
     """
 
+    _elementwise = True
+
     def __init__(self, parent_hyperparam=None, lr=None, alpha=None, eps=None):
         super(RMSpropRule, self).__init__(
             parent_hyperparam or _default_hyperparam)
@@ -21,6 +21,8 @@ class SGDRule(optimizer.UpdateRule):
 
     """
 
+    _elementwise = True
+
     def __init__(self, parent_hyperparam=None, lr=None):
         super(SGDRule, self).__init__(
             parent_hyperparam or _default_hyperparam)
@@ -36,6 +38,9 @@ class SGDRule(optimizer.UpdateRule):
         else:
             param.data -= self.hyperparam.lr * grad
 
+    def update_core_sparse(self, param, grad):
+        param.data[grad.rows] -= self.hyperparam.lr * grad.values
+
     def update_core_gpu(self, param):
         grad = param.grad
         if grad is None:
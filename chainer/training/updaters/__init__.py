@@ -1,3 +1,4 @@
+from chainer.training.updaters.gradient_accumulation_updater import GradientAccumulationUpdater  # NOQA
 from chainer.training.updaters.multiprocess_parallel_updater import MultiprocessParallelUpdater  # NOQA
 from chainer.training.updaters.parallel_updater import ParallelUpdater  # NOQA
 from chainer.training.updaters.standard_updater import StandardUpdater  # NOQA
@@ -0,0 +1,246 @@
+from __future__ import division
+
+import numpy
+import six
+
+from chainer.backends import cuda
+from chainer.dataset import convert
+from chainer.links.normalization import batch_normalization
+from chainer import reporter as reporter_module
+from chainer.training.updaters import standard_updater
+from chainer import variable
+
+
+class _RunningStatistics(object):
+
+    # Keeps the running statistics of batch normalization links so that each
+    # micro-batch updates them from the same state. The results are averaged
+    # with the weights of the micro-batches, which is equivalent to updating
+    # them once with the average of the batch statistics.
+
+    def __init__(self, target):
+        self._links = [
+            link for link in target.links()
+            if isinstance(link, batch_normalization.BatchNormalization)]
+        self._initial = [self._get(link) for link in self._links]
+        self._sums = [None] * len(self._links)
+
+    @staticmethod
+    def _get(link):
+        if not hasattr(link, 'avg_mean'):
+            # The statistics are initialized by zeros on the first call
+            return link.N, None, None
+        return link.N, link.avg_mean.copy(), link.avg_var.copy()
+
+    def restore(self):
+        for link, (N, avg_mean, avg_var) in six.moves.zip(
+                self._links, self._initial):
+            link.N = N
+            if not hasattr(link, 'avg_mean'):
+                continue
+            if avg_mean is None:
+                link.avg_mean.fill(0)
+                link.avg_var.fill(0)
+            else:
+                link.avg_mean[...] = avg_mean
+                link.avg_var[...] = avg_var
+
+    def accumulate(self, weight):
+        for i, link in enumerate(self._links):
+            if not hasattr(link, 'avg_mean'):
+                continue
+            if self._sums[i] is None:
+                self._sums[i] = (link.avg_mean * weight, link.avg_var * weight)
+            else:
+                sum_mean, sum_var = self._sums[i]
+                sum_mean += link.avg_mean * weight
+                sum_var += link.avg_var * weight
+
+    def finalize(self, total_weight):
+        for link, sums in six.moves.zip(self._links, self._sums):
+            if sums is not None:
+                link.avg_mean[...] = sums[0] / total_weight
+                link.avg_var[...] = sums[1] / total_weight
+
+
+def _add_observation(sums, others, observation, weight):
+    # Scalar observations are summed with the weights of the micro-batches to
+    # be averaged later, and the last value is used for the others.
+    for key, value in six.iteritems(observation):
+        if isinstance(value, variable.Variable):
+            value = value.array
+        if numpy.isscalar(value) or getattr(value, 'ndim', -1) == 0:
+            sums[key] = sums.get(key, 0) + value * weight
+        else:
+            others[key] = value
+
+
+def _scale_grads(target, scale):
+    for param in target.params():
+        grad = param.grad
+        if grad is not None:
+            with cuda.get_device_from_array(grad):
+                grad *= scale
+        sparse_grad = param.sparse_grad
+        if sparse_grad is not None:
+            with cuda.get_device_from_array(sparse_grad.values):
+                sparse_grad.values *= scale
+
+
+class GradientAccumulationUpdater(standard_updater.StandardUpdater):
+
+    """Updater that accumulates gradients over micro-batches.
+
+    This updater splits each batch into micro-batches and/or gathers
+    consecutive batches from the main iterator, runs the forward and backward
+    computations on each micro-batch, and accumulates the gradients into the
+    parameters before calling :meth:`~chainer.Optimizer.update` of the main
+    optimizer once. It realizes a large effective batch size with the memory
+    consumption of a micro-batch.
+
+    The loss function is assumed to return the loss averaged over the
+    examples. The loss of each micro-batch is weighted by the fraction of the
+    examples it has, so that the accumulated gradient is equal to that of the
+    whole batch. The scalar values reported during the forward computations
+    are averaged with the same weights.
+
+    The running statistics of :class:`~chainer.links.BatchNormalization`
+    links are updated from the same state by each micro-batch, and their
+    weighted average is used as the new statistics. It is equivalent to
+    updating them once with the average of the micro-batch statistics.
+
+    Args:
+        iterator: Dataset iterator for the training dataset. It can also be a
+            dictionary that maps strings to iterators.
+            If this is just an iterator, then the
+            iterator is registered by the name ``'main'``.
+        optimizer: Optimizer to update parameters. It can also be a dictionary
+            that maps strings to optimizers.
+            If this is just an optimizer, then the optimizer is
+            registered by the name ``'main'``.
+        converter: Converter function to build input arrays. Each micro-batch
+            and the ``device`` option are passed to this function.
+            :func:`~chainer.dataset.concat_examples` is used by default.
+        device: Device to which the training data is sent. Negative value
+            indicates the host memory (CPU).
+        loss_func: Loss function. The target link of the main optimizer is used
+            by default.
+        loss_scale (float): Loss scaling factor. See
+            :class:`~chainer.training.updaters.StandardUpdater`.
+        auto_new_epoch (bool): If ``True``,
+            :meth:`~chainer.Optimizer.new_epoch` of the main optimizer is
+            automatically called when the ``is_new_poch`` attribute of the
+            main iterator is ``True``.
+        micro_batch_size (int): Maximum number of examples in a micro-batch.
+            If it is ``None``, each batch is used as a micro-batch without
+            splitting.
+        accumulation_steps (int): Number of batches extracted from the main
+            iterator for each update.
+
+    Attributes:
+        micro_batch_size: Maximum number of examples in a micro-batch.
+        accumulation_steps: Number of batches used for each update.
+
+    """
+
+    def __init__(self, iterator, optimizer, converter=convert.concat_examples,
+                 device=None, loss_func=None, loss_scale=None,
+                 auto_new_epoch=True, micro_batch_size=None,
+                 accumulation_steps=1):
+        if micro_batch_size is not None and micro_batch_size < 1:
+            raise ValueError('micro_batch_size must be a positive integer')
+        if accumulation_steps < 1:
+            raise ValueError('accumulation_steps must be a positive integer')
+        super(GradientAccumulationUpdater, self).__init__(
+            iterator, optimizer, converter=converter, device=device,
+            loss_func=loss_func, loss_scale=loss_scale,
+            auto_new_epoch=auto_new_epoch)
+        self.micro_batch_size = micro_batch_size
+        self.accumulation_steps = accumulation_steps
+
+    def _split(self, batch):
+        size = self.micro_batch_size
+        if size is None:
+            return [batch]
+        return [batch[i:i + size]
+                for i in six.moves.range(0, len(batch), size)]
+
+    def update_core(self):
+        iterator = self._iterators['main']
+        optimizer = self._optimizers['main']
+        loss_func = self.loss_func or optimizer.target
+
+        try:
+            reporter = reporter_module.get_current_reporter()
+        except IndexError:
+            # Reports are not collected outside of a reporter scope
+            reporter = None
+
+        statistics = _RunningStatistics(optimizer.target)
+        sums = {}
+        others = {}
+        n_examples = 0
+        # The losses are weighted assuming that all batches extracted from
+        # the iterator have the same size as the first one, and the
+        # gradients are rescaled at the end if it is not the case.
+        expected_n_examples = None
+        n_new_epochs = 0
+
+        optimizer.target.cleargrads()
+        for _ in six.moves.range(self.accumulation_steps):
+            # Each batch is consumed before extracting the next one, so that
+            # the iterator may reuse its buffers.
+            batch = iterator.next()
+            if iterator.is_new_epoch:
+                n_new_epochs += 1
+            if expected_n_examples is None:
+                expected_n_examples = len(batch) * self.accumulation_steps
+
+            for micro_batch in self._split(batch):
+                if n_examples > 0:
+                    statistics.restore()
+                n_examples += len(micro_batch)
+                weight = len(micro_batch) / expected_n_examples
+                in_arrays = self.converter(micro_batch, self.device)
+
+                observation = {}
+                if reporter is not None:
+                    with reporter_module.report_scope(observation):
+                        loss = self._forward(loss_func, in_arrays)
+                else:
+                    loss = self._forward(loss_func, in_arrays)
+                del in_arrays
+                if weight != 1:
+                    loss = loss * weight
+                loss.backward(
+                    loss_scale=self.loss_scale, accumulate_grad_inplace=True)
+                del loss
+
+                statistics.accumulate(weight)
+                _add_observation(sums, others, observation, weight)
+            del batch
+
+        total_weight = n_examples / expected_n_examples
+        if total_weight != 1:
+            _scale_grads(optimizer.target, 1 / total_weight)
+        statistics.finalize(total_weight)
+        if reporter is not None:
+            summary = {key: value / total_weight
+                       for key, value in six.iteritems(sums)}
+            summary.update(others)
+            reporter_module.report(summary)
+
+        optimizer.update()
+
+        if self.auto_new_epoch:
+            for _ in six.moves.range(n_new_epochs):
+                optimizer.new_epoch(auto=True)
+
+    @staticmethod
+    def _forward(loss_func, in_arrays):
+        if isinstance(in_arrays, tuple):
+            return loss_func(*in_arrays)
+        elif isinstance(in_arrays, dict):
+            return loss_func(**in_arrays)
+        else:
+            return loss_func(in_arrays)
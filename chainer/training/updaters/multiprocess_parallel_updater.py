@@ -329,7 +329,29 @@ def _memcpy_gather():
             ''')
 
 
+def _get_packed_array(link, target):
+    # Returns the flat array of the parameter arena if it holds the target
+    # arrays of all parameters in the same layout as _gather and _scatter.
+    arena = link.param_arena
+    if arena is None or len(arena.data) != 1:
+        return None
+    flat = arena.data if target == 'data' else arena.grad
+    if flat is None or flat[0].dtype != numpy.float32:
+        return None
+    for param in link.params():
+        if not arena.is_packed(param):
+            return None
+    if target == 'grad':
+        arena.gather_grads()
+    return flat[0]
+
+
 def _gather(link, target):
+    packed = _get_packed_array(link, target)
+    if packed is not None:
+        with cuda.get_device_from_array(packed):
+            return packed.copy()
+
     size, num = size_num_grads(link)
 
     ptrs = numpy.empty(num, dtype=numpy.uint64)
@@ -361,6 +383,9 @@ def _gather(link, target):
 def gather_grads(link):
     """Put together all gradient arrays and make a single array
 
+    The row-sparse gradients of the parameters are added to their dense
+    gradients before gathering them.
+
     Args:
         link (chainer.link.Link): Target link object.
     Return:
@@ -368,6 +393,8 @@ def gather_grads(link):
     """
     if link.xp is numpy:
         raise RuntimeError('gather_grads works only on GPU.')
+    for param in link.params():
+        param._densify_grad()
     return _gather(link, "grad")
 
 
@@ -422,6 +449,12 @@ def _memcpy_scatter():
 
 
 def _scatter(link, array, target):
+    packed = _get_packed_array(link, target)
+    if packed is not None:
+        with cuda.get_device_from_array(packed):
+            packed[...] = array
+        return
+
     size, num = size_num_grads(link)
 
     ptrs = numpy.zeros(num, dtype=numpy.uint64)
@@ -89,6 +89,225 @@ def im2col_cpu(
     return col
 
 
+def im2col_view_cpu(
+        img, kh, kw, sy, sx, ph, pw, pval=0, cover_all=False, dy=1, dx=1):
+    """Returns the patches of an image as a strided view.
+
+    The view has the same shape and values as the array returned by
+    :func:`im2col_cpu`, but the patches are not copied. The image is copied
+    only if it is padded. The view is read-only since the overlapping patches
+    share the elements.
+
+    """
+    n, c, h, w = img.shape
+    out_h = get_conv_outsize(h, kh, sy, ph, cover_all, dy)
+    assert out_h > 0, 'Height in the output should be positive.'
+    out_w = get_conv_outsize(w, kw, sx, pw, cover_all, dx)
+    assert out_w > 0, 'Width in the output should be positive.'
+
+    # The image is padded so that all the patches are inside of it
+    pb = max(0, (out_h - 1) * sy + (kh - 1) * dy + 1 - h - ph)
+    pr = max(0, (out_w - 1) * sx + (kw - 1) * dx + 1 - w - pw)
+    if ph or pw or pb or pr:
+        img = numpy.pad(img, ((0, 0), (0, 0), (ph, pb), (pw, pr)),
+                        mode='constant', constant_values=(pval,))
+    st_n, st_c, st_h, st_w = img.strides
+    col = numpy.lib.stride_tricks.as_strided(
+        img, (n, c, kh, kw, out_h, out_w),
+        (st_n, st_c, st_h * dy, st_w * dx, st_h * sy, st_w * sx))
+    col.flags.writeable = False
+    return col
+
+
+# Upper bound of the size in bytes of the column buffer of the CPU
+# convolution routines below. The batch is processed in chunks of the
+# examples whose columns fit into the buffer, instead of expanding the columns
+# of the whole batch at once.
+_max_cpu_col_size = 32 * 1024 * 1024
+
+# Minimum number of the output pixels for which 1x1 convolutions are computed
+# per example without im2col. The products of smaller matrices are less
+# efficient than the product of the columns of a chunk.
+_min_pointwise_size = 256
+
+
+def _col_chunk_size(n, size_per_example):
+    return max(1, min(n, _max_cpu_col_size // max(size_per_example, 1)))
+
+
+def _im2col_chunks(img, kh, kw, sy, sx, ph, pw, out_h, out_w, dy, dx):
+    # Yields the columns of the chunks of the batch as matrices of shape
+    # (c * kh * kw, m * out_h * out_w), where m is the size of the chunk, so
+    # that they can be multiplied by the filters at once. The columns of all
+    # the chunks share one buffer.
+    n, c, h, w = img.shape
+    k = c * kh * kw
+    p = out_h * out_w
+    nb = _col_chunk_size(n, k * p * img.dtype.itemsize)
+    buf = numpy.empty((k * nb * p,), dtype=img.dtype)
+    for start in six.moves.range(0, n, nb):
+        end = min(start + nb, n)
+        m = end - start
+        chunk = img[start:end]
+        if ph or pw or sy > 1 or sx > 1:
+            chunk = numpy.pad(
+                chunk, ((0, 0), (0, 0), (ph, ph + sy - 1), (pw, pw + sx - 1)),
+                mode='constant')
+        col = buf[:k * m * p].reshape(c, kh, kw, m, out_h, out_w)
+        for j in six.moves.range(kh):
+            jdy = j * dy
+            j_lim = jdy + sy * out_h
+            for i in six.moves.range(kw):
+                idx = i * dx
+                i_lim = idx + sx * out_w
+                col[:, j, i] = chunk[
+                    :, :, jdy:j_lim:sy, idx:i_lim:sx].transpose(1, 0, 2, 3)
+        yield start, end, col.reshape(k, m * p)
+
+
+def _pointwise_input(x, kh, kw, sy, sx, ph, pw, out_h, out_w):
+    # Returns the input pixels of a 1x1 convolution as an array of shape
+    # (n, c, out_h * out_w), or None if the convolution is not pointwise,
+    # i.e. the windows include padding, or the output is small.
+    h, w = x.shape[2:]
+    if (kh != 1 or kw != 1 or ph != 0 or pw != 0 or
+            out_h * out_w < _min_pointwise_size or
+            (out_h - 1) * sy >= h or (out_w - 1) * sx >= w):
+        return None
+    if sy > 1 or sx > 1:
+        x = x[:, :, :(out_h - 1) * sy + 1:sy, :(out_w - 1) * sx + 1:sx]
+    return x.reshape(x.shape[:2] + (out_h * out_w,))
+
+
+def conv_2d_cpu(x, W, sy, sx, ph, pw, cover_all=False, dy=1, dx=1):
+    """Computes a two-dimensional convolution without bias on CPU.
+
+    A 1x1 convolution without padding is computed as a product of matrices
+    of the filters and the input pixels. The other convolutions expand the
+    columns of the input by im2col in chunks of the batch, whose size is
+    bounded, and multiply each chunk by the filters.
+
+    Args:
+        x (numpy.ndarray): Input of shape ``(n, c, h, w)``.
+        W (numpy.ndarray): Filters of shape ``(out_c, c, kh, kw)``.
+
+    Returns:
+        numpy.ndarray: C-contiguous output of shape
+        ``(n, out_c, out_h, out_w)`` and the dtype of ``x``.
+
+    """
+    n, c, h, w = x.shape
+    out_c, _, kh, kw = W.shape
+    out_h = get_conv_outsize(h, kh, sy, ph, cover_all, dy)
+    out_w = get_conv_outsize(w, kw, sx, pw, cover_all, dx)
+    W_mat = W.reshape(out_c, -1)
+    y = numpy.empty((n, out_c, out_h, out_w), dtype=x.dtype)
+    y_mat = y.reshape(n, out_c, out_h * out_w)
+
+    x_mat = _pointwise_input(x, kh, kw, sy, sx, ph, pw, out_h, out_w)
+    if x_mat is not None:
+        for i in six.moves.range(n):
+            y_mat[i] = W_mat.dot(x_mat[i])
+        return y
+
+    for start, end, col in _im2col_chunks(
+            x, kh, kw, sy, sx, ph, pw, out_h, out_w, dy, dx):
+        y_chunk = W_mat.dot(col).reshape(out_c, end - start, -1)
+        y_mat[start:end] = y_chunk.transpose(1, 0, 2)
+    return y
+
+
+def conv_2d_grad_w_cpu(x, gy, kh, kw, sy, sx, ph, pw, dy=1, dx=1):
+    """Computes the gradient of the filters of a convolution on CPU.
+
+    The strategies are the same as :func:`conv_2d_cpu`.
+
+    Args:
+        x (numpy.ndarray): Input of shape ``(n, c, h, w)``.
+        gy (numpy.ndarray): Gradient of the output of shape
+            ``(n, out_c, out_h, out_w)``.
+
+    Returns:
+        numpy.ndarray: Gradient of the filters of shape
+        ``(out_c, c, kh, kw)``.
+
+    """
+    n, c = x.shape[:2]
+    _, out_c, out_h, out_w = gy.shape
+    gy_mat = gy.reshape(n, out_c, out_h * out_w)
+    dtype = numpy.result_type(x, gy)
+    gW = numpy.zeros((out_c, c * kh * kw), dtype=dtype)
+
+    x_mat = _pointwise_input(x, kh, kw, sy, sx, ph, pw, out_h, out_w)
+    if x_mat is not None:
+        for i in six.moves.range(n):
+            gW += gy_mat[i].dot(x_mat[i].T)
+        return gW.reshape(out_c, c, kh, kw)
+
+    for start, end, col in _im2col_chunks(
+            x, kh, kw, sy, sx, ph, pw, out_h, out_w, dy, dx):
+        gy_chunk = gy_mat[start:end].transpose(1, 0, 2).reshape(out_c, -1)
+        gW += gy_chunk.dot(col.T)
+    return gW.reshape(out_c, c, kh, kw)
+
+
+def deconv_2d_cpu(x, W, sy, sx, ph, pw, out_h, out_w, dy=1, dx=1):
+    """Computes a two-dimensional deconvolution without bias on CPU.
+
+    A 1x1 deconvolution without padding is computed as a product of matrices.
+    The other deconvolutions multiply the filters by the input in chunks of
+    the batch, whose columns are bounded in size, and add the columns of each
+    chunk to the output by col2im.
+
+    Args:
+        x (numpy.ndarray): Input of shape ``(n, c, h, w)``.
+        W (numpy.ndarray): Filters of shape ``(c, out_c, kh, kw)``.
+
+    Returns:
+        numpy.ndarray: C-contiguous output of shape
+        ``(n, out_c, out_h, out_w)`` and the dtype of ``x``.
+
+    """
+    n, c, h, w = x.shape
+    _, out_c, kh, kw = W.shape
+    W_mat = W.reshape(c, -1).T
+    x_mat = x.reshape(n, c, h * w)
+
+    if (kh == 1 and kw == 1 and ph == 0 and pw == 0 and
+            h * w >= _min_pointwise_size and
+            (h - 1) * sy < out_h and (w - 1) * sx < out_w):
+        if sy == 1 and sx == 1 and h == out_h and w == out_w:
+            y = numpy.empty((n, out_c, out_h, out_w), dtype=x.dtype)
+            y_view = y
+        else:
+            y = numpy.zeros((n, out_c, out_h, out_w), dtype=x.dtype)
+            y_view = y[:, :, :(h - 1) * sy + 1:sy, :(w - 1) * sx + 1:sx]
+        for i in six.moves.range(n):
+            y_view[i] = W_mat.dot(x_mat[i]).reshape(out_c, h, w)
+        return y
+
+    y = numpy.empty((n, out_c, out_h, out_w), dtype=x.dtype)
+    k = out_c * kh * kw
+    nb = _col_chunk_size(n, k * h * w * numpy.result_type(x, W).itemsize)
+    for start in six.moves.range(0, n, nb):
+        end = min(start + nb, n)
+        x_chunk = x_mat[start:end].transpose(1, 0, 2).reshape(c, -1)
+        col = W_mat.dot(x_chunk).reshape(out_c, kh, kw, end - start, h, w)
+        img = numpy.zeros(
+            (end - start, out_c, out_h + 2 * ph + sy - 1,
+             out_w + 2 * pw + sx - 1), dtype=x.dtype)
+        for j in six.moves.range(kh):
+            jdy = j * dy
+            j_lim = jdy + sy * h
+            for i in six.moves.range(kw):
+                idx = i * dx
+                i_lim = idx + sx * w
+                img[:, :, jdy:j_lim:sy, idx:i_lim:sx] += col[
+                    :, j, i].transpose(1, 0, 2, 3)
+        y[start:end] = img[:, :, ph:ph + out_h, pw:pw + out_w]
+    return y
+
+
 def im2col_gpu(img, kh, kw, sy, sx, ph, pw, cover_all=False, dy=1, dx=1,
                out_h=None, out_w=None):
     n, c, h, w = img.shape
@@ -110,6 +110,191 @@ def col2im_nd_cpu(col, stride, pad, dims, dilate=1):
     return img[img_index]
 
 
+def _window_pad_width(dims, ksize, stride, pad, outs, dilate):
+    # Pads the image by the minimum widths so that all the windows are inside
+    # of it. Unlike im2col_nd_cpu, the image is not padded if not necessary.
+    return tuple(
+        (p, max(0, (out - 1) * s + (k - 1) * di + 1 - d - p))
+        for (d, k, s, p, out, di)
+        in zip(dims, ksize, stride, pad, outs, dilate))
+
+
+def im2col_nd_view_cpu(img, ksize, stride, pad, pval=0, cover_all=False,
+                       dilate=1):
+    """Returns the patches of an image as a strided view.
+
+    The view has the same shape and values as the array returned by
+    :func:`im2col_nd_cpu`, i.e. ``(n, c, k_1, ..., k_N, out_1, ..., out_N)``,
+    but the patches are not copied. The image is copied only if it is padded.
+    The view is read-only since the overlapping patches share the elements.
+
+    """
+    n, c = img.shape[0:2]
+    dims = img.shape[2:]
+    ndim = len(dims)
+    dilate = as_tuple(dilate, ndim)
+    assert ndim == len(ksize) == len(stride) == len(pad)
+    outs = tuple(get_conv_outsize(d, k, s, p, cover_all, di)
+                 for (d, k, s, p, di)
+                 in zip(dims, ksize, stride, pad, dilate))
+    assert all(out > 0 for out in outs), 'Output sizes should be positive.'
+
+    pad_width = _window_pad_width(dims, ksize, stride, pad, outs, dilate)
+    if any(before or after for (before, after) in pad_width):
+        img = numpy.pad(img, ((0, 0), (0, 0)) + pad_width, mode='constant',
+                        constant_values=(pval,))
+    strides = img.strides[2:]
+    col = numpy.lib.stride_tricks.as_strided(
+        img, (n, c) + tuple(ksize) + outs,
+        img.strides[:2] + tuple(st * di for (st, di) in zip(strides, dilate))
+        + tuple(st * s for (st, s) in zip(strides, stride)))
+    col.flags.writeable = False
+    return col
+
+
+def _window_slices(col):
+    # Iterates over the positions in the patches of a view returned by
+    # im2col_nd_view_cpu and the strided arrays of the elements at them.
+    ndim = (col.ndim - 2) // 2
+    colon = slice(None)
+    for kxs in itertools.product(
+            *[six.moves.range(k) for k in col.shape[2:2 + ndim]]):
+        yield col[(colon, colon) + kxs]
+
+
+def max_windows_nd_cpu(col, return_indices=False):
+    """Computes the maxima of the patches.
+
+    Args:
+        col (numpy.ndarray): Patches of shape
+            ``(n, c, k_1, ..., k_N, out_1, ..., out_N)``, typically a view
+            returned by :func:`im2col_nd_view_cpu`.
+        return_indices (bool): If ``True``, the indices of the maxima in the
+            flattened patches are also returned. The first one is chosen
+            among the equal maxima, like :func:`numpy.argmax`.
+
+    Returns:
+        numpy.ndarray or tuple: The maxima of shape
+        ``(n, c, out_1, ..., out_N)``, and their indices if
+        ``return_indices`` is ``True``.
+
+    """
+    slices = _window_slices(col)
+    y = next(slices).copy()
+    if not return_indices:
+        for x in slices:
+            numpy.maximum(y, x, out=y)
+        return y
+
+    indexes = numpy.zeros(y.shape, dtype=numpy.intp)
+    mask = numpy.empty(y.shape, dtype=numpy.bool_)
+    for i, x in enumerate(slices, 1):
+        numpy.greater(x, y, out=mask)
+        numpy.maximum(y, x, out=y)
+        numpy.putmask(indexes, mask, i)
+    return y, indexes
+
+
+def sum_windows_nd_cpu(col):
+    """Computes the sums of the patches.
+
+    Args:
+        col (numpy.ndarray): Patches of shape
+            ``(n, c, k_1, ..., k_N, out_1, ..., out_N)``, typically a view
+            returned by :func:`im2col_nd_view_cpu`.
+
+    Returns:
+        numpy.ndarray: The sums of shape ``(n, c, out_1, ..., out_N)``.
+
+    """
+    slices = _window_slices(col)
+    y = next(slices).copy()
+    for x in slices:
+        y += x
+    return y
+
+
+def take_windows_nd_cpu(col, indexes):
+    """Takes the elements of the patches at the given indices.
+
+    Args:
+        col (numpy.ndarray): Patches of shape
+            ``(n, c, k_1, ..., k_N, out_1, ..., out_N)``, typically a view
+            returned by :func:`im2col_nd_view_cpu`.
+        indexes (numpy.ndarray): Indices in the flattened patches of shape
+            ``(n, c, out_1, ..., out_N)``.
+
+    Returns:
+        numpy.ndarray: The elements of shape ``(n, c, out_1, ..., out_N)``.
+
+    """
+    y = numpy.empty(indexes.shape, dtype=col.dtype)
+    for i, x in enumerate(_window_slices(col)):
+        numpy.copyto(y, x, where=indexes == i)
+    return y
+
+
+def scatter_windows_nd_cpu(values, indexes, ksize, stride, pad, dims,
+                           dilate=1):
+    """Adds values to the elements of the patches at the given indices.
+
+    This is the transpose of :func:`take_windows_nd_cpu`, e.g. the gradient
+    of max pooling. Unlike :func:`col2im_nd_cpu`, the patches are not
+    materialized. The values are written to the flat indices of the elements
+    of the image, which are accumulated by :func:`numpy.bincount` only if the
+    patches overlap.
+
+    Args:
+        values (numpy.ndarray): Values of shape
+            ``(n, c, out_1, ..., out_N)``.
+        indexes (numpy.ndarray): Indices in the flattened patches of the
+            same shape as ``values``.
+        dims (tuple of ints): Shape of the image ``(d_1, ..., d_N)``.
+
+    Returns:
+        numpy.ndarray: The image of shape ``(n, c, d_1, ..., d_N)``.
+
+    """
+    n, c = values.shape[:2]
+    outs = values.shape[2:]
+    ndim = len(dims)
+    dilate = as_tuple(dilate, ndim)
+    assert ndim == len(ksize) == len(stride) == len(pad) == len(outs)
+
+    pad_width = _window_pad_width(dims, ksize, stride, pad, outs, dilate)
+    padded = tuple(d + before + after
+                   for (d, (before, after)) in zip(dims, pad_width))
+    steps = numpy.cumprod((1,) + padded[:0:-1])[::-1]
+    plane = int(numpy.prod(padded))
+    size = n * c * plane
+
+    # Flat indices of the first elements of the patches, and the offsets of
+    # the elements in the patches
+    starts = (numpy.arange(n * c) * plane).reshape((n, c) + (1,) * ndim)
+    offsets = numpy.zeros((), dtype=numpy.intp)
+    for i in six.moves.range(ndim):
+        shape = (-1,) + (1,) * (ndim - 1 - i)
+        starts = starts + (numpy.arange(outs[i]) * (
+            stride[i] * steps[i])).reshape(shape)
+        offsets = (offsets[..., None] +
+                   numpy.arange(ksize[i]) * (dilate[i] * steps[i])).ravel()
+    targets = (starts + offsets[indexes]).ravel()
+
+    if all(s >= (k - 1) * di + 1
+           for (k, s, di) in zip(ksize, stride, dilate)):
+        # The patches do not overlap, so the indices are unique
+        img = numpy.zeros(size, dtype=values.dtype)
+        img[targets] = values.ravel()
+    else:
+        img = numpy.bincount(targets, weights=values.ravel(),
+                             minlength=size).astype(values.dtype, copy=False)
+
+    img = img.reshape((n, c) + padded)
+    colon = slice(None)
+    return img[(colon, colon) + tuple(
+        slice(p, d + p) for (p, d) in zip(pad, dims))]
+
+
 def col2im_nd_gpu(col, stride, pad, dims, dilate=1):
     n, c = col.shape[:2]        # (n, c, k_1, ..., k_N, out_1, ..., out_N)
     mid = (len(col.shape) - 2) // 2 + 2
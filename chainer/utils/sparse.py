@@ -1,3 +1,5 @@
+import numpy
+
 import chainer
 from chainer.backends import cuda
 
@@ -126,3 +128,126 @@ def to_coo(x, ldnz=None, requires_grad=False):
         return CooMatrix(data, row, col, shape, requires_grad)
     else:
         raise ValueError('ndim of x must be 2 or 3.')
+
+
+class RowSparseArray(object):
+
+    """An array whose non-zero entries are in a subset of its rows.
+
+    This is the format of the gradients of parameters of which each update
+    only touches a few rows, e.g. the embedding matrix of
+    :func:`~chainer.functions.embed_id`. The array is represented by the
+    indices of the rows and the values of them. The same row may appear more
+    than once, in which case the values are summed up;
+    :meth:`coalesce` computes the sums of the duplicated rows.
+
+    Args:
+        rows (numpy.ndarray or cupy.ndarray): One-dimensional integer array of
+            the row indices.
+        values (numpy.ndarray or cupy.ndarray): Values of the rows. Its shape
+            is ``(len(rows),) + shape[1:]``.
+        shape (tuple of int): The shape of the array in dense format.
+        coalesced (bool): If ``True``, the rows are assumed to be sorted and
+            unique.
+
+    Attributes:
+        rows: Row indices.
+        values: Values of the rows.
+        shape (tuple of int): The shape of the array in dense format.
+        coalesced (bool): ``True`` if the rows are sorted and unique.
+
+    """
+
+    def __init__(self, rows, values, shape, coalesced=False):
+        shape = tuple(shape)
+        if rows.ndim != 1:
+            raise ValueError('ndim of rows must be 1.')
+        if values.shape != rows.shape + shape[1:]:
+            raise ValueError(
+                'shape of values must be {}, but is {}.'.format(
+                    rows.shape + shape[1:], values.shape))
+        self.rows = rows
+        self.values = values
+        self.shape = shape
+        self.coalesced = coalesced
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @staticmethod
+    def concatenate(arrays):
+        """Concatenates row-sparse arrays of the same shape.
+
+        The result represents the sum of the arrays.
+
+        Args:
+            arrays (list of RowSparseArray): Arrays to concatenate.
+
+        Returns:
+            RowSparseArray: The concatenated array.
+
+        """
+        if len(arrays) == 1:
+            return arrays[0]
+        shape = arrays[0].shape
+        if any([a.shape != shape for a in arrays]):
+            raise ValueError('shapes of the arrays must be the same.')
+        xp = cuda.get_array_module(arrays[0].values)
+        return RowSparseArray(
+            xp.concatenate([a.rows for a in arrays]),
+            xp.concatenate([a.values for a in arrays]), shape)
+
+    def coalesce(self):
+        """Returns the equivalent array of sorted and unique rows.
+
+        The values of the duplicated rows are summed up by a segment sum over
+        the rows sorted once, instead of scattering them one by one.
+
+        Returns:
+            RowSparseArray: The coalesced array. It is ``self`` if it is
+            already coalesced.
+
+        """
+        if self.coalesced:
+            return self
+        xp = cuda.get_array_module(self.values)
+        rows = self.rows
+        if len(rows) == 0:
+            return RowSparseArray(rows, self.values, self.shape, True)
+        order = rows.argsort()
+        rows = rows[order]
+        values = self.values[order]
+        boundary = rows[1:] != rows[:-1]
+        starts = xp.concatenate((xp.zeros(1, dtype=numpy.int64),
+                                 xp.flatnonzero(boundary) + 1))
+        if xp is numpy:
+            sums = numpy.add.reduceat(values, starts, axis=0)
+        else:
+            segments = xp.concatenate((xp.zeros(1, dtype=numpy.int64),
+                                       xp.cumsum(boundary)))
+            sums = xp.zeros((len(starts),) + values.shape[1:],
+                            dtype=values.dtype)
+            cuda.cupyx.scatter_add(sums, segments, values)
+        return RowSparseArray(rows[starts], sums, self.shape, True)
+
+    def add_to(self, array):
+        """Adds this array to a dense array in place.
+
+        Args:
+            array (numpy.ndarray or cupy.ndarray): Dense array to add to.
+
+        """
+        if array.shape != self.shape:
+            raise ValueError('shape of the array must be {}.'.format(
+                self.shape))
+        grad = self.coalesce()
+        array[grad.rows] += grad.values
+
+    def to_dense(self):
+        """Returns the array in dense format."""
+        xp = cuda.get_array_module(self.values)
+        grad = self.coalesce()
+        array = xp.zeros(self.shape, dtype=self.dtype)
+        array[grad.rows] = grad.values
+        return array
@@ -14,6 +14,7 @@ from chainer.backends import intel64
 from chainer import initializers
 from chainer.initializers import constant
 from chainer.utils import argument
+from chainer.utils import sparse
 
 
 def _check_grad_type(func, x, gx):
@@ -53,6 +54,124 @@ https://github.com/chainer/chainer/issues/new.
     raise typ(detail + msg)
 
 
+def _grad_nbytes(gx):
+    if gx is None:
+        return 0
+    if isinstance(gx, tuple):
+        return sum([_grad_nbytes(g) for g in gx])
+    data = gx.data
+    return 0 if data is None else data.nbytes
+
+
+class _BackwardMemoryPlanner(object):
+
+    """Releases retained arrays of a graph right after their last consumers.
+
+    The planner analyses the graph reachable from the given function node
+    before backprop starts and counts, for each retained array, the number of
+    function nodes that keep a reference to it. The array is released from
+    the graph once all of these function nodes finish their backward
+    computation.
+
+    The planner also keeps track of the total size of retained arrays and
+    gradients alive during backprop to estimate how much the peak memory
+    consumption is reduced compared to the case without releasing arrays.
+
+    """
+
+    def __init__(self, root):
+        # id(array) -> [number of pending users, nbytes, holder nodes]
+        self._users = {}
+        self.retained_bytes = 0
+        self.grad_bytes = 0
+        self.released_bytes = 0
+        self.peak_bytes = 0
+        self.peak_bytes_without_release = 0
+
+        cand_funcs = [root]
+        seen_set = set(cand_funcs)
+        while cand_funcs:
+            func = cand_funcs.pop()
+            for node, data in self._retained(func):
+                entry = self._users.get(id(data))
+                if entry is None:
+                    entry = [0, data.nbytes, [], data]
+                    self._users[id(data)] = entry
+                    self.retained_bytes += data.nbytes
+                entry[0] += 1
+                if node is not None:
+                    entry[2].append(node)
+            for x in func.inputs:
+                creator = x.creator_node
+                if creator is not None and creator not in seen_set:
+                    cand_funcs.append(creator)
+                    seen_set.add(creator)
+
+        self._initial_retained_bytes = self.retained_bytes
+        self.update()
+
+    @staticmethod
+    def _retained(func):
+        ret = []
+        if func._input_indexes_to_retain is not None:
+            inputs = func.inputs
+            for index in func._input_indexes_to_retain:
+                node = inputs[index]
+                if node._data is not None:
+                    ret.append((node, node._data))
+        if func._retained_output_data is not None:
+            for index, data in zip(func._output_indexes_to_retain,
+                                   func._retained_output_data):
+                ret.append((func.outputs[index](), data))
+        return ret
+
+    def release(self, func):
+        """Releases the arrays whose last user is the given function node."""
+        for _, data in self._retained(func):
+            entry = self._users.get(id(data))
+            if entry is None:
+                continue
+            entry[0] -= 1
+            if entry[0] == 0:
+                for node in entry[2]:
+                    # Keep dtype and shape of the node
+                    node._data = None
+                del self._users[id(data)]
+                self.retained_bytes -= entry[1]
+                self.released_bytes += entry[1]
+        func._retained_output_data = None
+        self.update()
+
+    def update(self):
+        self.peak_bytes = max(
+            self.peak_bytes, self.retained_bytes + self.grad_bytes)
+        self.peak_bytes_without_release = max(
+            self.peak_bytes_without_release,
+            self._initial_retained_bytes + self.grad_bytes)
+
+    def report(self):
+        chainer.reporter.report({
+            'backward/released_bytes': self.released_bytes,
+            'backward/peak_bytes': self.peak_bytes,
+            'backward/peak_bytes_saved':
+                self.peak_bytes_without_release - self.peak_bytes,
+        })
+
+
+class _TrackedGradDict(dict):
+
+    """Gradient mapping which keeps track of the total size of gradients."""
+
+    def __init__(self, planner):
+        super(_TrackedGradDict, self).__init__()
+        self._planner = planner
+
+    def __setitem__(self, node, gx):
+        self._planner.grad_bytes += (
+            _grad_nbytes(gx) - _grad_nbytes(self.get(node)))
+        super(_TrackedGradDict, self).__setitem__(node, gx)
+
+
 def variable_repr(var):
     """Return the string representation of a variable.
 
@@ -152,12 +271,11 @@ class VariableNode(object):
 
     """
 
-    _creator_node = None
-    _data = None
-    _rank = 0
-    # Name of the Function is assigned if this variable is a gradient generated
-    # by an old-style Function
-    _old_style_grad_generator = None
+    # Graphs may consist of a huge number of variable nodes, so the attributes
+    # are stored in slots instead of __dict__ to reduce the memory footprint.
+    __slots__ = ('_variable', 'name', '_requires_grad', '_creator_node',
+                 '_data', '_rank', '_old_style_grad_generator', 'dtype',
+                 'shape', '__weakref__')
 
     def __init__(self, variable, name, **kwargs):
         if kwargs:
@@ -169,6 +287,12 @@ class VariableNode(object):
         self._variable = weakref.ref(variable)
         self.name = name
         self._requires_grad = variable.requires_grad
+        self._creator_node = None
+        self._data = None
+        self._rank = 0
+        # Name of the Function is assigned if this variable is a gradient
+        # generated by an old-style Function
+        self._old_style_grad_generator = None
 
         vdata = variable.data
         self._update_data_info(vdata)
@@ -410,6 +534,19 @@ def _create_variable(data, name, grad, requires_grad):
         data, name=name, grad=grad, requires_grad=requires_grad)
 
 
+def _create_variable_fast(data, requires_grad):
+    # Creates a variable wrapping an output array of a function without the
+    # argument checks of Variable.__init__. It must initialize the same
+    # attributes as Variable.__init__.
+    var = Variable.__new__(Variable)
+    var._data = [data]
+    var._requires_grad = requires_grad
+    var._node = VariableNode(var, None)
+    var._grad_var = None
+    var._loss_scale = None
+    return var
+
+
 class Variable(object):
 
     """__init__(data=None, *, name=None, grad=None, requires_grad=True)
@@ -467,6 +604,12 @@ class Variable(object):
 
     """  # NOQA
 
+    # Variables are created for every output of functions, so the attributes
+    # are stored in slots instead of __dict__ to reduce the memory footprint.
+    # Subclasses without __slots__ can still have arbitrary attributes.
+    __slots__ = ('_data', '_requires_grad', '_node', '_grad_var',
+                 '_loss_scale', '__weakref__')
+
     def __init__(self, data=None, **kwargs):
         name, grad, requires_grad = argument.parse_kwargs(
             kwargs, ('name', None), ('grad', None), ('requires_grad', True),
@@ -487,10 +630,14 @@ Actual: {0}'''.format(type(data))
         self._loss_scale = None
 
     def __copy__(self):
-        return self._copy_to(Variable())
+        return self._copy_to(object.__new__(type(self)))
 
     def _copy_to(self, target):
-        target.__dict__ = copy.copy(self.__dict__)
+        for name in Variable.__slots__:
+            if name != '__weakref__':
+                setattr(target, name, getattr(self, name))
+        if hasattr(self, '__dict__'):
+            target.__dict__ = copy.copy(self.__dict__)
         target._node = VariableNode(target, self.name)
         return target
 
@@ -908,7 +1055,8 @@ Actual: {0}'''.format(type(data))
         self._node.set_creator_node(fnode)
 
     def backward(self, retain_grad=False, enable_double_backprop=False,
-                 loss_scale=None):
+                 loss_scale=None, release_memory=False,
+                 accumulate_grad_inplace=False):
         """Runs error backpropagation (a.k.a.\\  backprop) from this variable.
 
         On backprop,
@@ -958,14 +1106,47 @@ Actual: {0}'''.format(type(data))
                 computational graph along the backprop. The gradients of
                 parameters are divided by the factor just before the parameters
                 are to be updated.
+            release_memory (bool): If ``True``, the graph is analysed before
+                backprop and each array retained by function nodes for backprop
+                is released right after the last function node using it
+                finishes its backward computation. It reduces the peak memory
+                consumption of backprop, while the graph cannot be
+                backpropagated again. The sizes of released arrays and the
+                estimated reduction of the peak memory in bytes are reported
+                to the current reporter as ``backward/released_bytes`` and
+                ``backward/peak_bytes_saved``, respectively. This option
+                cannot be used with ``enable_double_backprop``.
+            accumulate_grad_inplace (bool): If ``True``, the gradients w.r.t.
+                leaf :class:`~chainer.Parameter` objects are added in place
+                into their gradient arrays instead of building a new gradient
+                variable for each partial sum. If the gradient of a parameter
+                has been cleared, the array used in the previous backprop is
+                reused as the buffer. It avoids allocations when a parameter
+                is used many times in the graph, e.g. the weights of RNNs
+                unrolled over timesteps. Note that the gradient arrays
+                obtained before are overwritten. This option cannot be used
+                with ``enable_double_backprop``.
         """
-        with chainer.using_config('enable_backprop', enable_double_backprop):
-            self._backward_main(retain_grad, loss_scale)
-
-    def _backward_main(self, retain_grad, loss_scale):
+        if release_memory and enable_double_backprop:
+            raise ValueError(
+                'release_memory cannot be used with enable_double_backprop')
+        if accumulate_grad_inplace and enable_double_backprop:
+            raise ValueError(
+                'accumulate_grad_inplace cannot be used with '
+                'enable_double_backprop')
+        with chainer.using_config('enable_backprop', enable_double_backprop), \
+                _backprop_utils.loss_scale_scope(loss_scale):
+            planner = self._backward_main(
+                retain_grad, loss_scale, release_memory,
+                accumulate_grad_inplace)
+        if planner is not None:
+            planner.report()
+
+    def _backward_main(self, retain_grad, loss_scale, release_memory=False,
+                       accumulate_grad_inplace=False):
         self._node._check_old_style_gradient()
         if self.creator_node is None:
-            return
+            return None
         initial_device = None
         if cuda.available and isinstance(self.data, cuda.ndarray):
             try:
@@ -978,7 +1159,12 @@ Actual: {0}'''.format(type(data))
 
         cand_funcs = []
         seen_set = set()
-        grads = {}
+        if release_memory:
+            planner = _BackwardMemoryPlanner(self.creator_node)
+            grads = _TrackedGradDict(planner)
+        else:
+            planner = None
+            grads = {}
 
         # Initialize error by 1, if this is a loss variable
         if self.data.size == 1 and self._grad_var is None:
@@ -1015,6 +1201,11 @@ Actual: {0}'''.format(type(data))
                 return grads[node]
             return node.grad_var
 
+        def is_inplace_target(node):
+            # Gradients w.r.t. leaf parameters are accumulated in place
+            return (accumulate_grad_inplace and node.creator_node is None and
+                    isinstance(node.get_variable_or_none(), Parameter))
+
         def set_grad(node, value):
             if node is None:
                 return
@@ -1031,6 +1222,8 @@ Actual: {0}'''.format(type(data))
                 i for i, x in enumerate(inputs) if x.requires_grad
             ])
             if not target_input_indexes:
+                if planner is not None:
+                    planner.release(func)
                 continue
             outputs = [y() for y in func.outputs]  # access via weak ref
 
@@ -1077,6 +1270,9 @@ Actual: {0}'''.format(type(data))
                     # Pass ``None`` for duplicated input variables except for
                     # the first occurrence (see the comment above).
                     gx = None
+                elif is_inplace_target(x):
+                    # The partial gradient is added to the buffer later
+                    gx = None
                 elif x in grads:
                     gx = grads[x]
                 elif x.creator_node is None:
@@ -1095,6 +1291,10 @@ Actual: {0}'''.format(type(data))
             for hook in hooks:
                 hook.backward_postprocess(func, in_data, out_grad_data)
 
+            if planner is not None:
+                del in_data
+                planner.release(func)
+
             if is_debug:
                 # gxs can be a tuple of tuples of variables (in case of
                 # lazy-grad-sum).
@@ -1145,6 +1345,12 @@ Actual: {0}'''.format(type(data))
                 else:
                     _check_grad_type(func, x, gx.data)
 
+                if is_inplace_target(x):
+                    x_var = x.get_variable()
+                    x_var._accumulate_grad(gx)
+                    x_var._loss_scale = loss_scale
+                    continue
+
                 if x in target_inputs[:i]:
                     # Accumulate the duplicated gradients here. See the comment
                     # above the code that builds ``in_grad``.
@@ -1171,9 +1377,13 @@ Actual: {0}'''.format(type(data))
                     add_cand(x.creator_node)
 
             del gxs  # to reduce memory usage
+            if planner is not None:
+                planner.update()
             if initial_device is not None:
                 initial_device.use()
 
+        return planner
+
     def reshape(self, *shape):
         """Returns a variable of a different shape and the same content.
 
@@ -1325,6 +1535,10 @@ class Parameter(Variable):
     _grad_initializer = None
     _initial_backend = None
     _initial_device = None
+    # Gradient array reused by in-place gradient accumulation
+    _grad_buffer = None
+    # Row-sparse gradients added apart from the dense gradient
+    _sparse_grads = None
 
     def __init__(self, initializer=None, shape=None, name=None):
         if initializer is None:
@@ -1355,20 +1569,27 @@ class Parameter(Variable):
         self.initializer = initializer
 
     def __copy__(self):
-        return self._copy_to(Parameter())
+        ret = self._copy_to(Parameter())
+        ret._grad_buffer = None
+        ret._sparse_grads = None
+        return ret
 
     def __reduce__(self):
         return _recover_parameter, (self.data, self.name, self.grad,
                                     self.initializer, self.update_rule)
 
     def to_cpu(self):
+        self._densify_grad()
         super(Parameter, self).to_cpu()
+        self._grad_buffer = None
         if self.data is None:
             self._initial_backend = None
             self._initial_device = None
 
     def to_gpu(self, device=None):
+        self._densify_grad()
         super(Parameter, self).to_gpu(device)
+        self._grad_buffer = None
         if self.data is None:
             if device is None:
                 device = cuda.Device().id
@@ -1376,18 +1597,121 @@ class Parameter(Variable):
             self._initial_device = device
 
     def to_intel64(self):
+        self._densify_grad()
         super(Parameter, self).to_intel64()
+        self._grad_buffer = None
         if self.data is None:
             self._initial_backend = 'intel64'
             self._initial_device = None
 
     def cleargrad(self):
         super(Parameter, self).cleargrad()
+        self._sparse_grads = None
         if self.data is None:
             self._grad_initializer = None
 
+    @property
+    def sparse_grad(self):
+        """Row-sparse gradient of the parameter.
+
+        Functions like :func:`~chainer.functions.embed_id` can add the
+        gradient of the parameter as a :class:`~chainer.utils.RowSparseArray`
+        instead of accumulating it into :attr:`grad`. The sparse gradient is
+        kept apart from :attr:`grad`, and the update rule applies it without
+        making the dense gradient if possible. It is coalesced on the access,
+        and is ``None`` if no sparse gradients have been added. It is cleared
+        by :meth:`cleargrad` and :meth:`zerograd`.
+
+        """
+        grads = self._sparse_grads
+        if not grads:
+            return None
+        if len(grads) > 1 or not grads[0].coalesced:
+            grads = [sparse.RowSparseArray.concatenate(grads).coalesce()]
+            self._sparse_grads = grads
+        return grads[0]
+
+    def _add_sparse_grad(self, grad, loss_scale=None):
+        # The loss scale of the backprop computing the gradient is recorded
+        # as the dense gradients do, since it is not passed through the graph
+        if self._sparse_grads is None:
+            self._sparse_grads = []
+        self._sparse_grads.append(grad)
+        self._loss_scale = loss_scale
+
+    def _densify_grad(self):
+        # Adds the sparse gradient to the dense gradient, which is then the
+        # only gradient of the parameter.
+        grad = self.sparse_grad
+        if grad is None:
+            return
+        self._sparse_grads = None
+        with cuda.get_device_from_array(grad.values):
+            if self.grad is None:
+                self.grad = grad.to_dense()
+            else:
+                grad.add_to(self.grad)
+
+    def addgrad(self, var):
+        super(Parameter, self).addgrad(var)
+        self._addgrad_sparse(var)
+
+    def _addgrad_sparse(self, var):
+        # Adds copies of the sparse gradients of the source variable, which
+        # are transferred to the device of this parameter.
+        grads = getattr(var, '_sparse_grads', None)
+        if not grads:
+            return
+        if self.data is None:
+            self.initialize(var.shape)
+        dst_dev = cuda.get_device_from_array(self.data)
+        for grad in grads:
+            if cuda.get_device_from_array(grad.values).id != dst_dev.id:
+                if dst_dev.id >= 0:
+                    rows = cuda.to_gpu(grad.rows, dst_dev.id)
+                    values = cuda.to_gpu(grad.values, dst_dev.id)
+                else:
+                    rows = cuda.to_cpu(grad.rows)
+                    values = cuda.to_cpu(grad.values)
+            else:
+                with dst_dev:
+                    rows = grad.rows.copy()
+                    values = grad.values.copy()
+            self._add_sparse_grad(sparse.RowSparseArray(
+                rows, values, grad.shape, grad.coalesced), self._loss_scale)
+
+    def _accumulate_grad(self, gx):
+        # Adds a partial gradient into the gradient array in place. If the
+        # gradient is cleared, the array of the previous backprop is reused.
+        if isinstance(gx, tuple):
+            for g in gx:
+                self._accumulate_grad(g)
+            return
+
+        gv = self._grad_var
+        g = gx.data
+        if not isinstance(g, (numpy.ndarray, cuda.ndarray)):
+            # Arrays of other backends are accumulated out of place
+            self._grad_var = gx if gv is None else gx + gv
+            return
+
+        with cuda.get_device_from_array(g):
+            if gv is not None:
+                gdata = gv.data
+                gdata += g
+                return
+            buf = self._grad_buffer
+            if (type(buf) is not type(g) or buf.shape != g.shape or
+                    buf.dtype != g.dtype):
+                buf = g.copy()
+            else:
+                buf[...] = g
+        self._grad_buffer = buf
+        self._grad_var = Variable(buf)
+
     def zerograd(self):
         super(Parameter, self).zerograd()
+        self._sparse_grads = None
         if self.data is None:
             dtype = getattr(self.initializer, 'dtype', None)
             self._grad_initializer = initializers.Zero(dtype)
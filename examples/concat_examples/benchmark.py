@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Benchmark of batch collation by concat_examples.
+
+This script measures the time of converting a list of examples into batch
+arrays with :func:`chainer.dataset.concat_examples` and
+:class:`chainer.dataset.ConcatWithBuffers` over combinations of the batch size
+and the example size. Each example is a tuple of a float32 feature vector and
+an int32 label, as in tabular datasets. The variable-length case makes token
+sequences of random lengths up to the example size and pads them.
+"""
+from __future__ import print_function
+import argparse
+import timeit
+
+import numpy
+
+from chainer import dataset
+
+
+def make_batch(batch_size, example_size, variable_length):
+    if variable_length:
+        lengths = numpy.random.randint(1, example_size + 1, batch_size)
+        return [(numpy.arange(n, dtype=numpy.int32), numpy.int32(0))
+                for n in lengths]
+    x = numpy.random.rand(batch_size * 4, example_size).astype(numpy.float32)
+    t = numpy.random.randint(0, 10, batch_size * 4).astype(numpy.int32)
+    # Examples are slices of dataset arrays taken in a shuffled order
+    order = numpy.random.permutation(len(x))[:batch_size]
+    return [(x[i], t[i]) for i in order]
+
+
+def bench(func, n_call):
+    func()
+    return min(timeit.repeat(func, number=n_call, repeat=5)) / n_call
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark of batch collation')
+    parser.add_argument('--batchsizes', '-b', type=int, nargs='+',
+                        default=[32, 256, 2048])
+    parser.add_argument('--sizes', '-s', type=int, nargs='+',
+                        default=[4, 64, 1024])
+    parser.add_argument('--call', '-n', type=int, default=20)
+    parser.add_argument('--variable-length', action='store_true',
+                        help='Pad examples of variable lengths')
+    args = parser.parse_args()
+
+    padding = -1 if args.variable_length else None
+    converter = dataset.ConcatWithBuffers()
+    print('batchsize\texample size\tconcat_examples [us]\t'
+          'ConcatWithBuffers [us]')
+    for batch_size in args.batchsizes:
+        for size in args.sizes:
+            batch = make_batch(batch_size, size, args.variable_length)
+            t_concat = bench(
+                lambda: dataset.concat_examples(batch, padding=padding),
+                args.call)
+            t_buffers = bench(
+                lambda: converter(batch, padding=padding), args.call)
+            print('{}\t{}\t{:.1f}\t{:.1f}'.format(
+                batch_size, size, t_concat * 1e6, t_buffers * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""Benchmark of the convolutions on CPU.
+
+This script measures the time and the peak memory of the forward and backward
+computation of :func:`~chainer.functions.convolution_2d` for the shapes of
+the convolutional layers of ResNet-50. The memory is measured using
+:mod:`tracemalloc`, which traces the buffers allocated by NumPy, so that it
+includes the temporary buffers such as the columns expanded by im2col.
+"""
+from __future__ import print_function
+import argparse
+import sys
+import timeit
+
+import numpy
+
+import chainer
+import chainer.functions as F
+
+
+# (name, in_channels, out_channels, size, ksize, stride, pad)
+resnet50_layers = [
+    ('conv1', 3, 64, 224, 7, 2, 3),
+    ('res2_1x1_reduce', 256, 64, 56, 1, 1, 0),
+    ('res2_3x3', 64, 64, 56, 3, 1, 1),
+    ('res2_1x1_expand', 64, 256, 56, 1, 1, 0),
+    ('res3_1x1_stride', 256, 128, 56, 1, 2, 0),
+    ('res3_3x3', 128, 128, 28, 3, 1, 1),
+    ('res4_3x3', 256, 256, 14, 3, 1, 1),
+    ('res4_1x1_expand', 256, 1024, 14, 1, 1, 0),
+    ('res5_3x3', 512, 512, 7, 3, 1, 1),
+    ('res5_1x1_expand', 512, 2048, 7, 1, 1, 0),
+]
+
+
+def measure(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def peak_memory(func):
+    if sys.version_info < (3, 4):
+        return float('nan')
+    import tracemalloc
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark of the convolutions on CPU')
+    parser.add_argument('--batchsize', '-b', type=int, default=8,
+                        help='Number of images in each mini-batch')
+    parser.add_argument('--repeat', '-r', type=int, default=3,
+                        help='Number of repetitions of the measurement')
+    args = parser.parse_args()
+
+    print('layer\tforward (ms)\tbackward (ms)\tpeak memory (MiB)')
+    for name, in_c, out_c, size, ksize, stride, pad in resnet50_layers:
+        x = chainer.Variable(numpy.random.uniform(
+            -1, 1, (args.batchsize, in_c, size, size)).astype(numpy.float32))
+        W = chainer.Variable(numpy.random.uniform(
+            -1, 1, (out_c, in_c, ksize, ksize)).astype(numpy.float32))
+
+        def forward():
+            return F.convolution_2d(x, W, stride=stride, pad=pad)
+
+        y = forward()
+        gy = numpy.ones_like(y.array)
+
+        def forward_backward():
+            x.cleargrad()
+            W.cleargrad()
+            y = forward()
+            y.grad = gy
+            y.backward()
+
+        t_forward = measure(forward, args.repeat)
+        t_total = measure(forward_backward, args.repeat)
+        peak = peak_memory(forward_backward)
+        print('{}\t{:.1f}\t{:.1f}\t{:.1f}'.format(
+            name, t_forward * 1e3, (t_total - t_forward) * 1e3,
+            peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
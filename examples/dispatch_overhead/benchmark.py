@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Microbenchmark of the per-call dispatch overhead of functions.
+
+This script measures the time of calling common functions on tiny CPU arrays,
+for which the time is dominated by the Python overhead of
+:meth:`chainer.FunctionNode.apply` rather than by the computation itself.
+Each function is measured both in the backprop mode and in the no-backprop
+mode.
+"""
+from __future__ import print_function
+import argparse
+import timeit
+
+import numpy
+
+import chainer
+import chainer.functions as F
+
+
+def make_cases(size):
+    x = chainer.Variable(numpy.ones((2, size), dtype=numpy.float32))
+    y = chainer.Variable(numpy.ones((2, size), dtype=numpy.float32))
+    W = chainer.Parameter(numpy.ones((size, size), dtype=numpy.float32))
+    b = chainer.Parameter(numpy.ones((size,), dtype=numpy.float32))
+    return [
+        ('add', lambda: x + y),
+        ('linear', lambda: F.linear(x, W, b)),
+        ('relu', lambda: F.relu(x)),
+        ('reshape', lambda: F.reshape(x, (size, 2))),
+        ('get_item', lambda: x[0]),
+    ]
+
+
+def bench(func, n_call):
+    func()
+    return min(timeit.repeat(func, number=n_call, repeat=5)) / n_call
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Microbenchmark of function dispatch overhead')
+    parser.add_argument('--size', '-s', type=int, default=4)
+    parser.add_argument('--call', '-n', type=int, default=10000)
+    args = parser.parse_args()
+
+    print('function\tbackprop [us]\tno-backprop [us]')
+    for name, func in make_cases(args.size):
+        t_backprop = bench(func, args.call)
+        with chainer.no_backprop_mode():
+            t_no_backprop = bench(func, args.call)
+        print('{}\t{:.2f}\t{:.2f}'.format(
+            name, t_backprop * 1e6, t_no_backprop * 1e6))
+
+
+if __name__ == '__main__':
+    main()
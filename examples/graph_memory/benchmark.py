@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Measurement of the memory consumed by computational graph objects.
+
+This script builds a long computational graph by unrolling a chain of small
+functions, like an RNN unrolled over many timesteps, and measures the memory
+allocated for the graph using :mod:`tracemalloc`. The size of the data arrays
+is excluded by reusing the same array for all the inputs, so the result shows
+the footprint of :class:`~chainer.Variable`, :class:`~chainer.VariableNode`
+and :class:`~chainer.FunctionNode` objects per function application.
+"""
+from __future__ import print_function
+import argparse
+import gc
+import sys
+import timeit
+
+import numpy
+
+import chainer
+import chainer.functions as F
+
+
+class Identity(chainer.FunctionNode):
+
+    # Returns the input array as is to exclude the size of arrays from the
+    # measurement
+    def forward(self, inputs):
+        return inputs
+
+    def backward(self, indexes, grad_outputs):
+        return grad_outputs
+
+
+def build_graph(x, length):
+    h = x
+    for _ in range(length):
+        h, = Identity().apply((h,))
+    return h
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measurement of the memory of computational graphs')
+    parser.add_argument('--length', '-l', type=int, default=100000,
+                        help='Number of function applications in the graph')
+    args = parser.parse_args()
+
+    if sys.version_info < (3, 4):
+        print('This script requires tracemalloc of Python 3.4 or later.')
+        return
+    import tracemalloc
+
+    x = chainer.Variable(numpy.zeros((1,), dtype=numpy.float32))
+    build_graph(x, 10)
+    gc.collect()
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    y = build_graph(x, args.length)
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    print('bytes per function application: {:.1f}'.format(
+        size / args.length))
+    print('(Variable, VariableNode and FunctionNode with its edges)')
+
+    def build_and_backward():
+        F.sum(build_graph(x, args.length)).backward()
+
+    del y
+    gc.collect()
+    print('time to build and backprop the graph: {:.3f} sec'.format(
+        min(timeit.repeat(build_and_backward, number=1, repeat=3))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""Benchmark of the per-iteration overhead of chainer.static_graph.
+
+This script measures the time of one forward and backward iteration of small
+models, for which the computation time is dominated by the Python overhead of
+building and traversing the computational graph. Each model is run with and
+without :func:`chainer.static_graph`.
+"""
+from __future__ import print_function
+import argparse
+import timeit
+
+import numpy
+
+import chainer
+import chainer.functions as F
+import chainer.links as L
+
+
+class MLP(chainer.Chain):
+
+    def __init__(self, n_units, n_layers):
+        super(MLP, self).__init__()
+        with self.init_scope():
+            self.layers = chainer.ChainList(
+                *[L.Linear(n_units, n_units) for _ in range(n_layers)])
+
+    def forward(self, x, t):
+        h = x
+        for layer in self.layers:
+            h = F.relu(layer(h))
+        return F.mean_squared_error(h, t)
+
+
+class StaticMLP(MLP):
+
+    @chainer.static_graph
+    def forward(self, x, t):
+        return super(StaticMLP, self).forward(x, t)
+
+
+class RNN(chainer.Chain):
+
+    def __init__(self, n_units):
+        super(RNN, self).__init__()
+        with self.init_scope():
+            self.cell = L.StatelessLSTM(n_units, n_units)
+
+    def step(self, c, h, x):
+        return self.cell(c, h, x)
+
+    def forward(self, xs, t):
+        c = h = None
+        for x in xs:
+            c, h = self.step(c, h, x)
+        return F.mean_squared_error(h, t)
+
+
+class StaticRNN(RNN):
+
+    @chainer.static_graph
+    def step(self, c, h, x):
+        return super(StaticRNN, self).step(c, h, x)
+
+
+def bench(model, args, n_iter):
+    def iteration():
+        model.cleargrads()
+        loss = model(*args)
+        loss.backward()
+
+    iteration()
+    iteration()
+    return min(timeit.repeat(iteration, number=n_iter, repeat=3)) / n_iter
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark of chainer.static_graph')
+    parser.add_argument('--batchsize', '-b', type=int, default=8)
+    parser.add_argument('--unit', '-u', type=int, default=32)
+    parser.add_argument('--layer', '-l', type=int, default=4)
+    parser.add_argument('--length', type=int, default=8,
+                        help='Number of unrolled RNN steps')
+    parser.add_argument('--iteration', '-i', type=int, default=200)
+    args = parser.parse_args()
+
+    x = numpy.random.uniform(
+        -1, 1, (args.batchsize, args.unit)).astype(numpy.float32)
+    t = numpy.random.uniform(
+        -1, 1, (args.batchsize, args.unit)).astype(numpy.float32)
+    xs = [x] * args.length
+
+    print('model\tdefine-by-run [us]\tstatic graph [us]\tspeedup')
+    for name, normal, static, inputs in [
+            ('MLP', MLP(args.unit, args.layer),
+             StaticMLP(args.unit, args.layer), (x, t)),
+            ('LSTM', RNN(args.unit), StaticRNN(args.unit), (xs, t))]:
+        static.copyparams(normal)
+        t_normal = bench(normal, inputs, args.iteration)
+        t_static = bench(static, inputs, args.iteration)
+        print('{}\t{:.1f}\t{:.1f}\t{:.2f}x'.format(
+            name, t_normal * 1e6, t_static * 1e6, t_normal / t_static))
+
+
+if __name__ == '__main__':
+    main()
@@ -153,6 +153,7 @@ setup(
               'chainer.functions.theano',
               'chainer.functions.util',
               'chainer.function_hooks',
+              'chainer.graph_optimizations',
               'chainer.iterators',
               'chainer.initializers',
               'chainer.links',
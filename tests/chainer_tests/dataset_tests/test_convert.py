@@ -260,6 +260,149 @@ class TestConcatExamplesWithBuiltInTypes(unittest.TestCase):
                                  expected_type=numpy.float64)
 
 
+class TestConcatExamplesNumpy(unittest.TestCase):
+
+    def check_padding(self, arrays, padding=-1):
+        array = dataset.concat_examples(arrays, padding=padding)
+        shape = numpy.max([a.shape for a in arrays], axis=0)
+        self.assertEqual(array.shape, (len(arrays),) + tuple(shape))
+        self.assertEqual(array.dtype, arrays[0].dtype)
+        expect = numpy.full(array.shape, padding, dtype=array.dtype)
+        for i, a in enumerate(arrays):
+            expect[(i,) + tuple(slice(dim) for dim in a.shape)] = a
+        numpy.testing.assert_array_equal(array, expect)
+
+    def test_padding_variable_length(self):
+        self.check_padding([numpy.arange(n, dtype=numpy.int32)
+                            for n in (3, 0, 5, 1)])
+
+    def test_padding_variable_length_2d(self):
+        self.check_padding([numpy.random.rand(n, 2) for n in (3, 1, 2)])
+
+    def test_padding_same_shape(self):
+        self.check_padding([numpy.random.rand(2, 3) for _ in range(4)])
+
+    def test_padding_mixed_dtypes(self):
+        self.check_padding([numpy.arange(3, dtype=numpy.int32),
+                            numpy.arange(2, dtype=numpy.float64)])
+        self.check_padding([numpy.arange(3, dtype=numpy.int32),
+                            numpy.arange(3, dtype=numpy.float64)])
+
+    def test_mixed_dtypes(self):
+        arrays = [numpy.arange(3, dtype=numpy.int32),
+                  numpy.arange(3, dtype=numpy.float64)]
+        array = dataset.concat_examples(arrays)
+        self.assertEqual(array.dtype, numpy.float64)
+        numpy.testing.assert_array_equal(array, [[0, 1, 2], [0, 1, 2]])
+
+    def test_scalar_arrays(self):
+        arrays = [numpy.array(i, dtype=numpy.float32) for i in range(3)]
+        array = dataset.concat_examples(arrays)
+        self.assertEqual(array.dtype, numpy.float32)
+        numpy.testing.assert_array_equal(array, [0, 1, 2])
+
+    def test_stacked_batch(self):
+        batch = numpy.random.rand(4, 3)
+        array = dataset.concat_examples(batch[1:])
+        self.assertIsNot(array, batch)
+        self.assertFalse(numpy.may_share_memory(array, batch))
+        numpy.testing.assert_array_equal(array, batch[1:])
+
+    def test_shape_mismatch(self):
+        with self.assertRaises(ValueError):
+            dataset.concat_examples(
+                [numpy.zeros((1, 3)), numpy.zeros((3, 3))])
+
+
+class TestConcatExamplesExampleBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.rand(4, 3).astype(numpy.float32)
+        self.t = numpy.arange(4, dtype=numpy.int32)
+
+    def test_tuple(self):
+        batch = dataset.ExampleBatch((self.x, self.t))
+        arrays = dataset.concat_examples(batch)
+        self.assertIs(arrays[0], self.x)
+        self.assertIs(arrays[1], self.t)
+
+    def test_dict(self):
+        batch = dataset.ExampleBatch({'x': self.x, 't': self.t})
+        arrays = dataset.concat_examples(batch)
+        self.assertIs(arrays['x'], self.x)
+        self.assertIs(arrays['t'], self.t)
+
+    def test_modified(self):
+        batch = dataset.ExampleBatch(self.x)
+        batch.pop()
+        array = dataset.concat_examples(batch)
+        numpy.testing.assert_array_equal(array, self.x[:3])
+
+    @attr.gpu
+    def test_to_gpu(self):
+        batch = dataset.ExampleBatch((self.x, self.t))
+        arrays = dataset.concat_examples(batch, device=cuda.Device().id)
+        self.assertIsInstance(arrays[0], cuda.ndarray)
+        numpy.testing.assert_array_equal(cuda.to_cpu(arrays[0]), self.x)
+
+
+class TestConcatWithBuffers(unittest.TestCase):
+
+    def get_batch(self):
+        return [(numpy.random.rand(2, 3).astype(numpy.float32), i)
+                for i in range(4)]
+
+    def check_batch(self, arrays, batch):
+        numpy.testing.assert_array_equal(
+            arrays[0], numpy.stack([x for x, _ in batch]))
+        numpy.testing.assert_array_equal(arrays[1], [t for _, t in batch])
+
+    def test_concat(self):
+        converter = dataset.ConcatWithBuffers()
+        batch = self.get_batch()
+        self.check_batch(converter(batch), batch)
+
+    def test_reuse(self):
+        converter = dataset.ConcatWithBuffers(n_buffers=2)
+        batches = [self.get_batch() for _ in range(3)]
+        arrays = [converter(batch) for batch in batches]
+        self.assertIsNot(arrays[0][0], arrays[1][0])
+        self.assertIs(arrays[0][0], arrays[2][0])
+        self.assertIs(arrays[0][1], arrays[2][1])
+        self.check_batch(arrays[1], batches[1])
+        self.check_batch(arrays[2], batches[2])
+
+    def test_shape_change(self):
+        converter = dataset.ConcatWithBuffers(n_buffers=1)
+        x1 = converter(self.get_batch())[0]
+        batch = self.get_batch()[:3]
+        x2 = converter(batch)[0]
+        self.assertIsNot(x1, x2)
+        self.check_batch((x2, [t for _, t in batch]), batch)
+
+    def test_padding(self):
+        converter = dataset.ConcatWithBuffers(n_buffers=1)
+        for n in (3, 2):
+            batch = [numpy.arange(n), numpy.arange(1)]
+            array = converter(batch, padding=-1)
+            expect = numpy.full((2, n), -1)
+            expect[0] = numpy.arange(n)
+            expect[1, 0] = 0
+            numpy.testing.assert_array_equal(array, expect)
+
+    @attr.gpu
+    def test_to_gpu(self):
+        converter = dataset.ConcatWithBuffers()
+        batch = self.get_batch()
+        arrays = converter(batch, device=cuda.Device().id)
+        self.assertIsInstance(arrays[0], cuda.ndarray)
+        self.check_batch([cuda.to_cpu(a) for a in arrays], batch)
+
+    def test_invalid_n_buffers(self):
+        with self.assertRaises(ValueError):
+            dataset.ConcatWithBuffers(n_buffers=0)
+
+
 def get_xp(gpu):
     if gpu:
         return cuda.cupy
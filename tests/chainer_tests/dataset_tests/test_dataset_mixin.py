@@ -67,6 +67,12 @@ class TestDatasetMixin(unittest.TestCase):
         # test ndarray
         self.assertEqual(ds[numpy.asarray([1, 2, 3])], ds[1:4])
 
+    def test_get_examples(self):
+        ds = self.ds
+        self.assertEqual(ds.get_examples([3, 0, 0]),
+                         [ds.values[3], ds.values[0], ds.values[0]])
+        self.assertEqual(ds.get_examples([]), [])
+
     def test_large_dataset(self):
         # Check performance of __get_item__ with large size of dataset
         ds = SimpleDataset(list(numpy.arange(1000000)))
@@ -0,0 +1,122 @@
+import unittest
+
+import numpy
+
+from chainer import dataset
+from chainer import testing
+
+
+class TestExampleBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.rand(4, 3).astype(numpy.float32)
+        self.t = numpy.arange(4, dtype=numpy.int32)
+
+    def test_array(self):
+        batch = dataset.ExampleBatch(self.x)
+        self.assertEqual(len(batch), 4)
+        self.assertIs(batch.columns, self.x)
+        for i in range(4):
+            numpy.testing.assert_array_equal(batch[i], self.x[i])
+
+    def test_tuple(self):
+        batch = dataset.ExampleBatch((self.x, self.t))
+        self.assertEqual(len(batch), 4)
+        for i in range(4):
+            self.assertIsInstance(batch[i], tuple)
+            numpy.testing.assert_array_equal(batch[i][0], self.x[i])
+            self.assertEqual(batch[i][1], self.t[i])
+
+    def test_dict(self):
+        batch = dataset.ExampleBatch({'x': self.x, 't': self.t})
+        self.assertEqual(len(batch), 4)
+        for i in range(4):
+            self.assertEqual(sorted(batch[i].keys()), ['t', 'x'])
+            numpy.testing.assert_array_equal(batch[i]['x'], self.x[i])
+            self.assertEqual(batch[i]['t'], self.t[i])
+
+    def test_modify(self):
+        batch = dataset.ExampleBatch(self.x)
+        batch.append(self.x[0])
+        self.assertIsNone(batch.columns)
+        self.assertEqual(len(batch), 5)
+
+        batch = dataset.ExampleBatch(self.x)
+        batch[0] = self.x[1]
+        self.assertIsNone(batch.columns)
+
+    def test_take(self):
+        batch = dataset.ExampleBatch((self.x, self.t))
+        taken = batch.take(numpy.array([2, 0]))
+        self.assertIsInstance(taken, dataset.ExampleBatch)
+        numpy.testing.assert_array_equal(taken.columns[0], self.x[[2, 0]])
+        numpy.testing.assert_array_equal(taken.columns[1], self.t[[2, 0]])
+
+    def test_take_modified(self):
+        batch = dataset.ExampleBatch(self.x)
+        batch.reverse()
+        taken = batch.take(numpy.array([0, 1]))
+        self.assertNotIsInstance(taken, dataset.ExampleBatch)
+        numpy.testing.assert_array_equal(taken[0], self.x[3])
+        numpy.testing.assert_array_equal(taken[1], self.x[2])
+
+    def test_concatenate(self):
+        batches = [dataset.ExampleBatch((self.x[:1], self.t[:1])),
+                   dataset.ExampleBatch((self.x[1:], self.t[1:]))]
+        batch = dataset.ExampleBatch.concatenate(batches)
+        self.assertIsInstance(batch, dataset.ExampleBatch)
+        numpy.testing.assert_array_equal(batch.columns[0], self.x)
+        numpy.testing.assert_array_equal(batch.columns[1], self.t)
+
+    def test_concatenate_list(self):
+        batches = [dataset.ExampleBatch(self.x[:2]), list(self.x[2:])]
+        batch = dataset.ExampleBatch.concatenate(batches)
+        self.assertNotIsInstance(batch, dataset.ExampleBatch)
+        self.assertEqual(len(batch), 4)
+        for i in range(4):
+            numpy.testing.assert_array_equal(batch[i], self.x[i])
+
+    def test_concatenate_different_shapes(self):
+        y = numpy.random.rand(2, 5).astype(numpy.float32)
+        batches = [dataset.ExampleBatch(self.x), dataset.ExampleBatch(y)]
+        batch = dataset.ExampleBatch.concatenate(batches)
+        self.assertNotIsInstance(batch, dataset.ExampleBatch)
+        self.assertEqual(len(batch), 6)
+        numpy.testing.assert_array_equal(batch[5], y[1])
+
+
+class SimpleDataset(object):
+
+    def __init__(self, values):
+        self.values = values
+        self.called = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, i):
+        return self.values[i]
+
+    def get_examples(self, indices):
+        self.called.append(list(indices))
+        return [self.values[i] for i in indices]
+
+
+class TestGetExamples(unittest.TestCase):
+
+    def test_get_examples_method(self):
+        ds = SimpleDataset([1, 2, 3])
+        self.assertEqual(dataset.get_examples(ds, [2, 0]), [3, 1])
+        self.assertEqual(ds.called, [[2, 0]])
+
+    def test_array(self):
+        x = numpy.random.rand(5, 2)
+        batch = dataset.get_examples(x, [4, 1, 1])
+        self.assertIsInstance(batch, dataset.ExampleBatch)
+        numpy.testing.assert_array_equal(batch.columns, x[[4, 1, 1]])
+
+    def test_list(self):
+        self.assertEqual(dataset.get_examples([1, 2, 3], [1, 2]), [2, 3])
+
+
+testing.run_module(__name__, __file__)
@@ -0,0 +1,189 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from chainer import dataset
+from chainer import datasets
+from chainer import iterators
+from chainer import testing
+
+
+def _make_examples(structure, variable, n):
+    examples = []
+    for i in range(n):
+        length = i + 1 if variable else 3
+        x = numpy.random.uniform(size=(length, 2)).astype(numpy.float32)
+        t = numpy.int32(i)
+        if structure == 'array':
+            examples.append(x)
+        elif structure == 'tuple':
+            examples.append((x, t))
+        else:
+            examples.append({'x': x, 't': t})
+    return examples
+
+
+def _assert_example_equal(actual, expected):
+    if isinstance(expected, tuple):
+        assert isinstance(actual, tuple)
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            _assert_example_equal(a, e)
+    elif isinstance(expected, dict):
+        assert sorted(actual) == sorted(expected)
+        for key in expected:
+            _assert_example_equal(actual[key], expected[key])
+    else:
+        assert numpy.asarray(actual).dtype == numpy.asarray(expected).dtype
+        numpy.testing.assert_array_equal(actual, expected)
+
+
+@testing.parameterize(*testing.product({
+    'structure': ['array', 'tuple', 'dict'],
+    'variable': [False, True],
+    'bulk': [False, True],
+}))
+class TestColumnarDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'dataset')
+        self.examples = _make_examples(self.structure, self.variable, 5)
+        with datasets.ColumnarDatasetWriter(self.path) as writer:
+            if self.bulk:
+                writer.extend(self.examples[:2])
+                writer.extend(self.examples[2:])
+            else:
+                for example in self.examples:
+                    writer.append(example)
+            self.assertEqual(len(writer), 5)
+        self.dataset = datasets.ColumnarDataset(self.path)
+
+    def tearDown(self):
+        del self.dataset
+        shutil.rmtree(self.dir)
+
+    def test_len(self):
+        self.assertEqual(len(self.dataset), 5)
+
+    def test_getitem(self):
+        for i in range(5):
+            _assert_example_equal(self.dataset[i], self.examples[i])
+        _assert_example_equal(self.dataset[-1], self.examples[-1])
+
+    def test_getitem_overrun(self):
+        with self.assertRaises(IndexError):
+            self.dataset[5]
+        with self.assertRaises(IndexError):
+            self.dataset[-6]
+
+    def test_get_examples(self):
+        indices = [4, 0, 2, 2, -1]
+        batch = self.dataset.get_examples(indices)
+        self.assertEqual(len(batch), len(indices))
+        for example, i in zip(batch, indices):
+            _assert_example_equal(example, self.examples[i])
+        if self.variable:
+            self.assertNotIsInstance(batch, dataset.ExampleBatch)
+        else:
+            self.assertIsInstance(batch, dataset.ExampleBatch)
+
+    def test_get_examples_overrun(self):
+        with self.assertRaises(IndexError):
+            self.dataset.get_examples([0, 5])
+
+    def test_slice(self):
+        for example, expected in zip(self.dataset[1:4], self.examples[1:4]):
+            _assert_example_equal(example, expected)
+
+    def test_pickle(self):
+        dataset = pickle.loads(pickle.dumps(self.dataset))
+        for i in range(5):
+            _assert_example_equal(dataset[i], self.examples[i])
+
+    def test_iterator(self):
+        it = iterators.SerialIterator(self.dataset, 2, repeat=False,
+                                      shuffle=False)
+        examples = sum([batch for batch in it], [])
+        self.assertEqual(len(examples), 5)
+        for example, expected in zip(examples, self.examples):
+            _assert_example_equal(example, expected)
+
+
+class TestColumnarDatasetWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'dataset')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_empty(self):
+        with datasets.ColumnarDatasetWriter(self.path):
+            pass
+        self.assertEqual(len(datasets.ColumnarDataset(self.path)), 0)
+
+    def test_cast(self):
+        with datasets.ColumnarDatasetWriter(self.path) as writer:
+            writer.append(numpy.zeros(2, dtype=numpy.float32))
+            writer.append(numpy.ones(2, dtype=numpy.float64))
+        ds = datasets.ColumnarDataset(self.path)
+        self.assertEqual(ds[1].dtype, numpy.float32)
+        numpy.testing.assert_array_equal(ds[1], [1, 1])
+
+    def test_shape_mismatch(self):
+        with datasets.ColumnarDatasetWriter(self.path) as writer:
+            writer.append(numpy.zeros((2, 3)))
+            with self.assertRaises(ValueError):
+                writer.append(numpy.zeros((2, 4)))
+
+    def test_structure_mismatch(self):
+        with datasets.ColumnarDatasetWriter(self.path) as writer:
+            writer.append((numpy.zeros(2), 0))
+            with self.assertRaises(ValueError):
+                writer.append(numpy.zeros(2))
+            with self.assertRaises(ValueError):
+                writer.append((numpy.zeros(2), 0, 1))
+
+    def test_object(self):
+        with datasets.ColumnarDatasetWriter(self.path) as writer:
+            with self.assertRaises(ValueError):
+                writer.append(numpy.array([None]))
+
+    def test_closed(self):
+        writer = datasets.ColumnarDatasetWriter(self.path)
+        writer.close()
+        with self.assertRaises(RuntimeError):
+            writer.append(numpy.zeros(2))
+
+    def test_write_columnar_dataset(self):
+        x = numpy.random.uniform(size=(10, 3)).astype(numpy.float32)
+        t = numpy.arange(10, dtype=numpy.int32)
+        datasets.write_columnar_dataset(
+            self.path, datasets.TupleDataset(x, t), batch_size=3)
+        ds = datasets.ColumnarDataset(self.path)
+        batch = ds.get_examples(numpy.arange(10))
+        numpy.testing.assert_array_equal(batch.columns[0], x)
+        numpy.testing.assert_array_equal(batch.columns[1], t)
+
+    def test_cache_or_load_columnar_dataset(self):
+        x = numpy.random.uniform(size=(4, 3)).astype(numpy.float32)
+        calls = []
+
+        def creator():
+            calls.append(None)
+            return x
+
+        for _ in range(2):
+            ds = datasets.cache_or_load_columnar_dataset(self.path, creator)
+            self.assertIsInstance(ds, datasets.ColumnarDataset)
+            numpy.testing.assert_array_equal(ds[:], x)
+        self.assertEqual(len(calls), 1)
+
+
+testing.run_module(__name__, __file__)
@@ -60,5 +60,44 @@ class TestConcatenatedDataset(unittest.TestCase):
                 concatenated_slice, expected_slice):
             np.testing.assert_equal(concatenated, expected)
 
+    def test_get_examples(self):
+        n = len(self.expected_dataset)
+        indices = np.random.randint(0, n, size=n * 2) if n else []
+        examples = self.concatenated_dataset.get_examples(indices)
+
+        self.assertEqual(len(examples), len(indices))
+        for example, i in six.moves.zip(examples, indices):
+            np.testing.assert_equal(example, self.expected_dataset[i])
+
+    def test_get_examples_overrun(self):
+        n = len(self.expected_dataset)
+        with self.assertRaises(IndexError):
+            self.concatenated_dataset.get_examples([n])
+        with self.assertRaises(IndexError):
+            self.concatenated_dataset.get_examples([-1])
+
+
+class TestConcatenatedDatasetManyShards(unittest.TestCase):
+
+    def setUp(self):
+        sizes = np.random.randint(0, 4, size=500)
+        self.datasets = [np.random.uniform(size=(n, 2)) for n in sizes]
+        self.expected = np.concatenate(self.datasets)
+        self.dataset = ConcatenatedDataset(*self.datasets)
+
+    def test_len(self):
+        self.assertEqual(len(self.dataset), len(self.expected))
+
+    def test_get_example(self):
+        for i in range(len(self.expected)):
+            np.testing.assert_equal(self.dataset[i], self.expected[i])
+        with self.assertRaises(IndexError):
+            self.dataset[len(self.expected)]
+
+    def test_get_examples(self):
+        indices = np.random.permutation(len(self.expected))
+        batch = self.dataset.get_examples(indices)
+        np.testing.assert_equal(np.stack(batch), self.expected[indices])
+
 
 testing.run_module(__name__, __file__)
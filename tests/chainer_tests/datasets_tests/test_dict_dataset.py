@@ -3,6 +3,7 @@ import unittest
 import numpy
 
 from chainer.backends import cuda
+from chainer import dataset
 from chainer import datasets
 from chainer import testing
 from chainer.testing import attr
@@ -47,6 +48,16 @@ class TestDictDataset(unittest.TestCase):
     def test_dict_dataset_gpu(self):
         self.check_dict_dataset(cuda.to_gpu(self.x), cuda.to_gpu(self.y))
 
+    def test_get_examples(self):
+        dd = datasets.DictDataset(x=self.x, y=self.y)
+        batch = dd.get_examples([1, 2])
+        self.assertIsInstance(batch, dataset.ExampleBatch)
+        numpy.testing.assert_array_equal(batch.columns['x'], self.x[[1, 2]])
+        numpy.testing.assert_array_equal(batch.columns['y'], self.y[[1, 2]])
+        for example, i in zip(batch, [1, 2]):
+            numpy.testing.assert_array_equal(example['x'], self.x[i])
+            numpy.testing.assert_array_equal(example['y'], self.y[i])
+
     def test_dict_dataset_len_mismatch(self):
         with self.assertRaises(ValueError):
             datasets.DictDataset(x=self.x, z=self.z)
@@ -1,7 +1,10 @@
 import os
 import pickle
+import shutil
+import tempfile
 import unittest
 
+import mock
 import numpy
 
 from chainer import datasets
@@ -137,4 +140,109 @@ class TestMultiZippedImageDataset(unittest.TestCase):
         self._get_check(ds)
 
 
+@unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
+class TestImageDatasetMinSize(unittest.TestCase):
+
+    def setUp(self):
+        self.root = os.path.join(os.path.dirname(__file__), 'image_dataset')
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_png(self):
+        ds = datasets.ImageDataset(['chainer.png'], root=self.root,
+                                   min_size=(100, 100))
+        self.assertEqual(ds[0].shape, (4, 100, 100))
+        ds = datasets.ImageDataset(['chainer.png'], root=self.root,
+                                   min_size=(140, 100))
+        self.assertEqual(ds[0].shape, (4, 150, 150))
+        ds = datasets.ImageDataset(['chainer.png'], root=self.root,
+                                   min_size=(400, 400))
+        self.assertEqual(ds[0].shape, (4, 300, 300))
+
+    def test_jpeg(self):
+        image = numpy.random.randint(0, 256, (600, 800, 3)).astype(numpy.uint8)
+        image_dataset.Image.fromarray(image).save(
+            os.path.join(self.dir, 'image.jpg'))
+        ds = datasets.LabeledImageDataset(
+            [('image.jpg', 0)], root=self.dir, min_size=(100, 120))
+        img, label = ds[0]
+        self.assertEqual(img.shape, (3, 150, 200))
+        self.assertEqual(label, 0)
+
+
+@unittest.skipUnless(image_dataset.available, 'image_dataset is not available')
+class TestImageDatasetCache(unittest.TestCase):
+
+    def setUp(self):
+        self.root = os.path.join(os.path.dirname(__file__), 'image_dataset')
+        self.dir = tempfile.mkdtemp()
+        self.read = mock.Mock(wraps=image_dataset._read_image_as_array)
+        patcher = mock.patch.object(
+            image_dataset, '_read_image_as_array', self.read)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _dataset(self, **kwargs):
+        return datasets.ImageDataset(
+            ['chainer.png', 'chainer_grey.png'], root=self.root, **kwargs)
+
+    def test_memory(self):
+        ds = self._dataset(cache_size=10 ** 7)
+        img = ds[0]
+        img[...] = 0
+        numpy.testing.assert_array_equal(ds[1], ds[1])
+        self.assertEqual(self.read.call_count, 2)
+        self.assertNotEqual(ds[0].max(), 0)
+        self.assertEqual(self.read.call_count, 2)
+
+    def test_memory_evict(self):
+        # Only one of the images fits in the cache
+        ds = self._dataset(cache_size=4 * 300 * 300 * 4)
+        ds[0]
+        ds[0]
+        self.assertEqual(self.read.call_count, 1)
+        ds[1]
+        ds[0]
+        self.assertEqual(self.read.call_count, 3)
+
+    def test_memory_too_large(self):
+        ds = self._dataset(cache_size=10)
+        ds[0]
+        ds[0]
+        self.assertEqual(self.read.call_count, 2)
+
+    def test_directory(self):
+        cache_dir = os.path.join(self.dir, 'cache')
+        expected = self._dataset(cache_dir=cache_dir)[0]
+        ds = self._dataset(cache_dir=cache_dir)
+        numpy.testing.assert_array_equal(ds[0], expected)
+        self.assertEqual(self.read.call_count, 1)
+        # Images decoded with different options are cached separately
+        ds = self._dataset(cache_dir=cache_dir, min_size=(100, 100))
+        self.assertEqual(ds[0].shape, (4, 100, 100))
+        self.assertEqual(self.read.call_count, 2)
+
+    def test_pickle(self):
+        ds = self._dataset(cache_size=10 ** 7)
+        expected = ds[0]
+        ds = pickle.loads(pickle.dumps(ds))
+        numpy.testing.assert_array_equal(ds[0], expected)
+        self.assertEqual(self.read.call_count, 2)
+
+    def test_zipped(self):
+        zipfilenames = [os.path.join(self.root, fn) for fn
+                        in ('zipped_images_1.zip', 'zipped_images_2.zip')]
+        ds = datasets.MultiZippedImageDataset(
+            zipfilenames, cache_size=10 ** 8)
+        images = [ds[i] for i in range(len(ds))]
+        for i, image in enumerate(images):
+            numpy.testing.assert_array_equal(ds[i], image)
+        self.assertEqual(self.read.call_count, 5)
+
+
 testing.run_module(__name__, __file__)
@@ -1,4 +1,6 @@
 import os
+import shutil
+import tempfile
 import unittest
 
 import importlib
@@ -6,6 +8,7 @@ import mock
 import numpy
 
 from chainer.dataset import download
+from chainer.datasets import columnar_dataset
 from chainer.datasets import get_fashion_mnist
 from chainer.datasets import get_mnist
 from chainer.datasets import tuple_dataset
@@ -107,4 +110,51 @@ class TestMnist(unittest.TestCase):
         self.assertEqual(load.call_count, 2)  # for training and test
 
 
+@testing.parameterize(*testing.product({
+    'withlabel': [True, False],
+    'ndim': [1, 3],
+}))
+class TestMnistMemmap(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.original_root = download.get_dataset_root()
+        download.set_dataset_root(self.root)
+        self.raw = {
+            'x': numpy.random.randint(0, 256, (5, 784)).astype(numpy.uint8),
+            'y': numpy.random.randint(0, 10, 5).astype(numpy.uint8)}
+
+    def tearDown(self):
+        download.set_dataset_root(self.original_root)
+        shutil.rmtree(self.root)
+
+    def get_mnist(self):
+        with mock.patch('chainer.datasets.mnist._retrieve_mnist_training',
+                        return_value=self.raw) as retrieve_train, \
+                mock.patch('chainer.datasets.mnist._retrieve_mnist_test',
+                           return_value=self.raw) as retrieve_test:
+            datasets = get_mnist(withlabel=self.withlabel, ndim=self.ndim,
+                                 memmap=True)
+        return datasets, retrieve_train.call_count + retrieve_test.call_count
+
+    def test_memmap(self):
+        (train, test), n_calls = self.get_mnist()
+        self.assertEqual(n_calls, 2)
+        for dataset in (train, test):
+            self.assertIsInstance(dataset, columnar_dataset.ColumnarDataset)
+            self.assertEqual(len(dataset), 5)
+            x = dataset[0][0] if self.withlabel else dataset[0]
+            self.assertEqual(x.dtype, numpy.float32)
+            self.assertEqual(x.ndim, self.ndim)
+            numpy.testing.assert_allclose(
+                x.ravel(), self.raw['x'][0] / 255., rtol=1e-6)
+            if self.withlabel:
+                self.assertEqual(dataset[0][1], self.raw['y'][0])
+
+        # The cached datasets are used on the second call
+        (train, test), n_calls = self.get_mnist()
+        self.assertEqual(n_calls, 0)
+        self.assertEqual(len(train), 5)
+
+
 testing.run_module(__name__, __file__)
@@ -2,8 +2,12 @@
 
 from __future__ import unicode_literals
 
+import io
 import os
 import pickle
+import shutil
+import tempfile
+import threading
 import unittest
 
 import six
@@ -148,4 +152,92 @@ class TestTextDataset(unittest.TestCase):
         assert ds2[1] == ('テスト2\n', 'テスト2\n')
 
 
+class TestTextDatasetIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'text.txt')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _write(self, text, encoding='utf-8'):
+        with io.open(self.path, 'w', encoding=encoding, newline='') as f:
+            f.write(text)
+
+    def test_universal_newlines(self):
+        self._write('a\rb\r\nc\nd')
+        ds = datasets.TextDataset(self.path, encoding='utf-8')
+        assert [ds[i] for i in range(len(ds))] == ['a\n', 'b\n', 'c\n', 'd']
+        ds = datasets.TextDataset(self.path, encoding='utf-8', newline='')
+        assert [ds[i] for i in range(len(ds))] == \
+            ['a\r', 'b\r\n', 'c\n', 'd']
+
+    def test_empty(self):
+        self._write('')
+        ds = datasets.TextDataset(self.path, encoding='utf-8')
+        assert len(ds) == 0
+        ds.close()
+
+    def test_not_ascii_compatible(self):
+        self._write('テスト1\nTest2\n', encoding='utf-16')
+        ds = datasets.TextDataset(self.path, encoding='utf-16')
+        assert ds._mmaps is None
+        assert ds[0] == 'テスト1\n'
+        assert ds[1] == 'Test2\n'
+
+    def test_index_cache(self):
+        self._write('hello\nworld\n')
+        ds = datasets.TextDataset(self.path, encoding='utf-8',
+                                  index_cache=True)
+        assert os.path.exists(self.path + '.idx')
+        assert len(ds) == 2
+        ds.close()
+
+        ds = datasets.TextDataset(self.path, encoding='utf-8',
+                                  index_cache=True)
+        assert ds[1] == 'world\n'
+        ds.close()
+
+        # The index is rebuilt when the file changes
+        self._write('hello\nworld\ntest\n')
+        ds = datasets.TextDataset(self.path, encoding='utf-8',
+                                  index_cache=True)
+        assert len(ds) == 3
+        assert ds[2] == 'test\n'
+        ds.close()
+
+    def test_index_cache_newline(self):
+        self._write('a\rb\n')
+        ds = datasets.TextDataset(self.path, encoding='utf-8',
+                                  index_cache=True)
+        assert len(ds) == 2
+        ds.close()
+        ds = datasets.TextDataset(self.path, encoding='utf-8', newline='\n',
+                                  index_cache=True)
+        assert len(ds) == 1
+        assert ds[0] == 'a\rb\n'
+        ds.close()
+
+    def test_threads(self):
+        lines = ['line {}\n'.format(i) for i in range(1000)]
+        self._write(''.join(lines))
+        ds = datasets.TextDataset(self.path, encoding='utf-8')
+        errors = []
+
+        def read(offset):
+            for i in range(offset, 1000, 4):
+                if ds[i] != lines[i]:
+                    errors.append(i)
+
+        threads = [threading.Thread(target=read, args=(i,))
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        ds.close()
+
+
 testing.run_module(__name__, __file__)
@@ -39,6 +39,18 @@ class TestTransformDataset(unittest.TestCase):
                 numpy.testing.assert_array_equal(
                     example, self.transform(self.dataset[i]))
 
+    def test_get_examples(self):
+        td = datasets.TransformDataset(self.dataset, self.transform)
+        examples = td.get_examples([1, 0])
+        self.assertEqual(len(examples), 2)
+        for example, i in zip(examples, [1, 0]):
+            expected = td[i]
+            if isinstance(example, tuple):
+                for arr, expected_arr in zip(example, expected):
+                    numpy.testing.assert_array_equal(arr, expected_arr)
+            else:
+                numpy.testing.assert_array_equal(example, expected)
+
     def test_transform_dataset_overrun(self):
         td = datasets.TransformDataset(self.dataset, self.transform)
         with self.assertRaises(IndexError):
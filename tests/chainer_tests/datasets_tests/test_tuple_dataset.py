@@ -3,6 +3,7 @@ import unittest
 import numpy
 
 from chainer.backends import cuda
+from chainer import dataset
 from chainer import datasets
 from chainer import testing
 from chainer.testing import attr
@@ -45,6 +46,24 @@ class TestTupleDataset(unittest.TestCase):
     def test_tuple_dataset_gpu(self):
         self.check_tuple_dataset(cuda.to_gpu(self.x0), cuda.to_gpu(self.x1))
 
+    def test_get_examples(self):
+        td = datasets.TupleDataset(self.x0, self.x1)
+        batch = td.get_examples([2, 0, 2])
+        self.assertIsInstance(batch, dataset.ExampleBatch)
+        numpy.testing.assert_array_equal(batch.columns[0], self.x0[[2, 0, 2]])
+        numpy.testing.assert_array_equal(batch.columns[1], self.x1[[2, 0, 2]])
+        for example, i in zip(batch, [2, 0, 2]):
+            numpy.testing.assert_array_equal(example[0], self.x0[i])
+            numpy.testing.assert_array_equal(example[1], self.x1[i])
+
+    def test_get_examples_list(self):
+        td = datasets.TupleDataset(self.x0, [1, 2, 3])
+        batch = td.get_examples([1, 2])
+        self.assertNotIsInstance(batch, dataset.ExampleBatch)
+        self.assertEqual(len(batch), 2)
+        numpy.testing.assert_array_equal(batch[0][0], self.x0[1])
+        self.assertEqual(batch[1][1], 3)
+
     def test_tuple_dataset_len_mismatch(self):
         with self.assertRaises(ValueError):
             datasets.TupleDataset(self.x0, self.z0)
@@ -128,4 +128,98 @@ class TestEmbedIdGrad(unittest.TestCase):
             cuda.to_gpu(self.x), cuda.to_gpu(self.gy), cuda.to_gpu(self.ggW))
 
 
+@testing.parameterize(*testing.product_dict(
+    [{'x_data': [0, 1, 0], 'ignore_label': None},
+     {'x_data': [[0, 1, -1], [-1, 0, 2]], 'ignore_label': None},
+     {'x_data': [[0, 1, -1], [-1, 0, 1]], 'ignore_label': -1},
+     {'x_data': [[0, 1, 0], [1, 0, 1]], 'ignore_label': 1}],
+))
+class TestEmbedIDSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.array(self.x_data, dtype=numpy.int32)
+        self.W = numpy.random.uniform(-1, 1, (3, 2)).astype('f')
+        self.gy = numpy.random.uniform(
+            -1, 1, self.x.shape + (2,)).astype('f')
+
+    def check_sparse_grad(self, x_data, W_data, y_grad):
+        W = chainer.Parameter(W_data)
+        y = chainer.functions.embed_id(
+            x_data, W, self.ignore_label, sparse_grad=True)
+        y.grad = y_grad
+        y.backward()
+        self.assertIsNone(W.grad)
+
+        W_dense = chainer.Variable(W_data)
+        y = chainer.functions.embed_id(x_data, W_dense, self.ignore_label)
+        y.grad = y_grad
+        y.backward()
+
+        grad = W.sparse_grad
+        self.assertTrue(grad.coalesced)
+        testing.assert_allclose(grad.to_dense(), W_dense.grad)
+        rows = cuda.to_cpu(grad.rows)
+        x = self.x[self.x != self.ignore_label]
+        numpy.testing.assert_array_equal(rows, numpy.unique(x % 3))
+
+        W._densify_grad()
+        self.assertIsNone(W.sparse_grad)
+        testing.assert_allclose(W.grad, W_dense.grad)
+
+    def test_sparse_grad_cpu(self):
+        self.check_sparse_grad(self.x, self.W, self.gy)
+
+    @attr.gpu
+    def test_sparse_grad_gpu(self):
+        self.check_sparse_grad(
+            cuda.to_gpu(self.x), cuda.to_gpu(self.W), cuda.to_gpu(self.gy))
+
+    def test_accumulate(self):
+        W = chainer.Parameter(self.W)
+        for _ in range(2):
+            y = chainer.functions.embed_id(
+                self.x, W, self.ignore_label, sparse_grad=True)
+            y.grad = self.gy
+            y.backward()
+        y = chainer.functions.embed_id(self.x, W, self.ignore_label)
+        y.grad = self.gy
+        y.backward()
+
+        W_dense = chainer.Variable(self.W)
+        y = chainer.functions.embed_id(self.x, W_dense, self.ignore_label)
+        y.grad = self.gy
+        y.backward()
+
+        testing.assert_allclose(W.sparse_grad.to_dense(), W_dense.grad * 2)
+        W._densify_grad()
+        testing.assert_allclose(W.grad, W_dense.grad * 3)
+
+    def test_cleargrad(self):
+        W = chainer.Parameter(self.W)
+        y = chainer.functions.embed_id(
+            self.x, W, self.ignore_label, sparse_grad=True)
+        y.grad = self.gy
+        y.backward()
+        W.cleargrad()
+        self.assertIsNone(W.sparse_grad)
+
+    def test_double_backprop(self):
+        # The gradient is dense when it is differentiated again
+        W = chainer.Parameter(self.W)
+        y = chainer.functions.embed_id(
+            self.x, W, self.ignore_label, sparse_grad=True)
+        y.grad = self.gy
+        y.backward(enable_double_backprop=True)
+        self.assertIsNone(W.sparse_grad)
+        self.assertIsNotNone(W.grad)
+
+    def test_not_parameter(self):
+        W = chainer.Variable(self.W)
+        y = chainer.functions.embed_id(
+            self.x, W, self.ignore_label, sparse_grad=True)
+        y.grad = self.gy
+        y.backward()
+        self.assertIsNotNone(W.grad)
+
+
 testing.run_module(__name__, __file__)
@@ -471,4 +471,86 @@ class TestNStepBiRNN(unittest.TestCase):
         self.check_call_cudnn_backward('auto')
 
 
+@testing.parameterize(*testing.product({
+    'rnn_mode': ['rnn_tanh', 'rnn_relu', 'gru', 'lstm'],
+    'use_bi_direction': [False, True],
+}))
+class TestNStepRNNCPU(unittest.TestCase):
+
+    batches = [3, 2, 2, 1]
+    in_size = 3
+    out_size = 2
+    n_layers = 2
+    dtype = numpy.float64
+
+    def setUp(self):
+        n_gates = {'rnn_tanh': 1, 'rnn_relu': 1, 'gru': 3, 'lstm': 4}
+        n_gates = n_gates[self.rnn_mode]
+        direction = 2 if self.use_bi_direction else 1
+        shape = (self.n_layers * direction, self.batches[0], self.out_size)
+        self.hx = _shaped_random(shape, self.dtype)
+        self.cx = _shaped_random(shape, self.dtype)
+        self.xs = [_shaped_random((b, self.in_size), self.dtype)
+                   for b in self.batches]
+        self.ws = []
+        self.bs = []
+        for layer in range(self.n_layers):
+            in_size = self.in_size if layer == 0 else (
+                self.out_size * direction)
+            for _ in range(direction):
+                self.ws.append(
+                    [_shaped_random((self.out_size, in_size), self.dtype)
+                     for _ in range(n_gates)] +
+                    [_shaped_random((self.out_size, self.out_size), self.dtype)
+                     for _ in range(n_gates)])
+                self.bs.append([_shaped_random((self.out_size,), self.dtype)
+                                for _ in range(2 * n_gates)])
+
+    def _call(self, xs, ws):
+        hx = chainer.Variable(self.hx)
+        if self.rnn_mode == 'lstm':
+            f = (functions.n_step_bilstm if self.use_bi_direction
+                 else functions.n_step_lstm)
+            hy, cy, ys = f(self.n_layers, 0.0, hx, chainer.Variable(self.cx),
+                           ws, self.bs, xs)
+        elif self.rnn_mode == 'gru':
+            f = (functions.n_step_bigru if self.use_bi_direction
+                 else functions.n_step_gru)
+            hy, ys = f(self.n_layers, 0.0, hx, ws, self.bs, xs)
+        else:
+            f = (functions.n_step_birnn if self.use_bi_direction
+                 else functions.n_step_rnn)
+            hy, ys = f(self.n_layers, 0.0, hx, ws, self.bs, xs,
+                       activation=self.rnn_mode[4:])
+        return hy, ys
+
+    def _grads(self, with_hy):
+        xs = _wrap_variable(self.xs)
+        ws = _wrap_variable(self.ws)
+        hy, ys = self._call(xs, ws)
+        loss = functions.sum(functions.concat(ys, axis=0) ** 2)
+        if with_hy:
+            loss += functions.sum(hy * 0)
+        loss.backward()
+        return [x.grad for x in xs] + [w.grad for w in sum(ws, [])]
+
+    def test_missing_output_grads(self):
+        for actual, expected in zip(self._grads(False), self._grads(True)):
+            testing.assert_allclose(actual, expected)
+
+    def test_double_backward(self):
+        def f(x, w):
+            xs = [x] + self.xs[1:]
+            ws = [[w] + self.ws[0][1:]] + self.ws[1:]
+            hy, ys = self._call(xs, ws)
+            return functions.sum(hy) + functions.sum(ys[1] ** 2),
+
+        inputs = [self.xs[0], self.ws[0][0]]
+        grad_grad_inputs = [_shaped_random(x.shape, self.dtype)
+                            for x in inputs]
+        gradient_check.check_double_backward(
+            f, inputs, numpy.ones((), self.dtype), grad_grad_inputs,
+            atol=1e-4, rtol=1e-3)
+
+
 testing.run_module(__name__, __file__)
@@ -336,6 +336,21 @@ class TestMaxPoolingNDIndices(unittest.TestCase):
     def test_cpu(self):
         self._check(self.x)
 
+    def test_cpu_no_backprop_mode(self):
+        with chainer.no_backprop_mode():
+            self._check(self.x)
+
+    def test_cpu_no_backprop_mode_overwrite_input(self):
+        x = self.x.copy()
+        func = functions.MaxPoolingND(2, 2, cover_all=False)
+        with chainer.no_backprop_mode():
+            func.apply((x,))
+        # The indexes do not depend on the input after the forward
+        x[...] = -x
+        func_expect = functions.MaxPoolingND(2, 2, cover_all=False)
+        func_expect.apply((self.x,))
+        numpy.testing.assert_array_equal(func.indexes, func_expect.indexes)
+
     @attr.gpu
     @attr.cudnn
     def test_gpu(self):
@@ -0,0 +1,140 @@
+import unittest
+
+import numpy
+
+import chainer
+from chainer.backends import cuda
+from chainer import functions
+from chainer import links
+from chainer import testing
+from chainer.testing import attr
+
+
+def _make_model():
+    return chainer.Sequential(
+        links.Linear(3, 4), links.BatchNormalization(4), functions.relu,
+        links.Linear(4, 4), functions.dropout, functions.tanh,
+        links.Linear(4, 2))
+
+
+@testing.parameterize(
+    {'n_segments': 1},
+    {'n_segments': 2},
+    {'n_segments': 3},
+    {'n_segments': 10},
+    {'memory_budget': 0},
+    {'memory_budget': 80},
+)
+class TestCheckpointSequential(unittest.TestCase):
+
+    def setUp(self):
+        self.model = _make_model()
+        self.expected_model = self.model.copy(mode='copy')
+        self.x = numpy.random.uniform(-1, 1, (5, 3)).astype(numpy.float32)
+        self.gy = numpy.random.uniform(-1, 1, (5, 2)).astype(numpy.float32)
+
+    def kwargs(self):
+        if hasattr(self, 'n_segments'):
+            return {'n_segments': self.n_segments}
+        return {'memory_budget': self.memory_budget}
+
+    def check_forward_backward(self, to_device):
+        x = to_device(self.x)
+        gy = to_device(self.gy)
+
+        numpy.random.seed(0)
+        x_expected = chainer.Variable(x)
+        y_expected = self.expected_model(x_expected)
+        y_expected.grad = gy
+        y_expected.backward()
+
+        numpy.random.seed(0)
+        x_actual = chainer.Variable(x)
+        y_actual = functions.checkpoint_sequential(
+            self.model, x_actual, **self.kwargs())
+        y_actual.grad = gy
+        y_actual.backward()
+
+        testing.assert_allclose(y_expected.array, y_actual.array)
+        testing.assert_allclose(x_expected.grad, x_actual.grad)
+        for p1, p2 in zip(self.expected_model.params(), self.model.params()):
+            testing.assert_allclose(p1.grad, p2.grad, atol=1e-6)
+        bn_expected = self.expected_model[1]
+        bn_actual = self.model[1]
+        testing.assert_allclose(bn_expected.avg_mean, bn_actual.avg_mean)
+        testing.assert_allclose(bn_expected.avg_var, bn_actual.avg_var)
+        self.assertEqual(bn_expected.N, bn_actual.N)
+
+    def test_forward_backward_cpu(self):
+        self.check_forward_backward(lambda x: x)
+
+    @attr.gpu
+    def test_forward_backward_gpu(self):
+        self.model.to_gpu()
+        self.expected_model.to_gpu()
+        self.check_forward_backward(cuda.to_gpu)
+
+
+class TestCheckpointSequentialReport(unittest.TestCase):
+
+    def test_report(self):
+        model = _make_model()
+        x = numpy.random.uniform(-1, 1, (5, 3)).astype(numpy.float32)
+        reporter = chainer.Reporter()
+        observation = {}
+        with reporter.scope(observation):
+            functions.checkpoint_sequential(model, x, n_segments=2)
+        self.assertEqual(observation['checkpoint/n_segments'], 2)
+        self.assertEqual(observation['checkpoint/recomputed_layers'], 3)
+        # outputs of Linear and BatchNormalization are recomputed
+        self.assertEqual(observation['checkpoint/released_bytes'], 2 * 80)
+        # outputs of the segment boundary and the last four layers are kept
+        self.assertEqual(
+            observation['checkpoint/stored_bytes'], 80 + 3 * 80 + 40)
+
+    def test_memory_budget(self):
+        model = _make_model()
+        x = numpy.random.uniform(-1, 1, (5, 3)).astype(numpy.float32)
+        reporter = chainer.Reporter()
+        observation = {}
+        with reporter.scope(observation):
+            functions.checkpoint_sequential(model, x, memory_budget=160)
+        self.assertEqual(observation['checkpoint/n_segments'], 4)
+
+
+class TestCheckpointSequentialChainList(unittest.TestCase):
+
+    def test_chain_list(self):
+        model = chainer.ChainList(
+            links.Linear(3, 4), links.Linear(4, 4), links.Linear(4, 2))
+        x = chainer.Variable(
+            numpy.random.uniform(-1, 1, (5, 3)).astype(numpy.float32))
+        y = functions.checkpoint_sequential(model, x, n_segments=3)
+        functions.sum(y).backward()
+        expected = model[2](model[1](model[0](x.array)))
+        testing.assert_allclose(y.array, expected.array)
+        for link in model:
+            self.assertIsNotNone(link.W.grad)
+
+
+class TestCheckpointSequentialInvalid(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.zeros((5, 3), dtype=numpy.float32)
+
+    def test_no_option(self):
+        with self.assertRaises(ValueError):
+            functions.checkpoint_sequential(_make_model(), self.x)
+
+    def test_both_options(self):
+        with self.assertRaises(ValueError):
+            functions.checkpoint_sequential(
+                _make_model(), self.x, n_segments=2, memory_budget=100)
+
+    def test_not_sequential(self):
+        with self.assertRaises(TypeError):
+            functions.checkpoint_sequential(
+                links.Linear(3, 2), self.x, n_segments=2)
+
+
+testing.run_module(__name__, __file__)
@@ -0,0 +1,198 @@
+import unittest
+
+import numpy
+
+import chainer
+from chainer.backends import cuda
+from chainer import function_hooks
+from chainer import functions
+from chainer import links
+from chainer import testing
+from chainer.testing import attr
+
+
+class MLP(chainer.Chain):
+
+    def __init__(self):
+        super(MLP, self).__init__()
+        with self.init_scope():
+            self.l1 = links.Linear(3, 4)
+            self.bn = links.BatchNormalization(4)
+            self.l2 = links.Linear(4, 2)
+
+    def forward(self, x, t):
+        h = functions.relu(self.bn(self.l1(x)))
+        h = h * 2 + h
+        return functions.softmax_cross_entropy(self.l2(h), t)
+
+
+class StaticMLP(MLP):
+
+    @chainer.static_graph
+    def forward(self, x, t):
+        return super(StaticMLP, self).forward(x, t)
+
+
+class TestStaticGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.model = MLP()
+        self.static_model = StaticMLP()
+        self.static_model.copyparams(self.model)
+
+    def make_data(self, batchsize):
+        x = numpy.random.uniform(-1, 1, (batchsize, 3)).astype(numpy.float32)
+        t = numpy.random.randint(0, 2, batchsize).astype(numpy.int32)
+        return x, t
+
+    def check_iterations(self, batchsizes, to_device):
+        for batchsize in batchsizes:
+            x, t = self.make_data(batchsize)
+            x, t = to_device(x), to_device(t)
+            losses = []
+            for model in (self.model, self.static_model):
+                model.cleargrads()
+                loss = model(x, t)
+                loss.backward()
+                losses.append(loss)
+            testing.assert_allclose(losses[0].array, losses[1].array)
+            for p1, p2 in zip(self.model.params(),
+                              self.static_model.params()):
+                testing.assert_allclose(p1.grad, p2.grad, atol=1e-6)
+            testing.assert_allclose(
+                self.model.bn.avg_mean, self.static_model.bn.avg_mean)
+            testing.assert_allclose(
+                self.model.bn.avg_var, self.static_model.bn.avg_var)
+
+    def test_replay_cpu(self):
+        self.check_iterations((5, 5, 5), lambda x: x)
+
+    def test_replay(self):
+        self.static_model(*self.make_data(5))
+        loss = self.static_model(*self.make_data(5))
+        self.assertIsInstance(
+            loss.creator, chainer.graph_optimizations.static_graph.
+            StaticGraphFunction)
+
+    def test_shape_change_cpu(self):
+        self.check_iterations((5, 5, 3, 3, 5), lambda x: x)
+
+    @attr.gpu
+    def test_replay_gpu(self):
+        self.model.to_gpu()
+        self.static_model.to_gpu()
+        self.check_iterations((5, 5, 3, 3, 5), cuda.to_gpu)
+
+    def test_test_mode(self):
+        x, t = self.make_data(5)
+        self.model(x, t)
+        self.static_model(x, t)
+        with chainer.using_config('train', False):
+            expected = self.model(x, t)
+            self.static_model(x, t)
+            actual = self.static_model(x, t)
+        testing.assert_allclose(expected.array, actual.array)
+
+    def test_no_backprop_mode(self):
+        x, t = self.make_data(5)
+        with chainer.no_backprop_mode():
+            self.static_model(x, t)
+            y = self.static_model(x, t)
+        self.assertIsNone(y.creator)
+
+    def test_separate_links(self):
+        other = StaticMLP()
+        x, t = self.make_data(5)
+        self.static_model(x, t)
+        self.static_model(x, t)
+        expected = MLP()
+        expected.copyparams(other)
+        testing.assert_allclose(expected(x, t).array, other(x, t).array)
+
+    def test_double_backprop(self):
+        x, t = self.make_data(5)
+        self.static_model(x, t)
+        loss = self.static_model(x, t)
+        with self.assertRaises(RuntimeError):
+            loss.backward(enable_double_backprop=True)
+
+    def test_function_hook(self):
+        x, t = self.make_data(5)
+        self.static_model(x, t)
+        with function_hooks.TimerHook() as hook:
+            self.static_model(x, t)
+        self.assertGreater(len(hook.call_history), 1)
+
+
+class TestStaticGraphFunction(unittest.TestCase):
+
+    def test_multiple_outputs(self):
+        @chainer.static_graph
+        def f(x, y):
+            return x * y, functions.sin(x)
+
+        for _ in range(3):
+            x = chainer.Variable(numpy.random.uniform(-1, 1, 4))
+            y = chainer.Variable(numpy.random.uniform(-1, 1, 4))
+            a, b = f(x, y)
+            functions.sum(a + b).backward()
+            testing.assert_allclose(a.array, x.array * y.array)
+            testing.assert_allclose(b.array, numpy.sin(x.array))
+            testing.assert_allclose(x.grad, y.array + numpy.cos(x.array))
+            testing.assert_allclose(y.grad, x.array)
+
+    def test_duplicated_input(self):
+        @chainer.static_graph
+        def f(x):
+            return x * x
+
+        for _ in range(3):
+            x = chainer.Variable(numpy.random.uniform(-1, 1, 4))
+            f(x).grad = numpy.ones(4)
+            y = f(x)
+            y.grad = numpy.ones(4)
+            y.backward()
+            testing.assert_allclose(x.grad, 2 * x.array)
+
+    def test_non_array_argument(self):
+        @chainer.static_graph
+        def f(x, n):
+            for _ in range(n):
+                x = x * 2
+            return x
+
+        x = chainer.Variable(numpy.ones(3))
+        for n in (1, 2, 1, 2):
+            testing.assert_allclose(f(x, n).array, x.array * 2 ** n)
+
+    def test_max_plans(self):
+        @chainer.static_graph(max_plans=2)
+        def f(x):
+            return x * 2
+
+        for n in (1, 2, 3, 1, 4, 3):
+            x = chainer.Variable(numpy.ones(n))
+            testing.assert_allclose(f(x).array, x.array * 2)
+            self.assertLessEqual(len(f._plans), 2)
+        self.assertEqual(
+            [key[0][0][1] for key in f._plans], [(4,), (3,)])
+
+    def test_external_input_falls_back(self):
+        state = {'h': chainer.Variable(numpy.zeros(3))}
+
+        @chainer.static_graph
+        def f(x):
+            state['h'] = state['h'] + x
+            return state['h'] * 1
+
+        x = numpy.ones(3)
+        f(x)
+        f(x)
+        y = f(x)
+        self.assertNotIsInstance(
+            y.creator, chainer.graph_optimizations.static_graph.
+            StaticGraphFunction)
+        testing.assert_allclose(y.array, x * 3)
+
+
+testing.run_module(__name__, __file__)
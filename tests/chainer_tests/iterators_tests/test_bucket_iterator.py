@@ -0,0 +1,251 @@
+from __future__ import division
+import pickle
+import unittest
+
+import numpy
+
+from chainer import iterators
+from chainer import serializer
+from chainer import testing
+
+
+class DummySerializer(serializer.Serializer):
+
+    def __init__(self, target):
+        super(DummySerializer, self).__init__()
+        self.target = target
+
+    def __getitem__(self, key):
+        raise NotImplementedError
+
+    def __call__(self, key, value):
+        self.target[key] = value
+        return self.target[key]
+
+
+class DummyDeserializer(serializer.Deserializer):
+
+    def __init__(self, target):
+        super(DummyDeserializer, self).__init__()
+        self.target = target
+
+    def __getitem__(self, key):
+        raise NotImplementedError
+
+    def __call__(self, key, value):
+        if value is None:
+            value = self.target[key]
+        elif isinstance(value, numpy.ndarray):
+            numpy.copyto(value, self.target[key])
+        else:
+            value = type(value)(numpy.asarray(self.target[key]))
+        return value
+
+
+def _padded_size(lengths, batch):
+    return len(batch) * max([lengths[i] for i in batch])
+
+
+@testing.parameterize(*testing.product({
+    'batch_size': [None, 3],
+    'max_tokens': [None, 20],
+    'bucket_width': [1, 4],
+    'shuffle': [True, False],
+}))
+class TestBucketOrderSampler(unittest.TestCase):
+
+    def setUp(self):
+        if self.batch_size is None and self.max_tokens is None:
+            self.batch_size = 4
+        self.lengths = numpy.random.randint(1, 16, size=30)
+        self.sampler = iterators.BucketOrderSampler(
+            self.lengths, batch_size=self.batch_size,
+            max_tokens=self.max_tokens, bucket_width=self.bucket_width,
+            shuffle=self.shuffle)
+
+    def test_sample_batches(self):
+        batches = self.sampler.sample_batches()
+        numpy.testing.assert_array_equal(
+            numpy.sort(numpy.concatenate(batches)), numpy.arange(30))
+        for batch in batches:
+            self.assertGreater(len(batch), 0)
+            if self.batch_size is not None:
+                self.assertLessEqual(len(batch), self.batch_size)
+            if self.max_tokens is not None and len(batch) > 1:
+                self.assertLessEqual(
+                    _padded_size(self.lengths, batch), self.max_tokens)
+
+        # Each batch is a run of the examples sorted by the buckets, so that
+        # the ranges of the buckets of the batches do not overlap
+        ranges = sorted([(b.min(), b.max()) for b in [
+            self.lengths[batch] // self.bucket_width for batch in batches]])
+        for (_, high), (low, _) in zip(ranges, ranges[1:]):
+            self.assertLessEqual(high, low)
+
+    def test_sorted_without_shuffle(self):
+        if self.shuffle:
+            return
+        batches = self.sampler.sample_batches()
+        buckets = self.lengths[numpy.concatenate(batches)] // self.bucket_width
+        self.assertTrue(numpy.all(numpy.diff(buckets) >= 0))
+
+    def test_call(self):
+        order = self.sampler(numpy.arange(30), 0)
+        self.assertEqual(order.shape, (30,))
+        numpy.testing.assert_array_equal(numpy.sort(order), numpy.arange(30))
+
+    def test_call_wrong_size(self):
+        with self.assertRaises(ValueError):
+            self.sampler(numpy.arange(29), 0)
+
+    def test_pickle(self):
+        sampler = pickle.loads(pickle.dumps(self.sampler))
+        numpy.testing.assert_array_equal(sampler.lengths, self.lengths)
+
+
+class TestBucketOrderSamplerOptions(unittest.TestCase):
+
+    def test_random_state(self):
+        lengths = numpy.random.randint(1, 16, size=30)
+        batches1 = iterators.BucketOrderSampler(
+            lengths, 4, random_state=numpy.random.RandomState(0)
+        ).sample_batches()
+        batches2 = iterators.BucketOrderSampler(
+            lengths, 4, random_state=numpy.random.RandomState(0)
+        ).sample_batches()
+        self.assertEqual(len(batches1), len(batches2))
+        for b1, b2 in zip(batches1, batches2):
+            numpy.testing.assert_array_equal(b1, b2)
+
+    def test_long_example(self):
+        sampler = iterators.BucketOrderSampler(
+            [1, 10, 2], max_tokens=4, shuffle=False)
+        batches = sampler.sample_batches()
+        self.assertEqual([b.tolist() for b in batches], [[0, 2], [1]])
+
+    def test_empty(self):
+        sampler = iterators.BucketOrderSampler([], 2)
+        self.assertEqual(sampler.sample_batches(), [])
+        self.assertEqual(len(sampler(numpy.arange(0), 0)), 0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            iterators.BucketOrderSampler([1, 2])
+        with self.assertRaises(ValueError):
+            iterators.BucketOrderSampler([1, 2], batch_size=0)
+        with self.assertRaises(ValueError):
+            iterators.BucketOrderSampler([1, 2], max_tokens=0)
+        with self.assertRaises(ValueError):
+            iterators.BucketOrderSampler([1, 2], 1, bucket_width=0)
+        with self.assertRaises(ValueError):
+            iterators.BucketOrderSampler([[1, 2]], 1)
+
+    def test_serial_iterator(self):
+        lengths = [3, 1, 2, 1, 3, 2]
+        dataset = [numpy.zeros(length) for length in lengths]
+        it = iterators.SerialIterator(
+            dataset, 2, order_sampler=iterators.BucketOrderSampler(
+                lengths, 2))
+        for _ in range(6):
+            batch = it.next()
+            self.assertEqual(len(batch[0]), len(batch[1]))
+
+
+@testing.parameterize(*testing.product({
+    'max_tokens': [None, 12],
+    'shuffle': [True, False],
+}))
+class TestBucketIterator(unittest.TestCase):
+
+    def setUp(self):
+        self.lengths = numpy.random.randint(1, 8, size=20)
+        self.dataset = [numpy.full(length, i)
+                        for i, length in enumerate(self.lengths)]
+        self.sampler = iterators.BucketOrderSampler(
+            self.lengths, batch_size=3, max_tokens=self.max_tokens,
+            shuffle=self.shuffle)
+
+    def _ids(self, batch):
+        return [int(x[0]) for x in batch]
+
+    def test_iterator_repeat(self):
+        it = iterators.BucketIterator(self.dataset, self.sampler)
+        for epoch in range(3):
+            ids = []
+            while True:
+                self.assertEqual(it.epoch, epoch)
+                previous = it.epoch_detail
+                batch = it.next()
+                self.assertAlmostEqual(it.previous_epoch_detail, previous)
+                self.assertAlmostEqual(
+                    it.epoch_detail,
+                    previous + len(batch) / 20 if not it.is_new_epoch
+                    else epoch + 1)
+                self.assertLessEqual(len(batch), 3)
+                ids.extend(self._ids(batch))
+                if it.is_new_epoch:
+                    break
+            self.assertEqual(sorted(ids), list(range(20)))
+
+    def test_iterator_not_repeat(self):
+        it = iterators.BucketIterator(self.dataset, self.sampler,
+                                      repeat=False)
+        ids = sum([self._ids(batch) for batch in it], [])
+        self.assertEqual(sorted(ids), list(range(20)))
+        self.assertEqual(it.epoch, 1)
+        with self.assertRaises(StopIteration):
+            it.next()
+
+    def test_reset(self):
+        it = iterators.BucketIterator(self.dataset, self.sampler,
+                                      repeat=False)
+        it.next()
+        it.reset()
+        self.assertEqual(it.epoch, 0)
+        self.assertEqual(it.current_position, 0)
+        self.assertIsNone(it.previous_epoch_detail)
+        ids = sum([self._ids(batch) for batch in it], [])
+        self.assertEqual(sorted(ids), list(range(20)))
+
+    def test_serialize(self):
+        it = iterators.BucketIterator(self.dataset, self.sampler)
+        for _ in range(3):
+            it.next()
+        target = {}
+        it.serialize(DummySerializer(target))
+        expected = [self._ids(it.next()) for _ in range(10)]
+
+        sampler = iterators.BucketOrderSampler(
+            self.lengths, batch_size=3, max_tokens=self.max_tokens,
+            shuffle=self.shuffle)
+        it = iterators.BucketIterator(self.dataset, sampler)
+        it.serialize(DummyDeserializer(target))
+        self.assertEqual(it.epoch, target['epoch'])
+        self.assertEqual(it.current_position, target['current_position'])
+        actual = [self._ids(it.next()) for _ in range(10)]
+        # The rest of the saved epoch is restored, and the batches of the
+        # following epochs are the same only if they are not shuffled
+        position = target['current_position']
+        for a, e in zip(actual, expected):
+            if position < 20 or not self.shuffle:
+                self.assertEqual(a, e)
+            position += len(a)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            iterators.BucketIterator(self.dataset[:-1], self.sampler)
+
+
+class TestBucketIteratorBulk(unittest.TestCase):
+
+    def test_array_dataset(self):
+        dataset = numpy.arange(10, dtype=numpy.float32)
+        sampler = iterators.BucketOrderSampler(
+            numpy.ones(10), 4, shuffle=False)
+        it = iterators.BucketIterator(dataset, sampler, repeat=False)
+        batches = list(it)
+        self.assertEqual([len(b) for b in batches], [4, 4, 2])
+        numpy.testing.assert_array_equal(batches[0].columns, [0, 1, 2, 3])
+
+
+testing.run_module(__name__, __file__)
@@ -13,6 +13,8 @@ import unittest
 import numpy
 import six
 
+from chainer import dataset as dataset_module
+from chainer import datasets
 from chainer import iterators
 from chainer import serializer
 from chainer import testing
@@ -500,6 +502,143 @@ class TestMultiprocessIteratorInvalidOrderSampler(unittest.TestCase):
             it.next()
 
 
+@testing.parameterize(*testing.product({
+    'n_prefetch': [1, 2],
+    'structure': ['array', 'tuple', 'dict'],
+}))
+class TestMultiprocessIteratorCollate(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(size=(10, 3, 2)).astype(numpy.float32)
+        self.t = numpy.arange(10, dtype=numpy.int32)
+        if self.structure == 'array':
+            self.dataset = self.x
+        elif self.structure == 'tuple':
+            self.dataset = datasets.TupleDataset(self.x, self.t)
+        else:
+            self.dataset = datasets.DictDataset(x=self.x, t=self.t)
+
+    def check_batch(self, batch, indices):
+        self.assertIsInstance(batch, dataset_module.ExampleBatch)
+        arrays = dataset_module.concat_examples(batch)
+        if self.structure == 'array':
+            numpy.testing.assert_array_equal(arrays, self.x[indices])
+        elif self.structure == 'tuple':
+            numpy.testing.assert_array_equal(arrays[0], self.x[indices])
+            numpy.testing.assert_array_equal(arrays[1], self.t[indices])
+        else:
+            numpy.testing.assert_array_equal(arrays['x'], self.x[indices])
+            numpy.testing.assert_array_equal(arrays['t'], self.t[indices])
+
+    def test_iterator(self):
+        it = iterators.MultiprocessIterator(
+            self.dataset, 4, repeat=False, shuffle=False, n_processes=2,
+            n_prefetch=self.n_prefetch, collate=True)
+        with it:
+            batches = list(it)
+            self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+            # The first batch is used to allocate the buffer, and the others
+            # are collated in it
+            for batch, start in zip(batches, [0, 4, 8]):
+                self.check_batch(batch, numpy.arange(start, start + 4)[
+                    :len(batch)])
+
+    def test_iterator_repeat(self):
+        it = iterators.MultiprocessIterator(
+            self.dataset, 4, shuffle=True, n_processes=2,
+            n_prefetch=self.n_prefetch, collate=True)
+        with it:
+            for _ in range(7):
+                batch = it.next()
+                self.assertEqual(len(batch), 4)
+                if self.structure == 'array':
+                    indices = [numpy.flatnonzero(
+                        (self.x == example).all(axis=(1, 2)))[0]
+                        for example in batch]
+                elif self.structure == 'tuple':
+                    indices = [int(t) for _, t in batch]
+                else:
+                    indices = [int(example['t']) for example in batch]
+                self.check_batch(batch, indices)
+
+    def test_hold_batches(self):
+        it = iterators.MultiprocessIterator(
+            self.dataset, 2, shuffle=False, n_processes=2,
+            n_prefetch=self.n_prefetch, collate=True)
+        n_buffers = self.n_prefetch + 2
+        with it:
+            # The first batch is used to allocate the buffers
+            it.next()
+            batches = [it.next() for _ in range(n_buffers)]
+            # The prefetch waits for a buffer while all of them are held
+            time.sleep(0.1)
+            for i, batch in enumerate(batches, 1):
+                self.check_batch(batch, [i * 2 % 10, (i * 2 + 1) % 10])
+                self.assertFalse(concat(batch).flags.owndata)
+            pointers = set([concat(batch).ctypes.data for batch in batches])
+
+            # The buffers are reused after the batches are released
+            del batch, batches
+            for i in range(n_buffers + 1, 2 * n_buffers + 1):
+                batch = it.next()
+                self.check_batch(batch, [i * 2 % 10, (i * 2 + 1) % 10])
+                self.assertIn(concat(batch).ctypes.data, pointers)
+
+    def test_copy_batches(self):
+        it = iterators.MultiprocessIterator(
+            self.dataset, 2, shuffle=False, n_processes=2,
+            n_prefetch=self.n_prefetch, collate=True, copy_batches=True)
+        with it:
+            batches = [it.next() for _ in range(6)]
+        for i, batch in enumerate(batches):
+            self.check_batch(batch, [i * 2 % 10, (i * 2 + 1) % 10])
+
+
+def concat(batch):
+    arrays = dataset_module.concat_examples(batch)
+    if isinstance(arrays, tuple):
+        return arrays[0]
+    elif isinstance(arrays, dict):
+        return arrays['x']
+    return arrays
+
+
+class TestMultiprocessIteratorCollateFallback(unittest.TestCase):
+
+    def test_variable_first_batch(self):
+        dataset = [numpy.zeros(i % 3 + 1) for i in range(6)]
+        with testing.assert_warns(UserWarning):
+            it = iterators.MultiprocessIterator(
+                dataset, 2, repeat=False, shuffle=False, n_processes=2,
+                collate=True)
+            batches = list(it)
+        it.finalize()
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 2])
+        for batch in batches:
+            self.assertNotIsInstance(batch, dataset_module.ExampleBatch)
+        for example, expected in zip(sum(batches, []), dataset):
+            numpy.testing.assert_array_equal(example, expected)
+
+    def test_variable_later_batch(self):
+        dataset = [numpy.full(3 if i < 2 else 4, i, dtype=numpy.float32)
+                   for i in range(6)]
+        it = iterators.MultiprocessIterator(
+            dataset, 2, repeat=False, shuffle=False, n_processes=2,
+            collate=True)
+        with it:
+            it.next()
+            with testing.assert_warns(UserWarning):
+                batch = it.next()
+        self.assertNotIsInstance(batch, dataset_module.ExampleBatch)
+        for example, expected in zip(batch, dataset[2:4]):
+            numpy.testing.assert_array_equal(example, expected)
+
+    def test_invalid_n_buffers(self):
+        with self.assertRaises(ValueError):
+            iterators.MultiprocessIterator(
+                numpy.zeros(4), 2, n_prefetch=2, collate=True, n_buffers=3)
+
+
 class TestMultiprocessIteratorConcurrency(unittest.TestCase):
 
     def test_finalize_not_deadlock(self):
@@ -5,6 +5,7 @@ import unittest
 import numpy
 import six
 
+from chainer import dataset as dataset_module
 from chainer import iterators
 from chainer import serializer
 from chainer import testing
@@ -45,6 +46,7 @@ class DummyDeserializer(serializer.Deserializer):
 
 @testing.parameterize(*testing.product({
     'n_threads': [1, 2],
+    'n_prefetch': [1, 3],
     'order_sampler': [
         None, lambda order, _: numpy.random.permutation(len(order))]
 }))
@@ -52,6 +54,7 @@ class TestMultithreadIterator(unittest.TestCase):
 
     def setUp(self):
         self.options = {'n_threads': self.n_threads,
+                        'n_prefetch': self.n_prefetch,
                         'order_sampler': self.order_sampler}
 
     def test_iterator_repeat(self):
@@ -286,6 +289,114 @@ class TestMultithreadIterator(unittest.TestCase):
 
 @testing.parameterize(*testing.product({
     'n_threads': [1, 2],
+    'n_prefetch': [1, 3],
+}))
+class TestMultithreadIteratorPrefetch(unittest.TestCase):
+
+    def test_prefetch_across_epochs(self):
+        dataset = [1, 2, 3, 4, 5]
+        it = iterators.MultithreadIterator(
+            dataset, 2, shuffle=False, n_threads=self.n_threads,
+            n_prefetch=self.n_prefetch)
+        batches = [it.next() for _ in range(6)]
+        self.assertEqual(sum(batches, []), dataset * 2 + [1, 2])
+        self.assertEqual(len(it._prefetched), self.n_prefetch)
+        it.finalize()
+
+    def test_not_repeat(self):
+        dataset = [1, 2, 3, 4, 5]
+        it = iterators.MultithreadIterator(
+            dataset, 2, repeat=False, shuffle=False,
+            n_threads=self.n_threads, n_prefetch=self.n_prefetch)
+        self.assertEqual(sum(list(it), []), dataset)
+        self.assertEqual(len(it._prefetched), 0)
+
+    def test_reset(self):
+        dataset = [1, 2, 3, 4, 5]
+        it = iterators.MultithreadIterator(
+            dataset, 2, shuffle=False, n_threads=self.n_threads,
+            n_prefetch=self.n_prefetch)
+        it.next()
+        it.next()
+        it.reset()
+        self.assertEqual(it.next(), [1, 2])
+
+    def test_prefetch_stats(self):
+        dataset = [1, 2, 3, 4, 5]
+        it = iterators.MultithreadIterator(
+            dataset, 2, n_threads=self.n_threads, n_prefetch=self.n_prefetch)
+        for _ in range(4):
+            it.next()
+        stats = it.prefetch_stats
+        self.assertEqual(stats['n_batches'], 4)
+        self.assertLessEqual(stats['n_waits'], 4)
+        self.assertGreaterEqual(stats['wait_time'], 0)
+        self.assertGreaterEqual(stats['mean_queue_depth'], 0)
+        self.assertLessEqual(stats['mean_queue_depth'], self.n_prefetch)
+
+        it.reset_prefetch_stats()
+        stats = it.prefetch_stats
+        self.assertEqual(stats['n_batches'], 0)
+        self.assertEqual(stats['n_waits'], 0)
+        self.assertEqual(stats['wait_time'], 0)
+        self.assertEqual(stats['mean_queue_depth'], 0)
+
+    def test_invalid_n_prefetch(self):
+        with self.assertRaises(ValueError):
+            iterators.MultithreadIterator([1, 2], 1, n_prefetch=0)
+
+
+@testing.parameterize(*testing.product({
+    'n_threads': [1, 2],
+    'structure': ['array', 'tuple', 'dict'],
+}))
+class TestMultithreadIteratorCollate(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(size=(5, 3)).astype(numpy.float32)
+        self.t = numpy.arange(5, dtype=numpy.int32)
+        if self.structure == 'array':
+            self.dataset = list(self.x)
+        elif self.structure == 'tuple':
+            self.dataset = list(zip(self.x, self.t))
+        else:
+            self.dataset = [{'x': x, 't': t} for x, t in zip(self.x, self.t)]
+
+    def test_collate(self):
+        it = iterators.MultithreadIterator(
+            self.dataset, 2, repeat=False, shuffle=False,
+            n_threads=self.n_threads, collate=True)
+        batches = list(it)
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        for batch, start in zip(batches, [0, 2, 4]):
+            self.assertIsInstance(batch, dataset_module.ExampleBatch)
+            arrays = dataset_module.concat_examples(batch)
+            x = self.x[start:start + 2]
+            t = self.t[start:start + 2]
+            if self.structure == 'array':
+                numpy.testing.assert_array_equal(arrays, x)
+            elif self.structure == 'tuple':
+                numpy.testing.assert_array_equal(arrays[0], x)
+                numpy.testing.assert_array_equal(arrays[1], t)
+            else:
+                numpy.testing.assert_array_equal(arrays['x'], x)
+                numpy.testing.assert_array_equal(arrays['t'], t)
+
+    def test_collate_variable_shapes(self):
+        dataset = [numpy.zeros(i + 1) for i in range(4)]
+        it = iterators.MultithreadIterator(
+            dataset, 2, repeat=False, shuffle=False,
+            n_threads=self.n_threads, collate=True)
+        batches = list(it)
+        for batch in batches:
+            self.assertNotIsInstance(batch, dataset_module.ExampleBatch)
+        for example, expected in zip(sum(batches, []), dataset):
+            numpy.testing.assert_array_equal(example, expected)
+
+
+@testing.parameterize(*testing.product({
+    'n_threads': [1, 2],
+    'n_prefetch': [1, 3],
     'order_sampler': [
         None, lambda order, _: numpy.random.permutation(len(order))]
 }))
@@ -293,6 +404,7 @@ class TestMultithreadIteratorSerialize(unittest.TestCase):
 
     def setUp(self):
         self.options = {'n_threads': self.n_threads,
+                        'n_prefetch': self.n_prefetch,
                         'order_sampler': self.order_sampler}
 
     def test_iterator_serialize(self):
@@ -0,0 +1,150 @@
+import unittest
+
+import numpy
+
+from chainer import iterators
+from chainer import serializer
+from chainer import testing
+
+
+class DummySerializer(serializer.Serializer):
+
+    def __init__(self, target):
+        super(DummySerializer, self).__init__()
+        self.target = target
+
+    def __getitem__(self, key):
+        raise NotImplementedError
+
+    def __call__(self, key, value):
+        self.target[key] = value
+        return self.target[key]
+
+
+class DummyDeserializer(serializer.Deserializer):
+
+    def __init__(self, target):
+        super(DummyDeserializer, self).__init__()
+        self.target = target
+
+    def __getitem__(self, key):
+        raise NotImplementedError
+
+    def __call__(self, key, value):
+        if value is None:
+            value = self.target[key]
+        elif isinstance(value, numpy.ndarray):
+            numpy.copyto(value, self.target[key])
+        else:
+            value = type(value)(numpy.asarray(self.target[key]))
+        return value
+
+
+@testing.parameterize(*testing.product({
+    'n': [12, 13],
+    'size': [1, 3, 4],
+    'shuffle': [True, False],
+    'drop_remainder': [True, False],
+}))
+class TestShardedOrderSampler(unittest.TestCase):
+
+    def setUp(self):
+        self.samplers = [
+            iterators.ShardedOrderSampler(
+                rank, self.size, seed=1, shuffle=self.shuffle,
+                drop_remainder=self.drop_remainder)
+            for rank in range(self.size)]
+
+    def _sample(self, orders):
+        return [sampler(order, 0)
+                for sampler, order in zip(self.samplers, orders)]
+
+    def test_shards(self):
+        orders = [numpy.arange(self.n)] * self.size
+        previous = None
+        for epoch in range(3):
+            orders = self._sample(orders)
+            sizes = [len(order) for order in orders]
+            self.assertEqual(len(set(sizes)), 1)
+            indices = numpy.concatenate(orders)
+            if self.drop_remainder:
+                self.assertEqual(sizes[0], self.n // self.size)
+                self.assertEqual(len(numpy.unique(indices)), len(indices))
+            else:
+                self.assertEqual(sizes[0], -(-self.n // self.size))
+                numpy.testing.assert_array_equal(
+                    numpy.unique(indices), numpy.arange(self.n))
+            if self.shuffle and previous is not None:
+                self.assertFalse(numpy.array_equal(indices, previous))
+            elif not self.shuffle and self.size == 1:
+                numpy.testing.assert_array_equal(indices, numpy.arange(
+                    len(indices)))
+            previous = indices
+
+    def test_set_epoch(self):
+        orders = [numpy.arange(self.n)] * self.size
+        expected = [self._sample(orders) for _ in range(3)][-1]
+        for sampler in self.samplers:
+            sampler.set_epoch(2)
+        for actual, e in zip(self._sample(expected), expected):
+            numpy.testing.assert_array_equal(actual, e)
+
+
+class TestShardedOrderSamplerInvalid(unittest.TestCase):
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            iterators.ShardedOrderSampler(0, 0)
+        with self.assertRaises(ValueError):
+            iterators.ShardedOrderSampler(2, 2)
+        with self.assertRaises(ValueError):
+            iterators.ShardedOrderSampler(-1, 2)
+
+
+@testing.parameterize(*testing.product({
+    'iterator': ['serial', 'multithread'],
+}))
+class TestShardedOrderSamplerIterator(unittest.TestCase):
+
+    def _create(self, dataset, rank, size):
+        sampler = iterators.ShardedOrderSampler(rank, size, seed=3)
+        if self.iterator == 'serial':
+            return iterators.SerialIterator(
+                dataset, 2, order_sampler=sampler)
+        return iterators.MultithreadIterator(
+            dataset, 2, order_sampler=sampler, n_prefetch=3)
+
+    def test_epoch_detail(self):
+        dataset = list(range(10))
+        its = [self._create(dataset, rank, 3) for rank in range(3)]
+        for epoch in range(3):
+            examples = []
+            while True:
+                batches = [it.next() for it in its]
+                for batch in batches:
+                    examples.extend(batch)
+                self.assertEqual(len(set([it.epoch_detail for it in its])), 1)
+                self.assertEqual(len(set([it.is_new_epoch for it in its])), 1)
+                if its[0].is_new_epoch:
+                    break
+            self.assertEqual(sorted(set(examples)), dataset)
+        for it in its:
+            it.finalize()
+
+    def test_serialize(self):
+        dataset = list(range(10))
+        it = self._create(dataset, 1, 3)
+        for _ in range(5):
+            it.next()
+        target = {}
+        it.serialize(DummySerializer(target))
+        expected = [it.next() for _ in range(8)]
+        it.finalize()
+
+        it = self._create(dataset, 1, 3)
+        it.serialize(DummyDeserializer(target))
+        self.assertEqual([it.next() for _ in range(8)], expected)
+        it.finalize()
+
+
+testing.run_module(__name__, __file__)
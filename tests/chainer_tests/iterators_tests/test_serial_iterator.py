@@ -3,6 +3,8 @@ import unittest
 
 import numpy
 
+import chainer
+from chainer import datasets
 from chainer import iterators
 from chainer import serializer
 from chainer import testing
@@ -240,6 +242,55 @@ class TestSerialIteratorShuffled(unittest.TestCase):
             it.reset()
 
 
+@testing.parameterize(*testing.product({
+    'shuffle': [False, True],
+    'repeat': [False, True],
+}))
+class TestSerialIteratorBulkRetrieval(unittest.TestCase):
+
+    def test_tuple_dataset(self):
+        x = numpy.arange(10, dtype=numpy.float32).reshape(5, 2)
+        t = numpy.arange(5, dtype=numpy.int32)
+        dataset = datasets.TupleDataset(x, t)
+        it = iterators.SerialIterator(dataset, 3, repeat=self.repeat,
+                                      shuffle=self.shuffle)
+
+        batches = [it.next() for _ in range(2)]
+        self.assertIsInstance(batches[0], chainer.dataset.ExampleBatch)
+        self.assertEqual(len(batches[0]), 3)
+        self.assertEqual(len(batches[1]), 3 if self.repeat else 2)
+        examples = batches[0] + batches[1]
+        for example in examples:
+            numpy.testing.assert_array_equal(example[0], x[example[1]])
+        self.assertEqual(sorted([int(t) for _, t in examples[:5]]),
+                         [0, 1, 2, 3, 4])
+
+    def test_bulk_dataset(self):
+        dataset = BulkDataset([1, 2, 3, 4, 5])
+        it = iterators.SerialIterator(dataset, 2, repeat=self.repeat,
+                                      shuffle=self.shuffle)
+        batches = sum([it.next() for _ in range(3)], [])
+        self.assertEqual(sorted(batches[:5]), [1, 2, 3, 4, 5])
+        self.assertEqual(len(dataset.calls), 3)
+
+
+class BulkDataset(object):
+
+    def __init__(self, values):
+        self.values = values
+        self.calls = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, i):
+        raise AssertionError('examples must be extracted in bulk')
+
+    def get_examples(self, indices):
+        self.calls.append(indices)
+        return [self.values[i] for i in indices]
+
+
 @testing.parameterize(
     {'order_sampler': None, 'shuffle': True},
     {'order_sampler': lambda order, _: numpy.random.permutation(len(order)),
@@ -118,12 +118,73 @@ class TestEmbedIDValueCheck(unittest.TestCase):
         self.check_value_check(self.t)
 
 
+class TestEmbedIDSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.link = links.EmbedID(5, 2, sparse_grad=True)
+        self.link.cleargrads()
+        self.x = numpy.array([[0, 3], [3, 1]], dtype=numpy.int32)
+
+    def test_backward(self):
+        y = self.link(self.x)
+        y.grad = numpy.ones(y.shape, dtype=numpy.float32)
+        y.backward()
+        W = self.link.W
+        self.assertIsNone(W.grad)
+        numpy.testing.assert_array_equal(W.sparse_grad.rows, [0, 1, 3])
+        numpy.testing.assert_array_equal(
+            W.sparse_grad.values, [[1, 1], [1, 1], [2, 2]])
+
+    @staticmethod
+    def total_grad(param):
+        grad = param.sparse_grad.to_dense()
+        if param.grad is not None:
+            grad += param.grad
+        return grad
+
+    def check_addgrads(self, pack):
+        y = self.link(self.x)
+        y.grad = numpy.ones(y.shape, dtype=numpy.float32)
+        y.backward()
+        expected = self.link.W.sparse_grad.to_dense()
+        dst = links.EmbedID(5, 2, sparse_grad=True)
+        dst.cleargrads()
+        if pack:
+            dst.pack_params(grads=True)
+            self.link.pack_params(grads=True)
+        dst.addgrads(self.link)
+        numpy.testing.assert_array_equal(self.total_grad(dst.W), expected)
+        dst.addgrads(self.link)
+        numpy.testing.assert_array_equal(
+            self.total_grad(dst.W), expected * 2)
+        self.assertIsNotNone(dst.W.sparse_grad)
+        numpy.testing.assert_array_equal(
+            self.link.W.sparse_grad.to_dense(), expected)
+
+    def test_addgrads(self):
+        self.check_addgrads(False)
+
+    def test_addgrads_packed(self):
+        self.check_addgrads(True)
+
+    @attr.gpu
+    def test_to_gpu(self):
+        y = self.link(self.x)
+        y.grad = numpy.ones(y.shape, dtype=numpy.float32)
+        y.backward()
+        expected = self.link.W.sparse_grad.to_dense()
+        self.link.to_gpu()
+        self.assertIsNone(self.link.W.sparse_grad)
+        testing.assert_allclose(self.link.W.grad, expected)
+
+
 class TestEmbedIDUnpickleOldFile(unittest.TestCase):
 
     def test_old_unpickle(self):
         embed = links.EmbedID(3, 4)
         # To emulate an old pickled file
         delattr(embed, 'ignore_label')
+        delattr(embed, 'sparse_grad')
         x = chainer.Variable(numpy.arange(2, dtype=numpy.int32))
         y = embed(x)
         self.assertEqual(y.data.shape, (2, 4))
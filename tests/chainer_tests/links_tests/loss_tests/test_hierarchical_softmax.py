@@ -31,6 +31,18 @@ class TestHuffmanTree(unittest.TestCase):
         self.assertTrue((('x', 'y'), 'z') == tree or
                         ('z', ('x', 'y')) == tree)
 
+    def test_deep(self):
+        # The tree is a chain deeper than the recursion limit
+        n = 2000
+        tree = links.BinaryHierarchicalSoftmax.create_huffman_tree(
+            {i: 2 ** i for i in range(n)})
+        link = links.BinaryHierarchicalSoftmax(2, tree)
+        f = link._func
+        self.assertEqual(f.parser_size, n - 1)
+        self.assertEqual(f.begins[-1], n * (n + 1) // 2 - 1)
+        self.assertEqual(f.begins[1] - f.begins[0], n - 1)
+        self.assertEqual(f.begins[n] - f.begins[n - 1], 1)
+
 
 class TestBinaryHierarchicalSoftmax(unittest.TestCase):
 
@@ -96,6 +108,33 @@ class TestBinaryHierarchicalSoftmax(unittest.TestCase):
                             cuda.to_gpu(self.t),
                             cuda.to_gpu(self.gy))
 
+    def test_repeated_targets_cpu(self):
+        x = numpy.random.uniform(-1, 1, (6, 3)).astype(numpy.float32)
+        t = numpy.array([4, 2, 2, 0, 4, 3], dtype=numpy.int32)
+        W = self.link.W.data
+        f = self.link._func
+
+        loss_expect = 0
+        gx_expect = numpy.empty_like(x)
+        gW_expect = numpy.zeros_like(W)
+        for i in range(len(t)):
+            begin, end = f.begins[t[i]], f.begins[t[i] + 1]
+            path = f.paths[begin:end]
+            codes = f.codes[begin:end]
+            wxy = W[path].dot(x[i]) * codes
+            loss_expect += numpy.logaddexp(0, -wxy).sum()
+            g = -self.gy * codes / (1 + numpy.exp(wxy))
+            gx_expect[i] = g.dot(W[path])
+            gW_expect[path] += numpy.outer(g, x[i])
+
+        x = chainer.Variable(x)
+        loss = self.link(x, t)
+        loss.grad = self.gy
+        loss.backward()
+        testing.assert_allclose(loss.data, loss_expect)
+        testing.assert_allclose(x.grad, gx_expect)
+        testing.assert_allclose(self.link.W.grad, gW_expect)
+
     @attr.gpu
     def test_to_cpu(self):
         f = copy.deepcopy(self.link)._func
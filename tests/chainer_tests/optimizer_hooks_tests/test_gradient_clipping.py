@@ -105,5 +105,15 @@ class TestGradientClipping(unittest.TestCase):
         self.target.to_gpu()
         self.check_clipping(2.0)
 
+    def test_clipping_packed_cpu(self):
+        self.target.pack_params(grads=True)
+        self.check_clipping(0.5)
+
+    @attr.gpu
+    def test_clipping_packed_gpu(self):
+        self.target.to_gpu()
+        self.target.pack_params(grads=True)
+        self.check_clipping(0.5)
+
 
 testing.run_module(__name__, __file__)
@@ -1,5 +1,6 @@
 import unittest
 
+import mock
 import numpy as np
 
 import chainer
@@ -49,5 +50,19 @@ class TestLasso(unittest.TestCase):
         self.target.to_gpu()
         self.check_lasso()
 
+    def test_lasso_packed_cpu(self):
+        self.target.pack_params(grads=True)
+        with mock.patch.object(
+                optimizer_hooks.Lasso, '__call__',
+                side_effect=AssertionError) as call:
+            self.check_lasso()
+        self.assertEqual(call.call_count, 0)
+
+    @attr.gpu
+    def test_lasso_packed_gpu(self):
+        self.target.to_gpu()
+        self.target.pack_params(grads=True)
+        self.check_lasso()
+
 
 testing.run_module(__name__, __file__)
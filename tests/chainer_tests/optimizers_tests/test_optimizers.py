@@ -138,4 +138,103 @@ class TestOptimizerHooks(unittest.TestCase):
         self.assertNotEqual(h_pre.value, h_post.value)
 
 
+class EmbedChain(chainer.Chain):
+
+    def __init__(self, sparse_grad):
+        super(EmbedChain, self).__init__()
+        with self.init_scope():
+            self.embed = chainer.links.EmbedID(
+                10, 3, initialW=np.arange(30, dtype=np.float32).reshape(
+                    10, 3) / 30, sparse_grad=sparse_grad)
+
+    def __call__(self, x):
+        return chainer.functions.sum(self.embed(x) ** 2)
+
+
+@testing.parameterize(*testing.product({
+    'impl': [
+        optimizers.AdaDelta,
+        optimizers.AdaGrad,
+        optimizers.Adam,
+        optimizers.CorrectedMomentumSGD,
+        optimizers.MomentumSGD,
+        optimizers.MSVAG,
+        optimizers.NesterovAG,
+        optimizers.RMSprop,
+        optimizers.RMSpropGraves,
+        optimizers.SGD,
+        optimizers.SMORMS3,
+    ],
+    'loss_scale': [None, 4],
+}))
+class TestOptimizerSparseGrad(unittest.TestCase):
+
+    # Update rules whose sparse updates only change the rows in the gradients
+    lazy = (optimizers.Adam, optimizers.MomentumSGD)
+
+    def create(self, sparse_grad, hook=None):
+        target = EmbedChain(sparse_grad)
+        optimizer = self.impl()
+        optimizer.setup(target)
+        optimizer.set_loss_scale(self.loss_scale)
+        if hook is not None:
+            optimizer.add_hook(hook)
+        return target, optimizer
+
+    def update(self, sparse_grad, xs, hook=None):
+        target, optimizer = self.create(sparse_grad, hook)
+        for x in xs:
+            optimizer.update(target, np.array(x, dtype=np.int32))
+        return target.embed.W.array
+
+    def test_first_update(self):
+        xs = [[1, 2, 2, 5]]
+        np.testing.assert_allclose(
+            self.update(True, xs), self.update(False, xs), rtol=1e-5)
+
+    def test_updates(self):
+        xs = [[1, 2, 2, 5], [3, 4], [1, 4]]
+        dense = self.update(False, xs)
+        sparse = self.update(True, xs)
+        if self.impl in self.lazy:
+            # The rows not in the last gradient stay as they were
+            sparse_before = self.update(True, xs[:-1])
+            for i in range(10):
+                if i in xs[-1]:
+                    self.assertFalse(np.allclose(sparse[i], sparse_before[i]))
+                else:
+                    np.testing.assert_array_equal(
+                        sparse[i], sparse_before[i])
+        else:
+            np.testing.assert_allclose(sparse, dense, rtol=1e-5)
+
+    def test_manual_backward(self):
+        # The loss scale given to backward is used instead of the one of the
+        # optimizer
+        target, optimizer = self.create(True)
+        loss = target(np.array([1, 2, 2, 5], dtype=np.int32))
+        target.cleargrads()
+        loss.backward(loss_scale=8)
+        optimizer.update()
+        np.testing.assert_allclose(
+            target.embed.W.array, self.update(False, [[1, 2, 2, 5]]),
+            rtol=1e-5)
+
+    def test_hook(self):
+        # Hooks work on the dense gradients
+        xs = [[1, 2, 2, 5], [3, 4], [1, 4]]
+        np.testing.assert_allclose(
+            self.update(True, xs, chainer.optimizer_hooks.WeightDecay(0.1)),
+            self.update(False, xs, chainer.optimizer_hooks.WeightDecay(0.1)),
+            rtol=1e-5)
+
+    def test_cleargrads(self):
+        target, optimizer = self.create(True)
+        optimizer.update(target, np.array([1, 2], dtype=np.int32))
+        self.assertIsNone(target.embed.W.grad)
+        self.assertIsNotNone(target.embed.W.sparse_grad)
+        target.cleargrads()
+        self.assertIsNone(target.embed.W.sparse_grad)
+
+
 testing.run_module(__name__, __file__)
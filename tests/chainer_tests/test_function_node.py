@@ -357,6 +357,65 @@ class TestFunctionNodeInconsistentBackends(unittest.TestCase):
             f.apply((x1, x2))
 
 
+class AddFunctionNodeWithRetaining(chainer.FunctionNode):
+
+    def forward(self, inputs):
+        self.retain_inputs((0,))
+        self.retain_outputs((0,))
+        return inputs[0] + inputs[1],
+
+
+class TestFunctionNodeFastPath(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.rand(2, 3).astype(numpy.float32)
+        self.f = AddFunctionNodeWithRetaining()
+        self.f._apply_fast = mock.MagicMock(wraps=self.f._apply_fast)
+
+    def check_fast_path(self, used):
+        x = chainer.Variable(self.x)
+        y, = self.f.apply((x, self.x))
+        self.assertEqual(self.f._apply_fast.called, used)
+        self.assertIs(y.creator_node, self.f)
+        self.assertEqual(y.rank, 1)
+        self.assertTrue(y.requires_grad)
+        self.assertEqual(len(self.f.inputs), 2)
+        self.assertIs(self.f.inputs[0], x.node)
+        self.assertIs(self.f.outputs[0](), y.node)
+        numpy.testing.assert_array_equal(self.f.inputs[0].data, self.x)
+        self.assertIs(self.f._retained_output_data[0], y.array)
+
+    def test_fast_path(self):
+        self.check_fast_path(True)
+
+    def test_function_hook(self):
+        with chainer.function_hooks.TimerHook():
+            self.check_fast_path(False)
+
+    def test_local_function_hook(self):
+        self.f.add_hook(chainer.function_hooks.TimerHook())
+        self.check_fast_path(False)
+
+    def test_debug(self):
+        with chainer.using_config('debug', True):
+            self.check_fast_path(False)
+
+    def test_incompatible_outputs(self):
+        self.f.forward = mock.MagicMock(return_value=(1,))
+        with self.assertRaises(TypeError):
+            self.f.apply((self.x,))
+
+    def test_non_tuple_outputs(self):
+        self.f.forward = mock.MagicMock(return_value=self.x)
+        with self.assertRaises(TypeError):
+            self.f.apply((self.x,))
+
+    @attr.gpu
+    def test_gpu(self):
+        self.x = cuda.to_gpu(self.x)
+        self.check_fast_path(False)
+
+
 @testing.parameterize(
     {'return_value': (numpy.array([float('nan')], numpy.float32),),
      'valid': False},
@@ -1643,6 +1643,226 @@ class TestChainListRepeat(unittest.TestCase):
         self.assertEqual(ret[0][0].x.dtype, ret[1][0].x.dtype)
 
 
+class TestParameterArena(unittest.TestCase):
+
+    def make_chain(self):
+        l1 = chainer.Link()
+        with l1.init_scope():
+            l1.x = chainer.Parameter(initializers.Normal(), (2, 3))
+            l1.y = chainer.Parameter(initializers.Normal())
+        l2 = chainer.Link()
+        with l2.init_scope():
+            l2.x = chainer.Parameter(initializers.Normal(), 2)
+            l2.z = chainer.Parameter(
+                initializers.Normal(dtype=numpy.float64), 4)
+        return chainer.ChainList(l1, l2)
+
+    def setUp(self):
+        self.c = self.make_chain()
+
+    def check_packed(self, arena, link):
+        for param in link.params(include_uninit=False):
+            self.assertTrue(arena.is_packed(param))
+            base = param.array.base
+            while base.base is not None:
+                base = base.base
+            self.assertTrue(any(base is data for data in arena.data))
+
+    def test_pack_params(self):
+        x = self.c[0].x.array.copy()
+        z = self.c[1].z.array.copy()
+        arena = self.c.pack_params()
+        self.assertIs(self.c.param_arena, arena)
+        self.assertEqual(len(arena.data), 2)
+        self.assertEqual(arena.data[0].dtype, numpy.float32)
+        self.assertEqual(arena.data[0].size, 8)
+        self.assertEqual(arena.data[1].dtype, numpy.float64)
+        self.assertEqual(arena.data[1].size, 4)
+        self.assertIsNone(arena.grad)
+        self.assertFalse(arena.is_packed(self.c[0].y))
+        self.check_packed(arena, self.c)
+        numpy.testing.assert_array_equal(self.c[0].x.array, x)
+        numpy.testing.assert_array_equal(self.c[1].z.array, z)
+
+        arena.data[0].fill(1)
+        numpy.testing.assert_array_equal(self.c[0].x.array, numpy.ones((2, 3)))
+        numpy.testing.assert_array_equal(self.c[1].x.array, numpy.ones(2))
+
+    def test_pack_grads(self):
+        self.c.cleargrads()
+        self.c[0].x.grad = numpy.ones((2, 3), dtype=numpy.float32)
+        arena = self.c.pack_params(grads=True)
+        self.assertEqual(len(arena.grad), 2)
+        numpy.testing.assert_array_equal(
+            arena.grad[0], [1, 1, 1, 1, 1, 1, 0, 0])
+        self.assertIsNone(self.c[1].x.grad)
+
+        arena.gather_grads()
+        arena.grad[0].fill(2)
+        numpy.testing.assert_array_equal(
+            self.c[0].x.grad, numpy.full((2, 3), 2))
+        numpy.testing.assert_array_equal(self.c[1].x.grad, numpy.full(2, 2))
+
+    def test_unpack_params(self):
+        self.c.pack_params()
+        self.c.unpack_params()
+        self.assertIsNone(self.c.param_arena)
+
+    def test_repack_after_initialization(self):
+        arena = self.c.pack_params()
+        self.c[0].y.initialize((3,))
+        y = self.c[0].y.array.copy()
+        self.assertIs(self.c.param_arena, arena)
+        self.assertTrue(arena.is_packed(self.c[0].y))
+        self.assertEqual(arena.data[0].size, 11)
+        self.check_packed(arena, self.c)
+        numpy.testing.assert_array_equal(self.c[0].y.array, y)
+
+    def test_repack_after_replacement(self):
+        arena = self.c.pack_params()
+        self.c[1].x.array = numpy.zeros(2, dtype=numpy.float32)
+        self.assertIs(self.c.param_arena, arena)
+        self.check_packed(arena, self.c)
+        numpy.testing.assert_array_equal(self.c[1].x.array, numpy.zeros(2))
+
+    def test_to_cpu(self):
+        arena = self.c.pack_params()
+        self.c.to_cpu()
+        self.assertIs(self.c.param_arena, arena)
+        self.check_packed(arena, self.c)
+
+    @attr.gpu
+    def test_to_gpu(self):
+        x = self.c[0].x.array.copy()
+        arena = self.c.pack_params()
+        self.c.to_gpu()
+        self.assertIs(self.c.param_arena, arena)
+        self.assertIsInstance(arena.data[0], cuda.cupy.ndarray)
+        cuda.cupy.testing.assert_array_equal(self.c[0].x.array, x)
+
+    def test_copy(self):
+        self.c.pack_params()
+        c = self.c.copy(mode='copy')
+        self.assertIsNone(c.param_arena)
+
+    def test_deepcopy(self):
+        self.c.pack_params(grads=True)
+        c = copy.deepcopy(self.c)
+        arena = c.param_arena
+        self.assertIsNot(arena, self.c.param_arena)
+        self.assertIsNotNone(arena.grad)
+        self.check_packed(arena, c)
+        numpy.testing.assert_array_equal(c[0].x.array, self.c[0].x.array)
+
+    def test_copyparams(self):
+        c = self.make_chain()
+        self.c.pack_params()
+        c.pack_params()
+        with mock.patch.object(
+                chainer.Parameter, 'copydata',
+                side_effect=AssertionError) as copydata:
+            self.c.copyparams(c)
+        self.assertEqual(copydata.call_count, 0)
+        numpy.testing.assert_array_equal(self.c[0].x.array, c[0].x.array)
+        numpy.testing.assert_array_equal(self.c[1].x.array, c[1].x.array)
+        numpy.testing.assert_array_equal(self.c[1].z.array, c[1].z.array)
+
+    def test_copyparams_uninitialized(self):
+        c = self.make_chain()
+        c[0].y.initialize((3,))
+        self.c.pack_params()
+        c.pack_params()
+        self.c.copyparams(c)
+        numpy.testing.assert_array_equal(self.c[0].x.array, c[0].x.array)
+        numpy.testing.assert_array_equal(self.c[0].y.array, c[0].y.array)
+
+    def test_addgrads(self):
+        c = self.make_chain()
+        self.c.cleargrads()
+        self.c[0].x.grad = numpy.ones((2, 3), dtype=numpy.float32)
+        c.zerograds()
+        c[0].x.grad.fill(2)
+        c[1].z.grad.fill(3)
+        self.c.pack_params(grads=True)
+        c.pack_params(grads=True)
+        self.c.addgrads(c)
+        numpy.testing.assert_array_equal(
+            self.c[0].x.grad, numpy.full((2, 3), 3))
+        numpy.testing.assert_array_equal(self.c[1].x.grad, numpy.zeros(2))
+        numpy.testing.assert_array_equal(self.c[1].z.grad, numpy.full(4, 3))
+
+    def test_addgrads_keeps_source(self):
+        c = self.make_chain()
+        self.c.zerograds()
+        c.cleargrads()
+        self.c.pack_params(grads=True)
+        c.pack_params(grads=True)
+        grad = numpy.full((2, 3), 2, dtype=numpy.float32)
+        c[0].x.grad = grad
+        self.c.addgrads(c)
+        numpy.testing.assert_array_equal(
+            self.c[0].x.grad, numpy.full((2, 3), 2))
+        numpy.testing.assert_array_equal(self.c[1].z.grad, numpy.zeros(4))
+        self.assertIs(c[0].x.grad, grad)
+        self.assertIsNone(c[1].x.grad)
+        self.assertIsNone(c[1].z.grad)
+
+    def test_addgrads_checks_arenas_once(self):
+        c = self.make_chain()
+        self.c.zerograds()
+        c.zerograds()
+        self.c.pack_params(grads=True)
+        c.pack_params(grads=True)
+        with mock.patch.object(
+                chainer.link.ParameterArena, 'is_compatible',
+                return_value=False) as is_compatible:
+            self.c.addgrads(c)
+            self.c.copyparams(c)
+        self.assertEqual(is_compatible.call_count, 2)
+
+    def test_zerograds(self):
+        self.c.cleargrads()
+        self.c[0].x.grad = numpy.ones((2, 3), dtype=numpy.float32)
+        arena = self.c.pack_params(grads=True)
+        with testing.assert_warns(DeprecationWarning):
+            self.c.zerograds()
+        numpy.testing.assert_array_equal(arena.grad[0], numpy.zeros(8))
+        for param in self.c.params(include_uninit=False):
+            numpy.testing.assert_array_equal(
+                param.grad, numpy.zeros(param.shape))
+        self.c[0].y.initialize((3,))
+        numpy.testing.assert_array_equal(self.c[0].y.grad, numpy.zeros(3))
+
+    def test_accumulate_grad_inplace(self):
+        link = chainer.links.Linear(3, 2)
+        link.cleargrads()
+        arena = link.pack_params(grads=True)
+        x = numpy.random.uniform(-1, 1, (4, 3)).astype(numpy.float32)
+        for _ in range(2):
+            loss = chainer.functions.sum(link(x))
+            loss.backward(accumulate_grad_inplace=True)
+        self.check_packed(arena, link)
+        for param in link.params():
+            base = param.grad.base
+            while base.base is not None:
+                base = base.base
+            self.assertIs(base, arena.grad[0])
+        numpy.testing.assert_allclose(link.b.grad, numpy.full(2, 8))
+
+    def test_serialize(self):
+        self.c.pack_params()
+        target = {}
+        self.c.serialize(chainer.serializers.DictionarySerializer(target))
+        self.assertEqual(target['0/x'].shape, (2, 3))
+        self.assertEqual(target['1/z'].shape, (4,))
+
+        c = self.make_chain()
+        c.pack_params()
+        chainer.serializers.NpzDeserializer(target).load(c)
+        self.check_packed(c.param_arena, c)
+        numpy.testing.assert_array_equal(c[0].x.array, self.c[0].x.array)
+
+
 @attr.ideep
 class TestIntel64(unittest.TestCase):
 
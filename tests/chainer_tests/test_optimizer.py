@@ -4,6 +4,7 @@ import warnings
 
 import mock
 import numpy as np
+import six
 
 import chainer
 from chainer.backends import cuda
@@ -369,6 +370,115 @@ class TestGradientMethodLossScale(unittest.TestCase):
         self.check_update()
 
 
+class FusedUpdateModel(chainer.Chain):
+
+    def __init__(self):
+        super(FusedUpdateModel, self).__init__()
+        with self.init_scope():
+            self.l1 = chainer.links.Linear(3, 4)
+            self.bn = chainer.links.BatchNormalization(4)
+            self.l2 = chainer.links.Linear(4, 2)
+
+    def __call__(self, x):
+        return chainer.functions.sum(self.l2(self.bn(self.l1(x))) ** 2)
+
+
+@testing.parameterize(*testing.product({
+    'optimizer': ['SGD', 'MomentumSGD', 'Adam', 'RMSprop'],
+    'loss_scale': [None, 4],
+}))
+class TestGradientMethodFusedUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.random.uniform(-1, 1, (5, 3)).astype(np.float32)
+        self.model1 = FusedUpdateModel()
+        self.model2 = self.model1.copy(mode='copy')
+        self.optimizer1 = self.create_optimizer(self.model1)
+        self.optimizer2 = self.create_optimizer(self.model2)
+        self.optimizer2.use_fused_update()
+
+    def create_optimizer(self, model):
+        opt = getattr(optimizers, self.optimizer)()
+        opt.setup(model)
+        # Per-parameter configurations are respected
+        model.l1.b.update_rule.hyperparam.lr = 0.5
+        model.l1.b.update_rule.hyperparam.alpha = 0.5
+        model.bn.beta.update_rule.enabled = False
+        return opt
+
+    def update(self, optimizer, model, x):
+        model.cleargrads()
+        model(x).backward(loss_scale=self.loss_scale)
+        optimizer.update()
+
+    def check_update(self, x):
+        for _ in range(3):
+            self.update(self.optimizer1, self.model1, x)
+            self.update(self.optimizer2, self.model2, x)
+        params1 = dict(self.model1.namedparams())
+        for name, param2 in self.model2.namedparams():
+            param1 = params1[name]
+            testing.assert_allclose(param1.array, param2.array)
+            self.assertEqual(param1.update_rule.t, param2.update_rule.t)
+            for key, value in six.iteritems(param1.update_rule.state or {}):
+                testing.assert_allclose(
+                    value, param2.update_rule.state[key])
+
+    def test_update_cpu(self):
+        self.check_update(self.x)
+
+    @attr.gpu
+    def test_update_gpu(self):
+        self.model1.to_gpu()
+        self.model2.to_gpu()
+        self.check_update(cuda.to_gpu(self.x))
+
+    def test_views(self):
+        self.update(self.optimizer2, self.model2, self.x)
+        # The parameters share one flat array except for the ones with their
+        # own configurations
+        W1, W2 = self.model2.l1.W, self.model2.l2.W
+        self.assertIsNotNone(W1.array.base)
+        self.assertIs(W1.array.base, W2.array.base)
+        self.assertIs(W1.grad.base, W2.grad.base)
+        for key, value in six.iteritems(W1.update_rule.state):
+            self.assertIs(value.base, W2.update_rule.state[key].base)
+        self.assertIsNot(self.model2.l1.b.array.base, W1.array.base)
+
+    def test_replace_array(self):
+        self.check_update(self.x)
+        # The parameters are packed again if an array is replaced
+        self.model1.l2.W.array = self.model1.l2.W.array.copy()
+        self.model2.l2.W.array = self.model2.l2.W.array.copy()
+        self.check_update(self.x)
+
+    def test_param_arena(self):
+        self.model2.pack_params(grads=True)
+        self.check_update(self.x)
+        # The flat arrays of the arena are used without packing again
+        arena = self.model2.param_arena
+        W1, W2 = self.model2.l1.W, self.model2.l2.W
+        self.assertIs(W1.array.base, arena.data[0])
+        self.assertIs(W2.grad.base, arena.grad[0])
+        self.assertTrue(arena.is_valid(self.model2))
+
+    def test_serialize(self):
+        self.check_update(self.x)
+        target = {}
+        serializer = chainer.serializers.DictionarySerializer(target)
+        self.optimizer2.serialize(serializer)
+
+        model = FusedUpdateModel()
+        opt = self.create_optimizer(model)
+        opt.serialize(
+            chainer.serializers.NpzDeserializer(target, strict=False))
+        params2 = dict(self.model2.namedparams())
+        for name, param in model.namedparams():
+            for key, value in six.iteritems(param.update_rule.state or {}):
+                testing.assert_allclose(
+                    value, params2[name].update_rule.state[key])
+
+
 class TestCleargradHook(unittest.TestCase):
 
     def setUp(self):
@@ -864,6 +864,62 @@ class TestVariableBasic(unittest.TestCase):
                 pass
 
 
+class VariableWithAttribute(chainer.Variable):
+
+    def __init__(self, data):
+        super(VariableWithAttribute, self).__init__(data)
+        self.attribute = 'attribute'
+
+
+class TestVariableSlots(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.arange(6, dtype=np.float32).reshape(2, 3)
+
+    def test_no_dict(self):
+        x = chainer.Variable(self.x)
+        y = x * 2
+        self.assertFalse(hasattr(x, '__dict__'))
+        self.assertFalse(hasattr(y, '__dict__'))
+        self.assertFalse(hasattr(y.node, '__dict__'))
+        with self.assertRaises(AttributeError):
+            x.attribute = 'attribute'
+
+    def test_subclass(self):
+        x = VariableWithAttribute(self.x)
+        x.grad = np.ones_like(self.x)
+        self.assertEqual(x.attribute, 'attribute')
+        y = copy.copy(x)
+        self.assertIsInstance(y, VariableWithAttribute)
+        self.assertEqual(y.attribute, 'attribute')
+        self.assertIs(y.array, x.array)
+        self.assertIs(y.grad, x.grad)
+        self.assertIsNot(y.node, x.node)
+
+    def test_copy(self):
+        x = chainer.Variable(self.x, name='x')
+        y = copy.copy(x)
+        self.assertIs(y.array, x.array)
+        self.assertEqual(y.name, 'x')
+        self.assertIsNot(y.node, x.node)
+        self.assertIs(y.node.get_variable(), y)
+
+    def test_deepcopy(self):
+        x = chainer.Variable(self.x, name='x')
+        y = copy.deepcopy(x)
+        np.testing.assert_array_equal(y.array, self.x)
+        self.assertIsNot(y.array, x.array)
+        self.assertEqual(y.name, 'x')
+
+    def test_parameter_pickle(self):
+        p = chainer.Parameter(self.x, name='p')
+        p.update_rule = None
+        q = six.moves.cPickle.loads(six.moves.cPickle.dumps(p))
+        self.assertIsInstance(q, chainer.Parameter)
+        np.testing.assert_array_equal(q.array, self.x)
+        self.assertEqual(q.name, 'p')
+
+
 class TestVariableDataAssign(unittest.TestCase):
 
     def test_variable_data_assign(self):
@@ -1839,6 +1895,124 @@ class TestLossScale(unittest.TestCase):
         self.check_loss_scale(cuda.to_gpu(self.x), cuda.to_gpu(self.y))
 
 
+@testing.parameterize(*testing.product({
+    'retain_grad': [False, True],
+}))
+class TestBackwardReleaseMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.random.uniform(-1, 1, (3, 4)).astype(np.float32)
+        self.w = np.random.uniform(-1, 1, (4, 4)).astype(np.float32)
+
+    def forward(self, x, w):
+        h = x
+        for _ in range(5):
+            h = F.tanh(F.matmul(h, w))
+        return F.sum(h * h)
+
+    def check_backward(self, x_data, w_data):
+        x1, w1 = chainer.Variable(x_data), chainer.Variable(w_data)
+        self.forward(x1, w1).backward(retain_grad=self.retain_grad)
+
+        x2, w2 = chainer.Variable(x_data), chainer.Variable(w_data)
+        loss = self.forward(x2, w2)
+        observation = {}
+        with chainer.Reporter().scope(observation):
+            loss.backward(retain_grad=self.retain_grad, release_memory=True)
+
+        testing.assert_allclose(x1.grad, x2.grad)
+        testing.assert_allclose(w1.grad, w2.grad)
+        self.assertGreater(observation['backward/released_bytes'], 0)
+        self.assertGreater(observation['backward/peak_bytes_saved'], 0)
+
+        # All retained arrays are released from the graph
+        func = loss.creator_node
+        while func is not None:
+            self.assertIsNone(func._retained_output_data)
+            for x in func.inputs:
+                if x.creator_node is not None:
+                    self.assertIsNone(x.data)
+                    self.assertIsNotNone(x.shape)
+            func = func.inputs[0].creator_node
+
+    def test_backward_cpu(self):
+        self.check_backward(self.x, self.w)
+
+    @attr.gpu
+    def test_backward_gpu(self):
+        self.check_backward(cuda.to_gpu(self.x), cuda.to_gpu(self.w))
+
+    def test_double_backprop(self):
+        loss = self.forward(chainer.Variable(self.x), chainer.Variable(self.w))
+        with self.assertRaises(ValueError):
+            loss.backward(enable_double_backprop=True, release_memory=True)
+
+
+@testing.parameterize(*testing.product({
+    'lazy_grad_sum': [False, True],
+    'loss_scale': [None, 16],
+}))
+class TestBackwardAccumulateGradInplace(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.random.uniform(-1, 1, (3, 4)).astype(np.float32)
+        self.w = np.random.uniform(-1, 1, (4, 4)).astype(np.float32)
+
+    def forward(self, x, w):
+        h = x
+        for _ in range(5):
+            h = F.tanh(F.matmul(h, w))
+        # The same parameter is passed twice to a function
+        return F.sum(h * h) + F.sum(w * w)
+
+    def check_backward(self, x_data, w_data):
+        w1 = chainer.Parameter(w_data.copy())
+        with chainer.using_config('lazy_grad_sum', self.lazy_grad_sum):
+            loss = self.forward(chainer.Variable(x_data), w1)
+        loss.backward(loss_scale=self.loss_scale)
+
+        w2 = chainer.Parameter(w_data.copy())
+        for _ in range(2):
+            w2.cleargrad()
+            with chainer.using_config('lazy_grad_sum', self.lazy_grad_sum):
+                loss = self.forward(chainer.Variable(x_data), w2)
+            loss.backward(loss_scale=self.loss_scale,
+                          accumulate_grad_inplace=True)
+            testing.assert_allclose(w1.grad, w2.grad, atol=1e-5, rtol=1e-4)
+            self.assertEqual(w2._loss_scale, self.loss_scale)
+            buf = w2.grad
+        # The gradient array is reused after cleargrad
+        self.assertIs(w2._grad_buffer, buf)
+
+        # Gradients are accumulated into the existing array
+        with chainer.using_config('lazy_grad_sum', self.lazy_grad_sum):
+            loss = self.forward(chainer.Variable(x_data), w2)
+        loss.backward(loss_scale=self.loss_scale,
+                      accumulate_grad_inplace=True)
+        self.assertIs(w2.grad, buf)
+        testing.assert_allclose(w1.grad * 2, w2.grad, atol=1e-5, rtol=1e-4)
+
+    def test_backward_cpu(self):
+        self.check_backward(self.x, self.w)
+
+    @attr.gpu
+    def test_backward_gpu(self):
+        self.check_backward(cuda.to_gpu(self.x), cuda.to_gpu(self.w))
+
+    def test_double_backprop(self):
+        loss = self.forward(
+            chainer.Variable(self.x), chainer.Parameter(self.w))
+        with self.assertRaises(ValueError):
+            loss.backward(enable_double_backprop=True,
+                          accumulate_grad_inplace=True)
+
+    def test_copy(self):
+        w = chainer.Parameter(self.w)
+        self.forward(chainer.Variable(self.x), w).backward(
+            accumulate_grad_inplace=True)
+        self.assertIsNone(copy.copy(w)._grad_buffer)
+
+
 @testing.parameterize(*testing.product({
     'shape': [(0,), (1,), (3, 2), (2, 3, 4, 3)],
     'dtype': [
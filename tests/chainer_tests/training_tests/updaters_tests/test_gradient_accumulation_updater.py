@@ -0,0 +1,236 @@
+import os
+import tempfile
+import unittest
+
+import numpy
+
+import chainer
+from chainer import iterators
+from chainer import links
+from chainer import optimizers
+from chainer import serializers
+from chainer import testing
+from chainer import training
+
+
+def _make_dataset(n):
+    x = numpy.random.uniform(-1, 1, (n, 3)).astype(numpy.float32)
+    t = numpy.random.randint(0, 4, n).astype(numpy.int32)
+    return chainer.datasets.TupleDataset(x, t)
+
+
+@testing.parameterize(*testing.product({
+    'micro_batch_size': [None, 1, 2, 4],
+    'accumulation_steps': [1, 3],
+}))
+class TestGradientAccumulationUpdater(unittest.TestCase):
+
+    def setUp(self):
+        self.batch_size = 5
+        self.dataset = _make_dataset(self.batch_size * self.accumulation_steps)
+        self.model = links.Classifier(links.Linear(3, 4))
+
+    def update(self, updater, model):
+        reporter = chainer.Reporter()
+        reporter.add_observer('main', model)
+        observation = {}
+        with reporter.scope(observation):
+            updater.update()
+        return observation
+
+    def test_update(self):
+        model1 = self.model.copy(mode='copy')
+        optimizer1 = optimizers.SGD()
+        optimizer1.setup(model1)
+        iterator1 = iterators.SerialIterator(
+            self.dataset, len(self.dataset), shuffle=False)
+        updater1 = training.updaters.StandardUpdater(iterator1, optimizer1)
+        observation1 = self.update(updater1, model1)
+
+        model2 = self.model
+        optimizer2 = optimizers.SGD()
+        optimizer2.setup(model2)
+        iterator2 = iterators.SerialIterator(
+            self.dataset, self.batch_size, shuffle=False)
+        updater2 = training.updaters.GradientAccumulationUpdater(
+            iterator2, optimizer2, micro_batch_size=self.micro_batch_size,
+            accumulation_steps=self.accumulation_steps)
+        observation2 = self.update(updater2, model2)
+
+        self.assertEqual(updater2.iteration, 1)
+        self.assertEqual(optimizer2.t, 1)
+        self.assertEqual(optimizer2.epoch, 1)
+        testing.assert_allclose(
+            model1.predictor.W.array, model2.predictor.W.array)
+        testing.assert_allclose(
+            model1.predictor.b.array, model2.predictor.b.array)
+        testing.assert_allclose(
+            observation1['main/loss'].array, observation2['main/loss'])
+        testing.assert_allclose(
+            observation1['main/accuracy'].array, observation2['main/accuracy'])
+
+
+class _ReusingIterator(chainer.dataset.Iterator):
+
+    # Returns batches of the given sizes, and overwrites the previous batch
+    # when the next one is extracted like iterators reusing their buffers.
+
+    def __init__(self, dataset, batch_sizes):
+        self.dataset = dataset
+        self.batch_sizes = batch_sizes
+        self.position = 0
+        self.is_new_epoch = False
+        self.batch = None
+
+    def __next__(self):
+        if self.batch is not None:
+            for x, _ in self.batch:
+                x[...] = 0
+        size = self.batch_sizes[0]
+        self.batch_sizes = self.batch_sizes[1:]
+        self.batch = [
+            (x.copy(), t)
+            for x, t in self.dataset[self.position:self.position + size]]
+        self.position += size
+        return self.batch
+
+    next = __next__
+
+
+@testing.parameterize(*testing.product({
+    'micro_batch_size': [None, 3],
+}))
+class TestGradientAccumulationUpdaterBatchSizes(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = _make_dataset(9)
+        self.model = links.Classifier(links.Linear(3, 4))
+
+    def update(self, updater, model):
+        reporter = chainer.Reporter()
+        reporter.add_observer('main', model)
+        with reporter.scope({}):
+            updater.update()
+
+    def test_update(self):
+        model1 = self.model.copy(mode='copy')
+        optimizer1 = optimizers.SGD()
+        optimizer1.setup(model1)
+        iterator1 = iterators.SerialIterator(
+            self.dataset, len(self.dataset), shuffle=False)
+        updater1 = training.updaters.StandardUpdater(iterator1, optimizer1)
+        self.update(updater1, model1)
+
+        model2 = self.model
+        optimizer2 = optimizers.SGD()
+        optimizer2.setup(model2)
+        iterator2 = _ReusingIterator(self.dataset, [4, 3, 2])
+        updater2 = training.updaters.GradientAccumulationUpdater(
+            iterator2, optimizer2, micro_batch_size=self.micro_batch_size,
+            accumulation_steps=3)
+        self.update(updater2, model2)
+
+        testing.assert_allclose(
+            model1.predictor.W.array, model2.predictor.W.array)
+        testing.assert_allclose(
+            model1.predictor.b.array, model2.predictor.b.array)
+
+
+class TestGradientAccumulationUpdaterBatchNormalization(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (6, 3)).astype(numpy.float32)
+        self.bn = links.BatchNormalization(3, decay=0.8)
+        self.bn.avg_mean[...] = numpy.random.uniform(-1, 1, 3)
+        self.bn.avg_var[...] = numpy.random.uniform(0.5, 1, 3)
+
+    def test_running_statistics(self):
+        avg_mean = self.bn.avg_mean.copy()
+        avg_var = self.bn.avg_var.copy()
+
+        optimizer = optimizers.SGD()
+        optimizer.setup(self.bn)
+        iterator = iterators.SerialIterator(self.x, 6, shuffle=False)
+        updater = training.updaters.GradientAccumulationUpdater(
+            iterator, optimizer, micro_batch_size=2,
+            loss_func=lambda x: chainer.functions.sum(self.bn(x)))
+        updater.update()
+
+        xs = self.x.reshape(3, 2, 3)
+        mean = xs.mean(axis=1).mean(axis=0)
+        var = xs.var(axis=1, ddof=1).mean(axis=0)
+        testing.assert_allclose(self.bn.avg_mean, 0.8 * avg_mean + 0.2 * mean)
+        testing.assert_allclose(self.bn.avg_var, 0.8 * avg_var + 0.2 * var)
+        self.assertEqual(self.bn.N, 0)
+
+    def test_uninitialized(self):
+        bn = links.BatchNormalization(axis=0, decay=0.8)
+        optimizer = optimizers.SGD()
+        optimizer.setup(bn)
+        iterator = iterators.SerialIterator(self.x, 6, shuffle=False)
+        updater = training.updaters.GradientAccumulationUpdater(
+            iterator, optimizer, micro_batch_size=2,
+            loss_func=lambda x: chainer.functions.sum(bn(x)))
+        updater.update()
+
+        mean = self.x.reshape(3, 2, 3).mean(axis=1).mean(axis=0)
+        testing.assert_allclose(bn.avg_mean, 0.2 * mean)
+
+
+class TestGradientAccumulationUpdaterTrainer(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = _make_dataset(10)
+        self.model = links.Classifier(links.Linear(3, 4))
+
+    def make_trainer(self, stop):
+        optimizer = optimizers.SGD()
+        optimizer.setup(self.model)
+        iterator = iterators.SerialIterator(self.dataset, 4)
+        updater = training.updaters.GradientAccumulationUpdater(
+            iterator, optimizer, micro_batch_size=3, accumulation_steps=2)
+        return training.Trainer(updater, (stop, 'iteration'))
+
+    def test_run(self):
+        trainer = self.make_trainer(3)
+        trainer.run()
+        self.assertEqual(trainer.updater.iteration, 3)
+        self.assertEqual(trainer.updater.get_iterator('main').epoch, 2)
+        self.assertEqual(trainer.updater.get_optimizer('main').epoch, 2)
+
+    def test_serialize(self):
+        trainer = self.make_trainer(2)
+        trainer.run()
+
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            serializers.save_npz(path, trainer.updater)
+            updater = self.make_trainer(2).updater
+            serializers.load_npz(path, updater)
+        finally:
+            os.remove(path)
+        self.assertEqual(updater.iteration, 2)
+        self.assertEqual(updater.get_iterator('main').current_position, 6)
+        self.assertEqual(updater.get_optimizer('main').t, 2)
+
+
+class TestGradientAccumulationUpdaterInvalidArguments(unittest.TestCase):
+
+    def setUp(self):
+        self.iterator = iterators.SerialIterator(_make_dataset(4), 2)
+        self.optimizer = optimizers.SGD()
+        self.optimizer.setup(links.Linear(3, 4))
+
+    def test_micro_batch_size(self):
+        with self.assertRaises(ValueError):
+            training.updaters.GradientAccumulationUpdater(
+                self.iterator, self.optimizer, micro_batch_size=0)
+
+    def test_accumulation_steps(self):
+        with self.assertRaises(ValueError):
+            training.updaters.GradientAccumulationUpdater(
+                self.iterator, self.optimizer, accumulation_steps=0)
+
+
+testing.run_module(__name__, __file__)
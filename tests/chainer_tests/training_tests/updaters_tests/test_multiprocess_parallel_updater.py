@@ -123,6 +123,52 @@ class TestGatherScatter(unittest.TestCase):
         cupy.testing.assert_array_equal(model0.fc.W.data, model1.fc.W.data)
         cupy.testing.assert_array_equal(model0.fc.b.data, model1.fc.b.data)
 
+    @attr.gpu
+    def test_gather_scatter_packed(self):
+        cupy = cuda.cupy
+        model0 = SimpleNet(dtype=self.dtype)
+        model1 = SimpleNet(dtype=self.dtype)
+        model0.to_gpu()
+        model1.to_gpu()
+        model0.pack_params(grads=True)
+        model1.pack_params(grads=True)
+        for param in model0.params():
+            param.grad = cupy.random.uniform(
+                -1, 1, param.shape).astype(self.dtype)
+
+        mpu.scatter_params(model1, mpu.gather_params(model0))
+        mpu.scatter_grads(model1, mpu.gather_grads(model0))
+
+        for name, param1 in model1.namedparams():
+            param0 = dict(model0.namedparams())[name]
+            cupy.testing.assert_array_equal(param0.array, param1.array)
+            cupy.testing.assert_array_equal(param0.grad, param1.grad)
+
+    @attr.gpu
+    def test_gather_scatter_sparse_grads(self):
+        cupy = cuda.cupy
+        model0 = chainer.Chain()
+        with model0.init_scope():
+            model0.embed = chainer.links.EmbedID(
+                10, 3, initialW=initializers.Normal(dtype=self.dtype),
+                sparse_grad=True)
+        model1 = copy.deepcopy(model0)
+        model0.to_gpu()
+        model1.to_gpu()
+
+        x = cupy.array([1, 3, 1], dtype=numpy.int32)
+        model0.cleargrads()
+        model1.cleargrads()
+        chainer.functions.sum(model0.embed(x)).backward()
+        self.assertIsNotNone(model0.embed.W.sparse_grad)
+        expected = model0.embed.W.sparse_grad.to_dense()
+
+        mpu.scatter_grads(model1, mpu.gather_grads(model0))
+
+        self.assertIsNone(model0.embed.W.sparse_grad)
+        cupy.testing.assert_array_equal(model0.embed.W.grad, expected)
+        cupy.testing.assert_array_equal(model1.embed.W.grad, expected)
+
     def test_gather_params_raise_on_cpu(self):
         model = SimpleNet(dtype=self.dtype)
         with self.assertRaises(RuntimeError):
@@ -103,6 +103,42 @@ class TestIm2Col(unittest.TestCase):
         self.check_im2col(*self.params, gpu=True)
 
 
+@testing.parameterize(*testing.product({
+    'params': [
+        (1, 1, 1, 1, 1, 1, 1, 1),
+        (2, 2, 2, 2, 2, 2, 2, 2),
+        (1, 2, 2, 1, 1, 2, 1, 1),
+        (1, 2, 3, 4, 1, 2, 1, 1),
+        (1, 2, 3, 4, 4, 5, 2, 3),
+        (3, 3, 2, 2, 1, 1, 1, 1),
+        (3, 3, 2, 2, 0, 0, 1, 1),
+        (3, 3, 1, 1, 0, 0, 1, 1),
+    ],
+    'cover_all': [True, False],
+}))
+class TestIm2ColView(unittest.TestCase):
+
+    def setUp(self):
+        self.img = numpy.random.uniform(-1, 1, (2, 3, 8, 10))
+
+    def test_im2col_view_cpu(self):
+        kh, kw, sy, sx, ph, pw, dy, dx = self.params
+        col = conv.im2col_view_cpu(
+            self.img, kh, kw, sy, sx, ph, pw, pval=-1,
+            cover_all=self.cover_all, dy=dy, dx=dx)
+        expect = conv.im2col_cpu(
+            self.img, kh, kw, sy, sx, ph, pw, pval=-1,
+            cover_all=self.cover_all, dy=dy, dx=dx)
+        self.assertFalse(col.flags.writeable)
+        numpy.testing.assert_array_equal(col, expect)
+
+    def test_zero_copy(self):
+        kh, kw, sy, sx, ph, pw, dy, dx = self.params
+        col = conv.im2col_view_cpu(self.img, kh, kw, sy, sx, 0, 0, dy=dy,
+                                   dx=dx)
+        self.assertTrue(numpy.may_share_memory(col, self.img))
+
+
 @testing.parameterize(*testing.product({
     'params': [
         (1, 1, 1, 1, 1, 1, 1, 1),
@@ -157,4 +193,71 @@ class TestCol2Im(unittest.TestCase):
         self.check_col2im(*self.params, gpu=True)
 
 
+@testing.parameterize(*testing.product({
+    'params': [
+        # (kh, kw, sy, sx, ph, pw, dy, dx, cover_all)
+        (3, 3, 1, 1, 1, 1, 1, 1, False),
+        (3, 2, 2, 3, 1, 0, 1, 1, True),
+        (3, 3, 1, 1, 2, 2, 2, 2, False),
+        (1, 1, 1, 1, 0, 0, 1, 1, False),
+        (1, 1, 2, 2, 0, 0, 1, 1, False),
+        (1, 1, 3, 3, 0, 0, 1, 1, True),
+        (1, 1, 1, 1, 1, 1, 1, 1, False),
+    ],
+    # Splits the batch into chunks, or computes 1x1 convolutions per example
+    'limits': [(1000, 256), (None, 1)],
+}))
+class TestConv2DCPU(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (5, 3, 8, 10))
+        self.original_limits = (
+            conv._max_cpu_col_size, conv._min_pointwise_size)
+        max_col_size, min_pointwise_size = self.limits
+        if max_col_size is not None:
+            conv._max_cpu_col_size = max_col_size
+        conv._min_pointwise_size = min_pointwise_size
+
+    def tearDown(self):
+        conv._max_cpu_col_size, conv._min_pointwise_size = (
+            self.original_limits)
+
+    def _col(self):
+        kh, kw, sy, sx, ph, pw, dy, dx, cover_all = self.params
+        return conv.im2col_cpu(self.x, kh, kw, sy, sx, ph, pw,
+                               cover_all=cover_all, dy=dy, dx=dx)
+
+    def test_conv_2d_cpu(self):
+        kh, kw, sy, sx, ph, pw, dy, dx, cover_all = self.params
+        W = numpy.random.uniform(-1, 1, (4, 3, kh, kw))
+        y = conv.conv_2d_cpu(self.x, W, sy, sx, ph, pw,
+                             cover_all=cover_all, dy=dy, dx=dx)
+        expect = numpy.rollaxis(numpy.tensordot(
+            self._col(), W, ((1, 2, 3), (1, 2, 3))), 3, 1)
+        self.assertTrue(y.flags.c_contiguous)
+        testing.assert_allclose(y, expect)
+
+    def test_conv_2d_grad_w_cpu(self):
+        kh, kw, sy, sx, ph, pw, dy, dx, cover_all = self.params
+        col = self._col()
+        gy = numpy.random.uniform(-1, 1, (5, 4) + col.shape[4:])
+        gW = conv.conv_2d_grad_w_cpu(self.x, gy, kh, kw, sy, sx, ph, pw,
+                                     dy=dy, dx=dx)
+        expect = numpy.tensordot(gy, col, ((0, 2, 3), (0, 4, 5)))
+        testing.assert_allclose(gW, expect)
+
+    def test_deconv_2d_cpu(self):
+        kh, kw, sy, sx, ph, pw, dy, dx, cover_all = self.params
+        W = numpy.random.uniform(-1, 1, (3, 4, kh, kw))
+        out_h = conv.get_deconv_outsize(8, kh, sy, ph, cover_all, dy)
+        out_w = conv.get_deconv_outsize(10, kw, sx, pw, cover_all, dx)
+        y = conv.deconv_2d_cpu(self.x, W, sy, sx, ph, pw, out_h, out_w,
+                               dy=dy, dx=dx)
+        col = numpy.rollaxis(numpy.tensordot(W, self.x, (0, 1)), 3)
+        expect = conv.col2im_cpu(col, sy, sx, ph, pw, out_h, out_w,
+                                 dy=dy, dx=dx)
+        self.assertTrue(y.flags.c_contiguous)
+        testing.assert_allclose(y, expect)
+
+
 testing.run_module(__name__, __file__)
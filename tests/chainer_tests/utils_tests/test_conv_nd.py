@@ -306,4 +306,84 @@ class TestCol2ImNDParameterRanks(unittest.TestCase):
             conv_nd.col2im_nd_gpu(col_gpu, self.stride, self.pad, (4,))
 
 
+@testing.parameterize(*testing.product({
+    'params': [
+        # (dims, ksize, stride, pad, dilate)
+        ((10,), (3,), (2,), (1,), 1),
+        ((10, 8), (2, 2), (2, 2), (0, 0), 1),
+        ((10, 8), (3, 3), (2, 2), (1, 1), 1),
+        ((10, 8), (3, 2), (1, 1), (1, 0), 2),
+        ((7, 6, 5), (2, 3, 2), (2, 1, 2), (1, 1, 0), 1),
+    ],
+    'cover_all': [True, False],
+}))
+class TestWindowsND(unittest.TestCase):
+
+    def setUp(self):
+        dims, ksize, stride, pad, dilate = self.params
+        self.img = numpy.random.uniform(-1, 1, (2, 3) + dims)
+        self.col = conv_nd.im2col_nd_cpu(
+            self.img, ksize, stride, pad, pval=-float('inf'),
+            cover_all=self.cover_all, dilate=dilate)
+        self.view = conv_nd.im2col_nd_view_cpu(
+            self.img, ksize, stride, pad, pval=-float('inf'),
+            cover_all=self.cover_all, dilate=dilate)
+        # (n, c, k_1 * ... * k_N, out_1, ..., out_N)
+        ndim = len(dims)
+        self.flat_col = self.col.reshape(
+            self.col.shape[:2] + (-1,) + self.col.shape[2 + ndim:])
+
+    def _index(self, indexes):
+        # Index of the elements of flat_col at the indices in the patches
+        index = numpy.indices(indexes.shape)
+        return (index[0], index[1], indexes) + tuple(index[2:])
+
+    def test_im2col_nd_view_cpu(self):
+        self.assertFalse(self.view.flags.writeable)
+        numpy.testing.assert_array_equal(self.view, self.col)
+
+    def test_max_windows_nd_cpu(self):
+        y = conv_nd.max_windows_nd_cpu(self.view)
+        numpy.testing.assert_array_equal(y, self.flat_col.max(axis=2))
+        y, indexes = conv_nd.max_windows_nd_cpu(
+            self.view, return_indices=True)
+        numpy.testing.assert_array_equal(y, self.flat_col.max(axis=2))
+        numpy.testing.assert_array_equal(
+            indexes, self.flat_col.argmax(axis=2))
+
+    def test_sum_windows_nd_cpu(self):
+        dims, ksize, stride, pad, dilate = self.params
+        view = conv_nd.im2col_nd_view_cpu(
+            self.img, ksize, stride, pad, cover_all=self.cover_all,
+            dilate=dilate)
+        col = conv_nd.im2col_nd_cpu(
+            self.img, ksize, stride, pad, cover_all=self.cover_all,
+            dilate=dilate)
+        axis = tuple(moves.range(2, 2 + len(dims)))
+        testing.assert_allclose(
+            conv_nd.sum_windows_nd_cpu(view), col.sum(axis=axis))
+
+    def test_take_windows_nd_cpu(self):
+        indexes = numpy.random.randint(
+            0, self.flat_col.shape[2],
+            self.flat_col.shape[:2] + self.flat_col.shape[3:])
+        y = conv_nd.take_windows_nd_cpu(self.view, indexes)
+        expect = self.flat_col[self._index(indexes)]
+        numpy.testing.assert_array_equal(y, expect)
+
+    def test_scatter_windows_nd_cpu(self):
+        dims, ksize, stride, pad, dilate = self.params
+        shape = self.flat_col.shape[:2] + self.flat_col.shape[3:]
+        indexes = numpy.random.randint(0, self.flat_col.shape[2], shape)
+        values = numpy.random.uniform(-1, 1, shape)
+        img = conv_nd.scatter_windows_nd_cpu(
+            values, indexes, ksize, stride, pad, dims, dilate=dilate)
+
+        col = numpy.zeros(self.flat_col.shape)
+        col[self._index(indexes)] = values
+        expect = conv_nd.col2im_nd_cpu(
+            col.reshape(self.col.shape), stride, pad, dims, dilate=dilate)
+        testing.assert_allclose(img, expect)
+
+
 testing.run_module(__name__, __file__)
@@ -2,7 +2,9 @@ import unittest
 
 import numpy
 
+from chainer.backends import cuda
 from chainer import testing
+from chainer.testing import attr
 from chainer import utils
 
 
@@ -54,4 +56,89 @@ class TestCooMatrix(unittest.TestCase):
         numpy.testing.assert_array_equal(x0, x1)
 
 
+@testing.parameterize(*testing.product({
+    'n_rows': [0, 1, 10],
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+}))
+class TestRowSparseArray(unittest.TestCase):
+
+    def setUp(self):
+        self.shape = (5, 3)
+        self.rows = numpy.random.randint(0, 5, size=self.n_rows)
+        self.values = numpy.random.uniform(
+            -1, 1, (self.n_rows, 3)).astype(self.dtype)
+        self.expected = numpy.zeros(self.shape, dtype=self.dtype)
+        numpy.add.at(self.expected, self.rows, self.values)
+        if self.dtype == numpy.float16:
+            self.tol = {'atol': 1e-3, 'rtol': 1e-3}
+        else:
+            self.tol = {'atol': 1e-6, 'rtol': 1e-6}
+
+    def check_coalesce(self, xp):
+        x = utils.RowSparseArray(
+            xp.asarray(self.rows), xp.asarray(self.values), self.shape)
+        y = x.coalesce()
+        self.assertTrue(y.coalesced)
+        self.assertIs(y.coalesce(), y)
+        rows = cuda.to_cpu(y.rows)
+        numpy.testing.assert_array_equal(rows, numpy.unique(self.rows))
+        testing.assert_allclose(
+            cuda.to_cpu(y.values), self.expected[rows], **self.tol)
+
+    def test_coalesce_cpu(self):
+        self.check_coalesce(numpy)
+
+    @attr.gpu
+    def test_coalesce_gpu(self):
+        self.check_coalesce(cuda.cupy)
+
+    def check_to_dense(self, xp):
+        x = utils.RowSparseArray(
+            xp.asarray(self.rows), xp.asarray(self.values), self.shape)
+        y = x.to_dense()
+        self.assertEqual(y.dtype, self.dtype)
+        testing.assert_allclose(cuda.to_cpu(y), self.expected, **self.tol)
+
+    def test_to_dense_cpu(self):
+        self.check_to_dense(numpy)
+
+    @attr.gpu
+    def test_to_dense_gpu(self):
+        self.check_to_dense(cuda.cupy)
+
+    def test_add_to(self):
+        x = utils.RowSparseArray(self.rows, self.values, self.shape)
+        y = numpy.ones(self.shape, dtype=self.dtype)
+        x.add_to(y)
+        testing.assert_allclose(y, self.expected + 1, **self.tol)
+
+    def test_concatenate(self):
+        x1 = utils.RowSparseArray(self.rows, self.values, self.shape)
+        x2 = utils.RowSparseArray(self.rows[::-1], self.values, self.shape)
+        y = utils.RowSparseArray.concatenate([x1, x2])
+        testing.assert_allclose(
+            y.to_dense(), self.expected + x2.to_dense(), **self.tol)
+
+
+class TestRowSparseArrayInvalid(unittest.TestCase):
+
+    def test_invalid_rows(self):
+        with self.assertRaises(ValueError):
+            utils.RowSparseArray(numpy.zeros((2, 1), dtype=numpy.int32),
+                                 numpy.zeros((2, 3)), (5, 3))
+
+    def test_invalid_values(self):
+        with self.assertRaises(ValueError):
+            utils.RowSparseArray(numpy.zeros(2, dtype=numpy.int32),
+                                 numpy.zeros((2, 4)), (5, 3))
+
+    def test_concatenate_shape_mismatch(self):
+        x1 = utils.RowSparseArray(numpy.zeros(1, dtype=numpy.int32),
+                                  numpy.zeros((1, 3)), (5, 3))
+        x2 = utils.RowSparseArray(numpy.zeros(1, dtype=numpy.int32),
+                                  numpy.zeros((1, 3)), (6, 3))
+        with self.assertRaises(ValueError):
+            utils.RowSparseArray.concatenate([x1, x2])
+
+
 testing.run_module(__name__, __file__)